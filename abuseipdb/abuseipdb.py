@@ -15,6 +15,14 @@ class AbuseIPDB(commands.Cog):
         }
         self.config.register_guild(**default_guild)
 
+    @property
+    def http(self):
+        # Pooled session shared by the BeeHive cogs, looked up per use so load order doesn't matter
+        cog = self.bot.get_cog("BeeHiveHTTP")
+        if cog is None:
+            raise RuntimeError("The beehivehttp cog must be loaded to make web requests.")
+        return cog.provider
+
     @commands.group(name="abuseipdbset")
     async def abuseipdbset(self, ctx):
         """Configure the AbuseIPDB cog"""
@@ -197,62 +205,61 @@ class AbuseIPDB(commands.Cog):
             "comment": comment,
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with ctx.typing():
-                try:
-                    async with session.post(abuseipdb_url, headers=headers, data=data) as response:
-                        try:
-                            response_data = await response.json()
-                        except Exception:
-                            await ctx.send("Failed to parse AbuseIPDB response.")
-                            return
-                        if response.status == 200:
-                            ip_address = response_data.get("data", {}).get("ipAddress")
-                            abuse_confidence_score = response_data.get("data", {}).get("abuseConfidenceScore")
-                            embed = discord.Embed(
-                                title="Your report was successfully processed",
-                                description="Reports like yours help assist security analysts and sysadmins around the world who rely on AbuseIPDB",
-                                color=0x2bbd8e
-                            )
-                            embed.add_field(name="IP address reported", value=ip_address or "Unknown", inline=True)
-                            embed.add_field(name="Updated abuse score", value=abuse_confidence_score if abuse_confidence_score is not None else "Unknown", inline=True)
-                            await ctx.send(embed=embed)
-
-                            # Track the report
-                            async with self.config.guild(ctx.guild).reports() as reports:
-                                user_id = str(ctx.author.id)
-                                now = datetime.utcnow().timestamp()
-                                if user_id not in reports:
-                                    reports[user_id] = []
-                                reports[user_id].append(now)
+        async with ctx.typing():
+            try:
+                async with self.http.post(abuseipdb_url, headers=headers, data=data) as response:
+                    try:
+                        response_data = await response.json()
+                    except Exception:
+                        await ctx.send("Failed to parse AbuseIPDB response.")
+                        return
+                    if response.status == 200:
+                        ip_address = response_data.get("data", {}).get("ipAddress")
+                        abuse_confidence_score = response_data.get("data", {}).get("abuseConfidenceScore")
+                        embed = discord.Embed(
+                            title="Your report was successfully processed",
+                            description="Reports like yours help assist security analysts and sysadmins around the world who rely on AbuseIPDB",
+                            color=0x2bbd8e
+                        )
+                        embed.add_field(name="IP address reported", value=ip_address or "Unknown", inline=True)
+                        embed.add_field(name="Updated abuse score", value=abuse_confidence_score if abuse_confidence_score is not None else "Unknown", inline=True)
+                        await ctx.send(embed=embed)
 
+                        # Track the report
+                        async with self.config.guild(ctx.guild).reports() as reports:
+                            user_id = str(ctx.author.id)
+                            now = datetime.utcnow().timestamp()
+                            if user_id not in reports:
+                                reports[user_id] = []
+                            reports[user_id].append(now)
+
+                    else:
+                        # Defensive: check for errors in response
+                        error_detail = None
+                        if "errors" in response_data and response_data["errors"]:
+                            error_detail = response_data["errors"][0].get("detail", "Unknown error.")
                         else:
-                            # Defensive: check for errors in response
-                            error_detail = None
-                            if "errors" in response_data and response_data["errors"]:
-                                error_detail = response_data["errors"][0].get("detail", "Unknown error.")
-                            else:
-                                error_detail = "Unknown error."
-                            embed = discord.Embed(
-                                title="Something went wrong",
-                                description=error_detail,
-                                color=0xff4545
-                            )
-                            await ctx.send(embed=embed)
-                except aiohttp.ClientError as e:
-                    embed = discord.Embed(
-                        title="Client Error",
-                        description=f"An error occurred while trying to report the IP address: {str(e)}",
-                        color=0xff4545
-                    )
-                    await ctx.send(embed=embed)
-                except Exception as e:
-                    embed = discord.Embed(
-                        title="Unexpected Error",
-                        description=f"An unexpected error occurred: {str(e)}",
-                        color=0xff4545
-                    )
-                    await ctx.send(embed=embed)
+                            error_detail = "Unknown error."
+                        embed = discord.Embed(
+                            title="Something went wrong",
+                            description=error_detail,
+                            color=0xff4545
+                        )
+                        await ctx.send(embed=embed)
+            except aiohttp.ClientError as e:
+                embed = discord.Embed(
+                    title="Client Error",
+                    description=f"An error occurred while trying to report the IP address: {str(e)}",
+                    color=0xff4545
+                )
+                await ctx.send(embed=embed)
+            except Exception as e:
+                embed = discord.Embed(
+                    title="Unexpected Error",
+                    description=f"An unexpected error occurred: {str(e)}",
+                    color=0xff4545
+                )
+                await ctx.send(embed=embed)
 
     @abuseipdb.command(name="leaderboard", description="Show the top 10 reporters over the last 30 days.")
     async def leaderboard(self, ctx):
@@ -344,44 +351,43 @@ class AbuseIPDB(commands.Cog):
         }
 
         all_reports = []
-        async with aiohttp.ClientSession() as session:
-            async with ctx.typing():
-                try:
-                    async with session.get(abuseipdb_url, headers=headers, params=params) as response:
-                        if response.status == 200:
-                            try:
-                                data = await response.json()
-                            except Exception:
-                                await ctx.send("Failed to parse AbuseIPDB response.")
-                                return
-                            report_data = data.get('data', {})
-                            total_reports = report_data.get('total', 0)
-                            if not isinstance(total_reports, int):
-                                total_reports = 0
-                            pages = (total_reports // params["perPage"]) + (1 if total_reports % params["perPage"] != 0 else 0)
-
-                            for page in range(1, pages + 1):
-                                params["page"] = page
-                                async with session.get(abuseipdb_url, headers=headers, params=params) as page_response:
-                                    if page_response.status == 200:
-                                        try:
-                                            page_data = await page_response.json()
-                                        except Exception:
-                                            await ctx.send("Failed to parse AbuseIPDB response.")
-                                            return
-                                        all_reports.extend(page_data.get('data', {}).get('results', []))
-                                    else:
-                                        await ctx.send("Failed to fetch data from AbuseIPDB.")
-                                        return
-                        else:
-                            await ctx.send("Failed to fetch data from AbuseIPDB.")
+        async with ctx.typing():
+            try:
+                async with self.http.get(abuseipdb_url, headers=headers, params=params) as response:
+                    if response.status == 200:
+                        try:
+                            data = await response.json()
+                        except Exception:
+                            await ctx.send("Failed to parse AbuseIPDB response.")
                             return
-                except aiohttp.ClientError as e:
-                    await ctx.send(f"Client error while fetching data from AbuseIPDB: {e}")
-                    return
-                except Exception as e:
-                    await ctx.send(f"Unexpected error while fetching data from AbuseIPDB: {e}")
-                    return
+                        report_data = data.get('data', {})
+                        total_reports = report_data.get('total', 0)
+                        if not isinstance(total_reports, int):
+                            total_reports = 0
+                        pages = (total_reports // params["perPage"]) + (1 if total_reports % params["perPage"] != 0 else 0)
+
+                        for page in range(1, pages + 1):
+                            params["page"] = page
+                            async with self.http.get(abuseipdb_url, headers=headers, params=params) as page_response:
+                                if page_response.status == 200:
+                                    try:
+                                        page_data = await page_response.json()
+                                    except Exception:
+                                        await ctx.send("Failed to parse AbuseIPDB response.")
+                                        return
+                                    all_reports.extend(page_data.get('data', {}).get('results', []))
+                                else:
+                                    await ctx.send("Failed to fetch data from AbuseIPDB.")
+                                    return
+                    else:
+                        await ctx.send("Failed to fetch data from AbuseIPDB.")
+                        return
+            except aiohttp.ClientError as e:
+                await ctx.send(f"Client error while fetching data from AbuseIPDB: {e}")
+                return
+            except Exception as e:
+                await ctx.send(f"Unexpected error while fetching data from AbuseIPDB: {e}")
+                return
 
         if not all_reports:
             await ctx.send(f"No reports found for IP address {ip}.")
@@ -478,65 +484,64 @@ class AbuseIPDB(commands.Cog):
             "verbose": ""
         }
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(abuseipdb_url, headers=headers, params=params) as response:
-                    if response.status == 200:
+        try:
+            async with self.http.get(abuseipdb_url, headers=headers, params=params) as response:
+                if response.status == 200:
+                    try:
+                        data = await response.json()
+                    except Exception:
+                        await ctx.send("Failed to parse AbuseIPDB response.")
+                        return
+                    report = data.get('data', {})
+                    embed = discord.Embed(title=f"AbuseIPDB report for {ip}", color=0xfffffe)
+                    embed.add_field(name="IP address", value=report.get('ipAddress', 'Unknown'), inline=True)
+                    embed.add_field(name="Abuse confidence score", value=report.get('abuseConfidenceScore', 'Unknown'), inline=True)
+                    embed.add_field(name="Country", value=f"{report.get('countryName', 'Unknown')} ({report.get('countryCode', '??')})", inline=True)
+                    embed.add_field(name="ISP", value=report.get('isp', 'Unknown'), inline=True)
+                    embed.add_field(name="Domain", value=report.get('domain', 'Unknown'), inline=True)
+                    embed.add_field(name="Total reports", value=report.get('totalReports', 'Unknown'), inline=True)
+
+                    last_reported_at = report.get('lastReportedAt')
+                    if last_reported_at:
                         try:
-                            data = await response.json()
+                            if hasattr(discord.utils, "parse_time"):
+                                dt = discord.utils.parse_time(last_reported_at)
+                            else:
+                                dt = datetime.fromisoformat(last_reported_at.replace("Z", "+00:00"))
+                            timestamp = int(dt.timestamp())
+                            time_str = f"**<t:{timestamp}:R>**"
                         except Exception:
-                            await ctx.send("Failed to parse AbuseIPDB response.")
-                            return
-                        report = data.get('data', {})
-                        embed = discord.Embed(title=f"AbuseIPDB report for {ip}", color=0xfffffe)
-                        embed.add_field(name="IP address", value=report.get('ipAddress', 'Unknown'), inline=True)
-                        embed.add_field(name="Abuse confidence score", value=report.get('abuseConfidenceScore', 'Unknown'), inline=True)
-                        embed.add_field(name="Country", value=f"{report.get('countryName', 'Unknown')} ({report.get('countryCode', '??')})", inline=True)
-                        embed.add_field(name="ISP", value=report.get('isp', 'Unknown'), inline=True)
-                        embed.add_field(name="Domain", value=report.get('domain', 'Unknown'), inline=True)
-                        embed.add_field(name="Total reports", value=report.get('totalReports', 'Unknown'), inline=True)
-
-                        last_reported_at = report.get('lastReportedAt')
-                        if last_reported_at:
+                            time_str = last_reported_at
+                        embed.add_field(name="Last reported", value=time_str, inline=True)
+                    else:
+                        embed.add_field(name="Last reported", value="No reports available", inline=True)
+
+                    # Defensive: check if 'reports' exists and is a list
+                    reports_list = report.get('reports', [])
+                    if isinstance(reports_list, list) and reports_list:
+                        for i, rep in enumerate(reports_list[:5]):
+                            rep_reported_at = rep.get("reportedAt")
                             try:
                                 if hasattr(discord.utils, "parse_time"):
-                                    dt = discord.utils.parse_time(last_reported_at)
+                                    dt = discord.utils.parse_time(rep_reported_at)
                                 else:
-                                    dt = datetime.fromisoformat(last_reported_at.replace("Z", "+00:00"))
+                                    dt = datetime.fromisoformat(rep_reported_at.replace("Z", "+00:00"))
                                 timestamp = int(dt.timestamp())
-                                time_str = f"**<t:{timestamp}:R>**"
+                                rep_time_str = f"**<t:{timestamp}:R>**"
                             except Exception:
-                                time_str = last_reported_at
-                            embed.add_field(name="Last reported", value=time_str, inline=True)
-                        else:
-                            embed.add_field(name="Last reported", value="No reports available", inline=True)
-
-                        # Defensive: check if 'reports' exists and is a list
-                        reports_list = report.get('reports', [])
-                        if isinstance(reports_list, list) and reports_list:
-                            for i, rep in enumerate(reports_list[:5]):
-                                rep_reported_at = rep.get("reportedAt")
-                                try:
-                                    if hasattr(discord.utils, "parse_time"):
-                                        dt = discord.utils.parse_time(rep_reported_at)
-                                    else:
-                                        dt = datetime.fromisoformat(rep_reported_at.replace("Z", "+00:00"))
-                                    timestamp = int(dt.timestamp())
-                                    rep_time_str = f"**<t:{timestamp}:R>**"
-                                except Exception:
-                                    rep_time_str = rep_reported_at or "Unknown time"
-                                comment = rep.get("comment", "")
-                                embed.add_field(
-                                    name=f"Report {i+1}",
-                                    value=f'{rep_time_str}, "{comment}"',
-                                    inline=False
-                                )
-                        await ctx.send(embed=embed)
-                    else:
-                        await ctx.send("Failed to fetch data from AbuseIPDB.")
-            except aiohttp.ClientError as e:
-                await ctx.send(f"Client error while fetching data from AbuseIPDB: {e}")
-            except Exception as e:
-                await ctx.send(f"Unexpected error while fetching data from AbuseIPDB: {e}")
+                                rep_time_str = rep_reported_at or "Unknown time"
+                            comment = rep.get("comment", "")
+                            embed.add_field(
+                                name=f"Report {i+1}",
+                                value=f'{rep_time_str}, "{comment}"',
+                                inline=False
+                            )
+                    await ctx.send(embed=embed)
+                else:
+                    await ctx.send("Failed to fetch data from AbuseIPDB.")
+        except aiohttp.ClientError as e:
+            await ctx.send(f"Client error while fetching data from AbuseIPDB: {e}")
+        except Exception as e:
+            await ctx.send(f"Unexpected error while fetching data from AbuseIPDB: {e}")
 
 
@@ -1,19 +1,120 @@
 import discord  # type: ignore
+from discord.ext import tasks  # type: ignore
 from redbot.core import commands, Config, checks  # type: ignore
 import asyncio
-import re
 import time
-import unicodedata
-import string
-from collections import defaultdict, deque, Counter
+from collections import deque, Counter
 from difflib import SequenceMatcher
 
+from .clusters import CopypastaIndex
+from .features import HOMOGLYPH_MAP, INVISIBLE_CHARS, MessageFeatures, TextFingerprint
+from .punish import PunishmentQueue
+from .state import ExpiringStore
+
 try:
     from rapidfuzz import fuzz
     RAPIDFUZZ_AVAILABLE = True
 except ImportError:
     RAPIDFUZZ_AVAILABLE = False
 
+
+class GuildSettings:
+    """
+    Per-guild snapshot of AntiSpam configuration.
+    Loaded once from Config and reused by the message hot path until a setting changes.
+    """
+
+    __slots__ = (
+        "enabled",
+        "message_limit",
+        "interval",
+        "similarity_threshold",
+        "ascii_art_threshold",
+        "ascii_art_min_lines",
+        "emoji_spam_threshold",
+        "emoji_spam_unique_threshold",
+        "punishment",
+        "timeout_time",
+        "ignored_channels",
+        "ignored_roles",
+        "ignored_users",
+        "log_channel",
+        "raid_enabled",
+        "raid_window",
+        "raid_join_age",
+        "raid_min_msgs",
+        "raid_min_unique_users",
+        "raid_min_new_users",
+        "raid_cluster_authors",
+        "raid_cluster_window",
+        "h1_max_lines",
+        "h1_max_length",
+        "h2_max_lines",
+        "h2_max_length",
+        "h3_max_lines",
+        "h3_max_length",
+    )
+
+    enabled: bool
+    message_limit: int
+    interval: int
+    similarity_threshold: float
+    ascii_art_threshold: int
+    ascii_art_min_lines: int
+    emoji_spam_threshold: int
+    emoji_spam_unique_threshold: int
+    punishment: str
+    timeout_time: int
+    ignored_channels: frozenset
+    ignored_roles: frozenset
+    ignored_users: frozenset
+    log_channel: int
+    raid_enabled: bool
+    raid_window: int
+    raid_join_age: int
+    raid_min_msgs: int
+    raid_min_unique_users: int
+    raid_min_new_users: int
+    raid_cluster_authors: int
+    raid_cluster_window: int
+    h1_max_lines: int
+    h1_max_length: int
+    h2_max_lines: int
+    h2_max_length: int
+    h3_max_lines: int
+    h3_max_length: int
+
+    def __init__(self, data: dict):
+        self.enabled = bool(data["enabled"])
+        self.message_limit = int(data["message_limit"])
+        self.interval = int(data["interval"])
+        self.similarity_threshold = float(data["similarity_threshold"])
+        self.ascii_art_threshold = int(data["ascii_art_threshold"])
+        self.ascii_art_min_lines = int(data["ascii_art_min_lines"])
+        self.emoji_spam_threshold = int(data["emoji_spam_threshold"])
+        self.emoji_spam_unique_threshold = int(data["emoji_spam_unique_threshold"])
+        self.punishment = data["punishment"]
+        self.timeout_time = int(data["timeout_time"])
+        self.ignored_channels = frozenset(data["ignored_channels"])
+        self.ignored_roles = frozenset(data["ignored_roles"])
+        self.ignored_users = frozenset(data["ignored_users"])
+        self.log_channel = data["log_channel"]
+        self.raid_enabled = bool(data["raid_enabled"])
+        self.raid_window = int(data["raid_window"])
+        self.raid_join_age = int(data["raid_join_age"])
+        self.raid_min_msgs = int(data["raid_min_msgs"])
+        self.raid_min_unique_users = int(data["raid_min_unique_users"])
+        self.raid_min_new_users = int(data["raid_min_new_users"])
+        self.raid_cluster_authors = int(data["raid_cluster_authors"])
+        self.raid_cluster_window = int(data["raid_cluster_window"])
+        self.h1_max_lines = int(data["h1_max_lines"])
+        self.h1_max_length = int(data["h1_max_length"])
+        self.h2_max_lines = int(data["h2_max_lines"])
+        self.h2_max_length = int(data["h2_max_length"])
+        self.h3_max_lines = int(data["h3_max_lines"])
+        self.h3_max_length = int(data["h3_max_length"])
+
+
 class AntiSpam(commands.Cog):
     """
     Heuristic-based anti-spam cog for Red-DiscordBot.
@@ -35,45 +136,15 @@ class AntiSpam(commands.Cog):
         # "Invisible.Obfuscation.H!msg": "Obfuscated/invisible characters: Message contains invisible or control unicode characters.",  # Removed
         "Unicode.Homoglyph.I!msg": "Unicode homoglyph abuse: Message uses visually confusable unicode characters.",
         "Coordinated.Raid.J!msg": "Coordinated spam/raid: Multiple new users spamming in a channel.",
+        "Coordinated.Copypasta.L!msg": "Coordinated copypasta: Many different users posting near-identical messages in a short time.",
         "Markdown.Header.K!msg": "Markdown header spam: Excessive or overly long H1/H2/H3 markdown headers in a message.",
     }
 
-    # Unicode invisible/obfuscation characters
-    INVISIBLE_CHARS = [
-        "\u200b",  # zero-width space
-        "\u200c",  # zero-width non-joiner
-        "\u200e",  # left-to-right mark
-        "\u200f",  # right-to-left mark
-        "\u202a",  # left-to-right embedding
-        "\u202b",  # right-to-left embedding
-        "\u202c",  # pop directional formatting
-        "\u202d",  # left-to-right override
-        "\u202e",  # right-to-left override
-        "\u2060",  # word joiner
-        "\u2061",  # function application
-        "\u2062",  # invisible times
-        "\u2063",  # invisible separator
-        "\u2064",  # invisible plus
-        "\ufeff",  # zero-width no-break space
-    ]
-
-    # Unicode confusables/homoglyphs
-    HOMOGLYPH_MAP = {
-        "а": "a",  # Cyrillic a
-        "е": "e",  # Cyrillic e
-        "о": "o",  # Cyrillic o
-        "р": "p",  # Cyrillic p
-        "с": "c",  # Cyrillic c
-        "у": "y",  # Cyrillic y
-        "х": "x",  # Cyrillic x
-        "і": "i",  # Cyrillic i
-        "Ι": "I",  # Greek capital iota
-        "Ο": "O",  # Greek capital omicron
-        "Α": "A",  # Greek capital alpha
-        "Β": "B",  # Greek capital beta
-        "ϲ": "c",  # Greek small letter lunate sigma
-        # ... (expand as needed)
-    }
+    # Unicode invisible/obfuscation characters (see features.py)
+    INVISIBLE_CHARS = INVISIBLE_CHARS
+
+    # Unicode confusables/homoglyphs (see features.py)
+    HOMOGLYPH_MAP = HOMOGLYPH_MAP
 
     # Default Markdown header spam thresholds
     HEADER_SPAM_LIMITS = {
@@ -85,51 +156,127 @@ class AntiSpam(commands.Cog):
         "h3_max_length": 100,   # Max allowed length of a single H3 line
     }
 
+    DEFAULT_GUILD = {
+        "enabled": True,
+        "message_limit": 6,
+        "interval": 7,
+        "similarity_threshold": 0.80,
+        "ascii_art_threshold": 12,
+        "ascii_art_min_lines": 6,
+        "emoji_spam_threshold": 15,
+        "emoji_spam_unique_threshold": 10,
+        "punishment": "timeout",
+        "timeout_time": 15,  # Default timeout time in minutes
+        "ignored_channels": [],
+        "ignored_roles": [],
+        "ignored_users": [],
+        "log_channel": None,
+        # Raid detection thresholds (new)
+        "raid_enabled": True,  # <--- NEW: raid detection toggle
+        "raid_window": 60,  # seconds
+        "raid_join_age": 1200,  # seconds (10 minutes)
+        "raid_min_msgs": 7,
+        "raid_min_unique_users": 8,
+        "raid_min_new_users": 5,
+        "raid_cluster_authors": 5,  # distinct authors posting the same text, 0 disables
+        "raid_cluster_window": 120,  # seconds
+        # Markdown header spam (customizable)
+        "h1_max_lines": HEADER_SPAM_LIMITS["h1_max_lines"],
+        "h1_max_length": HEADER_SPAM_LIMITS["h1_max_length"],
+        "h2_max_lines": HEADER_SPAM_LIMITS["h2_max_lines"],
+        "h2_max_length": HEADER_SPAM_LIMITS["h2_max_length"],
+        "h3_max_lines": HEADER_SPAM_LIMITS["h3_max_lines"],
+        "h3_max_length": HEADER_SPAM_LIMITS["h3_max_length"],
+    }
+
     def __init__(self, bot):
         self.bot = bot
         self.config = Config.get_conf(self, identifier=73947298374)
-        default_guild = {
-            "enabled": True,
-            "message_limit": 6,
-            "interval": 7,
-            "similarity_threshold": 0.80,
-            "ascii_art_threshold": 12,
-            "ascii_art_min_lines": 6,
-            "emoji_spam_threshold": 15,
-            "emoji_spam_unique_threshold": 10,
-            "punishment": "timeout",
-            "timeout_time": 15,  # Default timeout time in minutes
-            "ignored_channels": [],
-            "ignored_roles": [],
-            "ignored_users": [],
-            "log_channel": None,
-            # Raid detection thresholds (new)
-            "raid_enabled": True,  # <--- NEW: raid detection toggle
-            "raid_window": 60,  # seconds
-            "raid_join_age": 1200,  # seconds (10 minutes)
-            "raid_min_msgs": 7,
-            "raid_min_unique_users": 8,
-            "raid_min_new_users": 5,
-            # Markdown header spam (customizable)
-            "h1_max_lines": self.HEADER_SPAM_LIMITS["h1_max_lines"],
-            "h1_max_length": self.HEADER_SPAM_LIMITS["h1_max_length"],
-            "h2_max_lines": self.HEADER_SPAM_LIMITS["h2_max_lines"],
-            "h2_max_length": self.HEADER_SPAM_LIMITS["h2_max_length"],
-            "h3_max_lines": self.HEADER_SPAM_LIMITS["h3_max_lines"],
-            "h3_max_length": self.HEADER_SPAM_LIMITS["h3_max_length"],
-        }
-        self.config.register_guild(**default_guild)
-        self.user_message_cache = defaultdict(lambda: deque(maxlen=15))
-        self.user_last_action = {}
-
-        # For coordinated/raid detection
-        self.channel_user_message_times = defaultdict(lambda: deque(maxlen=100))
-        self.channel_new_user_joins = defaultdict(lambda: deque(maxlen=100))
-        self.user_first_seen = {}
+        self.config.register_guild(**self.DEFAULT_GUILD)
+        self.config.register_global(memory_limit_mb=64)
+        self._init_state()
+        self.sweep_state.start()
+
+    def _init_state(self):
+        """Set up in-memory detection state. Kept apart from __init__ so replay.py can reuse it without Red."""
+        # Wall clock used by the heuristics; the replay harness swaps in a virtual clock
+        self._clock = time.time
+
+        # In-memory detection state expires once idle for longer than any window that reads it,
+        # and is capped in size so a bot in thousands of guilds can't grow it forever.
+        # Heuristic 2 has no time window, so message history is kept well past 2b's 5 minutes.
+        self.user_message_cache = ExpiringStore(
+            "user_message_cache", ttl=30 * 60, max_entries=50000, factory=lambda: deque(maxlen=15)
+        )
+        self.user_last_action = ExpiringStore("user_last_action", ttl=60, max_entries=50000)
+
+        # For coordinated/raid detection (raid and cluster windows are capped at 600s)
+        self.channel_user_message_times = ExpiringStore(
+            "channel_user_message_times", ttl=15 * 60, max_entries=20000, factory=lambda: deque(maxlen=100)
+        )
+        self.channel_new_user_joins = ExpiringStore(
+            "channel_new_user_joins", ttl=15 * 60, max_entries=20000, factory=lambda: deque(maxlen=100)
+        )
+        # {(guild_id, user_id): join time}. Raid join age is capped at one day, so an entry idle
+        # for longer can only belong to an old member; a missing entry is never treated as new
+        self.user_first_seen = ExpiringStore("user_first_seen", ttl=25 * 60 * 60, max_entries=200000)
+        # Guild-wide near-duplicate index for cross-user copypasta
+        self.guild_copypasta_index = ExpiringStore(
+            "guild_copypasta_index", ttl=15 * 60, max_entries=5000, factory=CopypastaIndex
+        )
+        self._state_stores = (
+            self.user_message_cache,
+            self.user_last_action,
+            self.channel_user_message_times,
+            self.channel_new_user_joins,
+            self.user_first_seen,
+            self.guild_copypasta_index,
+        )
+        self._memory_limit_mb = 64
+
+        # Per-guild batched punishment pipelines
+        self.punishment_queues = {}
+
+        # Per-guild settings snapshots, dropped whenever a setting changes
+        self._settings_cache = {}
+
+    def cog_unload(self):
+        self.sweep_state.cancel()
+        for queue in self.punishment_queues.values():
+            queue.cancel()
 
     async def red_delete_data_for_user(self, *, requester, user_id: int):
         pass
 
+    @tasks.loop(seconds=60)
+    async def sweep_state(self):
+        """Expire idle detection state and shed least recently used entries above the memory ceiling."""
+        for store in self._state_stores:
+            store.sweep()
+        limit = self._memory_limit_mb * 1024 * 1024
+        total = sum(store.estimate_bytes() for store in self._state_stores)
+        if total > limit:
+            # Shed the same share from every store, with a little headroom so we don't trim every minute
+            fraction = min(1.0, (total - limit) / total + 0.05)
+            for store in self._state_stores:
+                store.shrink(fraction)
+
+    @sweep_state.before_loop
+    async def before_sweep_state(self):
+        self._memory_limit_mb = await self.config.memory_limit_mb()
+
+    async def _get_settings(self, guild) -> GuildSettings:
+        """Return the cached settings snapshot for a guild, loading it from Config if needed."""
+        settings = self._settings_cache.get(guild.id)
+        if settings is None:
+            settings = GuildSettings(await self.config.guild(guild).all())
+            self._settings_cache[guild.id] = settings
+        return settings
+
+    def _invalidate_settings(self, guild):
+        """Drop the cached settings snapshot for a guild so the next message reloads it."""
+        self._settings_cache.pop(guild.id, None)
+
     @commands.group(name="antispam", invoke_without_command=True)
     @commands.guild_only()
     @checks.admin_or_permissions(manage_guild=True)
@@ -141,12 +288,14 @@ class AntiSpam(commands.Cog):
     async def enable(self, ctx):
         """Enable AntiSpam in this server."""
         await self.config.guild(ctx.guild).enabled.set(True)
+        self._invalidate_settings(ctx.guild)
         await ctx.send("AntiSpam enabled.")
 
     @antispam.command()
     async def disable(self, ctx):
         """Disable AntiSpam in this server."""
         await self.config.guild(ctx.guild).enabled.set(False)
+        self._invalidate_settings(ctx.guild)
         await ctx.send("AntiSpam disabled.")
 
     @antispam.command()
@@ -157,6 +306,7 @@ class AntiSpam(commands.Cog):
             return
         await self.config.guild(ctx.guild).message_limit.set(messages)
         await self.config.guild(ctx.guild).interval.set(seconds)
+        self._invalidate_settings(ctx.guild)
         await ctx.send(f"Set to {messages} messages per {seconds} seconds.")
 
     @antispam.command()
@@ -167,6 +317,7 @@ class AntiSpam(commands.Cog):
             await ctx.send("Invalid punishment. Choose from: timeout, kick, ban, none.")
             return
         await self.config.guild(ctx.guild).punishment.set(punishment)
+        self._invalidate_settings(ctx.guild)
         await ctx.send(f"Punishment set to: {punishment}")
 
     @antispam.command()
@@ -176,6 +327,7 @@ class AntiSpam(commands.Cog):
             await ctx.send("Timeout time must be greater than 0 minutes.")
             return
         await self.config.guild(ctx.guild).timeout_time.set(minutes)
+        self._invalidate_settings(ctx.guild)
         await ctx.send(f"Timeout time set to {minutes} minutes.")
 
     @antispam.command()
@@ -186,6 +338,7 @@ class AntiSpam(commands.Cog):
             return
         await self.config.guild(ctx.guild).emoji_spam_threshold.set(max_emojis)
         await self.config.guild(ctx.guild).emoji_spam_unique_threshold.set(max_unique)
+        self._invalidate_settings(ctx.guild)
         await ctx.send(f"Emoji spam thresholds set: {max_emojis} total, {max_unique} unique per message.")
 
     @antispam.command(name="similarity")
@@ -198,6 +351,7 @@ class AntiSpam(commands.Cog):
             await ctx.send("Threshold must be between 0.0 and 1.0 (exclusive).")
             return
         await self.config.guild(ctx.guild).similarity_threshold.set(threshold)
+        self._invalidate_settings(ctx.guild)
         await ctx.send(f"Similarity threshold set to {threshold:.2f}.")
 
     @antispam.command(name="logs")
@@ -205,9 +359,11 @@ class AntiSpam(commands.Cog):
         """Set the channel where antispam logs are sent. Use without argument to clear."""
         if channel is None:
             await self.config.guild(ctx.guild).log_channel.set(None)
+            self._invalidate_settings(ctx.guild)
             await ctx.send("Antispam log channel cleared.")
         else:
             await self.config.guild(ctx.guild).log_channel.set(channel.id)
+            self._invalidate_settings(ctx.guild)
             await ctx.send(f"Antispam log channel set to {channel.mention}.")
 
     @antispam.group(name="whitelist")
@@ -226,6 +382,7 @@ class AntiSpam(commands.Cog):
             else:
                 chans.append(channel.id)
                 await ctx.send(f"Whitelisted channel: {channel.mention}")
+        self._invalidate_settings(ctx.guild)
 
     @whitelist.command(name="role")
     async def whitelist_role(self, ctx, role: discord.Role):
@@ -237,6 +394,7 @@ class AntiSpam(commands.Cog):
             else:
                 roles.append(role.id)
                 await ctx.send(f"Whitelisted role: {role.name}")
+        self._invalidate_settings(ctx.guild)
 
     @whitelist.command(name="user")
     async def whitelist_user(self, ctx, user: discord.Member):
@@ -248,6 +406,7 @@ class AntiSpam(commands.Cog):
             else:
                 users.append(user.id)
                 await ctx.send(f"Whitelisted user: {user.mention}")
+        self._invalidate_settings(ctx.guild)
 
     @antispam.command(name="signatures")
     async def signatures(self, ctx):
@@ -261,6 +420,68 @@ class AntiSpam(commands.Cog):
             embed.add_field(name=code, value=desc, inline=False)
         await ctx.send(embed=embed)
 
+    @antispam.group(name="debug", invoke_without_command=True)
+    @commands.is_owner()
+    async def debug(self, ctx):
+        """Show in-memory detection state: entries, estimated bytes, and evictions."""
+        embed = discord.Embed(
+            title="AntiSpam memory",
+            color=0xfffffe,
+            description=f"Memory ceiling: **{self._memory_limit_mb} MB**",
+        )
+        total_bytes = 0
+        for store in self._state_stores:
+            stats = store.stats()
+            total_bytes += stats["bytes"]
+            embed.add_field(
+                name=store.name,
+                value=(
+                    f"Entries: {stats['entries']:,}\n"
+                    f"Bytes (est.): {stats['bytes']:,}\n"
+                    f"Expired: {stats['expired']:,}\n"
+                    f"Evicted: {stats['evicted']:,}"
+                ),
+            )
+        embed.set_footer(text=f"Total estimated: {total_bytes / (1024 * 1024):.2f} MB")
+        await ctx.send(embed=embed)
+
+    @debug.command(name="memory")
+    async def debug_memory(self, ctx, megabytes: int):
+        """Set the memory ceiling (in MB) for in-memory detection state across all servers."""
+        if megabytes < 8 or megabytes > 4096:
+            await ctx.send("Memory ceiling must be between 8 and 4096 MB.")
+            return
+        await self.config.memory_limit_mb.set(megabytes)
+        self._memory_limit_mb = megabytes
+        await ctx.send(f"AntiSpam memory ceiling set to {megabytes} MB.")
+
+    @debug.command(name="replay")
+    async def debug_replay(self, ctx):
+        """
+        Replay an attached JSONL message stream through the heuristics offline.
+        Each line: {"ts": ..., "author": ..., "channel": ..., "content": ..., "mentions": [...]}
+        Uses this server's current settings. Nothing is punished.
+        """
+        from .replay import load_stream, replay
+
+        if not ctx.message.attachments:
+            await ctx.send("Attach a JSONL message stream to replay.")
+            return
+        try:
+            raw = await ctx.message.attachments[0].read()
+            records = load_stream(raw.decode("utf-8").splitlines())
+        except (UnicodeDecodeError, ValueError) as e:
+            await ctx.send(f"Could not parse the stream: {e}")
+            return
+        overrides = await self.config.guild(ctx.guild).all()
+        # CPU-bound, so it gets its own loop in a worker thread instead of stalling the gateway.
+        # Allocation tracing is process-wide, so that's left to the command-line harness.
+        async with ctx.typing():
+            report = await asyncio.to_thread(
+                asyncio.run, replay(records, overrides, measure_allocations=False)
+            )
+        await ctx.send(f"```\n{report.format()[:1900]}\n```")
+
     @antispam.group(name="raid", invoke_without_command=True)
     async def raid(self, ctx):
         """Configure coordinated raid/spam detection thresholds."""
@@ -270,12 +491,14 @@ class AntiSpam(commands.Cog):
     async def raid_enable(self, ctx):
         """Enable coordinated raid/spam detection."""
         await self.config.guild(ctx.guild).raid_enabled.set(True)
+        self._invalidate_settings(ctx.guild)
         await ctx.send("Raid detection enabled.")
 
     @raid.command(name="disable")
     async def raid_disable(self, ctx):
         """Disable coordinated raid/spam detection."""
         await self.config.guild(ctx.guild).raid_enabled.set(False)
+        self._invalidate_settings(ctx.guild)
         await ctx.send("Raid detection disabled.")
 
     @raid.command(name="window")
@@ -285,6 +508,7 @@ class AntiSpam(commands.Cog):
             await ctx.send("Window must be between 5 and 600 seconds.")
             return
         await self.config.guild(ctx.guild).raid_window.set(seconds)
+        self._invalidate_settings(ctx.guild)
         await ctx.send(f"Raid detection window set to {seconds} seconds.")
 
     @raid.command(name="joinage")
@@ -294,6 +518,7 @@ class AntiSpam(commands.Cog):
             await ctx.send("Join age must be between 60 and 86400 seconds (1 minute to 1 day).")
             return
         await self.config.guild(ctx.guild).raid_join_age.set(seconds)
+        self._invalidate_settings(ctx.guild)
         await ctx.send(f"Raid detection 'new user' join age set to {seconds} seconds.")
 
     @raid.command(name="minmsgs")
@@ -303,6 +528,7 @@ class AntiSpam(commands.Cog):
             await ctx.send("Minimum messages must be between 2 and 100.")
             return
         await self.config.guild(ctx.guild).raid_min_msgs.set(count)
+        self._invalidate_settings(ctx.guild)
         await ctx.send(f"Raid detection minimum messages set to {count}.")
 
     @raid.command(name="minunique")
@@ -312,6 +538,7 @@ class AntiSpam(commands.Cog):
             await ctx.send("Minimum unique users must be between 2 and 100.")
             return
         await self.config.guild(ctx.guild).raid_min_unique_users.set(count)
+        self._invalidate_settings(ctx.guild)
         await ctx.send(f"Raid detection minimum unique users set to {count}.")
 
     @raid.command(name="minnew")
@@ -321,8 +548,29 @@ class AntiSpam(commands.Cog):
             await ctx.send("Minimum new users must be between 1 and 100.")
             return
         await self.config.guild(ctx.guild).raid_min_new_users.set(count)
+        self._invalidate_settings(ctx.guild)
         await ctx.send(f"Raid detection minimum new users set to {count}.")
 
+    @raid.command(name="copypasta")
+    async def raid_copypasta(self, ctx, authors: int, seconds: int = 120):
+        """
+        Flag near-identical messages posted by many different users (default: 5 users in 120 seconds).
+        Set authors to 0 to disable cross-user copypasta detection.
+        """
+        if authors != 0 and (authors < 2 or authors > 100):
+            await ctx.send("Authors must be 0 (disabled) or between 2 and 100.")
+            return
+        if seconds < 10 or seconds > 600:
+            await ctx.send("Window must be between 10 and 600 seconds.")
+            return
+        await self.config.guild(ctx.guild).raid_cluster_authors.set(authors)
+        await self.config.guild(ctx.guild).raid_cluster_window.set(seconds)
+        self._invalidate_settings(ctx.guild)
+        if authors == 0:
+            await ctx.send("Cross-user copypasta detection disabled.")
+        else:
+            await ctx.send(f"Cross-user copypasta detection set to {authors} users within {seconds} seconds.")
+
     @antispam.group(name="headerspam", invoke_without_command=True)
     async def headerspam(self, ctx):
         """Configure markdown header spam thresholds."""
@@ -335,6 +583,7 @@ class AntiSpam(commands.Cog):
             await ctx.send("H1 max lines must be between 0 and 20.")
             return
         await self.config.guild(ctx.guild).h1_max_lines.set(max_lines)
+        self._invalidate_settings(ctx.guild)
         example = "\n".join([f"# Example H1 header {i+1}" for i in range(max_lines)]) if max_lines > 0 else "*No H1 headers allowed*"
         await ctx.send(f"Set H1 max lines to {max_lines}.\nExample:\n{example}")
 
@@ -345,6 +594,7 @@ class AntiSpam(commands.Cog):
             await ctx.send("H1 max length must be between 10 and 500.")
             return
         await self.config.guild(ctx.guild).h1_max_length.set(max_length)
+        self._invalidate_settings(ctx.guild)
         example = "# " + "A" * (max_length - 2)
         await ctx.send(f"Set H1 max length to {max_length}.\nExample:\n{example}")
 
@@ -355,6 +605,7 @@ class AntiSpam(commands.Cog):
             await ctx.send("H2 max lines must be between 0 and 20.")
             return
         await self.config.guild(ctx.guild).h2_max_lines.set(max_lines)
+        self._invalidate_settings(ctx.guild)
         example = "\n".join([f"## Example H2 header {i+1}" for i in range(max_lines)]) if max_lines > 0 else "*No H2 headers allowed*"
         await ctx.send(f"Set H2 max lines to {max_lines}.\nExample:\n{example}")
 
@@ -365,6 +616,7 @@ class AntiSpam(commands.Cog):
             await ctx.send("H2 max length must be between 10 and 500.")
             return
         await self.config.guild(ctx.guild).h2_max_length.set(max_length)
+        self._invalidate_settings(ctx.guild)
         example = "## " + "B" * (max_length - 3)
         await ctx.send(f"Set H2 max length to {max_length}.\nExample:\n{example}")
 
@@ -375,6 +627,7 @@ class AntiSpam(commands.Cog):
             await ctx.send("H3 max lines must be between 0 and 20.")
             return
         await self.config.guild(ctx.guild).h3_max_lines.set(max_lines)
+        self._invalidate_settings(ctx.guild)
         example = "\n".join([f"### Example H3 header {i+1}" for i in range(max_lines)]) if max_lines > 0 else "*No H3 headers allowed*"
         await ctx.send(f"Set H3 max lines to {max_lines}.\nExample:\n{example}")
 
@@ -385,6 +638,7 @@ class AntiSpam(commands.Cog):
             await ctx.send("H3 max length must be between 10 and 500.")
             return
         await self.config.guild(ctx.guild).h3_max_length.set(max_length)
+        self._invalidate_settings(ctx.guild)
         example = "### " + "C" * (max_length - 4)
         await ctx.send(f"Set H3 max length to {max_length}.\nExample:\n{example}")
 
@@ -402,71 +656,79 @@ class AntiSpam(commands.Cog):
                 return
 
         guild = message.guild
-        conf = self.config.guild(guild)
         try:
-            enabled = await conf.enabled()
+            settings = await self._get_settings(guild)
         except Exception:
             return
 
-        if not enabled:
+        if not settings.enabled:
             return
 
-        try:
-            ignored_channels = await conf.ignored_channels()
-            ignored_roles = await conf.ignored_roles()
-            ignored_users = await conf.ignored_users()
-        except Exception:
-            return
-
-        if message.channel.id in ignored_channels:
+        if message.channel.id in settings.ignored_channels:
             return
         if hasattr(message.author, "roles"):
-            if any(role.id in ignored_roles for role in getattr(message.author, "roles", [])):
+            ignored_roles = settings.ignored_roles
+            if ignored_roles and any(role.id in ignored_roles for role in getattr(message.author, "roles", [])):
                 return
-        if message.author.id in ignored_users:
+        if message.author.id in settings.ignored_users:
             return
 
-        now = time.time()
+        now = self._clock()
         cache = self.user_message_cache[message.author.id]
-        cache.append((now, message.content))
-
-        # Track first seen for coordinated/raid detection
-        if message.author.id not in self.user_first_seen:
-            self.user_first_seen[message.author.id] = now
-            # Track join for this channel
-            self.channel_new_user_joins[message.channel.id].append((now, message.author.id))
+        # Normalize once on the way in; the similarity heuristics reuse it for every later comparison
+        cache.append((now, message.content, TextFingerprint(message.content)))
+
+        # Track join time for coordinated/raid detection. It comes from joined_at, so a member whose
+        # entry expired or was evicted gets their real age back instead of looking brand new;
+        # the first message seen only stands in for authors without one
+        first_seen_key = (guild.id, message.author.id)
+        if first_seen_key not in self.user_first_seen:
+            joined_at = getattr(message.author, "joined_at", None)
+            first_seen = joined_at.timestamp() if joined_at is not None else now
+            if now - first_seen < settings.raid_join_age:
+                # Track join for this channel
+                self.channel_new_user_joins[message.channel.id].append((now, message.author.id))
+            self.user_first_seen[first_seen_key] = first_seen
+        else:
+            # Refreshes the entry for returning users so active members never expire
+            self.user_first_seen.setdefault(first_seen_key)
 
         # Track per-channel user message times for coordinated/raid detection
         self.channel_user_message_times[message.channel.id].append((now, message.author.id))
 
+        # Track guild-wide near-duplicates for cross-user copypasta, even if a later heuristic fires first
+        cluster_matches = []
+        if settings.raid_enabled and settings.raid_cluster_authors:
+            cluster_matches = self.guild_copypasta_index[guild.id].add_and_match(
+                now,
+                message.author.id,
+                message.channel.id,
+                cache[-1][2],
+                settings.raid_cluster_window,
+                lambda a, b: self._similar(a, b, settings.similarity_threshold),
+            )
+
         # Heuristic 1: Message Frequency (Flooding)
-        try:
-            message_limit = await conf.message_limit()
-            interval = await conf.interval()
-        except Exception:
-            return
-        recent_msgs = [t for t, _ in cache if now - t < interval]
-        if len(recent_msgs) >= message_limit:
+        interval = settings.interval
+        recent_msgs = [t for t, _, _ in cache if now - t < interval]
+        if len(recent_msgs) >= settings.message_limit:
             reason = "MsgFlood.A!msg"
             evidence = "\n".join(
                 f"<t:{int(ts)}:f>: {content[:200]}"
-                for ts, content in list(cache)[-len(recent_msgs):]
+                for ts, content, _ in list(cache)[-len(recent_msgs):]
             )
             await self._punish(message, reason, evidence=evidence)
             return
 
         # Heuristic 2: Message Similarity (Copypasta/Repeat)
-        try:
-            similarity_threshold = await conf.similarity_threshold()
-        except Exception:
-            similarity_threshold = 0.85
+        similarity_threshold = settings.similarity_threshold
         if len(cache) >= 3:
-            last = cache[-1][1]
+            _, last, last_fp = cache[-1]
             similar_count = 0
             similar_msgs = []
             similar_msgs_timestamps = []
-            for idx, (ts, prev) in enumerate(list(cache)[-4:-1]):
-                if self._similar(last, prev, similarity_threshold):
+            for ts, prev, prev_fp in list(cache)[-4:-1]:
+                if self._similar(last_fp, prev_fp, similarity_threshold):
                     similar_count += 1
                     similar_msgs.append(prev)
                     similar_msgs_timestamps.append(ts)
@@ -487,11 +749,11 @@ class AntiSpam(commands.Cog):
         five_minutes = 5 * 60
         similar_msgs_5min = []
         if len(cache) >= 2:
-            last_content = cache[-1][1]
-            for ts, prev_content in list(cache):
+            last_fp = cache[-1][2]
+            for ts, prev_content, prev_fp in list(cache):
                 if now - ts > five_minutes:
                     continue
-                if self._similar(last_content, prev_content, similarity_threshold):
+                if self._similar(last_fp, prev_fp, similarity_threshold):
                     similar_msgs_5min.append((ts, prev_content))
             if len(similar_msgs_5min) >= 2:
                 reason = "Repeat.Timespan.C!msg"
@@ -504,27 +766,15 @@ class AntiSpam(commands.Cog):
                 await self._punish(message, reason, evidence=evidence)
                 return
 
-        # Heuristic 2c: Markdown Header Spam (H1/H2/H3)
-        try:
-            h1_max_lines = await conf.h1_max_lines()
-            h1_max_length = await conf.h1_max_length()
-            h2_max_lines = await conf.h2_max_lines()
-            h2_max_length = await conf.h2_max_length()
-            h3_max_lines = await conf.h3_max_lines()
-            h3_max_length = await conf.h3_max_length()
-        except Exception:
-            h1_max_lines = self.HEADER_SPAM_LIMITS["h1_max_lines"]
-            h1_max_length = self.HEADER_SPAM_LIMITS["h1_max_length"]
-            h2_max_lines = self.HEADER_SPAM_LIMITS["h2_max_lines"]
-            h2_max_length = self.HEADER_SPAM_LIMITS["h2_max_length"]
-            h3_max_lines = self.HEADER_SPAM_LIMITS["h3_max_lines"]
-            h3_max_length = self.HEADER_SPAM_LIMITS["h3_max_length"]
+        # Heuristics 2c-8 are threshold checks over a single pass of the content
+        features = MessageFeatures(message.content)
 
+        # Heuristic 2c: Markdown Header Spam (H1/H2/H3)
         header_spam_result = self._check_markdown_header_spam(
-            message.content,
-            h1_max_lines, h1_max_length,
-            h2_max_lines, h2_max_length,
-            h3_max_lines, h3_max_length
+            features,
+            settings.h1_max_lines, settings.h1_max_length,
+            settings.h2_max_lines, settings.h2_max_length,
+            settings.h3_max_lines, settings.h3_max_length
         )
         if header_spam_result is not None:
             reason = "Markdown.Header.K!msg"
@@ -533,56 +783,45 @@ class AntiSpam(commands.Cog):
             return
 
         # Heuristic 3: ASCII Art / Large Block Messages
-        try:
-            ascii_art_threshold = await conf.ascii_art_threshold()
-            ascii_art_min_lines = await conf.ascii_art_min_lines()
-        except Exception:
-            ascii_art_threshold = 12
-            ascii_art_min_lines = 6
-        if self._is_ascii_art(message.content, ascii_art_threshold, ascii_art_min_lines):
+        if self._is_ascii_art(features, settings.ascii_art_threshold, settings.ascii_art_min_lines):
             reason = "Block.AsciiArt.D!msg"
             evidence = f"Message content (first 600 chars):\n`{message.content[:600]}`"
             await self._punish(message, reason, evidence=evidence)
             return
 
         # Heuristic 4: Emoji Spam/Excessive Emoji Usage
-        try:
-            emoji_spam_threshold = await conf.emoji_spam_threshold()
-            emoji_spam_unique_threshold = await conf.emoji_spam_unique_threshold()
-        except Exception:
-            emoji_spam_threshold = 15
-            emoji_spam_unique_threshold = 10
-        emoji_count, unique_emoji_count, emoji_list = self._count_emojis(message.content)
-        if emoji_count >= emoji_spam_threshold or unique_emoji_count >= emoji_spam_unique_threshold:
+        if (
+            features.emoji_count >= settings.emoji_spam_threshold
+            or features.unique_emoji_count >= settings.emoji_spam_unique_threshold
+        ):
             reason = "Emoji.Spam.E!msg"
             evidence = (
-                f"Total emojis: {emoji_count}\n"
-                f"Unique emojis: {unique_emoji_count}\n"
-                f"Emojis: {' '.join(emoji_list)[:400]}\n"
+                f"Total emojis: {features.emoji_count}\n"
+                f"Unique emojis: {features.unique_emoji_count}\n"
+                f"Emojis: {' '.join(features.emojis)[:400]}\n"
                 f"Message content (first 400 chars):\n{message.content[:400]}"
             )
             await self._punish(message, reason, evidence=evidence)
             return
 
         # Heuristic 5: Zalgo/Unicode Spam
-        if self._is_zalgo(message.content):
-            zalgo_chars = re.findall(r'[\u0300-\u036F\u0489]', message.content)
+        if self._is_zalgo(features):
             reason = "Unicode.Zalgo.F!msg"
             evidence = (
                 f"Message content (first 400 chars):\n{message.content[:400]}\n\n"
-                f"Number of zalgo/unicode marks: {len(zalgo_chars)}"
+                f"Number of zalgo/unicode marks: {features.combining_marks}"
             )
             await self._punish(message, reason, evidence=evidence)
             return
 
         # Heuristic 6: Mass Mentions
-        if self._is_mass_mention(message):
+        if self._is_mass_mention(message, features):
             mention_list = [f"<@{m.id}>" for m in message.mentions]
             reason = "Mention.Mass.G!msg"
             evidence = (
                 f"Mentions: {', '.join(mention_list) if mention_list else 'None'}\n"
-                f"@everyone: {'@everyone' in message.content}\n"
-                f"@here: {'@here' in message.content}\n"
+                f"@everyone: {features.has_everyone}\n"
+                f"@here: {features.has_here}\n"
                 f"Message content (first 400 chars):\n{message.content[:400]}"
             )
             await self._punish(message, reason, evidence=evidence)
@@ -592,7 +831,7 @@ class AntiSpam(commands.Cog):
         # (Removed: No longer checks for invisible/obfuscated characters)
 
         # Heuristic 8: Unicode Homoglyph/Language Abuse
-        if self._has_homoglyph_abuse(message.content):
+        if self._has_homoglyph_abuse(features):
             reason = "Unicode.Homoglyph.I!msg"
             evidence = (
                 f"Message contains suspicious unicode homoglyphs (confusable with ASCII):\n"
@@ -602,20 +841,24 @@ class AntiSpam(commands.Cog):
             return
 
         # Heuristic 9: Coordinated Spam/Raid Detection (toggleable)
-        try:
-            raid_enabled = await conf.raid_enabled()
-        except Exception:
-            raid_enabled = True
-        if raid_enabled:
-            raid_triggered, raid_evidence = await self._detect_coordinated_raid(message)
+        if settings.raid_enabled:
+            raid_triggered, raid_evidence = await self._detect_coordinated_raid(message, settings)
             if raid_triggered:
                 reason = "Coordinated.Raid.J!msg"
                 await self._punish(message, reason, evidence=raid_evidence)
                 return
 
+        # Heuristic 10: Cross-user copypasta cluster (part of raid detection)
+        if cluster_matches:
+            cluster_evidence = self._check_copypasta_cluster(message, settings, cluster_matches, now)
+            if cluster_evidence is not None:
+                reason = "Coordinated.Copypasta.L!msg"
+                await self._punish(message, reason, evidence=cluster_evidence)
+                return
+
     def _check_markdown_header_spam(
         self,
-        content: str,
+        features: MessageFeatures,
         h1_max_lines: int, h1_max_length: int,
         h2_max_lines: int, h2_max_length: int,
         h3_max_lines: int, h3_max_length: int
@@ -623,19 +866,9 @@ class AntiSpam(commands.Cog):
         """
         Returns evidence string if header spam detected, else None.
         """
-        h1_lines = []
-        h2_lines = []
-        h3_lines = []
-        lines = content.splitlines()
-        for line in lines:
-            # Remove leading/trailing whitespace for accurate matching
-            lstripped = line.lstrip()
-            if lstripped.startswith("# "):
-                h1_lines.append(lstripped)
-            elif lstripped.startswith("## "):
-                h2_lines.append(lstripped)
-            elif lstripped.startswith("### "):
-                h3_lines.append(lstripped)
+        h1_lines = features.h1_lines
+        h2_lines = features.h2_lines
+        h3_lines = features.h3_lines
         # Check for too many headers
         if len(h1_lines) > h1_max_lines:
             return (
@@ -673,27 +906,16 @@ class AntiSpam(commands.Cog):
                 )
         return None
 
-    def _normalize_text(self, text):
-        # Remove invisible chars, normalize case, strip punctuation, NFKC normalize, replace homoglyphs
-        text = unicodedata.normalize("NFKC", text)
-        # Remove invisible chars
-        for ch in self.INVISIBLE_CHARS:
-            text = text.replace(ch, "")
-        # Replace homoglyphs with ASCII equivalents
-        text = "".join(self.HOMOGLYPH_MAP.get(c, c) for c in text)
-        # Remove punctuation
-        text = text.translate(str.maketrans("", "", string.punctuation))
-        # Lowercase
-        text = text.lower()
-        # Remove extra whitespace
-        text = " ".join(text.split())
-        return text
-
     def _similar(self, a, b, threshold):
-        if not a or not b:
+        """Compare two cached TextFingerprints, skipping the fuzzy matcher when they cannot match."""
+        if a.norm is None or b.norm is None:
+            return False
+        if a is b or (a.norm and a.norm == b.norm):
+            return True
+        if not a.may_be_similar(b, threshold):
             return False
-        norm_a = self._normalize_text(a)
-        norm_b = self._normalize_text(b)
+        norm_a = a.norm
+        norm_b = b.norm
         try:
             if RAPIDFUZZ_AVAILABLE:
                 # Use token_sort_ratio for better fuzzy matching
@@ -705,97 +927,39 @@ class AntiSpam(commands.Cog):
             return False
         return score > threshold
 
-    def _is_ascii_art(self, content, threshold, min_lines):
-        lines = content.splitlines()
-        if len(lines) < min_lines:
-            return False
-        ascii_lines = 0
-        for line in lines:
-            if len(line) > threshold and all(ord(c) < 128 for c in line if c.strip()):
-                ascii_lines += 1
-        return ascii_lines >= min_lines
-
-    def _is_zalgo(self, content):
-        zalgo_re = re.compile(r'[\u0300-\u036F\u0489]')
-        try:
-            return len(zalgo_re.findall(content)) > 15
-        except Exception:
+    def _is_ascii_art(self, features, threshold, min_lines):
+        if len(features.lines) < min_lines:
             return False
+        return features.ascii_art_lines(threshold) >= min_lines
+
+    def _is_zalgo(self, features):
+        return features.combining_marks > 15
 
-    def _is_mass_mention(self, message):
+    def _is_mass_mention(self, message, features):
         if hasattr(message, "mentions") and len(message.mentions) >= 5:
             return True
-        if "@everyone" in message.content or "@here" in message.content:
+        if features.has_everyone or features.has_here:
             return True
         return False
 
-    def _count_emojis(self, content):
-        custom_emoji_re = re.compile(r'<a?:\w+:\d+>')
-        unicode_emoji_re = re.compile(
-            "["
-            "\U0001F600-\U0001F64F"
-            "\U0001F300-\U0001F5FF"
-            "\U0001F680-\U0001F6FF"
-            "\U0001F1E0-\U0001F1FF"
-            "\U00002700-\U000027BF"
-            "\U0001F900-\U0001F9FF"
-            "\U00002600-\U000026FF"
-            "\U00002B50"
-            "\U00002B06"
-            "\U00002B07"
-            "\U00002B1B-\U00002B1C"
-            "\U0000231A-\U0000231B"
-            "\U000025AA-\U000025AB"
-            "\U000025FB-\U000025FE"
-            "\U0001F004"
-            "\U0001F0CF"
-            "]+"
-        )
-        custom_emojis = custom_emoji_re.findall(content)
-        unicode_emojis = unicode_emoji_re.findall(content)
-        emoji_list = custom_emojis + unicode_emojis
-        unique_emoji_set = set(emoji_list)
-        return len(emoji_list), len(unique_emoji_set), emoji_list
-
-    # Removed _find_invisible_chars and all uses
-
-    def _has_homoglyph_abuse(self, content):
+    def _has_homoglyph_abuse(self, features):
         # If message contains a suspicious number of non-ASCII chars that are confusable with ASCII
-        count = 0
-        for c in content:
-            if c in self.HOMOGLYPH_MAP and self.HOMOGLYPH_MAP[c] != c:
-                count += 1
+        count = features.homoglyph_count
         # Heuristic: 3+ confusable chars in a short message, or 5+ in any message
         if count >= 5:
             return True
-        if count >= 3 and len(content) < 50:
+        if count >= 3 and features.length < 50:
             return True
         return False
 
-    async def _detect_coordinated_raid(self, message):
+    async def _detect_coordinated_raid(self, message, settings):
         # Look for many new users (joined in last X minutes) sending messages in a channel in a short time
-        now = time.time()
-        conf = self.config.guild(message.guild)
-        try:
-            window = await conf.raid_window()
-        except Exception:
-            window = 30
-        try:
-            join_age = await conf.raid_join_age()
-        except Exception:
-            join_age = 10 * 60
-        try:
-            min_msgs = await conf.raid_min_msgs()
-        except Exception:
-            min_msgs = 6
-        try:
-            min_unique_users = await conf.raid_min_unique_users()
-        except Exception:
-            min_unique_users = 4
-        try:
-            min_new_users = await conf.raid_min_new_users()
-        except Exception:
-            min_new_users = 3
+        now = self._clock()
+        window = settings.raid_window
+        join_age = settings.raid_join_age
+        min_msgs = settings.raid_min_msgs
+        min_unique_users = settings.raid_min_unique_users
+        min_new_users = settings.raid_min_new_users
 
         channel_id = message.channel.id
         recent_msgs = [u for t, u in self.channel_user_message_times[channel_id] if now - t < window]
@@ -804,7 +968,7 @@ class AntiSpam(commands.Cog):
         # Count how many unique users, and how many are "new"
         user_counts = Counter(recent_msgs)
         unique_users = set(recent_msgs)
-        new_users = [u for u in unique_users if now - self.user_first_seen.get(u, now) < join_age]
+        new_users = [u for u in unique_users if self._is_new_user(message.guild.id, u, now, join_age)]
         if len(new_users) >= min_new_users and len(unique_users) >= min_unique_users:
             evidence = (
                 f"Possible coordinated spam/raid detected in {message.channel.mention}.\n"
@@ -814,89 +978,53 @@ class AntiSpam(commands.Cog):
             return True, evidence
         return False, None
 
+    def _is_new_user(self, guild_id, user_id, now, join_age):
+        first_seen = self.user_first_seen.get((guild_id, user_id))
+        return first_seen is not None and now - first_seen < join_age
+
+    def _check_copypasta_cluster(self, message, settings, matches, now):
+        """
+        Returns evidence string if enough distinct authors posted near-duplicates of this message
+        inside the cluster window, else None.
+        """
+        authors = {}
+        for entry in matches:
+            authors.setdefault(entry.author_id, entry)
+        if len(authors) + 1 < settings.raid_cluster_authors:
+            return None
+        join_age = settings.raid_join_age
+        lines = []
+        for author_id, entry in authors.items():
+            is_new = self._is_new_user(message.guild.id, author_id, now, join_age)
+            lines.append(
+                f"<@{author_id}> (`{author_id}`){' (new)' if is_new else ''} in <#{entry.channel_id}> <t:{int(entry.timestamp)}:R>"
+            )
+        return (
+            f"{len(authors) + 1} different users posted near-identical messages within "
+            f"{settings.raid_cluster_window}s.\n"
+            f"Message content (first 300 chars):\n{message.content[:300]}\n"
+            f"Matching authors:\n" + "\n".join(lines[:15])
+        )
+
     async def _punish(self, message, reason, evidence=None):
+        """
+        Queue the offending message on the guild's punishment pipeline.
+        Repeat offenses by a user already waiting in the queue are merged into the same action.
+        """
         guild = message.guild
-        conf = self.config.guild(guild)
-        try:
-            punishment = await conf.punishment()
-        except Exception:
-            punishment = "timeout"
-        try:
-            timeout_time = await conf.timeout_time()
-        except Exception:
-            timeout_time = 1  # fallback to 1 minute
         user = message.author
+        queue = self.punishment_queues.get(guild.id)
+        if queue is None:
+            queue = self.punishment_queues[guild.id] = PunishmentQueue(self, guild)
+
+        if not queue.has_pending(user.id):
+            now = self._clock()
+            last = self.user_last_action.get(user.id, 0)
+            if now - last < 10:
+                return
+            self.user_last_action[user.id] = now
 
-        now = time.time()
-        last = self.user_last_action.get(user.id, 0)
-        if now - last < 10:
-            return
-        self.user_last_action[user.id] = now
-
-        try:
-            await message.delete()
-        except discord.NotFound:
-            pass
-        except discord.Forbidden:
-            pass
-        except Exception:
-            pass
-
-        try:
-            if punishment == "timeout":
-                if hasattr(user, "timeout"):
-                    import datetime
-                    until = discord.utils.utcnow() + datetime.timedelta(minutes=timeout_time)
-                    await user.timeout(until, reason=reason)
-                # If the user object does not have a timeout method, do nothing (no fallback mute)
-            elif punishment == "kick":
-                try:
-                    await user.kick(reason=reason)
-                except Exception:
-                    pass
-            elif punishment == "ban":
-                try:
-                    await user.ban(reason=reason, delete_message_days=1)
-                except Exception:
-                    pass
-        except Exception:
-            pass
-
-        try:
-            log_channel_id = await conf.log_channel()
-        except Exception:
-            log_channel_id = None
-
-        log_channel = None
-        if log_channel_id:
-            log_channel = guild.get_channel(log_channel_id)
-            if log_channel is None and hasattr(self.bot, "get_channel"):
-                log_channel = self.bot.get_channel(log_channel_id)
-        if log_channel and isinstance(log_channel, discord.TextChannel):
-            try:
-                perms = log_channel.permissions_for(guild.me)
-                if not (perms.send_messages and perms.embed_links):
-                    return
-                embed = discord.Embed(
-                    title="Potential spam detected",
-                    color=0xff4545,
-                    timestamp=discord.utils.utcnow(),
-                )
-                embed.add_field(name="User", value=f"{user.mention} (`{user.id}`)", inline=False)
-                embed.add_field(
-                    name="Signature",
-                    value=f"**{reason}**\n-# [p]antispam signatures for details.",
-                    inline=False
-                )
-                embed.add_field(name="Punishment", value=punishment)
-                embed.add_field(name="Channel", value=message.channel.mention)
-                if evidence:
-                    if len(evidence) > 1000:
-                        evidence = evidence[:1000] + "\n...(truncated)"
-                    embed.add_field(name="Evidence", value=evidence, inline=False)
-                await log_channel.send(embed=embed)
-            except Exception as e:
-                pass
+        queue.submit(message, reason, evidence)
 
     @antispam.command()
     @commands.guild_only()
@@ -922,6 +1050,8 @@ class AntiSpam(commands.Cog):
             raid_min_msgs = await conf.raid_min_msgs()
             raid_min_unique_users = await conf.raid_min_unique_users()
             raid_min_new_users = await conf.raid_min_new_users()
+            raid_cluster_authors = await conf.raid_cluster_authors()
+            raid_cluster_window = await conf.raid_cluster_window()
             h1_max_lines = await conf.h1_max_lines()
             h1_max_length = await conf.h1_max_length()
             h2_max_lines = await conf.h2_max_lines()
@@ -952,7 +1082,9 @@ class AntiSpam(commands.Cog):
                 f"Join age: {raid_join_age}s, "
                 f"Min msgs: {raid_min_msgs}, "
                 f"Min unique users: {raid_min_unique_users}, "
-                f"Min new users: {raid_min_new_users}"
+                f"Min new users: {raid_min_new_users}\n"
+                f"Copypasta cluster: "
+                + (f"{raid_cluster_authors} users in {raid_cluster_window}s" if raid_cluster_authors else "disabled")
             ),
             inline=False
         )
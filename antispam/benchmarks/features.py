@@ -0,0 +1,157 @@
+"""
+Throughput of the AntiSpam content heuristics.
+
+Runs the header, ASCII art, emoji, zalgo and homoglyph checks over a small mixed
+corpus, once with the per-heuristic helpers AntiSpam used before
+:class:`MessageFeatures` and once with a single ``MessageFeatures`` pass, and checks
+both agree on every message before timing them.
+
+Usage::
+
+    python -m antispam.benchmarks.features [--rounds 2000]
+"""
+
+import argparse
+import re
+import timeit
+from types import SimpleNamespace
+
+from ..antispam import AntiSpam
+from ..features import HOMOGLYPH_MAP, MessageFeatures
+
+CORPUS = [
+    "hey what's up",
+    "lol ok 😂😂",
+    "Check this out https://example.com/some/path?x=1 <:pog:123456789012345678>",
+    "# Big header\n## sub\nsome text here " * 3,
+    "\n".join("|||///\\\\\\###@@@!!!***&&&^^^" for _ in range(10)),
+    "H̷̢̛e̴͈͝l̸͇̈́l̵̺̈o̸̫̍ w̸o̴r̷l̵d̸ ̴z̷a̶l̷g̴o̷ ̸t̶e̴x̷t̸" * 2,
+    "Ꭲhе quісk brоwn fох",
+    "😀🎉🔥💯🚀" * 5 + " <a:dance:111> <:x:222>",
+    "Привет, как дела? Это обычное сообщение на русском языке.",
+    "a normal longer message that talks about something interesting for a while, " * 4,
+]
+
+# Default guild thresholds
+HEADER_LIMITS = (2, 80, 3, 80, 5, 100)
+ASCII_ART_THRESHOLD = 12
+ASCII_ART_MIN_LINES = 6
+
+
+# The helpers AntiSpam used before MessageFeatures, one scan of the content each
+
+
+def old_header_lines(content):
+    # The line split from the old _check_markdown_header_spam; the threshold checks are unchanged
+    h1_lines = []
+    h2_lines = []
+    h3_lines = []
+    for line in content.splitlines():
+        lstripped = line.lstrip()
+        if lstripped.startswith("# "):
+            h1_lines.append(lstripped)
+        elif lstripped.startswith("## "):
+            h2_lines.append(lstripped)
+        elif lstripped.startswith("### "):
+            h3_lines.append(lstripped)
+    return h1_lines, h2_lines, h3_lines
+
+
+def old_is_ascii_art(content, threshold, min_lines):
+    lines = content.splitlines()
+    if len(lines) < min_lines:
+        return False
+    ascii_lines = 0
+    for line in lines:
+        if len(line) > threshold and all(ord(c) < 128 for c in line if c.strip()):
+            ascii_lines += 1
+    return ascii_lines >= min_lines
+
+
+def old_is_zalgo(content):
+    zalgo_re = re.compile(r"[\u0300-\u036F\u0489]")
+    return len(zalgo_re.findall(content)) > 15
+
+
+def old_count_emojis(content):
+    custom_emoji_re = re.compile(r"<a?:\w+:\d+>")
+    unicode_emoji_re = re.compile(
+        "["
+        "\U0001F600-\U0001F64F"
+        "\U0001F300-\U0001F5FF"
+        "\U0001F680-\U0001F6FF"
+        "\U0001F1E0-\U0001F1FF"
+        "\U00002700-\U000027BF"
+        "\U0001F900-\U0001F9FF"
+        "\U00002600-\U000026FF"
+        "\U00002B50"
+        "\U00002B06"
+        "\U00002B07"
+        "\U00002B1B-\U00002B1C"
+        "\U0000231A-\U0000231B"
+        "\U000025AA-\U000025AB"
+        "\U000025FB-\U000025FE"
+        "\U0001F004"
+        "\U0001F0CF"
+        "]+"
+    )
+    emoji_list = custom_emoji_re.findall(content) + unicode_emoji_re.findall(content)
+    return len(emoji_list), len(set(emoji_list)), emoji_list
+
+
+def old_has_homoglyph_abuse(content):
+    count = 0
+    for c in content:
+        if c in HOMOGLYPH_MAP and HOMOGLYPH_MAP[c] != c:
+            count += 1
+    if count >= 5:
+        return True
+    if count >= 3 and len(content) < 50:
+        return True
+    return False
+
+
+def old_checks(cog, content):
+    h1_lines, h2_lines, h3_lines = old_header_lines(content)
+    headers = SimpleNamespace(h1_lines=h1_lines, h2_lines=h2_lines, h3_lines=h3_lines)
+    return (
+        cog._check_markdown_header_spam(headers, *HEADER_LIMITS),
+        old_is_ascii_art(content, ASCII_ART_THRESHOLD, ASCII_ART_MIN_LINES),
+        old_count_emojis(content),
+        old_is_zalgo(content),
+        old_has_homoglyph_abuse(content),
+    )
+
+
+def new_checks(cog, content):
+    features = MessageFeatures(content)
+    return (
+        cog._check_markdown_header_spam(features, *HEADER_LIMITS),
+        cog._is_ascii_art(features, ASCII_ART_THRESHOLD, ASCII_ART_MIN_LINES),
+        (features.emoji_count, features.unique_emoji_count, features.emojis),
+        cog._is_zalgo(features),
+        cog._has_homoglyph_abuse(features),
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the AntiSpam content heuristics before and after MessageFeatures.")
+    parser.add_argument("--rounds", type=int, default=2000, help="passes over the corpus")
+    args = parser.parse_args(argv)
+
+    cog = AntiSpam.__new__(AntiSpam)
+    for content in CORPUS:
+        assert old_checks(cog, content) == new_checks(cog, content), content
+
+    messages = len(CORPUS) * args.rounds
+    old = timeit.timeit(lambda: [old_checks(cog, c) for c in CORPUS], number=args.rounds)
+    new = timeit.timeit(lambda: [new_checks(cog, c) for c in CORPUS], number=args.rounds)
+    print(f"{len(CORPUS)} messages x {args.rounds} rounds, verdicts identical")
+    print(f"{'helpers':<18}{'msg/s':>12}")
+    print(f"{'per heuristic':<18}{messages / old:>12,.0f}")
+    print(f"{'MessageFeatures':<18}{messages / new:>12,.0f}")
+    print(f"speedup {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
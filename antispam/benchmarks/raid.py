@@ -0,0 +1,204 @@
+"""
+Discord API load while AntiSpam punishes a simulated raid.
+
+A wave of users each post a few flood messages, and every offending message goes
+to ``_punish``. It runs once with the per-message ``_punish`` AntiSpam used before
+:class:`PunishmentQueue`, and once with the current queue. Discord is replaced by
+a stand-in HTTP layer with fixed request latency and per-route fixed-window limits.
+It answers over-limit requests with a 429 and retries them after ``retry_after``,
+like discord.py does. Runs in real time, so the default raid takes about two minutes.
+
+Usage::
+
+    python -m antispam.benchmarks.raid [--users 100] [--messages 3] [--rate 500] [--latency 0.04]
+"""
+
+import argparse
+import asyncio
+import datetime
+import time
+from types import SimpleNamespace
+
+import discord  # type: ignore
+
+from ..antispam import AntiSpam
+
+
+class FakeHTTP:
+    """Per-route fixed-window rate limits; over-limit requests get a 429 and are retried."""
+
+    # route: (requests, per seconds)
+    LIMITS = {
+        "message_delete": (5, 1.0),
+        "bulk_delete": (1, 1.0),
+        "member_edit": (10, 1.0),
+        "ban": (10, 1.0),
+        "bulk_ban": (1, 10.0),
+        "log_send": (5, 5.0),
+    }
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.windows = {}
+        self.requests = 0
+        self.rate_limited = 0
+
+    async def request(self, route: str):
+        limit, per = self.LIMITS[route]
+        while True:
+            self.requests += 1
+            await asyncio.sleep(self.latency)
+            now = time.monotonic()
+            started, used = self.windows.get(route, (now, 0))
+            if now - started >= per:
+                started, used = now, 0
+            if used < limit:
+                self.windows[route] = (started, used + 1)
+                return
+            self.rate_limited += 1
+            await asyncio.sleep(per - (now - started))
+
+
+class FakeMember:
+    def __init__(self, member_id: int, raid: "Raid"):
+        self.id = member_id
+        self.mention = f"<@{member_id}>"
+        self._raid = raid
+
+    def __str__(self):
+        return f"user{self.id}"
+
+    async def timeout(self, until, reason=None):
+        await self._raid.http.request("member_edit")
+        self._raid.neutralized.add(self.id)
+
+
+class FakeChannel(discord.TextChannel):
+    # Subclassed so the isinstance check on the log channel passes
+    def __init__(self, channel_id: int, raid: "Raid"):
+        self.id = channel_id
+        self._raid = raid
+
+    def permissions_for(self, member):
+        return SimpleNamespace(send_messages=True, embed_links=True)
+
+    async def delete_messages(self, messages):
+        await self._raid.http.request("bulk_delete")
+
+    async def send(self, content=None, *, embed=None, embeds=None):
+        await self._raid.http.request("log_send")
+        self._raid.log_messages += 1
+
+
+class FakeMessage:
+    def __init__(self, author: FakeMember, channel: FakeChannel, guild):
+        self.author = author
+        self.channel = channel
+        self.guild = guild
+
+    async def delete(self):
+        await self.author._raid.http.request("message_delete")
+
+
+class Raid:
+    def __init__(self, latency: float):
+        self.http = FakeHTTP(latency)
+        self.neutralized = set()
+        self.log_messages = 0
+        self.log_channel = FakeChannel(99, self)
+        self.guild = SimpleNamespace(id=1, me=None, get_channel=lambda channel_id: self.log_channel)
+        self.settings = SimpleNamespace(punishment="timeout", timeout_time=15, log_channel=self.log_channel.id)
+
+
+async def old_punish(cog, message, reason, evidence=None):
+    # AntiSpam._punish before PunishmentQueue, with the Config reads taken from the settings snapshot
+    settings = await cog._get_settings(message.guild)
+    user = message.author
+    now = time.time()
+    if now - cog.user_last_action.get(user.id, 0) < 10:
+        return
+    cog.user_last_action[user.id] = now
+    try:
+        await message.delete()
+    except Exception:
+        pass
+    until = discord.utils.utcnow() + datetime.timedelta(minutes=settings.timeout_time)
+    await user.timeout(until, reason=reason)
+    log_channel = message.guild.get_channel(settings.log_channel)
+    embed = discord.Embed(title="Potential spam detected", color=0xff4545, timestamp=discord.utils.utcnow())
+    embed.add_field(name="User", value=f"{user.mention} (`{user.id}`)", inline=False)
+    embed.add_field(name="Signature", value=f"**{reason}**", inline=False)
+    embed.add_field(name="Punishment", value=settings.punishment)
+    embed.add_field(name="Channel", value=message.channel.mention)
+    if evidence:
+        embed.add_field(name="Evidence", value=evidence[:1000], inline=False)
+    await log_channel.send(embed=embed)
+
+
+def build_cog(raid: Raid) -> AntiSpam:
+    cog = AntiSpam.__new__(AntiSpam)
+    cog.bot = None
+    cog._init_state()
+
+    async def get_settings(guild):
+        return raid.settings
+
+    cog._get_settings = get_settings
+    return cog
+
+
+async def run(users: int, messages: int, rate: float, latency: float, use_queue: bool) -> dict:
+    raid = Raid(latency)
+    cog = build_cog(raid)
+    channel = FakeChannel(5, raid)
+    members = [FakeMember(1000 + i, raid) for i in range(users)]
+    tasks = []
+    started = time.monotonic()
+    for _ in range(messages):
+        for member in members:
+            message = FakeMessage(member, channel, raid.guild)
+            # Each gateway message is handled in its own task, as discord.py dispatches them
+            if use_queue:
+                tasks.append(asyncio.ensure_future(cog._punish(message, "MsgFlood.A!msg", "evidence")))
+            else:
+                tasks.append(asyncio.ensure_future(old_punish(cog, message, "MsgFlood.A!msg", "evidence")))
+            await asyncio.sleep(1 / rate)
+    while len(raid.neutralized) < users:
+        await asyncio.sleep(0.01)
+    neutralized = time.monotonic() - started
+    await asyncio.gather(*tasks)
+    queue = cog.punishment_queues.get(raid.guild.id)
+    if queue is not None:
+        while queue._task is not None and not queue._task.done():
+            await asyncio.sleep(0.01)
+        if queue._log_task is not None:
+            await queue._log_task
+    return {
+        "neutralized": neutralized,
+        "done": time.monotonic() - started,
+        "requests": raid.http.requests,
+        "rate_limited": raid.http.rate_limited,
+        "log_messages": raid.log_messages,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate AntiSpam punishing a raid against rate-limited routes.")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--messages", type=int, default=3, help="flood messages per user")
+    parser.add_argument("--rate", type=float, default=500, help="messages per second arriving")
+    parser.add_argument("--latency", type=float, default=0.04, help="seconds per API request")
+    args = parser.parse_args(argv)
+
+    print(f"{args.users} users x {args.messages} messages at ~{args.rate:g} msg/s, {args.latency * 1000:g}ms per request")
+    print(f"{'pipeline':<10}{'neutralized':>13}{'all done':>10}{'requests':>10}{'429s':>7}{'log msgs':>10}")
+    for name, use_queue in (("old", False), ("queue", True)):
+        result = asyncio.run(run(args.users, args.messages, args.rate, args.latency, use_queue))
+        print(
+            f"{name:<10}{result['neutralized']:>12.1f}s{result['done']:>9.1f}s"
+            f"{result['requests']:>10}{result['rate_limited']:>7}{result['log_messages']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Throughput of the AntiSpam repeat heuristics (2 and 2b).
+
+Feeds synthetic chat through the similarity checks of heuristics 2 and 2b, once
+normalizing both messages on every comparison as AntiSpam did before
+:class:`TextFingerprint`, and once with fingerprints cached per message and the
+length/histogram pre-check in front of the fuzzy matcher. Both runs must count the
+same matches. Each matcher AntiSpam supports is timed: rapidfuzz when installed,
+and the difflib fallback.
+
+Usage::
+
+    python -m antispam.benchmarks.similarity [--messages 5000] [--threshold 0.8]
+"""
+
+import argparse
+import random
+import string
+import time
+import unicodedata
+from collections import deque
+from difflib import SequenceMatcher
+
+from .. import antispam as antispam_module
+from ..antispam import AntiSpam
+from ..features import HOMOGLYPH_MAP, INVISIBLE_CHARS, TextFingerprint
+
+WORDS = (
+    "the a to and hey lol what is this free nitro discord gift click here "
+    "anyone know how fix my code game tonight"
+).split()
+
+
+# The normalization and comparison AntiSpam used before TextFingerprint
+
+
+def old_normalize_text(text):
+    text = unicodedata.normalize("NFKC", text)
+    for ch in INVISIBLE_CHARS:
+        text = text.replace(ch, "")
+    text = "".join(HOMOGLYPH_MAP.get(c, c) for c in text)
+    text = text.translate(str.maketrans("", "", string.punctuation))
+    text = text.lower()
+    return " ".join(text.split())
+
+
+def old_similar(a, b, threshold):
+    if not a or not b:
+        return False
+    norm_a = old_normalize_text(a)
+    norm_b = old_normalize_text(b)
+    if antispam_module.RAPIDFUZZ_AVAILABLE:
+        score = antispam_module.fuzz.token_sort_ratio(norm_a, norm_b) / 100.0
+    else:
+        score = SequenceMatcher(None, norm_a, norm_b).ratio()
+    return score > threshold
+
+
+def make_messages(count, seed=1):
+    rng = random.Random(seed)
+    messages = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 25))) for _ in range(count)]
+    # Some near-repeats so both heuristics have matches to find
+    for i in range(50, count, 50):
+        messages[i] = messages[i - 1] + "!"
+    return messages
+
+
+def run(messages, similar, fingerprint, threshold):
+    """Heuristics 2 and 2b over one user's message cache. Returns the match counts per message."""
+    cache = deque(maxlen=15)
+    matches = []
+    for content in messages:
+        cache.append((content, fingerprint(content)))
+        last = cache[-1][1]
+        repeat = sum(similar(last, prev, threshold) for _, prev in list(cache)[-4:-1]) if len(cache) >= 3 else 0
+        timespan = sum(similar(last, prev, threshold) for _, prev in cache) if len(cache) >= 2 else 0
+        matches.append((repeat, timespan))
+    return matches
+
+
+def timed(messages, similar, fingerprint, threshold):
+    started = time.perf_counter()
+    matches = run(messages, similar, fingerprint, threshold)
+    return matches, time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the AntiSpam repeat heuristics before and after TextFingerprint.")
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    args = parser.parse_args(argv)
+
+    cog = AntiSpam.__new__(AntiSpam)
+    messages = make_messages(args.messages)
+    matchers = [("SequenceMatcher", False)]
+    if antispam_module.RAPIDFUZZ_AVAILABLE:
+        matchers.insert(0, ("rapidfuzz", True))
+    else:
+        print("rapidfuzz isn't installed, only the difflib fallback is timed")
+
+    print(f"{args.messages:,} messages, threshold {args.threshold}")
+    print(f"{'matcher':<18}{'before msg/s':>14}{'after msg/s':>14}{'speedup':>10}")
+    available = antispam_module.RAPIDFUZZ_AVAILABLE
+    try:
+        for name, use_rapidfuzz in matchers:
+            antispam_module.RAPIDFUZZ_AVAILABLE = use_rapidfuzz
+            before, old = timed(messages, old_similar, str, args.threshold)
+            after, new = timed(messages, cog._similar, TextFingerprint, args.threshold)
+            assert before == after, name
+            print(f"{name:<18}{args.messages / old:>14,.0f}{args.messages / new:>14,.0f}{old / new:>9.1f}x")
+    finally:
+        antispam_module.RAPIDFUZZ_AVAILABLE = available
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import heapq
+from collections import deque
+from typing import Callable, Deque, Dict, List, Tuple
+
+from .features import TextFingerprint
+
+
+class ClusterEntry:
+    """A single message remembered by the guild-wide copypasta index."""
+
+    __slots__ = ("timestamp", "author_id", "channel_id", "fingerprint", "keys")
+
+    timestamp: float
+    author_id: int
+    channel_id: int
+    fingerprint: TextFingerprint
+    keys: Tuple[int, ...]
+
+    def __init__(self, timestamp, author_id, channel_id, fingerprint, keys):
+        self.timestamp = timestamp
+        self.author_id = author_id
+        self.channel_id = channel_id
+        self.fingerprint = fingerprint
+        self.keys = keys
+
+
+class CopypastaIndex:
+    """
+    Sliding-window LSH index of normalized messages for one guild.
+
+    Each message is shingled into overlapping character n-grams and bucketed under its
+    ``BANDS`` smallest shingle hashes (a bottom-k sketch). Near-duplicates share most
+    shingles, so they almost always share at least one bucket, and only those candidates
+    are checked with the real similarity function.
+
+    Entries are evicted once they fall outside ``window`` seconds or once the index holds
+    ``max_entries`` messages, whichever comes first, so memory stays bounded during raids.
+    """
+
+    SHINGLE_SIZE = 4
+    BANDS = 4
+    # Short messages ("gm", "lol") are identical across users all the time
+    MIN_LENGTH = 20
+
+    def __init__(self, max_entries: int = 500):
+        self.max_entries = max_entries
+        self.entries: Deque[ClusterEntry] = deque()
+        self.buckets: Dict[int, Deque[ClusterEntry]] = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _keys(self, norm: str) -> Tuple[int, ...]:
+        size = self.SHINGLE_SIZE
+        shingles = {hash(norm[i:i + size]) for i in range(len(norm) - size + 1)}
+        return tuple(heapq.nsmallest(self.BANDS, shingles))
+
+    def _evict_oldest(self):
+        entry = self.entries.popleft()
+        # Entries are inserted in time order, so the oldest entry is at the front of every bucket it is in
+        for key in entry.keys:
+            bucket = self.buckets.get(key)
+            if bucket and bucket[0] is entry:
+                bucket.popleft()
+                if not bucket:
+                    del self.buckets[key]
+
+    def prune(self, now: float, window: float):
+        """Drop entries older than ``window`` seconds."""
+        entries = self.entries
+        while entries and now - entries[0].timestamp > window:
+            self._evict_oldest()
+
+    def add_and_match(
+        self,
+        now: float,
+        author_id: int,
+        channel_id: int,
+        fingerprint: TextFingerprint,
+        window: float,
+        similar: Callable[[TextFingerprint, TextFingerprint], bool],
+    ) -> List[ClusterEntry]:
+        """
+        Record a message and return the entries from *other* authors within ``window``
+        that are near-duplicates of it (oldest first).
+        """
+        self.prune(now, window)
+        norm = fingerprint.norm
+        if not norm or len(norm) < self.MIN_LENGTH:
+            return []
+
+        keys = self._keys(norm)
+        matches = []
+        seen = set()
+        for key in keys:
+            for candidate in self.buckets.get(key, ()):
+                if id(candidate) in seen or candidate.author_id == author_id:
+                    continue
+                seen.add(id(candidate))
+                if similar(fingerprint, candidate.fingerprint):
+                    matches.append(candidate)
+
+        entry = ClusterEntry(now, author_id, channel_id, fingerprint, keys)
+        self.entries.append(entry)
+        for key in keys:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = deque()
+            bucket.append(entry)
+        while len(self.entries) > self.max_entries:
+            self._evict_oldest()
+
+        matches.sort(key=lambda e: e.timestamp)
+        return matches
@@ -0,0 +1,201 @@
+import re
+import string
+import unicodedata
+from collections import Counter
+from typing import List, Optional, Tuple
+
+# Unicode invisible/obfuscation characters
+INVISIBLE_CHARS = [
+    "\u200b",  # zero-width space
+    "\u200c",  # zero-width non-joiner
+    "\u200e",  # left-to-right mark
+    "\u200f",  # right-to-left mark
+    "\u202a",  # left-to-right embedding
+    "\u202b",  # right-to-left embedding
+    "\u202c",  # pop directional formatting
+    "\u202d",  # left-to-right override
+    "\u202e",  # right-to-left override
+    "\u2060",  # word joiner
+    "\u2061",  # function application
+    "\u2062",  # invisible times
+    "\u2063",  # invisible separator
+    "\u2064",  # invisible plus
+    "\ufeff",  # zero-width no-break space
+]
+
+# Unicode confusables/homoglyphs
+HOMOGLYPH_MAP = {
+    "а": "a",  # Cyrillic a
+    "е": "e",  # Cyrillic e
+    "о": "o",  # Cyrillic o
+    "р": "p",  # Cyrillic p
+    "с": "c",  # Cyrillic c
+    "у": "y",  # Cyrillic y
+    "х": "x",  # Cyrillic x
+    "і": "i",  # Cyrillic i
+    "Ι": "I",  # Greek capital iota
+    "Ο": "O",  # Greek capital omicron
+    "Α": "A",  # Greek capital alpha
+    "Β": "B",  # Greek capital beta
+    "ϲ": "c",  # Greek small letter lunate sigma
+    # ... (expand as needed)
+}
+
+# Only characters that actually map to something else count as homoglyph hits
+HOMOGLYPH_RE = re.compile(
+    "[" + "".join(re.escape(c) for c, ascii_c in HOMOGLYPH_MAP.items() if c != ascii_c) + "]"
+)
+# Strips invisible chars and punctuation and folds homoglyphs in a single str.translate call
+NORMALIZE_TABLE = str.maketrans(HOMOGLYPH_MAP)
+NORMALIZE_TABLE.update({ord(c): None for c in INVISIBLE_CHARS})
+NORMALIZE_TABLE.update({ord(c): None for c in string.punctuation})
+
+ZALGO_RE = re.compile(r"[\u0300-\u036F\u0489]")
+CUSTOM_EMOJI_RE = re.compile(r"<a?:\w+:\d+>")
+UNICODE_EMOJI_RE = re.compile(
+    "["
+    "\U0001F600-\U0001F64F"
+    "\U0001F300-\U0001F5FF"
+    "\U0001F680-\U0001F6FF"
+    "\U0001F1E0-\U0001F1FF"
+    "\U00002700-\U000027BF"
+    "\U0001F900-\U0001F9FF"
+    "\U00002600-\U000026FF"
+    "\U00002B50"
+    "\U00002B06"
+    "\U00002B07"
+    "\U00002B1B-\U00002B1C"
+    "\U0000231A-\U0000231B"
+    "\U000025AA-\U000025AB"
+    "\U000025FB-\U000025FE"
+    "\U0001F004"
+    "\U0001F0CF"
+    "]+"
+)
+NON_ASCII_VISIBLE_RE = re.compile(r"[^\x00-\x7f\s]")
+
+
+class MessageFeatures:
+    """
+    Counts used by the AntiSpam content heuristics, extracted from a message in one pass.
+
+    Pure ASCII content (the common case) skips the unicode-only scans entirely,
+    and every regex used here is compiled once at import time.
+    """
+
+    __slots__ = (
+        "length",
+        "emojis",
+        "emoji_count",
+        "unique_emoji_count",
+        "combining_marks",
+        "homoglyph_count",
+        "lines",
+        "h1_lines",
+        "h2_lines",
+        "h3_lines",
+        "has_everyone",
+        "has_here",
+    )
+
+    length: int
+    emojis: List[str]
+    emoji_count: int
+    unique_emoji_count: int
+    combining_marks: int
+    homoglyph_count: int
+    lines: List[Tuple[int, bool]]
+    h1_lines: List[str]
+    h2_lines: List[str]
+    h3_lines: List[str]
+    has_everyone: bool
+    has_here: bool
+
+    def __init__(self, content: str):
+        self.length = len(content)
+        is_ascii = content.isascii()
+
+        emojis = CUSTOM_EMOJI_RE.findall(content) if "<" in content else []
+        if is_ascii:
+            self.combining_marks = 0
+            self.homoglyph_count = 0
+        else:
+            emojis += UNICODE_EMOJI_RE.findall(content)
+            self.combining_marks = len(ZALGO_RE.findall(content))
+            self.homoglyph_count = len(HOMOGLYPH_RE.findall(content))
+        self.emojis = emojis
+        self.emoji_count = len(emojis)
+        self.unique_emoji_count = len(set(emojis))
+
+        # (line length, line is pure ASCII ignoring whitespace) plus markdown header lines
+        lines = []
+        h1_lines = []
+        h2_lines = []
+        h3_lines = []
+        for line in content.splitlines():
+            lines.append((len(line), is_ascii or line.isascii() or not NON_ASCII_VISIBLE_RE.search(line)))
+            if "#" in line:
+                lstripped = line.lstrip()
+                if lstripped.startswith("# "):
+                    h1_lines.append(lstripped)
+                elif lstripped.startswith("## "):
+                    h2_lines.append(lstripped)
+                elif lstripped.startswith("### "):
+                    h3_lines.append(lstripped)
+        self.lines = lines
+        self.h1_lines = h1_lines
+        self.h2_lines = h2_lines
+        self.h3_lines = h3_lines
+
+        self.has_everyone = "@everyone" in content
+        self.has_here = "@here" in content
+
+    def ascii_art_lines(self, threshold: int) -> int:
+        """Number of lines longer than ``threshold`` made only of ASCII (ignoring whitespace)."""
+        return sum(1 for length, ascii_only in self.lines if ascii_only and length > threshold)
+
+
+def normalize_text(text: str) -> str:
+    """
+    NFKC normalize, drop invisible chars and punctuation, fold homoglyphs to ASCII,
+    lowercase and collapse whitespace.
+    """
+    text = unicodedata.normalize("NFKC", text)
+    text = text.translate(NORMALIZE_TABLE).lower()
+    return " ".join(text.split())
+
+
+class TextFingerprint:
+    """
+    Normalized form of a message plus a character histogram, computed once when the
+    message enters the per-user cache.
+
+    Both rapidfuzz's ratio family and SequenceMatcher.ratio are bounded above by
+    2 * (shared characters) / (total length), so the histogram gives an exact upper
+    bound on similarity. Pairs whose bound is at or below the threshold are
+    rejected without running the fuzzy matcher.
+    """
+
+    __slots__ = ("norm", "length", "chars")
+
+    norm: Optional[str]
+    length: int
+    chars: Counter
+
+    def __init__(self, content: str):
+        # Empty messages (attachments only) never count as similar to anything
+        self.norm = normalize_text(content) if content else None
+        self.length = len(self.norm) if self.norm else 0
+        self.chars = Counter(self.norm) if self.norm else Counter()
+
+    def may_be_similar(self, other: "TextFingerprint", threshold: float) -> bool:
+        """Return False only if the two texts cannot score above ``threshold``."""
+        if not self.length or not other.length:
+            # Leave empty normalized text to the matcher, it has its own opinion on ""
+            return True
+        total = self.length + other.length
+        # Cheapest check first: the length difference alone caps the ratio
+        if 2.0 * min(self.length, other.length) / total <= threshold:
+            return False
+        shared = sum((self.chars & other.chars).values())
+        return 2.0 * shared / total > threshold
@@ -0,0 +1,266 @@
+import asyncio
+import datetime
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import discord  # type: ignore
+
+
+class TokenBucket:
+    """
+    Async token bucket used to pace requests on a single Discord route.
+
+    discord.py already retries on 429, but staying under the limit avoids the
+    retry-after stalls that otherwise serialize a whole raid response.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class PendingOffense:
+    """Every offending message from one user that is waiting to be actioned."""
+
+    __slots__ = ("user", "messages", "reason", "evidence", "channel", "count")
+
+    def __init__(self, message, reason: str, evidence: Optional[str]):
+        self.user = message.author
+        self.messages = [message]
+        self.reason = reason
+        self.evidence = evidence
+        self.channel = message.channel
+        self.count = 1
+
+    def merge(self, message):
+        self.messages.append(message)
+        self.count += 1
+
+
+class PunishmentQueue:
+    """
+    Per-guild punishment pipeline.
+
+    Offenses are collected while the previous batch is being actioned, so a raid turns
+    into a handful of batches instead of one task per message:
+    - repeated offenses by the same user merge into a single punishment
+    - offending messages are bulk deleted per channel
+    - bans go through one bulk ban request when the library supports it
+    - log entries are collapsed into one log message per ``LOG_WINDOW`` seconds
+    Each Discord route is paced by its own token bucket.
+    """
+
+    LOG_WINDOW = 5
+    # Embed limits: 25 fields per embed, 10 embeds and 6000 characters per message
+    LOG_FIELDS_PER_EMBED = 25
+    LOG_EMBEDS_PER_MESSAGE = 10
+    LOG_CHARS_PER_MESSAGE = 5500
+
+    def __init__(self, cog, guild):
+        self.cog = cog
+        self.guild = guild
+        self.pending: Dict[int, PendingOffense] = {}
+        self.log_records: List[PendingOffense] = []
+        self.buckets = {
+            "delete": TokenBucket(rate=5, capacity=5),
+            "member": TokenBucket(rate=5, capacity=10),
+            "ban": TokenBucket(rate=5, capacity=10),
+            "log": TokenBucket(rate=1, capacity=2),
+        }
+        self._task: Optional[asyncio.Task] = None
+        self._log_task: Optional[asyncio.Task] = None
+
+    def has_pending(self, user_id: int) -> bool:
+        return user_id in self.pending
+
+    def submit(self, message, reason: str, evidence: Optional[str] = None):
+        offense = self.pending.get(message.author.id)
+        if offense is None:
+            self.pending[message.author.id] = PendingOffense(message, reason, evidence)
+        else:
+            offense.merge(message)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def cancel(self):
+        for task in (self._task, self._log_task):
+            if task is not None and not task.done():
+                task.cancel()
+
+    async def _run(self):
+        while self.pending:
+            batch, self.pending = self.pending, {}
+            try:
+                settings = await self.cog._get_settings(self.guild)
+            except Exception:
+                return
+            offenses = list(batch.values())
+            await asyncio.gather(
+                self._delete_messages(offenses),
+                self._apply_punishment(offenses, settings.punishment, settings.timeout_time),
+            )
+            self.log_records.extend(offenses)
+            if self._log_task is None or self._log_task.done():
+                self._log_task = asyncio.create_task(self._flush_logs_later())
+
+    async def _delete_messages(self, offenses: List[PendingOffense]):
+        by_channel = defaultdict(list)
+        for offense in offenses:
+            for message in offense.messages:
+                by_channel[message.channel].append(message)
+        await asyncio.gather(*(self._delete_in_channel(channel, messages) for channel, messages in by_channel.items()))
+
+    async def _delete_in_channel(self, channel, messages):
+        for i in range(0, len(messages), 100):
+            chunk = messages[i:i + 100]
+            await self.buckets["delete"].acquire()
+            try:
+                if len(chunk) == 1:
+                    await chunk[0].delete()
+                else:
+                    await channel.delete_messages(chunk)
+            except Exception:
+                pass
+
+    async def _apply_punishment(self, offenses: List[PendingOffense], punishment: str, timeout_time: int):
+        if punishment == "ban" and len(offenses) > 1 and hasattr(self.guild, "bulk_ban"):
+            users = [offense.user for offense in offenses]
+            reasons = sorted({offense.reason for offense in offenses})
+            for i in range(0, len(users), 200):
+                await self.buckets["ban"].acquire()
+                try:
+                    await self.guild.bulk_ban(
+                        users[i:i + 200], reason=", ".join(reasons)[:500], delete_message_seconds=86400
+                    )
+                except Exception:
+                    pass
+            return
+        await asyncio.gather(*(self._punish_one(offense, punishment, timeout_time) for offense in offenses))
+
+    async def _punish_one(self, offense: PendingOffense, punishment: str, timeout_time: int):
+        user = offense.user
+        try:
+            if punishment == "timeout":
+                if hasattr(user, "timeout"):
+                    await self.buckets["member"].acquire()
+                    until = discord.utils.utcnow() + datetime.timedelta(minutes=timeout_time)
+                    await user.timeout(until, reason=offense.reason)
+                # If the user object does not have a timeout method, do nothing (no fallback mute)
+            elif punishment == "kick":
+                await self.buckets["member"].acquire()
+                await user.kick(reason=offense.reason)
+            elif punishment == "ban":
+                await self.buckets["ban"].acquire()
+                await user.ban(reason=offense.reason, delete_message_days=1)
+        except Exception:
+            pass
+
+    async def _flush_logs_later(self):
+        await asyncio.sleep(self.LOG_WINDOW)
+        records, self.log_records = self.log_records, []
+        if not records:
+            return
+        try:
+            await self._send_logs(records)
+        except Exception:
+            pass
+
+    async def _send_logs(self, records: List[PendingOffense]):
+        guild = self.guild
+        settings = await self.cog._get_settings(guild)
+        log_channel_id = settings.log_channel
+        log_channel = None
+        if log_channel_id:
+            log_channel = guild.get_channel(log_channel_id)
+            if log_channel is None and hasattr(self.cog.bot, "get_channel"):
+                log_channel = self.cog.bot.get_channel(log_channel_id)
+        if not (log_channel and isinstance(log_channel, discord.TextChannel)):
+            return
+        perms = log_channel.permissions_for(guild.me)
+        if not (perms.send_messages and perms.embed_links):
+            return
+
+        if len(records) == 1:
+            embeds = [self._single_log_embed(records[0], settings.punishment)]
+        else:
+            embeds = self._batch_log_embeds(records, settings.punishment)
+
+        # Pack embeds into as few messages as the size limits allow
+        batch = []
+        batch_chars = 0
+        for embed in embeds:
+            size = len(embed)
+            if batch and (len(batch) >= self.LOG_EMBEDS_PER_MESSAGE or batch_chars + size > self.LOG_CHARS_PER_MESSAGE):
+                await self.buckets["log"].acquire()
+                await log_channel.send(embeds=batch)
+                batch = []
+                batch_chars = 0
+            batch.append(embed)
+            batch_chars += size
+        if batch:
+            await self.buckets["log"].acquire()
+            await log_channel.send(embeds=batch)
+
+    def _single_log_embed(self, record: PendingOffense, punishment: str) -> discord.Embed:
+        user = record.user
+        embed = discord.Embed(
+            title="Potential spam detected",
+            color=0xff4545,
+            timestamp=discord.utils.utcnow(),
+        )
+        embed.add_field(name="User", value=f"{user.mention} (`{user.id}`)", inline=False)
+        embed.add_field(
+            name="Signature",
+            value=f"**{record.reason}**\n-# [p]antispam signatures for details.",
+            inline=False
+        )
+        embed.add_field(name="Punishment", value=punishment)
+        embed.add_field(name="Channel", value=record.channel.mention)
+        if record.count > 1:
+            embed.add_field(name="Messages removed", value=str(record.count))
+        evidence = record.evidence
+        if evidence:
+            if len(evidence) > 1000:
+                evidence = evidence[:1000] + "\n...(truncated)"
+            embed.add_field(name="Evidence", value=evidence, inline=False)
+        return embed
+
+    def _batch_log_embeds(self, records: List[PendingOffense], punishment: str) -> List[discord.Embed]:
+        embeds = []
+        for i in range(0, len(records), self.LOG_FIELDS_PER_EMBED):
+            chunk = records[i:i + self.LOG_FIELDS_PER_EMBED]
+            embed = discord.Embed(
+                title=f"Potential spam detected ({len(records)} users)" if i == 0 else None,
+                description=(
+                    f"Punishment: **{punishment}**\n-# [p]antispam signatures for details."
+                    if i == 0 else None
+                ),
+                color=0xff4545,
+                timestamp=discord.utils.utcnow(),
+            )
+            for record in chunk:
+                evidence = (record.evidence or "").split("\n", 1)[0][:120]
+                value = (
+                    f"{record.user.mention} in {record.channel.mention}\n"
+                    f"**{record.reason}** ({record.count} message{'s' if record.count != 1 else ''})"
+                )
+                if evidence:
+                    value += f"\n{evidence}"
+                embed.add_field(name=f"{record.user} ({record.user.id})"[:256], value=value, inline=False)
+            embeds.append(embed)
+        return embeds
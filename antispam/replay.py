@@ -0,0 +1,290 @@
+"""
+Offline replay harness for the AntiSpam heuristic chain.
+
+Feeds a recorded message stream through ``AntiSpam.on_message_without_command`` using
+lightweight stand-ins for discord.py objects and an in-memory Config, so throughput and
+false-positive rates can be measured without a live guild.
+
+Streams are JSONL, one message per line::
+
+    {"ts": 1715000000.0, "author": 123, "channel": 456, "content": "hello", "mentions": [789]}
+
+``guild`` (defaults to 1), ``roles``, ``admin`` and ``joined`` (the author's join
+timestamp) are optional per line.
+
+Usage::
+
+    python -m antispam.replay stream.jsonl [stream2.jsonl ...] [--set key=value ...]
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import statistics
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from .antispam import AntiSpam
+
+
+class FakeRole:
+    __slots__ = ("id",)
+
+    def __init__(self, role_id: int):
+        self.id = role_id
+
+
+class FakePermissions:
+    __slots__ = ("administrator",)
+
+    def __init__(self, administrator: bool = False):
+        self.administrator = administrator
+
+
+class FakeGuild:
+    __slots__ = ("id",)
+
+    def __init__(self, guild_id: int):
+        self.id = guild_id
+
+
+class FakeChannel:
+    __slots__ = ("id", "guild", "mention")
+
+    def __init__(self, channel_id: int, guild: FakeGuild):
+        self.id = channel_id
+        self.guild = guild
+        self.mention = f"<#{channel_id}>"
+
+
+class FakeMember:
+    __slots__ = ("id", "guild", "bot", "roles", "guild_permissions", "mention", "joined_at")
+
+    def __init__(self, member_id: int, guild: FakeGuild, roles=(), admin: bool = False, joined: Optional[float] = None):
+        self.id = member_id
+        self.guild = guild
+        self.bot = False
+        self.roles = [FakeRole(r) for r in roles]
+        self.guild_permissions = FakePermissions(admin)
+        self.mention = f"<@{member_id}>"
+        self.joined_at = (
+            None if joined is None else datetime.datetime.fromtimestamp(joined, datetime.timezone.utc)
+        )
+
+
+class FakeMessage:
+    __slots__ = ("content", "author", "channel", "guild", "mentions", "webhook_id")
+
+    def __init__(self, content: str, author: FakeMember, channel: FakeChannel, mentions: List[FakeMember]):
+        self.content = content
+        self.author = author
+        self.channel = channel
+        self.guild = channel.guild
+        self.mentions = mentions
+        self.webhook_id = None
+
+
+class _MemoryGuildConfig:
+    def __init__(self, data: dict):
+        self._data = data
+
+    async def all(self) -> dict:
+        return dict(self._data)
+
+
+class MemoryConfig:
+    """Stand-in for ``redbot.core.Config`` covering what the message hot path reads."""
+
+    def __init__(self, defaults: dict, overrides: Optional[dict] = None):
+        self._defaults = dict(defaults)
+        self._defaults.update(overrides or {})
+        self._guilds: Dict[int, dict] = {}
+
+    def guild(self, guild) -> _MemoryGuildConfig:
+        data = self._guilds.get(guild.id)
+        if data is None:
+            data = self._guilds[guild.id] = dict(self._defaults)
+        return _MemoryGuildConfig(data)
+
+
+class ReplayReport:
+    """Results of one replay run."""
+
+    def __init__(self):
+        self.messages = 0
+        self.elapsed = 0.0
+        self.latencies: List[float] = []
+        self.triggers: Counter = Counter()
+        self.flagged_authors: Counter = Counter()
+        self.alloc_peak = 0
+        self.alloc_retained = 0
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.messages / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, pct: int) -> float:
+        """Per-message latency percentile in milliseconds."""
+        if len(self.latencies) < 2:
+            return sum(self.latencies) * 1000
+        return statistics.quantiles(self.latencies, n=100, method="inclusive")[pct - 1] * 1000
+
+    def format(self) -> str:
+        lines = [
+            f"Messages:       {self.messages:,}",
+            f"Throughput:     {self.messages_per_second:,.0f} msg/s",
+            f"Latency p50:    {self.percentile(50):.3f} ms",
+            f"Latency p99:    {self.percentile(99):.3f} ms",
+        ]
+        if self.alloc_peak:
+            lines += [
+                f"Alloc peak:     {self.alloc_peak / 1024:,.1f} KiB",
+                f"Alloc retained: {self.alloc_retained / 1024:,.1f} KiB",
+            ]
+        lines += [
+            f"Flagged users:  {len(self.flagged_authors):,}",
+            "Triggers:",
+        ]
+        if self.triggers:
+            for reason, count in self.triggers.most_common():
+                lines.append(f"  {reason:<30} {count:,}")
+        else:
+            lines.append("  none")
+        return "\n".join(lines)
+
+
+def load_stream(lines: Iterable[str]) -> List[dict]:
+    """Parse JSONL records, skipping blank lines, and order them by timestamp."""
+    records = []
+    for line in lines:
+        line = line.strip()
+        if line:
+            records.append(json.loads(line))
+    records.sort(key=lambda r: r.get("ts", 0))
+    return records
+
+
+def _build_messages(records: List[dict]) -> List[tuple]:
+    """Turn stream records into (timestamp, FakeMessage) pairs, sharing guild/channel/member objects."""
+    guilds: Dict[int, FakeGuild] = {}
+    channels: Dict[int, FakeChannel] = {}
+    members: Dict[tuple, FakeMember] = {}
+
+    def get_member(guild, member_id, roles=(), admin=False, joined=None):
+        key = (guild.id, int(member_id))
+        member = members.get(key)
+        if member is None:
+            member = members[key] = FakeMember(int(member_id), guild, roles, admin, joined)
+        return member
+
+    messages = []
+    for record in records:
+        guild_id = int(record.get("guild", 1))
+        guild = guilds.get(guild_id)
+        if guild is None:
+            guild = guilds[guild_id] = FakeGuild(guild_id)
+        channel_id = int(record["channel"])
+        channel = channels.get(channel_id)
+        if channel is None:
+            channel = channels[channel_id] = FakeChannel(channel_id, guild)
+        author = get_member(
+            guild, record["author"], record.get("roles", ()), record.get("admin", False), record.get("joined")
+        )
+        mentions = [get_member(guild, m) for m in record.get("mentions", ())]
+        message = FakeMessage(record.get("content", ""), author, channel, mentions)
+        messages.append((float(record.get("ts", 0)), message))
+    return messages
+
+
+def _build_cog(overrides: Optional[dict]) -> AntiSpam:
+    cog = AntiSpam.__new__(AntiSpam)
+    cog.bot = None
+    cog.config = MemoryConfig(AntiSpam.DEFAULT_GUILD, overrides)
+    cog._init_state()
+    return cog
+
+
+async def _run(records: List[dict], overrides: Optional[dict], report: Optional[ReplayReport]) -> ReplayReport:
+    cog = _build_cog(overrides)
+    clock = [0.0]
+    cog._clock = lambda: clock[0]
+
+    async def record_punish(message, reason, evidence=None):
+        if report is not None:
+            report.triggers[reason] += 1
+            report.flagged_authors[message.author.id] += 1
+
+    cog._punish = record_punish
+
+    messages = _build_messages(records)
+
+    handler = cog.on_message_without_command
+    perf_counter = time.perf_counter
+    latencies = report.latencies if report is not None else None
+    started = perf_counter()
+    for ts, message in messages:
+        clock[0] = ts
+        before = perf_counter()
+        await handler(message)
+        if latencies is not None:
+            latencies.append(perf_counter() - before)
+    if report is not None:
+        report.elapsed = perf_counter() - started
+        report.messages = len(messages)
+    return report
+
+
+async def replay(records: List[dict], overrides: Optional[dict] = None, measure_allocations: bool = True) -> ReplayReport:
+    """
+    Replay ``records`` through a fresh AntiSpam instance and return a report.
+
+    Allocations are measured in a second, untimed pass so tracemalloc's overhead
+    doesn't skew the latency numbers.
+    """
+    report = await _run(records, overrides, ReplayReport())
+    if measure_allocations:
+        tracemalloc.start()
+        try:
+            await _run(records, overrides, None)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        report.alloc_peak = peak
+        report.alloc_retained = current
+    return report
+
+
+def _parse_value(value: str):
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Replay recorded message streams through the AntiSpam heuristics.")
+    parser.add_argument("streams", nargs="+", help="JSONL message streams")
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="KEY=VALUE",
+                        help="Override a guild setting, e.g. --set similarity_threshold=0.9")
+    args = parser.parse_args(argv)
+
+    overrides = {}
+    for item in args.overrides:
+        key, _, value = item.partition("=")
+        if key not in AntiSpam.DEFAULT_GUILD:
+            parser.error(f"Unknown setting: {key}")
+        overrides[key] = _parse_value(value)
+
+    for path in args.streams:
+        with open(path, encoding="utf-8") as fp:
+            records = load_stream(fp)
+        report = asyncio.run(replay(records, overrides))
+        print(f"== {path}")
+        print(report.format())
+
+
+if __name__ == "__main__":
+    main()
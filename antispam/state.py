@@ -0,0 +1,143 @@
+import sys
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class ExpiringStore:
+    """
+    Dict-like store with per-key idle expiry and an LRU entry ceiling.
+
+    Every read or write of a key refreshes it, so the underlying OrderedDict is always
+    ordered from least to most recently used. Expiry and LRU eviction both pop from the
+    front, which keeps :meth:`sweep` proportional to the number of entries it removes.
+
+    When ``factory`` is given, missing keys are created on ``store[key]`` like a defaultdict.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        max_entries: int,
+        factory: Optional[Callable[[], Any]] = None,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.factory = factory
+        self._data: "OrderedDict[Hashable, list]" = OrderedDict()
+        self.expired = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def __getitem__(self, key):
+        item = self._data.get(key)
+        if item is None:
+            if self.factory is None:
+                raise KeyError(key)
+            value = self.factory()
+            self._data[key] = [value, time.monotonic()]
+            if len(self._data) > self.max_entries:
+                self._evict(len(self._data) - self.max_entries)
+            return value
+        item[1] = time.monotonic()
+        self._data.move_to_end(key)
+        return item[0]
+
+    def __setitem__(self, key, value):
+        self._data[key] = [value, time.monotonic()]
+        self._data.move_to_end(key)
+        if len(self._data) > self.max_entries:
+            self._evict(len(self._data) - self.max_entries)
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def setdefault(self, key, default=None):
+        item = self._data.get(key)
+        if item is None:
+            self[key] = default
+            return default
+        item[1] = time.monotonic()
+        self._data.move_to_end(key)
+        return item[0]
+
+    def get(self, key, default=None):
+        item = self._data.get(key)
+        if item is None:
+            return default
+        return item[0]
+
+    def pop(self, key, default=None):
+        item = self._data.pop(key, None)
+        if item is None:
+            return default
+        return item[0]
+
+    def values(self):
+        return (item[0] for item in self._data.values())
+
+    def _evict(self, count: int) -> int:
+        data = self._data
+        removed = 0
+        while data and removed < count:
+            data.popitem(last=False)
+            removed += 1
+        self.evicted += removed
+        return removed
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Remove every entry idle for longer than ``ttl``. Returns the number removed."""
+        if now is None:
+            now = time.monotonic()
+        data = self._data
+        removed = 0
+        while data:
+            key, item = next(iter(data.items()))
+            if now - item[1] <= self.ttl:
+                break
+            del data[key]
+            removed += 1
+        self.expired += removed
+        return removed
+
+    def shrink(self, fraction: float) -> int:
+        """Evict the least recently used ``fraction`` of entries."""
+        return self._evict(max(1, int(len(self._data) * fraction))) if self._data else 0
+
+    def estimate_bytes(self, sample: int = 500) -> int:
+        """
+        Rough memory footprint: the mapping itself plus each key, value and the
+        value's direct children (deque items, CopypastaIndex entries and so on).
+        Only the ``sample`` most recently used entries are measured and the
+        average is extrapolated, so this stays cheap on very large stores.
+        """
+        data = self._data
+        if not data:
+            return sys.getsizeof(data)
+        measured = 0
+        count = 0
+        for key in islice(reversed(data), sample):
+            value = data[key][0]
+            measured += sys.getsizeof(key) + sys.getsizeof(data[key]) + sys.getsizeof(value)
+            children = getattr(value, "entries", value)
+            if isinstance(children, (list, tuple)) or hasattr(children, "maxlen"):
+                for child in children:
+                    measured += sys.getsizeof(child)
+            count += 1
+        return sys.getsizeof(data) + measured * len(data) // count
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._data),
+            "bytes": self.estimate_bytes(),
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("redbot")
+
+from antispam.replay import _build_cog, _build_messages  # noqa: E402
+
+DAY = 24 * 60 * 60
+JOIN_AGE = 1200
+
+
+def _feed(cog, records):
+    async def run():
+        for ts, message in _build_messages(records):
+            cog._clock = lambda ts=ts: ts
+            await cog.on_message_without_command(message)
+
+    asyncio.run(run())
+
+
+def _record(ts, author, **extra):
+    return {"ts": ts, "author": author, "channel": 10, "content": f"message {ts}", **extra}
+
+
+def test_new_member_is_new():
+    cog = _build_cog(None)
+    _feed(cog, [_record(1000.0, 7, joined=900.0)])
+    assert cog._is_new_user(1, 7, 1000.0, JOIN_AGE)
+
+
+def test_returning_member_after_expiry_is_not_new():
+    cog = _build_cog(None)
+    _feed(cog, [_record(1000.0, 7, joined=0.0)])
+    cog.user_first_seen.sweep(now=float("inf"))
+    assert len(cog.user_first_seen) == 0
+
+    _feed(cog, [_record(1000.0 + 2 * DAY, 7, joined=0.0)])
+    assert not cog._is_new_user(1, 7, 1000.0 + 2 * DAY, JOIN_AGE)
+
+
+def test_evicted_entry_is_not_new():
+    cog = _build_cog(None)
+    _feed(cog, [_record(1000.0, 7)])
+    assert cog._is_new_user(1, 7, 1000.0, JOIN_AGE)
+    cog.user_first_seen.shrink(1.0)
+    assert not cog._is_new_user(1, 7, 1000.0, JOIN_AGE)
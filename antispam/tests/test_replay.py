@@ -0,0 +1,51 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("redbot")
+
+from antispam.replay import load_stream, replay  # noqa: E402
+
+STREAM = Path(__file__).parent / "data" / "stream.jsonl"
+
+# Authors 100-103 are ordinary chatter and must never be flagged
+CLEAN_AUTHORS = {100, 101, 102, 103}
+
+
+def _replay(**overrides):
+    with STREAM.open(encoding="utf-8") as fp:
+        records = load_stream(fp)
+    return asyncio.run(replay(records, overrides, measure_allocations=False))
+
+
+def test_trigger_counts():
+    report = _replay()
+    assert report.messages == 33
+    assert dict(report.triggers) == {
+        "MsgFlood.A!msg": 3,
+        "Repeat.Copypasta.B!msg": 2,
+        "Repeat.Timespan.C!msg": 3,
+        "Block.AsciiArt.D!msg": 1,
+        "Emoji.Spam.E!msg": 1,
+        "Coordinated.Copypasta.L!msg": 3,
+    }
+
+
+def test_no_false_positives():
+    report = _replay()
+    assert not CLEAN_AUTHORS & set(report.flagged_authors)
+
+
+def test_overrides_apply():
+    report = _replay(raid_cluster_authors=0, ascii_art_threshold=1000)
+    assert "Coordinated.Copypasta.L!msg" not in report.triggers
+    assert "Block.AsciiArt.D!msg" not in report.triggers
+    assert report.triggers["MsgFlood.A!msg"] == 3
+
+
+def test_allocation_pass():
+    with STREAM.open(encoding="utf-8") as fp:
+        records = load_stream(fp)
+    report = asyncio.run(replay(records))
+    assert report.alloc_peak > 0
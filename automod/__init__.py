@@ -1,4 +1,6 @@
 from .automod import AutoMod
 
 async def setup(bot):
-    await bot.add_cog(AutoMod(bot))
+    cog = AutoMod(bot)
+    await cog.initialize()
+    await bot.add_cog(cog)
@@ -1,5 +1,7 @@
 import discord # type: ignore
+from discord.ext import tasks # type: ignore
 from redbot.core import commands, Config # type: ignore
+from redbot.core.data_manager import cog_data_path # type: ignore
 import aiohttp # type: ignore
 from collections import Counter
 import unicodedata
@@ -9,6 +11,7 @@ import tempfile
 import math
 import calendar
 from datetime import datetime, timezone, timedelta
+from logging import getLogger
 import asyncio
 import io
 import os
@@ -18,13 +21,83 @@ import plotly.io as pio
 import base64
 
 from . import views
+from .cache import VerdictCache
+from .moderation import MODERATION_MODEL, ModerationClient, ModerationError
+from .phash import MAX_IMAGE_BYTES, ImageHashIndex, dhash
+from .queue import POLICIES, ModerationQueue
+from .stats import StatsSink
+from .violations import ViolationLog
+
+
+log = getLogger("red.beehive.automod")
+
+# A near-duplicate of a clean image is only trusted this close (in dHash bits);
+# near-duplicates of flagged images are trusted up to the index's full range
+CLEAN_MATCH_DISTANCE = 2
+
+
+class GuildPolicy:
+    """
+    Per-guild snapshot of the settings process_message consults before calling the API.
+    Loaded once from Config and reused until a command changes one of these settings.
+    """
+
+    __slots__ = (
+        "moderation_enabled",
+        "moderation_threshold",
+        "timeout_duration",
+        "log_channel",
+        "debug_mode",
+        "delete_violatory_messages",
+        "bypass_nsfw",
+        "monitoring_warning_enabled",
+        "whitelisted_channels",
+        "whitelisted_categories",
+        "whitelisted_roles",
+        "whitelisted_users",
+    )
+
+    KEYS = __slots__
+
+    def __init__(self, data: dict):
+        self.moderation_enabled = bool(data["moderation_enabled"])
+        self.moderation_threshold = float(data["moderation_threshold"])
+        self.timeout_duration = int(data["timeout_duration"])
+        self.log_channel = data["log_channel"]
+        self.debug_mode = bool(data["debug_mode"])
+        self.delete_violatory_messages = bool(data["delete_violatory_messages"])
+        self.bypass_nsfw = bool(data["bypass_nsfw"])
+        self.monitoring_warning_enabled = bool(data["monitoring_warning_enabled"])
+        self.whitelisted_channels = frozenset(data["whitelisted_channels"])
+        self.whitelisted_categories = frozenset(data["whitelisted_categories"])
+        self.whitelisted_roles = frozenset(data["whitelisted_roles"])
+        self.whitelisted_users = frozenset(data["whitelisted_users"])
+
+    def is_whitelisted(self, message) -> bool:
+        """Whether the message's channel, category, author or author's roles are exempt from moderation."""
+        channel = message.channel
+        if getattr(channel, "id", None) in self.whitelisted_channels:
+            return True
+        if getattr(channel, "category_id", None) in self.whitelisted_categories:
+            return True
+        author = message.author
+        if getattr(author, "id", None) in self.whitelisted_users:
+            return True
+        if self.whitelisted_roles and any(getattr(role, "id", None) in self.whitelisted_roles for role in getattr(author, "roles", ())):
+            return True
+        if self.bypass_nsfw and callable(getattr(channel, "is_nsfw", None)):
+            try:
+                return bool(channel.is_nsfw())
+            except Exception:
+                return False
+        return False
+
 
 class AutoMod(commands.Cog):
     """AI-powered automatic text moderation provided by frontier moderation models"""
 
     def __init__(self, bot):
         self.bot = bot
-        self.session = None
 
         # Configuration setup
         self.config = Config.get_conf(self, identifier=11111111111)
@@ -32,6 +105,26 @@ class AutoMod(commands.Cog):
 
         # In-memory reminder tracking to prevent duplicate reminders
         self._reminder_sent_at = {}  # {guild_id: {channel_id: datetime}}
+        self._reminder_counts = Counter()  # {channel_id: messages since the last reminder}
+
+        # Batches moderation requests across messages and paces them with a shared RequestPacer
+        self.moderation = ModerationClient(lambda: self.http.session)
+
+        # Category scores by content hash, so reposts and edits don't hit the API again
+        self.verdict_cache = VerdictCache(MODERATION_MODEL, path=cog_data_path(self) / "verdicts.sqlite3")
+
+        # Perceptual hashes of scored images, so re-encoded or resized reposts skip the API
+        self.image_index = ImageHashIndex(MODERATION_MODEL, cog_data_path(self) / "image_hashes.sqlite3")
+
+        # Messages wait here for a moderation worker instead of holding up event dispatch
+        self.queue = ModerationQueue(self._process_queued)
+
+        # Per-user violation history, appended to on every flagged message and compacted daily
+        self.violation_log = ViolationLog(cog_data_path(self) / "violations.sqlite3")
+
+        # Statistics are buffered here and written to Config by flush_stats
+        self.stats_sink = StatsSink(self.config)
+        self.flush_stats.start()
 
         # Track timeouts issued by message id for "Untimeout" button
         self._timeout_issued_for_message = {}  # {message_id: True/False}
@@ -42,6 +135,21 @@ class AutoMod(commands.Cog):
         # For logging: track which image was flagged if an image is moderated
         self._flagged_image_for_message = {}  # {message_id: image_url}
 
+        # Cached GuildPolicy per guild, dropped whenever a command changes one of its settings
+        self._policy_cache = {}  # {guild_id: GuildPolicy}
+
+        # Cached OpenAI key, refreshed when Red reports a shared API token change
+        self._api_key = None
+        self._api_key_loaded = False
+
+    @property
+    def http(self):
+        # Pooled session shared by the BeeHive cogs, looked up per use so load order doesn't matter
+        cog = self.bot.get_cog("BeeHiveHTTP")
+        if cog is None:
+            raise RuntimeError("The beehivehttp cog must be loaded to make web requests.")
+        return cog.provider
+
     def _register_config(self):
         """Register configuration defaults."""
         self.config.register_guild(
@@ -58,7 +166,7 @@ class AutoMod(commands.Cog):
             whitelisted_users=[],
             whitelisted_categories=[],
             moderation_enabled=True,
-            user_message_counts={},
+            user_message_counts={},  # Legacy, per-user counts now live in member scope
             image_count=0,
             moderated_image_count=0,
             timeout_count=0,
@@ -71,7 +179,7 @@ class AutoMod(commands.Cog):
             last_reminder_time=None,
             bypass_nsfw=False,
             monitoring_warning_enabled=True,
-            user_violations={},  # {user_id: [violation_dict, ...]}
+            user_violations={},  # Legacy, moved into the violation log on load
             user_warnings={},    # {user_id: int}
         )
         self.config.register_global(
@@ -82,17 +190,63 @@ class AutoMod(commands.Cog):
             global_image_count=0,
             global_moderated_image_count=0,
             global_timeout_count=0,
-            global_total_timeout_duration=0
+            global_total_timeout_duration=0,
+            verdict_cache_persist=True,
+            queue_workers=4,
+            queue_max_depth=1000,
+            queue_policy="drop",
+            violation_retention_days=90,
         )
+        self.config.register_member(message_count=0)
 
     async def initialize(self):
-        """Initialize the aiohttp session."""
+        """Apply the global cache and queue settings and move legacy violation history into the log."""
         try:
-            if self.session is None or getattr(self.session, "closed", True):
-                self.session = aiohttp.ClientSession()
+            if not await self.config.verdict_cache_persist():
+                self.verdict_cache.path = None
+            self.queue.max_depth = await self.config.queue_max_depth()
+            self.queue.guild_max_depth = max(1, self.queue.max_depth // 4)
+            self.queue.policy = await self.config.queue_policy()
+            self.queue.resize(await self.config.queue_workers())
+            for guild_id, data in (await self.config.all_guilds()).items():
+                if data.get("user_violations"):
+                    await self.violation_log.import_legacy(guild_id, data["user_violations"])
+                    await self.config.guild_from_id(guild_id).user_violations.clear()
+            self.compact_violations.start()
         except Exception as e:
             raise RuntimeError(f"Failed to initialize AutoMod cog: {e}")
 
+    @property
+    def session(self):
+        return self.http.session
+
+    async def get_policy(self, guild) -> GuildPolicy:
+        """Return the cached policy for a guild, loading it from Config if needed."""
+        policy = self._policy_cache.get(guild.id)
+        if policy is None:
+            guild_conf = self.config.guild(guild)
+            # Read only the policy keys; all() would also copy the large per-user dicts
+            data = {key: await guild_conf.get_attr(key)() for key in GuildPolicy.KEYS}
+            policy = self._policy_cache[guild.id] = GuildPolicy(data)
+        return policy
+
+    def invalidate_policy(self, guild):
+        """Drop the cached policy for a guild so the next message reloads it."""
+        self._policy_cache.pop(getattr(guild, "id", guild), None)
+
+    async def get_api_key(self):
+        """Return the OpenAI API key from Red's shared tokens, cached until the tokens change."""
+        if not self._api_key_loaded:
+            self._api_key = (await self.bot.get_shared_api_tokens("openai")).get("api_key")
+            self._api_key_loaded = True
+        return self._api_key
+
+    @commands.Cog.listener()
+    async def on_red_api_tokens_update(self, service_name, api_tokens):
+        if service_name == "openai":
+            self._api_key = api_tokens.get("api_key")
+            self._api_key_loaded = True
+
     def normalize_text(self, text):
         """Normalize text to replace with standard alphabetical/numeric characters."""
         try:
@@ -109,9 +263,17 @@ class AutoMod(commands.Cog):
 
     @commands.Cog.listener()
     async def on_message(self, message):
-        await self.process_message(message)
+        self.enqueue_message(message)
         await self.check_monitoring_reminder(message)
 
+    def enqueue_message(self, message):
+        if getattr(message.author, "bot", False) or not getattr(message, "guild", None):
+            return
+        self.queue.submit(message)
+
+    async def _process_queued(self, message, degraded):
+        await self.process_message(message, skip_images=degraded)
+
     async def check_monitoring_reminder(self, message):
         """Check and send a monitoring reminder if needed."""
         if getattr(message.author, "bot", False) or not getattr(message, "guild", None):
@@ -121,47 +283,20 @@ class AutoMod(commands.Cog):
         channel = message.channel
 
         # Check if monitoring warning is enabled
-        monitoring_warning_enabled = await self.config.guild(guild).monitoring_warning_enabled()
-        if not monitoring_warning_enabled:
+        policy = await self.get_policy(guild)
+        if not policy.monitoring_warning_enabled:
             return
 
         # Check all whitelist conditions before incrementing or sending reminder
-        whitelisted_channels = await self.config.guild(guild).whitelisted_channels()
-        whitelisted_categories = await self.config.guild(guild).whitelisted_categories()
-        whitelisted_roles = await self.config.guild(guild).whitelisted_roles()
-        whitelisted_users = await self.config.guild(guild).whitelisted_users()
-        bypass_nsfw = await self.config.guild(guild).bypass_nsfw()
-
-        # Check if channel is whitelisted by channel ID
-        if getattr(channel, "id", None) in whitelisted_channels:
+        if policy.is_whitelisted(message):
             return
-        # Check if channel's category is whitelisted
-        if getattr(channel, "category_id", None) in whitelisted_categories:
-            return
-        # Check if any of the author's roles are whitelisted
-        if hasattr(message.author, "roles") and any(getattr(role, "id", None) in whitelisted_roles for role in getattr(message.author, "roles", [])):
-            return
-        # Check if author is whitelisted
-        if getattr(message.author, "id", None) in whitelisted_users:
-            return
-        # Check if NSFW bypass is enabled and channel is NSFW
-        if hasattr(channel, "is_nsfw") and callable(getattr(channel, "is_nsfw", None)):
-            try:
-                is_nsfw = channel.is_nsfw()
-            except Exception:
-                is_nsfw = False
-            if is_nsfw and bypass_nsfw:
-                return
 
-        # Increment the message count for the channel in config
-        guild_conf = self.config.guild(guild)
-        user_message_counts = await guild_conf.user_message_counts()
+        # Increment the message count for the channel
         channel_id = channel.id
-        user_message_counts[channel_id] = user_message_counts.get(channel_id, 0) + 1
-        await guild_conf.user_message_counts.set(user_message_counts)
+        self._reminder_counts[channel_id] += 1
 
         # Check if the message count has reached 75
-        if user_message_counts[channel_id] >= 75:
+        if self._reminder_counts[channel_id] >= 75:
             # Prevent duplicate reminders by checking last sent time
             now = datetime.utcnow()
             if guild.id not in self._reminder_sent_at:
@@ -172,16 +307,14 @@ class AutoMod(commands.Cog):
                 await self.send_monitoring_reminder(channel)
                 self._reminder_sent_at[guild.id][channel.id] = now
             # Reset the message count for the channel regardless
-            user_message_counts[channel_id] = 0
-            await guild_conf.user_message_counts.set(user_message_counts)
+            del self._reminder_counts[channel_id]
 
     async def send_monitoring_reminder(self, channel):
         """Send a monitoring reminder to the specified channel."""
         try:
             # Check if monitoring warning is enabled for this guild
             guild = channel.guild
-            monitoring_warning_enabled = await self.config.guild(guild).monitoring_warning_enabled()
-            if not monitoring_warning_enabled:
+            if not (await self.get_policy(guild)).monitoring_warning_enabled:
                 return
             command_prefixes = await self.bot.get_valid_prefixes()
             command_prefix = command_prefixes[0] if command_prefixes else "!"
@@ -200,73 +333,53 @@ class AutoMod(commands.Cog):
 
     @commands.Cog.listener()
     async def on_message_edit(self, before, after):
-        await self.process_message(after)
+        self.enqueue_message(after)
 
-    async def process_message(self, message):
+    async def process_message(self, message, skip_images=False):
+        """Moderate one message. With ``skip_images`` (queue under pressure) only the text is checked."""
         try:
             if getattr(message.author, "bot", False) or not getattr(message, "guild", None):
                 return
 
             guild = message.guild
-            guild_conf = self.config.guild(guild)
-            if not await guild_conf.moderation_enabled():
-                return
-
-            if getattr(message.channel, "id", None) in await guild_conf.whitelisted_channels():
-                return
-
-            whitelisted_categories = await guild_conf.whitelisted_categories()
-            if getattr(message.channel, "category_id", None) in whitelisted_categories:
-                return
-
-            whitelisted_roles = await guild_conf.whitelisted_roles()
-            if hasattr(message.author, "roles") and any(getattr(role, "id", None) in whitelisted_roles for role in getattr(message.author, "roles", [])):
+            policy = await self.get_policy(guild)
+            if not policy.moderation_enabled:
                 return
 
-            if getattr(message.author, "id", None) in await guild_conf.whitelisted_users():
+            if policy.is_whitelisted(message):
                 return
 
-            if hasattr(message.channel, "is_nsfw") and callable(getattr(message.channel, "is_nsfw", None)):
-                try:
-                    is_nsfw = message.channel.is_nsfw()
-                except Exception:
-                    is_nsfw = False
-                if is_nsfw and await guild_conf.bypass_nsfw():
-                    return
-
-            # Increment statistics directly in config
+            # Buffered, written to config by flush_stats
             await self.increment_statistic(guild.id, 'message_count')
             await self.increment_statistic('global', 'global_message_count')
             await self.increment_user_message_count(guild.id, message.author.id)
 
-            api_key = (await self.bot.get_shared_api_tokens("openai")).get("api_key")
+            api_key = await self.get_api_key()
             if not api_key:
                 return
 
-            if self.session is None or getattr(self.session, "closed", True):
-                self.session = aiohttp.ClientSession()
-
             normalized_content = self.normalize_text(message.content)
-            input_data = [{"type": "text", "text": normalized_content}]
 
             # Count and increment image stats for each image (not just once for the message)
             image_attachments = []
-            if getattr(message, "attachments", None):
+            if getattr(message, "attachments", None) and not skip_images:
                 for attachment in message.attachments:
                     if getattr(attachment, "content_type", None) and attachment.content_type.startswith("image/") and not attachment.content_type.endswith("gif"):
                         image_attachments.append(attachment)
                         await self.increment_statistic(guild.id, 'image_count')
                         await self.increment_statistic('global', 'global_image_count')
 
-            # Only send text for moderation in the main request
-            text_category_scores = await self.analyze_content(input_data, api_key, message)
-            moderation_threshold = await guild_conf.moderation_threshold()
+            # Cached verdicts are reused; misses are batched with other messages' text,
+            # images go one per request (API limit) in parallel
+            moderation_threshold = policy.moderation_threshold
+            text_result, image_results = await self.moderate_message(
+                api_key, normalized_content, image_attachments, moderation_threshold
+            )
+            text_category_scores = await self._scores_or_log(message, text_result)
             text_flagged = any(score > moderation_threshold for score in text_category_scores.values())
 
-            # Analyze each image individually (API only supports one image at a time)
-            for attachment in image_attachments:
-                image_data = [{"type": "image_url", "image_url": {"url": attachment.url}}]
-                image_category_scores = await self.analyze_content(image_data, api_key, message)
+            for attachment, image_result in zip(image_attachments, image_results):
+                image_category_scores = await self._scores_or_log(message, image_result)
                 image_flagged = any(score > moderation_threshold for score in image_category_scores.values())
 
                 if image_flagged:
@@ -280,9 +393,6 @@ class AutoMod(commands.Cog):
                     if self._flagged_image_for_message.get(message.id) == attachment.url:
                         del self._flagged_image_for_message[message.id]
 
-                # Space out requests
-                await asyncio.sleep(1)
-
             if text_flagged:
                 await self.update_moderation_stats(guild.id, message, text_category_scores)
                 # For text moderation, clear any flagged image for this message
@@ -290,7 +400,7 @@ class AutoMod(commands.Cog):
                     del self._flagged_image_for_message[message.id]
                 await self.handle_moderation(message, text_category_scores, flagged_image_url=None)
 
-            if await guild_conf.debug_mode():
+            if policy.debug_mode:
                 # For debug logging, also use the flagged image if present
                 flagged_image_url = self._flagged_image_for_message.get(message.id)
                 await self.log_message(message, text_category_scores, flagged_image_url=flagged_image_url)
@@ -298,22 +408,27 @@ class AutoMod(commands.Cog):
             raise RuntimeError(f"Error processing message: {e}")
 
     async def increment_statistic(self, guild_id, stat_name, increment_value=1):
-        if guild_id == 'global':
-            current_value = await self.config.get_attr(stat_name)()
-            await self.config.get_attr(stat_name).set(current_value + increment_value)
-        else:
-            guild_conf = self.config.guild_from_id(guild_id)
-            current_value = await guild_conf.get_attr(stat_name)()
-            await guild_conf.get_attr(stat_name).set(current_value + increment_value)
+        self.stats_sink.add(None if guild_id == 'global' else guild_id, stat_name, increment_value)
 
     async def increment_user_message_count(self, guild_id, user_id):
         if guild_id == 'global':
             # Not used for global
             return
-        guild_conf = self.config.guild_from_id(guild_id)
-        user_message_counts = await guild_conf.user_message_counts()
-        user_message_counts[user_id] = user_message_counts.get(user_id, 0) + 1
-        await guild_conf.user_message_counts.set(user_message_counts)
+        self.stats_sink.add_member_message(guild_id, user_id)
+
+    @tasks.loop(seconds=30)
+    async def flush_stats(self):
+        # StatsSink.flush swaps its buffers out before writing, so a flush cancelled
+        # halfway would lose those deltas. The shield lets it finish; the final flush
+        # queued by cog_unload then waits on the sink's lock and writes the rest.
+        await asyncio.shield(self.stats_sink.flush())
+
+    @tasks.loop(hours=24)
+    async def compact_violations(self):
+        try:
+            await self.violation_log.compact(await self.config.violation_retention_days())
+        except Exception:
+            log.exception("Failed to compact the violation log")
 
     async def update_moderation_stats(self, guild_id, message, text_category_scores):
         # Increment counts
@@ -322,14 +437,9 @@ class AutoMod(commands.Cog):
 
         # Update per-user moderation counts
         if guild_id == 'global':
-            conf = self.config
-            key = 'global_moderated_users'
+            self.stats_sink.add_keyed(None, 'global_moderated_users', message.author.id)
         else:
-            conf = self.config.guild_from_id(guild_id)
-            key = 'moderated_users'
-        users = await conf.get_attr(key)()
-        users[str(message.author.id)] = users.get(str(message.author.id), 0) + 1
-        await conf.get_attr(key).set(users)
+            self.stats_sink.add_keyed(guild_id, 'moderated_users', message.author.id)
 
         # Update category counters
         await self.update_category_counter(guild_id, text_category_scores)
@@ -350,13 +460,7 @@ class AutoMod(commands.Cog):
                 "author_name": getattr(message.author, "display_name", str(message.author)),
                 "attachments": [a.url for a in getattr(message, "attachments", []) if getattr(a, "content_type", None) and a.content_type.startswith("image/") and not a.content_type.endswith("gif")],
             }
-            guild_conf = self.config.guild_from_id(guild_id)
-            user_violations = await guild_conf.user_violations()
-            user_id_str = str(message.author.id)
-            if user_id_str not in user_violations:
-                user_violations[user_id_str] = []
-            user_violations[user_id_str] = (user_violations[user_id_str] + [violation_entry])[-50:]
-            await guild_conf.user_violations.set(user_violations)
+            await self.violation_log.append(guild_id, violation_entry)
 
         if any(getattr(attachment, "content_type", None) and attachment.content_type.startswith("image/") and not attachment.content_type.endswith("gif") for attachment in getattr(message, "attachments", [])):
             await self.increment_statistic(guild_id, 'moderated_image_count')
@@ -364,62 +468,102 @@ class AutoMod(commands.Cog):
 
     async def update_category_counter(self, guild_id, text_category_scores):
         if guild_id == 'global':
-            conf = self.config
-            key = 'global_category_counter'
+            scope, key = None, 'global_category_counter'
         else:
-            conf = self.config.guild_from_id(guild_id)
-            key = 'category_counter'
-        counter = Counter(await conf.get_attr(key)())
+            scope, key = guild_id, 'category_counter'
         for category, score in text_category_scores.items():
             if score > 0.2:
-                counter[category] += 1
-        await conf.get_attr(key).set(dict(counter))
+                self.stats_sink.add_keyed(scope, key, category)
+
+    async def _read_image(self, attachment):
+        """Download an attachment for hashing, or return None if it's too large or can't be read."""
+        if getattr(attachment, "size", 0) > MAX_IMAGE_BYTES:
+            return None
+        try:
+            return await attachment.read()
+        except Exception:
+            return None
+
+    async def moderate_message(self, api_key, text, image_attachments, threshold):
+        """
+        Score a message's text and images, reusing cached verdicts and sending only the misses.
+
+        Images are checked against the exact verdict cache first, then against the
+        perceptual hash index: a near-duplicate of a flagged image reuses its scores
+        outright, a near-duplicate of a clean image only if it is a closer match.
+        Returns ``(text_result, [image_result, ...])`` like ModerationClient.moderate_message.
+        """
+        cache = self.verdict_cache
+        text_key = cache.text_key(text) if text else None
+        text_result = await cache.get(text_key) if text_key else {}
+        image_data = await asyncio.gather(*(self._read_image(attachment) for attachment in image_attachments))
+        image_keys = [
+            cache.image_key(data) if data is not None else cache.url_key(attachment.url)
+            for attachment, data in zip(image_attachments, image_data)
+        ]
+        image_results = [await cache.get(key) for key in image_keys]
+
+        image_hashes = {}
+        for i, result in enumerate(image_results):
+            if result is not None or image_data[i] is None:
+                continue
+            image_hash = await asyncio.to_thread(dhash, image_data[i])
+            if image_hash is None:
+                continue
+            image_hashes[i] = image_hash
+            match = await self.image_index.match(image_hash)
+            if match is not None:
+                scores, distance = match
+                if distance <= CLEAN_MATCH_DISTANCE or any(score > threshold for score in scores.values()):
+                    image_results[i] = scores
+                    await cache.put(image_keys[i], scores)
+
+        missing = [i for i, result in enumerate(image_results) if result is None]
+        if text_result is None or missing:
+            fresh_text, fresh_images = await self.moderation.moderate_message(
+                api_key,
+                text if text_result is None else "",
+                [image_attachments[i].url for i in missing],
+            )
+            if text_result is None:
+                text_result = fresh_text
+                if isinstance(fresh_text, dict):
+                    await cache.put(text_key, fresh_text)
+            for i, result in zip(missing, fresh_images):
+                image_results[i] = result
+                if isinstance(result, dict):
+                    await cache.put(image_keys[i], result)
+                    if i in image_hashes:
+                        await self.image_index.add(image_hashes[i], result)
+        return text_result, image_results
 
     async def analyze_content(self, input_data, api_key, message):
         """
         Analyze content using the OpenAI moderation endpoint.
-        Automatically retries on 4XX and 5XX errors, with exponential backoff up to a max number of attempts.
+        Each text or image item goes through the batching client and the highest score per category is returned.
+        Failures are logged with their error code and return an empty dict.
         """
-        max_attempts = 5
-        base_delay = 2  # seconds
-        attempt = 0
-        while attempt < max_attempts:
-            try:
-                if self.session is None or getattr(self.session, "closed", True):
-                    self.session = aiohttp.ClientSession()
-                async with self.session.post(
-                    "https://api.openai.com/v1/moderations",
-                    headers={
-                        "Content-Type": "application/json",
-                        "Authorization": f"Bearer {api_key}"
-                    },
-                    json={
-                        "model": "omni-moderation-latest",
-                        "input": input_data
-                    }
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get("results", [{}])[0].get("category_scores", {})
-                    elif 400 <= response.status < 600:
-                        # Retry on any 4XX or 5XX error
-                        attempt += 1
-                        if attempt >= max_attempts:
-                            await self.log_message(message, {}, error_code=response.status)
-                            return {}
-                        await asyncio.sleep(base_delay * attempt)
-                    else:
-                        # Unexpected status, log and return empty
-                        await self.log_message(message, {}, error_code=response.status)
-                        return {}
-            except Exception as e:
-                attempt += 1
-                if attempt >= max_attempts:
-                    raise RuntimeError(f"Failed to analyze content after {max_attempts} attempts: {e}")
-                await asyncio.sleep(base_delay * attempt)
-        # If all attempts fail, return empty
-        await self.log_message(message, {}, error_code="max_retries")
-        return {}
+        jobs = []
+        for item in input_data:
+            if item.get("type") == "image_url":
+                jobs.append(self.moderation.moderate_image(api_key, item["image_url"]["url"]))
+            else:
+                jobs.append(self.moderation.moderate_text(api_key, item.get("text", "")))
+        category_scores = {}
+        for result in await asyncio.gather(*jobs, return_exceptions=True):
+            scores = await self._scores_or_log(message, result)
+            for category, score in scores.items():
+                category_scores[category] = max(score, category_scores.get(category, 0))
+        return category_scores
+
+    async def _scores_or_log(self, message, result):
+        """Unwrap a moderation result, logging failed requests the way analyze_content always has."""
+        if isinstance(result, ModerationError):
+            await self.log_message(message, {}, error_code=result.code)
+            return {}
+        if isinstance(result, BaseException):
+            raise RuntimeError(f"Failed to analyze content: {result}")
+        return result
 
     async def translate_to_language(self, text, language):
         """
@@ -427,11 +571,9 @@ class AutoMod(commands.Cog):
         Returns the translated text, or None if translation fails.
         """
         try:
-            api_key = (await self.bot.get_shared_api_tokens("openai")).get("api_key")
+            api_key = await self.get_api_key()
             if not api_key:
                 return None
-            if self.session is None or getattr(self.session, "closed", True):
-                self.session = aiohttp.ClientSession()
             # Use the chat/completions endpoint for translation
             prompt = (
                 f"Translate the following message to {language}. "
@@ -472,11 +614,9 @@ class AutoMod(commands.Cog):
         then use GPT-4o to explain why the message matches those moderation scores.
         """
         try:
-            api_key = (await self.bot.get_shared_api_tokens("openai")).get("api_key")
+            api_key = await self.get_api_key()
             if not api_key:
                 return None
-            if self.session is None or getattr(self.session, "closed", True):
-                self.session = aiohttp.ClientSession()
 
             # Step 1: Get moderation scores from OpenAI Moderations endpoint
             moderation_scores = None
@@ -544,8 +684,6 @@ class AutoMod(commands.Cog):
         Upload a file to tmpfiles.org and return the URL.
         """
         try:
-            if self.session is None or getattr(self.session, "closed", True):
-                self.session = aiohttp.ClientSession()
             with open(file_path, "rb") as f:
                 data = aiohttp.FormData()
                 data.add_field("file", f, filename=os.path.basename(file_path))
@@ -561,10 +699,10 @@ class AutoMod(commands.Cog):
     async def handle_moderation(self, message, category_scores, flagged_image_url=None):
         try:
             guild = message.guild
-            guild_conf = self.config.guild(guild)
-            timeout_duration = await guild_conf.timeout_duration()
-            log_channel_id = await guild_conf.log_channel()
-            delete_violatory_messages = await guild_conf.delete_violatory_messages()
+            policy = await self.get_policy(guild)
+            timeout_duration = policy.timeout_duration
+            log_channel_id = policy.log_channel
+            delete_violatory_messages = policy.delete_violatory_messages
 
             message_deleted = False
             flagged_image_tempfile = None
@@ -574,8 +712,6 @@ class AutoMod(commands.Cog):
             # If a flagged image is present, download it before deletion using tempfile
             if flagged_image_url:
                 try:
-                    if self.session is None or getattr(self.session, "closed", True):
-                        self.session = aiohttp.ClientSession()
                     async with self.session.get(flagged_image_url) as resp:
                         if resp.status == 200:
                             # Try to get the filename from the URL
@@ -604,9 +740,7 @@ class AutoMod(commands.Cog):
                     }
                     await message.delete()
                     # Increment per-user moderation count
-                    users = await guild_conf.moderated_users()
-                    users[str(message.author.id)] = users.get(str(message.author.id), 0) + 1
-                    await guild_conf.moderated_users.set(users)
+                    self.stats_sink.add_keyed(guild.id, 'moderated_users', message.author.id)
                     message_deleted = True
                 except discord.NotFound:
                     pass
@@ -668,7 +802,7 @@ class AutoMod(commands.Cog):
                     )
                     # Use the ModerationActionView from views.py instead of the local class
                     timeout_issued_val = timeout_issued
-                    timeout_duration_val = await guild_conf.timeout_duration()
+                    timeout_duration_val = timeout_duration
                     view = views.ModerationActionView(self, message, timeout_issued_val, timeout_duration=timeout_duration_val)
                     # If a flagged image was present and we have the tempfile, send as a file
                     if flagged_image_tempfile and flagged_image_filename:
@@ -701,7 +835,7 @@ class AutoMod(commands.Cog):
         embed.add_field(name="Action taken", value=action_taken, inline=True)
         embed.add_field(name="AI moderator ratings", value="", inline=False)
         embed.set_footer(text="AI can make mistakes, have a human review this alert")
-        moderation_threshold = await self.config.guild(message.guild).moderation_threshold()
+        moderation_threshold = (await self.get_policy(message.guild)).moderation_threshold
         sorted_scores = sorted(category_scores.items(), key=lambda item: item[1], reverse=True)[:6]
         for category, score in sorted_scores:
             score_percentage = score * 100
@@ -724,7 +858,7 @@ class AutoMod(commands.Cog):
         # Determine if a timeout was issued for this message
         if timeout_issued is None:
             timeout_issued = self._timeout_issued_for_message.get(message.id, False)
-        timeout_duration = await self.config.guild(message.guild).timeout_duration()
+        timeout_duration = (await self.get_policy(message.guild)).timeout_duration
         # Use the ModerationActionView from views.py
         return views.ModerationActionView(self, message, timeout_issued, timeout_duration=timeout_duration)
 
@@ -802,8 +936,6 @@ class AutoMod(commands.Cog):
                         # Download and upload to tmpfiles
                         tmpfiles_url = None
                         try:
-                            if self.session is None or getattr(self.session, "closed", True):
-                                self.session = aiohttp.ClientSession()
                             async with self.session.get(image_url) as resp:
                                 if resp.status == 200:
                                     # Try to get the filename from the URL
@@ -852,15 +984,17 @@ class AutoMod(commands.Cog):
         [View command documentation](<https://sentri.beehive.systems/features/agentic-moderator#automod-stats>)
         """
         try:
-            # Local statistics
-            message_count = await self.config.guild(ctx.guild).message_count()
-            moderated_count = await self.config.guild(ctx.guild).moderated_count()
-            moderated_users = await self.config.guild(ctx.guild).moderated_users()
-            category_counter = Counter(await self.config.guild(ctx.guild).category_counter())
-            image_count = await self.config.guild(ctx.guild).image_count()
-            moderated_image_count = await self.config.guild(ctx.guild).moderated_image_count()
-            timeout_count = await self.config.guild(ctx.guild).timeout_count()
-            total_timeout_duration = await self.config.guild(ctx.guild).total_timeout_duration()
+            # Local statistics, read through the sink so unflushed counts are included
+            sink = self.stats_sink
+            guild_id = ctx.guild.id
+            message_count = await sink.value(guild_id, 'message_count')
+            moderated_count = await sink.value(guild_id, 'moderated_count')
+            moderated_users = await sink.mapping(guild_id, 'moderated_users')
+            category_counter = Counter(await sink.mapping(guild_id, 'category_counter'))
+            image_count = await sink.value(guild_id, 'image_count')
+            moderated_image_count = await sink.value(guild_id, 'moderated_image_count')
+            timeout_count = await sink.value(guild_id, 'timeout_count')
+            total_timeout_duration = await sink.value(guild_id, 'total_timeout_duration')
             too_weak_votes = await self.config.guild(ctx.guild).too_weak_votes()
             too_tough_votes = await self.config.guild(ctx.guild).too_tough_votes()
             just_right_votes = await self.config.guild(ctx.guild).just_right_votes()
@@ -922,14 +1056,14 @@ class AutoMod(commands.Cog):
             # Show global stats if in more than 45 servers
             if len(self.bot.guilds) > 45:
                 # Global statistics
-                global_message_count = await self.config.global_message_count()
-                global_moderated_count = await self.config.global_moderated_count()
-                global_moderated_users = await self.config.global_moderated_users()
-                global_category_counter = Counter(await self.config.global_category_counter())
-                global_image_count = await self.config.global_image_count()
-                global_moderated_image_count = await self.config.global_moderated_image_count()
-                global_timeout_count = await self.config.global_timeout_count()
-                global_total_timeout_duration = await self.config.global_total_timeout_duration()
+                global_message_count = await sink.value(None, 'global_message_count')
+                global_moderated_count = await sink.value(None, 'global_moderated_count')
+                global_moderated_users = await sink.mapping(None, 'global_moderated_users')
+                global_category_counter = Counter(await sink.mapping(None, 'global_category_counter'))
+                global_image_count = await sink.value(None, 'global_image_count')
+                global_moderated_image_count = await sink.value(None, 'global_moderated_image_count')
+                global_timeout_count = await sink.value(None, 'global_timeout_count')
+                global_total_timeout_duration = await sink.value(None, 'global_total_timeout_duration')
 
                 # Global warnings
                 global_total_warnings = 0
@@ -986,6 +1120,25 @@ class AutoMod(commands.Cog):
                 embed.add_field(name="Estimated minimum staff time saved", value=f"{global_time_saved_str} of **hands-on-keyboard** time to simply read and moderate automatically screened content.", inline=False)
                 embed.add_field(name="Most frequent flags", value=global_top_categories_bullets, inline=False)
 
+            cache = self.verdict_cache
+            embed.add_field(
+                name="Verdict cache",
+                value=(
+                    f"**{cache.hits:,}** moderation call{'s' if cache.hits != 1 else ''} saved "
+                    f"({cache.hit_rate * 100:.1f}% hit rate), **{len(cache):,}** verdicts in memory"
+                ),
+                inline=False
+            )
+            index = self.image_index
+            embed.add_field(
+                name="Image pre-filter",
+                value=(
+                    f"**{index.matches:,}** near-duplicate image{'s' if index.matches != 1 else ''} matched, "
+                    f"**{len(index):,}** image hashes indexed"
+                ),
+                inline=False
+            )
+
             embed.set_footer(text="Statistics are subject to vary and change as data is collected")
             await ctx.send(embed=embed)
         except Exception as e:
@@ -1012,26 +1165,21 @@ class AutoMod(commands.Cog):
                 return
 
             guild_conf = self.config.guild(guild)
-            user_violations = await guild_conf.user_violations()
-            violations = user_violations.get(str(user.id), [])
-
-            # Sort violations most recent first by timestamp (descending)
-            violations = sorted(
-                violations,
-                key=lambda v: v.get("timestamp", 0),
-                reverse=True
-            )
+            total_violations = await self.violation_log.count(guild.id, user.id)
+            retention_days = await self.config.violation_retention_days()
 
             # Get warning count for this user
             user_warnings = await guild_conf.user_warnings()
             warning_count = user_warnings.get(str(user.id), 0)
+            messages_processed = await self.stats_sink.member_messages(guild.id, user.id)
 
-            if not violations and warning_count == 0:
+            if not total_violations and warning_count == 0:
                 await ctx.send(f"No violations or warnings found for {user.mention}.")
                 return
 
             # --- Generate abuse trend "GitHub-style" heatmap using plotly ---
-            timestamps = [v.get("timestamp") for v in violations if v.get("timestamp")]
+            heatmap_start = datetime.combine(datetime.now(timezone.utc).date() - timedelta(days=55), datetime.min.time(), tzinfo=timezone.utc)
+            timestamps = await self.violation_log.timestamps(guild.id, user.id, heatmap_start.timestamp())
             image_url = None
             temp_file = None
             if timestamps:
@@ -1138,13 +1286,12 @@ class AutoMod(commands.Cog):
 
             # Pagination setup
             VIOLATIONS_PER_PAGE = 5
-            total_violations = len(violations)
             total_pages = max(1, math.ceil(total_violations / VIOLATIONS_PER_PAGE))
 
-            def make_embed(page: int):
+            async def make_embed(page: int):
                 start = page * VIOLATIONS_PER_PAGE
                 end = start + VIOLATIONS_PER_PAGE
-                violations_to_show = violations[start:end]
+                violations_to_show = await self.violation_log.page(guild.id, user.id, start, VIOLATIONS_PER_PAGE)
                 embed = discord.Embed(
                     title=f"Violation history for {user.display_name}",
                     color=0xff4545,
@@ -1168,14 +1315,19 @@ class AutoMod(commands.Cog):
                     value=f"{warning_count} warning{'s' if warning_count != 1 else ''} for this user.",
                     inline=False
                 )
-                embed.set_footer(text=f"Page {page+1}/{total_pages} • Only the last 50 violations are kept per user. Warnings are cumulative.")
+                embed.add_field(
+                    name="Messages processed",
+                    value=f"{messages_processed:,} message{'s' if messages_processed != 1 else ''} from this user.",
+                    inline=False
+                )
+                embed.set_footer(text=f"Page {page+1}/{total_pages} • Violations are kept for {retention_days} days. Warnings are cumulative.")
                 if image_url:
                     embed.set_image(url=image_url)
                 return embed
 
             # If only one page, just send the embed
             if total_pages == 1:
-                embed = make_embed(0)
+                embed = await make_embed(0)
                 if temp_file:
                     with open(temp_file.name, "rb") as f:
                         file = discord.File(f, filename="abuse_trend.png")
@@ -1196,7 +1348,7 @@ class AutoMod(commands.Cog):
             PAGINATION_EMOJIS = [LEFT_EMOJI, CLOSE_EMOJI, RIGHT_EMOJI]
 
             page = 0
-            embed = make_embed(page)
+            embed = await make_embed(page)
             if temp_file:
                 with open(temp_file.name, "rb") as f:
                     file = discord.File(f, filename="abuse_trend.png")
@@ -1251,7 +1403,7 @@ class AutoMod(commands.Cog):
                         pass
 
                     if page != old_page:
-                        embed = make_embed(page)
+                        embed = await make_embed(page)
                         if temp_file:
                             with open(temp_file.name, "rb") as f:
                                 file = discord.File(f, filename="abuse_trend.png")
@@ -1343,7 +1495,8 @@ class AutoMod(commands.Cog):
                 await ctx.send("Cleanup operation cancelled due to timeout.")
                 return
 
-            # Reset all guild statistics
+            # Reset all guild statistics, dropping buffered deltas first so a flush can't restore them
+            await self.stats_sink.discard()
             all_guilds = await self.config.all_guilds()
             for guild_id in all_guilds:
                 guild_conf = self.config.guild_from_id(guild_id)
@@ -1359,7 +1512,6 @@ class AutoMod(commands.Cog):
                 await guild_conf.too_weak_votes.set(0)
                 await guild_conf.too_tough_votes.set(0)
                 await guild_conf.just_right_votes.set(0)
-                await guild_conf.user_violations.set({})
                 await guild_conf.user_warnings.set({})
 
             # Reset global statistics
@@ -1371,12 +1523,19 @@ class AutoMod(commands.Cog):
             await self.config.global_moderated_image_count.set(0)
             await self.config.global_timeout_count.set(0)
             await self.config.global_total_timeout_duration.set(0)
+            await self.config.clear_all_members()
+            await self.violation_log.clear()
 
             # Clear in-memory statistics
             self._reminder_sent_at.clear()
+            self._reminder_counts.clear()
             self._timeout_issued_for_message.clear()
             self._deleted_messages.clear()
             self._flagged_image_for_message.clear()
+            self.verdict_cache.hits = 0
+            self.verdict_cache.misses = 0
+            self.image_index.matches = 0
+            self.image_index.misses = 0
 
             # Confirmation message
             confirmation_embed = discord.Embed(
@@ -1403,6 +1562,7 @@ class AutoMod(commands.Cog):
         try:
             if 0 <= threshold <= 1:
                 await self.config.guild(ctx.guild).moderation_threshold.set(threshold)
+                self.invalidate_policy(ctx.guild)
                 await ctx.send(f"Moderation threshold set to {threshold}.")
             else:
                 await ctx.send("Threshold must be between 0 and 1.")
@@ -1452,6 +1612,7 @@ class AutoMod(commands.Cog):
                     elif vote_type == "too strict":
                         moderation_threshold = min(1, moderation_threshold + 0.01)
                     await self.config.guild(guild).moderation_threshold.set(moderation_threshold)
+                    self.invalidate_policy(guild)
                     await self.config.guild(guild).last_vote_time.set(current_time.isoformat())
                     threshold_adjusted = True
 
@@ -1525,6 +1686,7 @@ class AutoMod(commands.Cog):
             current_status = await self.config.guild(guild).moderation_enabled()
             new_status = not current_status
             await self.config.guild(guild).moderation_enabled.set(new_status)
+            self.invalidate_policy(guild)
             status = "enabled" if new_status else "disabled"
             await ctx.send(f"Automatic moderation {status}.")
         except Exception as e:
@@ -1565,10 +1727,12 @@ class AutoMod(commands.Cog):
                     return
 
                 await self.config.guild(guild).monitoring_warning_enabled.set(False)
+                self.invalidate_policy(guild)
                 await ctx.send("Monitoring warning has been **disabled**. You are responsible for informing your members about moderation and logging.")
             else:
                 # Enable without confirmation
                 await self.config.guild(guild).monitoring_warning_enabled.set(True)
+                self.invalidate_policy(guild)
                 await ctx.send("Monitoring warning has been **enabled**. Members will be periodically notified that conversations are subject to moderation.")
         except Exception as e:
             raise RuntimeError(f"Failed to toggle monitoring warning: {e}")
@@ -1618,6 +1782,7 @@ class AutoMod(commands.Cog):
             current_status = await self.config.guild(guild).delete_violatory_messages()
             new_status = not current_status
             await self.config.guild(guild).delete_violatory_messages.set(new_status)
+            self.invalidate_policy(guild)
             status = "enabled" if new_status else "disabled"
             await ctx.send(f"Deletion of violatory messages {status}.")
         except Exception as e:
@@ -1635,6 +1800,7 @@ class AutoMod(commands.Cog):
         try:
             if duration >= 0:
                 await self.config.guild(ctx.guild).timeout_duration.set(duration)
+                self.invalidate_policy(ctx.guild)
                 await ctx.send(f"Timeout duration set to {duration} minutes.")
             else:
                 await ctx.send("Timeout duration must be 0 or greater.")
@@ -1651,6 +1817,7 @@ class AutoMod(commands.Cog):
         """
         try:
             await self.config.guild(ctx.guild).log_channel.set(channel.id)
+            self.invalidate_policy(ctx.guild)
             await ctx.send(f"Log channel set to {channel.mention}.")
         except Exception as e:
             raise RuntimeError(f"Failed to set log channel: {e}")
@@ -1685,6 +1852,7 @@ class AutoMod(commands.Cog):
                 changelog.append(f"Added: {channel.mention}")
 
             await self.config.guild(guild).whitelisted_channels.set(whitelisted_channels)
+            self.invalidate_policy(guild)
 
             if changelog:
                 changelog_message = "\n".join(changelog)
@@ -1713,6 +1881,7 @@ class AutoMod(commands.Cog):
                 changelog.append(f"Added: {role.mention}")
 
             await self.config.guild(guild).whitelisted_roles.set(whitelisted_roles)
+            self.invalidate_policy(guild)
 
             if changelog:
                 changelog_message = "\n".join(changelog)
@@ -1741,6 +1910,7 @@ class AutoMod(commands.Cog):
                 changelog.append(f"Added: {user.mention}")
 
             await self.config.guild(guild).whitelisted_users.set(whitelisted_users)
+            self.invalidate_policy(guild)
 
             if changelog:
                 changelog_message = "\n".join(changelog)
@@ -1769,6 +1939,7 @@ class AutoMod(commands.Cog):
                 changelog.append(f"Added: {category.name}")
 
             await self.config.guild(guild).whitelisted_categories.set(whitelisted_categories)
+            self.invalidate_policy(guild)
 
             if changelog:
                 changelog_message = "\n".join(changelog)
@@ -1789,6 +1960,7 @@ class AutoMod(commands.Cog):
             current_status = await self.config.guild(guild).bypass_nsfw()
             new_status = not current_status
             await self.config.guild(guild).bypass_nsfw.set(new_status)
+            self.invalidate_policy(guild)
             status_text = "enabled" if new_status else "disabled"
             embed = discord.Embed(
                 title="Whitelist updated",
@@ -1799,6 +1971,127 @@ class AutoMod(commands.Cog):
         except Exception as e:
             raise RuntimeError(f"Failed to toggle NSFW bypass: {e}")
 
+    @automod.group(name="cache", hidden=True)
+    @commands.is_owner()
+    async def verdict_cache_group(self, ctx):
+        """Manage the moderation verdict cache."""
+        pass
+
+    @verdict_cache_group.command(name="persist")
+    async def verdict_cache_persist(self, ctx):
+        """Toggle keeping cached verdicts on disk across restarts."""
+        try:
+            new_status = not await self.config.verdict_cache_persist()
+            await self.config.verdict_cache_persist.set(new_status)
+            self.verdict_cache.close()
+            self.verdict_cache.path = cog_data_path(self) / "verdicts.sqlite3" if new_status else None
+            status = "enabled" if new_status else "disabled"
+            await ctx.send(f"Persistent verdict cache {status}.")
+        except Exception as e:
+            raise RuntimeError(f"Failed to toggle verdict cache persistence: {e}")
+
+    @verdict_cache_group.command(name="clear")
+    async def verdict_cache_clear(self, ctx):
+        """Forget every cached verdict and indexed image hash."""
+        try:
+            self.verdict_cache.clear()
+            self.image_index.clear()
+            await ctx.send("Verdict cache and image hash index cleared.")
+        except Exception as e:
+            raise RuntimeError(f"Failed to clear verdict cache: {e}")
+
+    @automod.group(name="queue", hidden=True, invoke_without_command=True)
+    @commands.is_owner()
+    async def queue_group(self, ctx):
+        """Show moderation queue metrics."""
+        try:
+            queue = self.queue
+            busiest = sorted(queue.guild_depths().items(), key=lambda item: item[1], reverse=True)[:5]
+            busiest_str = "\n".join(
+                f"{getattr(self.bot.get_guild(guild_id), 'name', guild_id)}: **{depth:,}**" for guild_id, depth in busiest
+            ) or "None"
+            embed = discord.Embed(title="Moderation queue", color=0xfffffe)
+            embed.add_field(name="Workers", value=f"**{queue.in_flight}** busy of **{queue.workers}**", inline=True)
+            embed.add_field(name="Depth", value=f"**{queue.depth:,}** / {queue.max_depth:,} (peak {queue.peak_depth:,})", inline=True)
+            embed.add_field(name="Policy", value=queue.policy, inline=True)
+            embed.add_field(name="Wait time", value=f"p50 **{queue.wait_percentile(50):.0f} ms**, p95 **{queue.wait_percentile(95):.0f} ms**", inline=True)
+            embed.add_field(
+                name="Messages",
+                value=(
+                    f"**{queue.enqueued:,}** queued, **{queue.processed:,}** processed, **{queue.failed:,}** failed\n"
+                    f"**{queue.dropped:,}** dropped, **{queue.degraded:,}** text-only"
+                ),
+                inline=False
+            )
+            embed.add_field(name="Deepest guild queues", value=busiest_str, inline=False)
+            await ctx.send(embed=embed)
+        except Exception as e:
+            raise RuntimeError(f"Failed to display queue metrics: {e}")
+
+    @queue_group.command(name="workers")
+    async def queue_workers(self, ctx, workers: int):
+        """Set how many messages can be moderated at once."""
+        try:
+            if not 1 <= workers <= 64:
+                await ctx.send("Workers must be between 1 and 64.")
+                return
+            await self.config.queue_workers.set(workers)
+            self.queue.resize(workers)
+            await ctx.send(f"Moderation workers set to {workers}.")
+        except Exception as e:
+            raise RuntimeError(f"Failed to set queue workers: {e}")
+
+    @queue_group.command(name="depth")
+    async def queue_depth(self, ctx, depth: int):
+        """Set the maximum number of queued messages. Each guild may use a quarter of it."""
+        try:
+            if depth < 10:
+                await ctx.send("Queue depth must be at least 10.")
+                return
+            await self.config.queue_max_depth.set(depth)
+            self.queue.max_depth = depth
+            self.queue.guild_max_depth = max(1, depth // 4)
+            await ctx.send(f"Moderation queue depth set to {depth}.")
+        except Exception as e:
+            raise RuntimeError(f"Failed to set queue depth: {e}")
+
+    @queue_group.command(name="policy")
+    async def queue_policy(self, ctx, policy: str):
+        """
+        Set what happens under load
+
+        `drop` - drop new messages once the queue is full
+        `degrade` - also check only text (no images) once the queue is half full
+        """
+        try:
+            policy = policy.lower()
+            if policy not in POLICIES:
+                await ctx.send(f"Policy must be one of: {', '.join(POLICIES)}.")
+                return
+            await self.config.queue_policy.set(policy)
+            self.queue.policy = policy
+            await ctx.send(f"Moderation queue policy set to {policy}.")
+        except Exception as e:
+            raise RuntimeError(f"Failed to set queue policy: {e}")
+
+    @automod.command(name="retention", hidden=True)
+    @commands.is_owner()
+    async def violation_retention(self, ctx, days: int = None):
+        """Show or set how many days of violation history are kept."""
+        try:
+            if days is None:
+                days = await self.config.violation_retention_days()
+                await ctx.send(f"Violation history is kept for {days} days.")
+                return
+            if not 1 <= days <= 3650:
+                await ctx.send("Retention must be between 1 and 3650 days.")
+                return
+            await self.config.violation_retention_days.set(days)
+            removed = await self.violation_log.compact(days)
+            await ctx.send(f"Violation history is now kept for {days} days. Removed {removed:,} older violations.")
+        except Exception as e:
+            raise RuntimeError(f"Failed to set violation retention: {e}")
+
     @automod.command(hidden=True)
     @commands.is_owner()
     async def debug(self, ctx):
@@ -1808,14 +2101,17 @@ class AutoMod(commands.Cog):
             current_debug_mode = await self.config.guild(guild).debug_mode()
             new_debug_mode = not current_debug_mode
             await self.config.guild(guild).debug_mode.set(new_debug_mode)
+            self.invalidate_policy(guild)
             status = "enabled" if new_debug_mode else "disabled"
             await ctx.send(f"Debug mode {status}.")
         except Exception as e:
             raise RuntimeError(f"Failed to toggle debug mode: {e}")
 
     def cog_unload(self):
-        try:
-            if self.session and not self.session.closed:
-                self.bot.loop.create_task(self.session.close())
-        except Exception as e:
-            raise RuntimeError(f"Failed to unload cog: {e}")
\ No newline at end of file
+        self.flush_stats.cancel()
+        self.bot.loop.create_task(self.stats_sink.flush())
+        self.verdict_cache.close()
+        self.image_index.close()
+        self.queue.close()
+        self.compact_violations.cancel()
+        self.violation_log.close()
@@ -0,0 +1,120 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class VerdictCache:
+    """
+    Bounded LRU + TTL cache of moderation category scores, keyed by content hash.
+
+    Text is keyed by the hash of its normalized form and images by the hash of their
+    bytes, both namespaced by model so a model change never serves stale verdicts.
+    When ``path`` is given, verdicts are also kept in a small SQLite table so a restart
+    doesn't start cold; all SQLite work runs in a thread.
+    """
+
+    def __init__(self, model, ttl=7 * 86400, max_entries=5000, path=None):
+        self.model = model
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path
+        self._entries = OrderedDict()  # {key: (expires, scores)}
+        self._db = None
+        self._db_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def text_key(self, text):
+        return hashlib.sha256(f"{self.model}\0text\0{text}".encode()).hexdigest()
+
+    def image_key(self, data):
+        digest = hashlib.sha256(data).hexdigest()
+        return hashlib.sha256(f"{self.model}\0image\0{digest}".encode()).hexdigest()
+
+    def url_key(self, url):
+        # Discord CDN links carry rotating signature params, so only the path identifies the file
+        return hashlib.sha256(f"{self.model}\0url\0{url.split('?', 1)[0]}".encode()).hexdigest()
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self):
+        return len(self._entries)
+
+    async def get(self, key):
+        """Return cached scores for ``key`` or None, consulting the persistent tier on a memory miss."""
+        entry = self._entries.get(key)
+        now = time.time()
+        if entry is not None:
+            if entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+        if self.path is not None:
+            row = await asyncio.to_thread(self._db_get, key, now)
+            if row is not None:
+                expires, scores = row
+                self._remember(key, expires, scores)
+                self.hits += 1
+                return scores
+        self.misses += 1
+        return None
+
+    async def put(self, key, scores):
+        expires = time.time() + self.ttl
+        self._remember(key, expires, scores)
+        if self.path is not None:
+            await asyncio.to_thread(self._db_put, key, expires, scores)
+
+    def _remember(self, key, expires, scores):
+        self._entries[key] = (expires, scores)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        if self._db is not None:
+            with self._db_lock, self._db:
+                self._db.execute("DELETE FROM verdicts")
+
+    def close(self):
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _connect(self):
+        if self._db is None:
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+            with self._db:
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS verdicts (key TEXT PRIMARY KEY, expires REAL NOT NULL, scores TEXT NOT NULL)"
+                )
+                self._db.execute("DELETE FROM verdicts WHERE expires <= ?", (time.time(),))
+        return self._db
+
+    def _db_get(self, key, now):
+        with self._db_lock:
+            row = self._connect().execute("SELECT expires, scores FROM verdicts WHERE key = ?", (key,)).fetchone()
+        if row is None or row[0] <= now:
+            return None
+        return row[0], json.loads(row[1])
+
+    def _db_put(self, key, expires, scores):
+        with self._db_lock:
+            db = self._connect()
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO verdicts (key, expires, scores) VALUES (?, ?, ?)",
+                    (key, expires, json.dumps(scores)),
+                )
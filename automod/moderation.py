@@ -0,0 +1,187 @@
+import asyncio
+import time
+
+import aiohttp # type: ignore
+
+MODERATION_URL = "https://api.openai.com/v1/moderations"
+MODERATION_MODEL = "omni-moderation-latest"
+
+
+class ModerationError(Exception):
+    """Raised when the moderation endpoint could not score an input. ``code`` is the HTTP status or a short reason."""
+
+    def __init__(self, code):
+        super().__init__(f"Moderation request failed: {code}")
+        self.code = code
+
+
+class RequestPacer:
+    """
+    Spaces requests ``1 / rate`` seconds apart, letting up to ``burst`` go back to
+    back after a quiet spell. Each caller reserves the next free slot and sleeps
+    until it comes round, so no lock is held while waiting.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.interval = 1 / rate
+        self.burst = burst
+        self._next_slot = 0.0
+
+    async def wait(self):
+        now = time.monotonic()
+        slot = max(self._next_slot, now - self.interval * (self.burst - 1))
+        self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class ModerationClient:
+    """
+    Micro-batching client for the moderation endpoint.
+
+    Texts submitted within ``batch_window`` seconds of each other, from any message
+    in any guild, are sent together as one string-array request and the per-input
+    results are mapped back to each caller. The endpoint accepts only one image per
+    request, so images are sent individually but concurrently. Every request goes
+    through one pacer instead of fixed sleeps, and 429/5XX responses are retried
+    with backoff (honouring ``Retry-After``). If a batch is rejected with a 400, its
+    inputs are resent one by one so only the bad input fails.
+    """
+
+    def __init__(
+        self,
+        get_session,
+        rate: float = 5,
+        burst: int = 5,
+        max_batch: int = 32,
+        batch_window: float = 0.05,
+        max_attempts: int = 5,
+        base_delay: float = 2,
+        url: str = MODERATION_URL,
+        model: str = MODERATION_MODEL,
+    ):
+        self._get_session = get_session
+        self.pacer = RequestPacer(rate, burst)
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.url = url
+        self.model = model
+        self._pending = {}  # {api_key: [(text, future), ...]}
+        self._flush_tasks = {}  # {api_key: Task}
+        self._tasks = set()
+        self.requests = 0
+        self.inputs = 0
+
+    async def moderate_text(self, api_key, text):
+        """Return category scores for ``text``. Raises ModerationError on failure."""
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending.setdefault(api_key, [])
+        pending.append((text, future))
+        if len(pending) >= self.max_batch:
+            # Full batch, send it now; anything queued afterwards waits for the timer
+            self._pending[api_key] = []
+            self._spawn(self._send_batch(api_key, pending))
+        elif api_key not in self._flush_tasks:
+            self._flush_tasks[api_key] = self._spawn(self._flush_later(api_key))
+        return await future
+
+    async def moderate_image(self, api_key, image_url):
+        """Return category scores for one image. Raises ModerationError on failure."""
+        results = await self._request(api_key, [{"type": "image_url", "image_url": {"url": image_url}}])
+        return results[0]
+
+    async def moderate_message(self, api_key, text, image_urls):
+        """
+        Score a message's text and images concurrently.
+        Returns ``(text_scores, [image_scores, ...])``; an entry is a ModerationError if that input failed.
+        Empty text isn't sent and scores as ``{}``.
+        """
+        jobs = [self.moderate_text(api_key, text) if text else _empty_scores()]
+        jobs.extend(self.moderate_image(api_key, url) for url in image_urls)
+        results = await asyncio.gather(*jobs, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, ModerationError):
+                raise result
+        return results[0], results[1:]
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _flush_later(self, api_key):
+        await asyncio.sleep(self.batch_window)
+        self._flush_tasks.pop(api_key, None)
+        batch = self._pending.pop(api_key, [])
+        if batch:
+            await self._send_batch(api_key, batch)
+
+    async def _send_batch(self, api_key, batch):
+        try:
+            results = await self._request(api_key, [text for text, _ in batch])
+        except ModerationError as e:
+            if e.code == 400 and len(batch) > 1:
+                await asyncio.gather(*(self._send_batch(api_key, [item]) for item in batch))
+                return
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(ModerationError(e.code))
+            return
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), scores in zip(batch, results):
+            if not future.done():
+                future.set_result(scores)
+
+    async def _request(self, api_key, inputs):
+        """POST ``inputs`` and return one category-score dict per input, retrying on 429/5XX."""
+        attempt = 0
+        while True:
+            await self.pacer.wait()
+            retry_after = None
+            try:
+                session = self._get_session()
+                self.requests += 1
+                async with session.post(
+                    self.url,
+                    headers={
+                        "Content-Type": "application/json",
+                        "Authorization": f"Bearer {api_key}"
+                    },
+                    json={"model": self.model, "input": inputs},
+                ) as response:
+                    if response.status == 200:
+                        data = await response.json()
+                        results = data.get("results", [])
+                        if len(results) != len(inputs):
+                            raise ModerationError("bad_response")
+                        self.inputs += len(inputs)
+                        return [result.get("category_scores", {}) for result in results]
+                    if response.status != 429 and response.status < 500:
+                        # Bad input or bad key, sending it again won't help
+                        raise ModerationError(response.status)
+                    error = response.status
+                    retry_after = response.headers.get("Retry-After")
+            except ModerationError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = e
+            attempt += 1
+            if attempt >= self.max_attempts:
+                raise ModerationError(error if isinstance(error, int) else "max_retries")
+            try:
+                delay = float(retry_after) if retry_after else self.base_delay * attempt
+            except ValueError:
+                delay = self.base_delay * attempt
+            await asyncio.sleep(delay)
+
+
+async def _empty_scores():
+    return {}
@@ -0,0 +1,189 @@
+import asyncio
+import io
+import json
+import sqlite3
+import threading
+import time
+
+from PIL import Image # type: ignore
+
+# Attachments larger than this are never downloaded for hashing
+MAX_IMAGE_BYTES = 8 * 1024 * 1024
+# Refuse to decode anything bigger than this, whatever the file size claims
+MAX_IMAGE_PIXELS = 40_000_000
+
+# The 64-bit hash is split into this many bands. Two hashes within BANDS - 1 bits of
+# each other must agree exactly on at least one band, so lookups only compare
+# against entries sharing a band instead of scanning the whole index.
+BANDS = 5
+_BAND_BITS = (13, 13, 13, 13, 12)
+
+
+def dhash(data: bytes):
+    """
+    64-bit difference hash of an image: shrink to 9x8 greyscale and record whether
+    each pixel is brighter than its right neighbour. Survives re-encoding, resizing
+    and small edits. Returns None if the bytes can't be decoded. CPU-bound, so call
+    it in a thread.
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            if img.width * img.height > MAX_IMAGE_PIXELS:
+                return None
+            img.draft("L", (64, 64))  # let JPEG decode at reduced size
+            pixels = list(img.convert("L").resize((9, 8), Image.LANCZOS).getdata())
+    except Exception:
+        return None
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def _bands(value):
+    bands = []
+    shift = 64
+    for index, bits in enumerate(_BAND_BITS):
+        shift -= bits
+        bands.append((index, (value >> shift) & ((1 << bits) - 1)))
+    return bands
+
+
+def _to_signed(value):
+    # SQLite integers are signed 64-bit
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+class ImageHashIndex:
+    """
+    Bounded index of perceptual hashes of images that were already scored, with
+    their category scores.
+
+    :meth:`match` returns the scores of the closest stored image within
+    ``max_distance`` bits, so reposts that were re-encoded, resized or lightly edited
+    reuse the earlier verdict. Entries live in SQLite in the cog data path and are
+    loaded into memory on first use; the least recently matched are evicted once
+    ``max_entries`` is reached. Stored scores are dropped if ``model`` changes.
+    """
+
+    def __init__(self, model, path, max_entries=20000, max_distance=BANDS - 1):
+        if max_distance >= BANDS:
+            raise ValueError(f"max_distance must be below {BANDS}")
+        self.model = model
+        self.path = path
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self._entries = {}  # {hash: [scores, last_seen]}
+        self._bands = {}  # {(band, value): {hash, ...}}
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._loaded = False
+        self.matches = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    async def match(self, value):
+        """Return ``(scores, distance)`` for the nearest stored image within range, or None."""
+        await self._ensure_loaded()
+        best = None
+        candidates = set()
+        for band in _bands(value):
+            candidates.update(self._bands.get(band, ()))
+        for candidate in candidates:
+            distance = bin(candidate ^ value).count("1")
+            if distance <= self.max_distance and (best is None or distance < best[1]):
+                best = (candidate, distance)
+        if best is None:
+            self.misses += 1
+            return None
+        self.matches += 1
+        entry = self._entries[best[0]]
+        entry[1] = time.time()
+        return entry[0], best[1]
+
+    async def add(self, value, scores):
+        await self._ensure_loaded()
+        now = time.time()
+        self._remember(value, scores, now)
+        evicted = []
+        if len(self._entries) > self.max_entries:
+            # Evict in chunks so a full index doesn't sort on every insert
+            excess = len(self._entries) - self.max_entries + self.max_entries // 20
+            for old in sorted(self._entries, key=lambda h: self._entries[h][1])[:excess]:
+                self._forget(old)
+                evicted.append(old)
+        await asyncio.to_thread(self._db_put, value, scores, now, evicted)
+
+    def clear(self):
+        self._entries.clear()
+        self._bands.clear()
+        self.matches = 0
+        self.misses = 0
+        with self._db_lock:
+            db = self._connect()
+            with db:
+                db.execute("DELETE FROM image_hashes")
+
+    def close(self):
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, value, scores, seen):
+        if value not in self._entries:
+            for band in _bands(value):
+                self._bands.setdefault(band, set()).add(value)
+        self._entries[value] = [scores, seen]
+
+    def _forget(self, value):
+        del self._entries[value]
+        for band in _bands(value):
+            members = self._bands.get(band)
+            if members is not None:
+                members.discard(value)
+                if not members:
+                    del self._bands[band]
+
+    async def _ensure_loaded(self):
+        if not self._loaded:
+            self._loaded = True
+            for value, scores, seen in await asyncio.to_thread(self._db_load):
+                self._remember(value, scores, seen)
+
+    def _connect(self):
+        if self._db is None:
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+            with self._db:
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS image_hashes (hash INTEGER PRIMARY KEY, scores TEXT NOT NULL, seen REAL NOT NULL)"
+                )
+                self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+                row = self._db.execute("SELECT value FROM meta WHERE key = 'model'").fetchone()
+                if row is None or row[0] != self.model:
+                    self._db.execute("DELETE FROM image_hashes")
+                    self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('model', ?)", (self.model,))
+        return self._db
+
+    def _db_load(self):
+        with self._db_lock:
+            rows = self._connect().execute(
+                "SELECT hash, scores, seen FROM image_hashes ORDER BY seen DESC LIMIT ?", (self.max_entries,)
+            ).fetchall()
+        return [(value % (1 << 64), json.loads(scores), seen) for value, scores, seen in rows]
+
+    def _db_put(self, value, scores, seen, evicted):
+        with self._db_lock:
+            db = self._connect()
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO image_hashes (hash, scores, seen) VALUES (?, ?, ?)",
+                    (_to_signed(value), json.dumps(scores), seen),
+                )
+                if evicted:
+                    db.executemany("DELETE FROM image_hashes WHERE hash = ?", [(_to_signed(old),) for old in evicted])
@@ -0,0 +1,181 @@
+import asyncio
+import statistics
+import time
+from collections import deque
+from logging import getLogger
+
+log = getLogger("red.beehive.automod")
+
+POLICIES = ("drop", "degrade")
+
+
+class _Lane:
+    """Pending messages for one channel. Only one is processed at a time, so channel order is kept."""
+
+    __slots__ = ("items", "busy")
+
+    def __init__(self):
+        self.items = deque()
+        self.busy = False
+
+
+class _GuildQueue:
+    __slots__ = ("lanes", "ready", "depth")
+
+    def __init__(self):
+        self.lanes = {}  # {channel_id: _Lane}
+        self.ready = deque()  # channel ids with work and no message in flight
+        self.depth = 0
+
+
+class ModerationQueue:
+    """
+    Bounded, fair work queue in front of process_message.
+
+    - A fixed pool of workers caps how many messages are being moderated at once.
+    - Guilds are served round-robin, so one noisy guild can't starve the others.
+    - Within a channel, messages are processed strictly in arrival order.
+    - Backpressure: once the queue (or one guild's share of it) is full, new messages
+      are dropped. With the ``degrade`` policy, messages queued while the queue is
+      more than half full are processed text-only, skipping the per-image API calls.
+    """
+
+    def __init__(self, handler, workers=4, max_depth=1000, guild_max_depth=250, policy="drop"):
+        self.handler = handler  # async (message, degraded: bool)
+        self.max_depth = max_depth
+        self.guild_max_depth = guild_max_depth
+        self.policy = policy
+        self._queues = {}  # guild_id -> _GuildQueue
+        self._ready_guilds = deque()  # round-robin order of guilds with ready channels
+        self._ready = asyncio.Semaphore(0)  # one permit per ready channel entry
+        self._workers = set()
+        self._idle = set()
+        self._target = 0
+        self.depth = 0
+        self.in_flight = 0
+        self.peak_depth = 0
+        self.enqueued = 0
+        self.processed = 0
+        self.dropped = 0
+        self.degraded = 0
+        self.failed = 0
+        self.waits = deque(maxlen=1000)
+        self.resize(workers)
+
+    @property
+    def workers(self):
+        return self._target
+
+    def resize(self, workers):
+        """Grow or shrink the worker pool. Busy workers finish their message before exiting."""
+        self._target = max(1, int(workers))
+        while len(self._workers) < self._target:
+            self._workers.add(asyncio.create_task(self._worker()))
+        for task in list(self._idle):
+            if len(self._workers) <= self._target:
+                break
+            self._idle.discard(task)
+            self._workers.discard(task)
+            task.cancel()
+
+    def submit(self, message) -> bool:
+        """Queue a message. Returns False if it was dropped by backpressure."""
+        guild_id = message.guild.id
+        queue = self._queues.get(guild_id)
+        if queue is None:
+            queue = self._queues[guild_id] = _GuildQueue()
+        if self.depth >= self.max_depth or queue.depth >= self.guild_max_depth:
+            self.dropped += 1
+            return False
+
+        degraded = self.policy == "degrade" and self.depth >= self.max_depth // 2
+        channel_id = message.channel.id
+        lane = queue.lanes.get(channel_id)
+        if lane is None:
+            lane = queue.lanes[channel_id] = _Lane()
+        lane.items.append((message, time.monotonic(), degraded))
+        queue.depth += 1
+        self.depth += 1
+        self.enqueued += 1
+        self.peak_depth = max(self.peak_depth, self.depth)
+        if not lane.busy and len(lane.items) == 1:
+            self._mark_ready(guild_id, queue, channel_id)
+        return True
+
+    def _mark_ready(self, guild_id, queue, channel_id):
+        if not queue.ready:
+            self._ready_guilds.append(guild_id)
+        queue.ready.append(channel_id)
+        self._ready.release()
+
+    def _take(self):
+        """Pop the next message, rotating across guilds. Returns None if nothing is ready."""
+        while self._ready_guilds:
+            guild_id = self._ready_guilds.popleft()
+            queue = self._queues.get(guild_id)
+            if queue is None or not queue.ready:
+                continue
+            channel_id = queue.ready.popleft()
+            if queue.ready:
+                # Still has other channels ready, go to the back of the rotation
+                self._ready_guilds.append(guild_id)
+            lane = queue.lanes[channel_id]
+            message, queued_at, degraded = lane.items.popleft()
+            lane.busy = True
+            queue.depth -= 1
+            self.depth -= 1
+            return guild_id, queue, channel_id, lane, message, queued_at, degraded
+        return None
+
+    def _release(self, guild_id, queue, channel_id, lane):
+        lane.busy = False
+        if lane.items:
+            self._mark_ready(guild_id, queue, channel_id)
+        else:
+            del queue.lanes[channel_id]
+            if not queue.lanes:
+                self._queues.pop(guild_id, None)
+
+    async def _worker(self):
+        task = asyncio.current_task()
+        while len(self._workers) <= self._target:
+            self._idle.add(task)
+            try:
+                await self._ready.acquire()
+            finally:
+                self._idle.discard(task)
+            job = self._take()
+            if job is None:
+                continue
+            guild_id, queue, channel_id, lane, message, queued_at, degraded = job
+            self.waits.append(time.monotonic() - queued_at)
+            self.in_flight += 1
+            try:
+                if degraded:
+                    self.degraded += 1
+                await self.handler(message, degraded)
+                self.processed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.failed += 1
+                log.exception("Failed to moderate message %s", getattr(message, "id", None))
+            finally:
+                self.in_flight -= 1
+                self._release(guild_id, queue, channel_id, lane)
+        self._workers.discard(task)
+
+    def wait_percentile(self, pct):
+        """Queue wait time percentile over the last 1000 messages, in milliseconds."""
+        if len(self.waits) < 2:
+            return sum(self.waits) * 1000
+        return statistics.quantiles(self.waits, n=100, method="inclusive")[pct - 1] * 1000
+
+    def guild_depths(self):
+        return {guild_id: queue.depth for guild_id, queue in self._queues.items() if queue.depth}
+
+    def close(self):
+        for task in self._workers:
+            task.cancel()
+        self._workers.clear()
+        self._idle.clear()
@@ -0,0 +1,104 @@
+import asyncio
+from collections import Counter, defaultdict
+
+
+class StatsSink:
+    """
+    Write-behind buffer for AutoMod statistics.
+
+    Counters are accumulated in memory and written to Config by :meth:`flush`,
+    one read/write per touched value instead of one per message. Scalar counters
+    and keyed counters (``moderated_users``, ``category_counter``) live on the guild
+    or global scope; pass ``None`` as the guild id for global values. Per-user
+    message counts are stored in member scope, so a flush only touches the members
+    that actually posted.
+
+    Reads go through :meth:`value` and :meth:`mapping`, which apply pending deltas
+    to the stored values, so stats shown before a flush are still exact.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self._scalars = defaultdict(Counter)  # {guild_id | None: Counter({field: delta})}
+        self._keyed = defaultdict(lambda: defaultdict(Counter))  # {guild_id | None: {field: Counter({key: delta})}}
+        self._members = defaultdict(Counter)  # {guild_id: Counter({user_id: delta})}
+        self._lock = asyncio.Lock()
+
+    @property
+    def pending(self) -> int:
+        return (
+            sum(len(c) for c in self._scalars.values())
+            + sum(len(c) for fields in self._keyed.values() for c in fields.values())
+            + sum(len(c) for c in self._members.values())
+        )
+
+    def _group(self, guild_id):
+        return self.config if guild_id is None else self.config.guild_from_id(guild_id)
+
+    def add(self, guild_id, field, amount=1):
+        self._scalars[guild_id][field] += amount
+
+    def add_keyed(self, guild_id, field, key, amount=1):
+        self._keyed[guild_id][field][str(key)] += amount
+
+    def add_member_message(self, guild_id, user_id, amount=1):
+        self._members[guild_id][user_id] += amount
+
+    async def value(self, guild_id, field):
+        async with self._lock:
+            stored = await self._group(guild_id).get_attr(field)()
+            return stored + self._scalars.get(guild_id, {}).get(field, 0)
+
+    async def mapping(self, guild_id, field) -> dict:
+        async with self._lock:
+            stored = dict(await self._group(guild_id).get_attr(field)())
+            for key, amount in self._keyed.get(guild_id, {}).get(field, {}).items():
+                stored[key] = stored.get(key, 0) + amount
+            return stored
+
+    async def member_messages(self, guild_id, user_id) -> int:
+        async with self._lock:
+            stored = await self.config.member_from_ids(guild_id, user_id).message_count()
+            return stored + self._members.get(guild_id, {}).get(user_id, 0)
+
+    async def discard(self):
+        """Drop every pending delta, used when the stored statistics are reset."""
+        # Taking the lock waits out any flush that is already writing
+        async with self._lock:
+            self._scalars.clear()
+            self._keyed.clear()
+            self._members.clear()
+
+    async def flush(self):
+        """Write all pending deltas to Config. Deltas whose write fails are kept for the next flush."""
+        async with self._lock:
+            scalars, self._scalars = self._scalars, defaultdict(Counter)
+            keyed, self._keyed = self._keyed, defaultdict(lambda: defaultdict(Counter))
+            members, self._members = self._members, defaultdict(Counter)
+
+            for guild_id, counter in scalars.items():
+                group = self._group(guild_id)
+                for field, amount in counter.items():
+                    try:
+                        value = group.get_attr(field)
+                        await value.set(await value() + amount)
+                    except Exception:
+                        self._scalars[guild_id][field] += amount
+
+            for guild_id, fields in keyed.items():
+                group = self._group(guild_id)
+                for field, counter in fields.items():
+                    try:
+                        async with group.get_attr(field)() as stored:
+                            for key, amount in counter.items():
+                                stored[key] = stored.get(key, 0) + amount
+                    except Exception:
+                        self._keyed[guild_id][field].update(counter)
+
+            for guild_id, counter in members.items():
+                for user_id, amount in counter.items():
+                    try:
+                        value = self.config.member_from_ids(guild_id, user_id).message_count
+                        await value.set(await value() + amount)
+                    except Exception:
+                        self._members[guild_id][user_id] += amount
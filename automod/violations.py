@@ -0,0 +1,146 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+
+COLUMNS = ("message_id", "timestamp", "content", "categories", "channel_id", "channel_name", "author_id", "author_name", "attachments")
+
+
+class ViolationLog:
+    """
+    Append-only log of moderation violations, stored in SQLite in the cog data path.
+
+    Rows are indexed by ``(guild_id, user_id, timestamp)`` so a user's history is read
+    one page at a time, and by ``timestamp`` so :meth:`compact` can drop everything past
+    the retention window in one statement. Recording a violation is a single insert,
+    no matter how many users the guild has. All SQLite work runs in a thread.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._db = None
+        self._lock = threading.Lock()
+
+    async def append(self, guild_id, entry):
+        """Record one violation. ``entry`` uses the same keys as the old ``user_violations`` dicts."""
+        await asyncio.to_thread(self._insert, [(guild_id, entry)])
+
+    async def import_legacy(self, guild_id, user_violations):
+        """Move a guild's old Config ``user_violations`` blob into the log."""
+        rows = [
+            (guild_id, {**entry, "author_id": entry.get("author_id") or int(user_id)})
+            for user_id, entries in user_violations.items()
+            for entry in entries
+        ]
+        if rows:
+            await asyncio.to_thread(self._insert, rows)
+        return len(rows)
+
+    async def count(self, guild_id, user_id, since=None) -> int:
+        return await asyncio.to_thread(self._count, guild_id, user_id, since or 0)
+
+    async def page(self, guild_id, user_id, offset=0, limit=5):
+        """Return up to ``limit`` violations for a user, most recent first, skipping ``offset``."""
+        return await asyncio.to_thread(self._page, guild_id, user_id, offset, limit)
+
+    async def timestamps(self, guild_id, user_id, since):
+        """Timestamps of a user's violations at or after ``since``, for the trend heatmap."""
+        return await asyncio.to_thread(self._timestamps, guild_id, user_id, since)
+
+    async def compact(self, retention_days) -> int:
+        """Delete violations older than ``retention_days``. Returns the number of rows removed."""
+        return await asyncio.to_thread(self._compact, time.time() - retention_days * 86400)
+
+    async def clear(self):
+        await asyncio.to_thread(self._clear)
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _connect(self):
+        if self._db is None:
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            with self._db:
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS violations ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, guild_id INTEGER NOT NULL, user_id INTEGER NOT NULL, "
+                    "timestamp REAL NOT NULL, message_id INTEGER, channel_id INTEGER, channel_name TEXT, "
+                    "author_name TEXT, content TEXT, categories TEXT NOT NULL, attachments TEXT NOT NULL)"
+                )
+                self._db.execute(
+                    "CREATE INDEX IF NOT EXISTS violations_by_user ON violations (guild_id, user_id, timestamp)"
+                )
+                self._db.execute("CREATE INDEX IF NOT EXISTS violations_by_time ON violations (timestamp)")
+        return self._db
+
+    def _insert(self, rows):
+        with self._lock:
+            db = self._connect()
+            with db:
+                db.executemany(
+                    "INSERT INTO violations (guild_id, user_id, timestamp, message_id, channel_id, channel_name, "
+                    "author_name, content, categories, attachments) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            guild_id,
+                            entry.get("author_id"),
+                            entry.get("timestamp") or time.time(),
+                            entry.get("message_id"),
+                            entry.get("channel_id"),
+                            entry.get("channel_name", ""),
+                            entry.get("author_name", ""),
+                            entry.get("content", ""),
+                            json.dumps(entry.get("categories", {})),
+                            json.dumps(entry.get("attachments", [])),
+                        )
+                        for guild_id, entry in rows
+                    ],
+                )
+
+    def _count(self, guild_id, user_id, since):
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT COUNT(*) FROM violations WHERE guild_id = ? AND user_id = ? AND timestamp >= ?",
+                (guild_id, user_id, since),
+            ).fetchone()
+        return row[0]
+
+    def _page(self, guild_id, user_id, offset, limit):
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT message_id, timestamp, content, categories, channel_id, channel_name, user_id, author_name, attachments "
+                "FROM violations WHERE guild_id = ? AND user_id = ? ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?",
+                (guild_id, user_id, limit, offset),
+            ).fetchall()
+        violations = []
+        for row in rows:
+            violation = dict(zip(COLUMNS, row))
+            violation["categories"] = json.loads(violation["categories"])
+            violation["attachments"] = json.loads(violation["attachments"])
+            violations.append(violation)
+        return violations
+
+    def _timestamps(self, guild_id, user_id, since):
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT timestamp FROM violations WHERE guild_id = ? AND user_id = ? AND timestamp >= ?",
+                (guild_id, user_id, since),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def _compact(self, cutoff):
+        with self._lock:
+            db = self._connect()
+            with db:
+                return db.execute("DELETE FROM violations WHERE timestamp < ?", (cutoff,)).rowcount
+
+    def _clear(self):
+        with self._lock:
+            db = self._connect()
+            with db:
+                db.execute("DELETE FROM violations")
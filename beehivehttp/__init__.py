@@ -0,0 +1,9 @@
+from .beehivehttp import BeeHiveHTTP
+from .provider import HTTPSessionProvider, HostMetrics
+
+__all__ = ["BeeHiveHTTP", "HTTPSessionProvider", "HostMetrics"]
+
+
+async def setup(bot):
+    cog = BeeHiveHTTP(bot)
+    await bot.add_cog(cog)
@@ -0,0 +1,46 @@
+from redbot.core import commands # type: ignore
+from redbot.core.utils.chat_formatting import box, pagify # type: ignore
+
+from .provider import HTTPSessionProvider
+
+
+class BeeHiveHTTP(commands.Cog):
+    """Pooled HTTP session shared by the BeeHive cogs."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.provider = HTTPSessionProvider()
+
+    async def cog_unload(self):
+        await self.provider.close()
+
+    async def red_delete_data_for_user(self, **kwargs):
+        return
+
+    @commands.is_owner()
+    @commands.command(name="httpmetrics")
+    async def httpmetrics(self, ctx):
+        """Show request counts, retries, status codes and latency for each host the BeeHive cogs call."""
+        metrics = self.provider.metrics()
+        if not metrics:
+            await ctx.send("No requests have been made through the shared session yet.")
+            return
+        rows = [("Host", "Requests", "Errors", "Retries", "Avg ms", "p50 ms", "p95 ms", "Statuses")]
+        for host, stats in metrics.items():
+            statuses = ", ".join(f"{status}: {count}" for status, count in sorted(stats["statuses"].items()))
+            rows.append(
+                (
+                    host or "-",
+                    str(stats["requests"]),
+                    str(stats["errors"]),
+                    str(stats["retries"]),
+                    f"{stats['avg_ms']:.0f}",
+                    f"{stats['p50_ms']:.0f}",
+                    f"{stats['p95_ms']:.0f}",
+                    statuses or "-",
+                )
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        table = "\n".join("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in rows)
+        for page in pagify(table, page_length=1980):
+            await ctx.send(box(page))
@@ -0,0 +1,212 @@
+import asyncio
+import random
+import statistics
+import time
+from collections import deque
+from logging import getLogger
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import aiohttp # type: ignore
+
+log = getLogger("red.beehive.http")
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class HostMetrics:
+    """Request counters and recent latencies for one host."""
+
+    __slots__ = ("requests", "errors", "retries", "statuses", "latencies", "total_latency")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.statuses = {}  # {status: count}
+        self.latencies = deque(maxlen=500)  # seconds, most recent requests
+        self.total_latency = 0.0
+
+    def percentile(self, pct) -> float:
+        """Latency percentile over the recent window, in milliseconds."""
+        if len(self.latencies) < 2:
+            return sum(self.latencies) * 1000
+        return statistics.quantiles(self.latencies, n=100, method="inclusive")[pct - 1] * 1000
+
+    def as_dict(self) -> dict:
+        completed = self.requests - self.errors
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "statuses": dict(self.statuses),
+            "avg_ms": (self.total_latency / completed * 1000) if completed else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+        }
+
+
+class _RetryingRequest:
+    """``async with`` wrapper around a request that retries connection errors and retryable statuses."""
+
+    def __init__(self, provider, method, url, retries, backoff, kwargs):
+        self._provider = provider
+        self._method = method
+        self._url = url
+        self._retries = retries
+        self._backoff = backoff
+        self._kwargs = kwargs
+        self._response = None
+
+    def __await__(self):
+        return self._send().__await__()
+
+    async def __aenter__(self):
+        self._response = await self._send()
+        return self._response
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._response is not None:
+            self._response.release()
+
+    async def _send(self):
+        attempt = 0
+        while True:
+            try:
+                response = await self._provider.session.request(self._method, self._url, **self._kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= self._retries:
+                    raise
+                delay = self._backoff * 2 ** attempt
+            else:
+                if response.status not in RETRY_STATUSES or attempt >= self._retries:
+                    return response
+                delay = _retry_after(response) or self._backoff * 2 ** attempt
+                response.release()
+            attempt += 1
+            self._provider.host_metrics(urlsplit(str(self._url)).hostname or "").retries += 1
+            # Jitter so callers that failed together don't retry together
+            await asyncio.sleep(delay * random.uniform(0.8, 1.2))
+
+
+def _retry_after(response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return min(float(value), 60.0)
+    except ValueError:
+        return None
+
+
+class HTTPSessionProvider:
+    """
+    One aiohttp session shared by every BeeHive cog on a bot.
+
+    The beehivehttp cog owns the provider and closes it when it unloads. Other
+    cogs look the provider up through that cog each time they make a request, so
+    the order the cogs load in doesn't matter. The session is created on first use
+    and recreated transparently if something closed it, so callers should read
+    :attr:`session` at the point of use instead of holding on to it.
+
+    The connector pools keep-alive connections and caches DNS lookups, and every
+    request made through the session, including plain ``session.get`` calls, is
+    counted in the per-host metrics. There is no per-host cap by default, since one
+    cog's slow calls to a host would otherwise hold up every other cog using it.
+    The session keeps aiohttp's default timeout; pass ``timeout=`` per request for
+    anything tighter.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 30,
+        dns_cache_ttl: int = 300,
+        timeout: Optional[aiohttp.ClientTimeout] = None,
+        retries: int = 2,
+        backoff: float = 0.5,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._metrics: Dict[str, HostMetrics] = {}
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl,
+        )
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_request_end.append(self._on_request_end)
+        trace.on_request_exception.append(self._on_request_exception)
+        kwargs = {} if self.timeout is None else {"timeout": self.timeout}
+        return aiohttp.ClientSession(connector=connector, trace_configs=[trace], **kwargs)
+
+    async def close(self):
+        """Close the session. It is reopened if anything makes another request."""
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+    def request(self, method: str, url: str, *, retries: Optional[int] = None, backoff: Optional[float] = None, **kwargs):
+        """
+        Make a request through the shared session, retrying connection errors, timeouts
+        and 429/5XX responses with exponential backoff (``Retry-After`` is honoured).
+        Only idempotent methods are retried unless ``retries`` is given explicitly.
+        Use as ``async with provider.request(...) as resp`` or ``resp = await provider.request(...)``.
+        """
+        if retries is None:
+            retries = self.retries if method.upper() in IDEMPOTENT_METHODS else 0
+        return _RetryingRequest(self, method, url, retries, self.backoff if backoff is None else backoff, kwargs)
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def host_metrics(self, host: str) -> HostMetrics:
+        host = host.lower()
+        metrics = self._metrics.get(host)
+        if metrics is None:
+            metrics = self._metrics[host] = HostMetrics()
+        return metrics
+
+    def metrics(self) -> Dict[str, dict]:
+        """Per-host request counts, retries, status codes and latency percentiles."""
+        return {host: metrics.as_dict() for host, metrics in sorted(self._metrics.items())}
+
+    async def _on_request_start(self, session, ctx, params):
+        ctx.started = time.monotonic()
+
+    async def _on_request_end(self, session, ctx, params):
+        metrics = self.host_metrics(params.url.host or "")
+        elapsed = time.monotonic() - ctx.started
+        metrics.requests += 1
+        metrics.latencies.append(elapsed)
+        metrics.total_latency += elapsed
+        status = params.response.status
+        metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+    async def _on_request_exception(self, session, ctx, params):
+        metrics = self.host_metrics(params.url.host or "")
+        metrics.requests += 1
+        metrics.errors += 1
+        log.debug("Request to %s failed: %r", params.url.host, params.exception)
+
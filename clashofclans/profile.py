@@ -3,20 +3,18 @@ from collections import defaultdict
 from redbot.core import commands, Config, checks
 import math
 import datetime
-import aiohttp
 from io import BytesIO
 from PIL import Image
 import asyncio
 import colorsys
 
 # Move this helper to the class scope so it can be used in _build_log_embed
-async def get_brightest_color_from_url(url):
+async def get_brightest_color_from_url(http, url):
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                if resp.status != 200:
-                    return None
-                data = await resp.read()
+        async with http.get(url) as resp:
+            if resp.status != 200:
+                return None
+            data = await resp.read()
         with Image.open(BytesIO(data)) as img:
             img = img.convert("RGBA").resize((32, 32))
             pixels = list(img.getdata())
@@ -57,6 +55,14 @@ class ClashProfile(commands.Cog):
         self.config.register_guild(**default_guild)
         self._log_task = self.bot.loop.create_task(self._log_loop())
 
+    @property
+    def http(self):
+        # Pooled session shared by the BeeHive cogs, looked up per use so load order doesn't matter
+        cog = self.bot.get_cog("BeeHiveHTTP")
+        if cog is None:
+            raise RuntimeError("The beehivehttp cog must be loaded to make web requests.")
+        return cog.provider
+
     def cog_unload(self):
         if hasattr(self, "_log_task"):
             self._log_task.cancel()
@@ -73,12 +79,11 @@ class ClashProfile(commands.Cog):
             "Accept": "application/json"
         }
         payload = {"token": user_apikey}
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=payload) as resp:
-                if resp.status != 200:
-                    return False
-                data = await resp.json()
-                return data.get("status") == "ok"
+        async with self.http.post(url, headers=headers, json=payload) as resp:
+            if resp.status != 200:
+                return False
+            data = await resp.json()
+            return data.get("status") == "ok"
 
     async def fetch_player_data(self, tag: str, dev_api_key: str):
         tag = tag.replace("#", "").upper()
@@ -87,11 +92,10 @@ class ClashProfile(commands.Cog):
             "Authorization": f"Bearer {dev_api_key}",
             "Accept": "application/json"
         }
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as resp:
-                if resp.status != 200:
-                    return None
-                return await resp.json()
+        async with self.http.get(url, headers=headers) as resp:
+            if resp.status != 200:
+                return None
+            return await resp.json()
 
     async def fetch_clan_data(self, tag: str, dev_api_key: str):
         tag = tag.replace("#", "").upper()
@@ -100,11 +104,10 @@ class ClashProfile(commands.Cog):
             "Authorization": f"Bearer {dev_api_key}",
             "Accept": "application/json"
         }
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as resp:
-                if resp.status != 200:
-                    return None
-                return await resp.json()
+        async with self.http.get(url, headers=headers) as resp:
+            if resp.status != 200:
+                return None
+            return await resp.json()
 
     async def fetch_clan_warlog(self, tag: str, dev_api_key: str, limit: int = 10):
         tag = tag.replace("#", "").upper()
@@ -113,11 +116,10 @@ class ClashProfile(commands.Cog):
             "Authorization": f"Bearer {dev_api_key}",
             "Accept": "application/json"
         }
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as resp:
-                if resp.status != 200:
-                    return None
-                return await resp.json()
+        async with self.http.get(url, headers=headers) as resp:
+            if resp.status != 200:
+                return None
+            return await resp.json()
 
     async def fetch_clan_current_war(self, tag: str, dev_api_key: str):
         tag = tag.replace("#", "").upper()
@@ -126,11 +128,10 @@ class ClashProfile(commands.Cog):
             "Authorization": f"Bearer {dev_api_key}",
             "Accept": "application/json"
         }
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as resp:
-                if resp.status != 200:
-                    return None
-                return await resp.json()
+        async with self.http.get(url, headers=headers) as resp:
+            if resp.status != 200:
+                return None
+            return await resp.json()
 
     @commands.group(name="clash")
     async def clash(self, ctx):
@@ -828,24 +829,23 @@ class ClashProfile(commands.Cog):
         season_start = None
         season_end = None
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    "https://api.clashofclans.com/v1/goldpass/seasons/current",
-                    headers={
-                        "Authorization": f"Bearer {dev_api_key}",
-                        "Accept": "application/json"
-                    }
-                ) as resp:
-                    if resp.status == 200:
-                        season_data = await resp.json()
-                        # Example: "20250601T080100.000Z"
-                        def parse_coc_time(ts):
-                            # Remove milliseconds if present
-                            ts = ts.split(".")[0]
-                            # Format: YYYYMMDDT HHMMSS Z
-                            return datetime.datetime.strptime(ts, "%Y%m%dT%H%M%S").replace(tzinfo=datetime.timezone.utc)
-                        season_start = parse_coc_time(season_data.get("startTime"))
-                        season_end = parse_coc_time(season_data.get("endTime"))
+            async with self.http.get(
+                "https://api.clashofclans.com/v1/goldpass/seasons/current",
+                headers={
+                    "Authorization": f"Bearer {dev_api_key}",
+                    "Accept": "application/json"
+                }
+            ) as resp:
+                if resp.status == 200:
+                    season_data = await resp.json()
+                    # Example: "20250601T080100.000Z"
+                    def parse_coc_time(ts):
+                        # Remove milliseconds if present
+                        ts = ts.split(".")[0]
+                        # Format: YYYYMMDDT HHMMSS Z
+                        return datetime.datetime.strptime(ts, "%Y%m%dT%H%M%S").replace(tzinfo=datetime.timezone.utc)
+                    season_start = parse_coc_time(season_data.get("startTime"))
+                    season_end = parse_coc_time(season_data.get("endTime"))
         except Exception:
             season_start = None
             season_end = None
@@ -859,7 +859,7 @@ class ClashProfile(commands.Cog):
             league = player["league"]
             league_icon = league.get("iconUrls", {}).get("medium")
             if league_icon:
-                color = await get_brightest_color_from_url(league_icon)
+                color = await get_brightest_color_from_url(self.http, league_icon)
                 if color:
                     embed_color = color
 
@@ -1891,7 +1891,7 @@ class ClashProfile(commands.Cog):
                 author_icon_url = clan_icon
 
         if author_icon_url:
-            color_from_img = await get_brightest_color_from_url(author_icon_url)
+            color_from_img = await get_brightest_color_from_url(self.http, author_icon_url)
             if color_from_img:
                 color = color_from_img
 
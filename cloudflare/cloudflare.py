@@ -5,7 +5,6 @@ import tempfile
 from datetime import datetime
 from PIL import Image #type: ignore
 from redbot.core import commands, Config #type: ignore
-import aiohttp #type: ignore
 import ipaddress
 import json
 import re
@@ -29,7 +28,14 @@ class Cloudflare(commands.Cog):
         }
         self.config.register_global(**default_global)
         self.config.register_guild(**default_guild)
-        self.session = aiohttp.ClientSession()
+
+    @property
+    def http(self):
+        # Pooled session shared by the BeeHive cogs, looked up per use so load order doesn't matter
+        cog = self.bot.get_cog("BeeHiveHTTP")
+        if cog is None:
+            raise RuntimeError("The beehivehttp cog must be loaded to make web requests.")
+        return cog.provider
 
     @commands.group()
     async def urlscanner(self, ctx):
@@ -79,7 +85,7 @@ class Cloudflare(commands.Cog):
         params = {"query": query}
 
         try:
-            async with self.session.get(url, headers=headers, params=params) as response:
+            async with self.http.get(url, headers=headers, params=params) as response:
                 data = await response.json()
                 if not data.get("success", False):
                     error_message = data.get("errors", [{"message": "Unknown error"}])[0].get("message")
@@ -202,7 +208,7 @@ class Cloudflare(commands.Cog):
         api_url = f"https://api.cloudflare.com/client/v4/accounts/{account_id}/urlscanner/scan"
 
         try:
-            async with self.session.post(api_url, headers=headers, json=payload) as response:
+            async with self.http.post(api_url, headers=headers, json=payload) as response:
                 data = await response.json()
                 if not data.get("success", False):
                     error_message = data.get("errors", [{"message": "Unknown error"}])[0].get("message")
@@ -261,7 +267,7 @@ class Cloudflare(commands.Cog):
         api_url = f"https://api.cloudflare.com/client/v4/accounts/{account_id}/urlscanner/scan/{scan_id}"
 
         try:
-            async with self.session.get(api_url, headers=headers) as response:
+            async with self.http.get(api_url, headers=headers) as response:
                 data = await response.json()
                 if not data.get("success", False):
                     error_message = data.get("errors", [{"message": "Unknown error"}])[0].get("message")
@@ -342,7 +348,7 @@ class Cloudflare(commands.Cog):
         api_url = f"https://api.cloudflare.com/client/v4/accounts/{account_id}/urlscanner/scan/{scan_id}/har"
 
         try:
-            async with self.session.get(api_url, headers=headers) as response:
+            async with self.http.get(api_url, headers=headers) as response:
                 data = await response.json()
                 if not data.get("success", False):
                     error_message = data.get("errors", [{"message": "Unknown error"}])[0].get("message")
@@ -399,7 +405,7 @@ class Cloudflare(commands.Cog):
         screenshot_url = f"https://api.cloudflare.com/client/v4/accounts/{account_id}/urlscanner/scan/{scan_id}/screenshot"
 
         try:
-            async with self.session.get(screenshot_url, headers=headers) as screenshot_response:
+            async with self.http.get(screenshot_url, headers=headers) as screenshot_response:
                 if screenshot_response.content_type == "image/png":
                     screenshot_data = await screenshot_response.read()
                     screenshot_file = discord.File(io.BytesIO(screenshot_data), filename=f"{scan_id}_screenshot.png")
@@ -461,7 +467,7 @@ class Cloudflare(commands.Cog):
         payload = {"url": url}
 
         try:
-            async with self.session.post(submit_url, headers=headers, json=payload) as response:
+            async with self.http.post(submit_url, headers=headers, json=payload) as response:
                 if response.status == 409:
                     embed = discord.Embed(title="Domain on cooldown", description="The domain was too recently scanned. Please try again in a few minutes.", color=0xff4545)
                     await ctx.send(embed=embed)
@@ -496,7 +502,7 @@ class Cloudflare(commands.Cog):
         while True:
             await asyncio.sleep(15)
             try:
-                async with self.session.get(status_url, headers=headers) as response:
+                async with self.http.get(status_url, headers=headers) as response:
                     if response.status == 202:
                         await ctx.typing()
                         continue
@@ -616,7 +622,7 @@ class Cloudflare(commands.Cog):
             api_url = f"https://api.cloudflare.com/client/v4/accounts/{account_id}/urlscanner/scan"
 
             try:
-                async with self.session.post(api_url, headers=headers, json=payload) as response:
+                async with self.http.post(api_url, headers=headers, json=payload) as response:
                     data = await response.json()
                     if not data.get("success", False):
                         continue
@@ -628,7 +634,7 @@ class Cloudflare(commands.Cog):
                     await asyncio.sleep(120)
 
                     scan_result_url = f"https://api.cloudflare.com/client/v4/accounts/{account_id}/urlscanner/scan/{scan_id}"
-                    async with self.session.get(scan_result_url, headers=headers) as scan_response:
+                    async with self.http.get(scan_result_url, headers=headers) as scan_response:
                         scan_data = await scan_response.json()
                         if not scan_data.get("success", False):
                             continue
@@ -725,7 +731,7 @@ class Cloudflare(commands.Cog):
             "Content-Type": "application/json"
         }
 
-        async with self.session.get(f"https://api.cloudflare.com/client/v4/accounts/{account_id}/intel/whois?domain={domain}", headers=headers) as response:
+        async with self.http.get(f"https://api.cloudflare.com/client/v4/accounts/{account_id}/intel/whois?domain={domain}", headers=headers) as response:
             if response.status != 200:
                 embed = discord.Embed(
                     title="Error",
@@ -1083,7 +1089,7 @@ class Cloudflare(commands.Cog):
 
         # Fetch the blocklist from the web
         blocklist_url = "https://www.beehive.systems/hubfs/blocklist/blocklist.json"
-        async with self.session.get(blocklist_url) as blocklist_response:
+        async with self.http.get(blocklist_url) as blocklist_response:
             if blocklist_response.status == 200:
                 blocklist = await blocklist_response.json()
             else:
@@ -1109,7 +1115,7 @@ class Cloudflare(commands.Cog):
             "domain": domain
         }
 
-        async with self.session.get(url, headers=headers, params=params) as response:
+        async with self.http.get(url, headers=headers, params=params) as response:
             data = await response.json()
             if response.status == 200 and data.get("success", False):
                 result = data.get("result", {})
@@ -1242,7 +1248,7 @@ class Cloudflare(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        async with self.session.get(url, headers=headers, params=params) as response:
+        async with self.http.get(url, headers=headers, params=params) as response:
             data = await response.json()
             if response.status == 200 and data.get("success", False):
                 result = data.get("result", [{}])[0]
@@ -1330,7 +1336,7 @@ class Cloudflare(commands.Cog):
         }
         params = {"domain": domain}
 
-        async with self.session.get(url, headers=headers, params=params) as response:
+        async with self.http.get(url, headers=headers, params=params) as response:
             if response.status == 200:
                 data = await response.json()
                 if data["success"] and data["result"]:
@@ -1424,7 +1430,7 @@ class Cloudflare(commands.Cog):
             "Content-Type": "application/json",
         }
 
-        async with self.session.get(url, headers=headers) as response:
+        async with self.http.get(url, headers=headers) as response:
             if response.status == 200:
                 data = await response.json()
                 if data["success"]:
@@ -1480,7 +1486,7 @@ class Cloudflare(commands.Cog):
             "Content-Type": "application/json",
         }
 
-        async with self.session.get(url, headers=headers) as response:
+        async with self.http.get(url, headers=headers) as response:
             if response.status == 200:
                 data = await response.json()
                 if data["success"]:
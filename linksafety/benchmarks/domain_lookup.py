@@ -0,0 +1,68 @@
+"""
+Blocklist lookup throughput.
+
+Builds a synthetic blocklist and checks a batch of message hosts against it, once
+as the plain list LinkSafety kept before :class:`DomainIndex` and once through the
+index. The index also matches subdomains of listed domains, which the list never
+did; the generated hosts are either exact entries or unlisted, so both must find
+the same hits.
+
+Usage::
+
+    python -m linksafety.benchmarks.domain_lookup [--domains 30000] [--hosts 1000] [--hit-rate 0.1]
+"""
+
+import argparse
+import random
+import string
+import timeit
+
+from ..domains import DomainIndex
+
+TLDS = ("com", "net", "xyz", "ru", "gift")
+
+
+def make_data(domains: int, hosts: int, hit_rate: float, seed: int = 0):
+    rng = random.Random(seed)
+
+    def label(length):
+        return "".join(rng.choice(string.ascii_lowercase) for _ in range(length))
+
+    listed = list({f"{label(8)}-{label(5)}.{rng.choice(TLDS)}" for _ in range(domains)})
+    hits = int(hosts * hit_rate)
+    checked = [f"www.{label(10)}.com" for _ in range(hosts - hits)]
+    checked += [rng.choice(listed) for _ in range(hits)]
+    rng.shuffle(checked)
+    return listed, checked
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare blocklist lookups in a list and in DomainIndex.")
+    parser.add_argument("--domains", type=int, default=30000)
+    parser.add_argument("--hosts", type=int, default=1000)
+    parser.add_argument("--hit-rate", type=float, default=0.1)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    listed, checked = make_data(args.domains, args.hosts, args.hit_rate)
+    index = DomainIndex(listed)
+    list_hits = sum(host in listed for host in checked)
+    index_hits = sum(host in index for host in checked)
+    assert list_hits == index_hits
+    assert f"login.{listed[0]}" in index
+
+    lookups = len(checked) * args.rounds
+    list_time = timeit.timeit(lambda: [host in listed for host in checked], number=args.rounds)
+    # The index is much faster, so give it enough rounds to measure
+    index_rounds = args.rounds * 100
+    index_time = timeit.timeit(lambda: [host in index for host in checked], number=index_rounds) / 100
+
+    print(f"{len(listed):,} listed domains, {len(checked):,} hosts, {list_hits} hits")
+    print(f"{'lookup':<14}{'lookups/s':>14}")
+    print(f"{'list':<14}{lookups / list_time:>14,.0f}")
+    print(f"{'DomainIndex':<14}{lookups / index_time:>14,.0f}")
+    print(f"speedup {list_time / index_time:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import asyncio
+from collections import Counter
+from logging import getLogger
+from typing import Dict, Tuple
+
+log = getLogger("red.beehive.linksafety")
+
+
+class CounterBuffer:
+    """
+    Write-behind aggregator for Config statistic counters.
+
+    Increments are collected in memory and written with one read/write per counter
+    on :meth:`flush`, instead of a read-modify-write round trip per detection.
+    Flushes are serialized by a lock, so concurrent detections can't lose updates.
+    Reads go through :meth:`guild_totals`, which adds pending increments to the
+    stored values so the numbers shown are always exact.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self._guilds: Dict[int, Counter] = {}
+        self._members: Dict[Tuple[int, int], Counter] = {}
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(c) for c in self._guilds.values()) + sum(len(c) for c in self._members.values())
+
+    def add_guild(self, guild_id: int, field: str, amount: int = 1):
+        counter = self._guilds.get(guild_id)
+        if counter is None:
+            counter = self._guilds[guild_id] = Counter()
+        counter[field] += amount
+
+    def add_member(self, guild_id: int, member_id: int, field: str, amount: int = 1):
+        key = (guild_id, member_id)
+        counter = self._members.get(key)
+        if counter is None:
+            counter = self._members[key] = Counter()
+        counter[field] += amount
+
+    async def guild_totals(self, guild_id: int) -> dict:
+        """Stored guild settings with pending increments applied."""
+        async with self._lock:
+            data = await self.config.guild_from_id(guild_id).all()
+            for field, amount in self._guilds.get(guild_id, {}).items():
+                data[field] = data.get(field, 0) + amount
+        return data
+
+    async def flush(self):
+        """Write every pending increment to Config. Failed writes are kept for the next flush."""
+        async with self._lock:
+            guilds, self._guilds = self._guilds, {}
+            members, self._members = self._members, {}
+            for guild_id, counter in guilds.items():
+                group = self.config.guild_from_id(guild_id)
+                await self._write(group, counter, lambda f, a, g=guild_id: self.add_guild(g, f, a))
+            for (guild_id, member_id), counter in members.items():
+                group = self.config.member_from_ids(guild_id, member_id)
+                await self._write(group, counter, lambda f, a, k=(guild_id, member_id): self.add_member(*k, f, a))
+
+    @staticmethod
+    async def _write(group, counter: Counter, requeue):
+        for field, amount in counter.items():
+            value = getattr(group, field)
+            try:
+                await value.set(await value() + amount)
+            except Exception:
+                log.exception("Error saving %s counter, keeping it for the next flush", field)
+                requeue(field, amount)
@@ -0,0 +1,224 @@
+import codecs
+import json
+from typing import Iterable, List, Optional
+from urllib.parse import urlsplit
+
+# High-traffic hosts that are safe to skip redirect resolution for. Hosts with open
+# redirectors (google.com/url, steamcommunity.com/linkfilter and the like) are deliberately
+# left out, and so are hosts serving arbitrary user uploads (GitHub releases and raw files,
+# Discord's attachment CDN, imgur, reddit); guilds that trust those can allowlist them.
+DEFAULT_SAFE_DOMAINS = (
+    "discord.com",
+    "discord.gg",
+    "discord.media",
+    "tenor.com",
+    "giphy.com",
+    "wikipedia.org",
+    "twitch.tv",
+    "spotify.com",
+    "x.com",
+    "twitter.com",
+    "fxtwitter.com",
+    "steampowered.com",
+)
+
+# Open redirect paths on hosts guilds commonly allowlist. Links on these paths are always
+# resolved, even when the host itself is allowlisted.
+REDIRECTOR_PATHS = {
+    "steamcommunity.com": ("/linkfilter",),
+    "google.com": ("/url",),
+    "youtube.com": ("/redirect",),
+    "facebook.com": ("/l.php",),
+    "reddit.com": ("/out",),
+}
+
+# Link shorteners always go through redirect resolution, even if a guild allowlists them
+URL_SHORTENERS = frozenset((
+    "bit.ly",
+    "t.co",
+    "tinyurl.com",
+    "goo.gl",
+    "ow.ly",
+    "is.gd",
+    "buff.ly",
+    "cutt.ly",
+    "rebrand.ly",
+    "shorturl.at",
+    "rb.gy",
+    "t.ly",
+    "tiny.cc",
+    "s.id",
+    "v.gd",
+    "lnkd.in",
+    "bl.ink",
+    "short.io",
+    "urlz.fr",
+    "qrco.de",
+))
+
+
+def normalize_host(host: str) -> str:
+    """
+    Normalize a hostname or netloc for blocklist lookups.
+
+    Strips userinfo, port and trailing dots, lowercases, and converts IDN labels to
+    punycode so ``exämple.com`` and ``xn--exmple-cua.com`` compare equal.
+    """
+    host = host.strip()
+    if "@" in host:
+        host = host.rsplit("@", 1)[1]
+    if host.startswith("["):
+        # IPv6 literal, keep as-is without the port
+        return host.split("]", 1)[0].lstrip("[").lower()
+    if ":" in host:
+        host = host.split(":", 1)[0]
+    host = host.rstrip(".").lower()
+    if not host.isascii():
+        try:
+            host = host.encode("idna").decode("ascii")
+        except UnicodeError:
+            pass
+    return host
+
+
+def link_host(url: str) -> str:
+    """Normalized host of a link as written in a message, with or without a scheme."""
+    if "://" not in url:
+        url = "http://" + url
+    try:
+        netloc = urlsplit(url).netloc
+    except ValueError:
+        return ""
+    return normalize_host(netloc)
+
+
+def is_redirector(url: str) -> bool:
+    """Whether a link points at a known open redirect path on its host."""
+    if "://" not in url:
+        url = "http://" + url
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return False
+    host = normalize_host(parts.netloc)
+    path = parts.path.lower()
+    while "." in host:
+        for prefix in REDIRECTOR_PATHS.get(host, ()):
+            if path == prefix or path.startswith(prefix + "/"):
+                return True
+        host = host.partition(".")[2]
+    return False
+
+
+class DomainIndex:
+    """
+    Immutable hash index over blocklisted domains.
+
+    ``lookup`` walks the host's parent domains (``a.b.evil.com`` -> ``b.evil.com`` ->
+    ``evil.com``), so a listed domain also matches all of its subdomains in O(label count)
+    set probes. Bare TLDs are never tested. Refreshes build a new index and swap it in
+    with a single assignment, so readers never see a half-built set.
+    """
+
+    __slots__ = ("_domains",)
+
+    def __init__(self, domains: Iterable[str] = ()):
+        normalized = set()
+        for domain in domains:
+            if isinstance(domain, str):
+                domain = normalize_host(domain)
+                if domain:
+                    normalized.add(domain)
+        self._domains = frozenset(normalized)
+
+    def __len__(self) -> int:
+        return len(self._domains)
+
+    def __contains__(self, host) -> bool:
+        return isinstance(host, str) and self.lookup(host) is not None
+
+    def __iter__(self):
+        return iter(self._domains)
+
+    def lookup(self, host: str) -> Optional[str]:
+        """Return the listed domain matching ``host`` or one of its parents, else None."""
+        host = normalize_host(host)
+        domains = self._domains
+        if host in domains:
+            return host
+        dot = host.find(".")
+        while dot != -1:
+            host = host[dot + 1:]
+            dot = host.find(".")
+            if dot == -1:
+                # Only the TLD is left
+                break
+            if host in domains:
+                return host
+        return None
+
+
+class JSONArrayStream:
+    """
+    Incremental parser for a top-level JSON array, fed raw response chunks.
+
+    Items are decoded as soon as they are complete, so a multi-megabyte blocklist is
+    never held as one big string next to its parsed copy.
+    """
+
+    _WHITESPACE = " \t\r\n"
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._started = False
+        self._done = False
+        self.items: List = []
+
+    def feed(self, data: bytes):
+        self._buffer += self._decoder.decode(data)
+        self._parse()
+
+    def close(self) -> List:
+        self._buffer += self._decoder.decode(b"", final=True)
+        self._parse(final=True)
+        if not self._done:
+            raise ValueError("truncated JSON array")
+        return self.items
+
+    def _parse(self, final: bool = False):
+        buf = self._buffer
+        end = len(buf)
+        pos = 0
+        whitespace = self._WHITESPACE
+        while not self._done:
+            while pos < end and buf[pos] in whitespace:
+                pos += 1
+            if pos >= end:
+                break
+            char = buf[pos]
+            if not self._started:
+                if char != "[":
+                    raise ValueError("expected a JSON array")
+                self._started = True
+                pos += 1
+            elif char == ",":
+                pos += 1
+            elif char == "]":
+                self._done = True
+                pos += 1
+            else:
+                try:
+                    item, item_end = self._json.raw_decode(buf, pos)
+                except ValueError:
+                    if final:
+                        raise
+                    # Incomplete item, wait for the next chunk
+                    break
+                if item_end >= end and not final and not isinstance(item, (str, list, dict)):
+                    # A bare number or literal at the end of the buffer may continue in the next chunk
+                    break
+                self.items.append(item)
+                pos = item_end
+        self._buffer = buf[pos:]
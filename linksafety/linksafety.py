@@ -1,7 +1,11 @@
+import asyncio
 import contextlib
 import datetime
+import json
+import os
 import re
-from typing import List, Optional
+import time
+from typing import Dict, List, Optional
 from urllib.parse import urlparse
 import aiohttp  # type: ignore
 import discord  # type: ignore
@@ -9,6 +13,21 @@ from discord.ext import tasks  # type: ignore
 from redbot.core import Config, commands, modlog  # type: ignore
 from redbot.core.bot import Red  # type: ignore
 from redbot.core.commands import Context  # type: ignore
+from redbot.core.data_manager import cog_data_path  # type: ignore
+
+from .counters import CounterBuffer
+from .domains import DEFAULT_SAFE_DOMAINS, URL_SHORTENERS, DomainIndex, JSONArrayStream, is_redirector, link_host
+from .resolver import RedirectResolver
+
+
+BLOCKLIST_SOURCES = {
+    "sinking_yachts": "https://phish.sinking.yachts/v2/all",
+    "beehive": "https://www.beehive.systems/hubfs/blocklist/blocklist.json",
+}
+
+# Overall time budget for resolving every link in one message
+REDIRECT_DEADLINE = 8
+REDIRECT_TIMEOUT = aiohttp.ClientTimeout(total=REDIRECT_DEADLINE)
 
 URL_REGEX_PATTERN = re.compile(
     r"(?i)\b((?:https?://|www\d{0,3}[.]|[a-z0-9.\-]+[.][a-z]{2,4}/)(?:[^\s()<>]+|\(([^\s()<>]+|(\([^\s()<>]+\)))*\))+(?:\(([^\s()<>]+|(\([^\s()<>]+\)))*\)|[^\s`!()\[\]{};:'\".,<>?«»“”‘’]))"
@@ -38,14 +57,96 @@ class LinkSafety(commands.Cog):
             vendor_server_id=None,
             log_channel=None,
             timeout_duration=30,  # Default timeout duration in minutes
+            allowlist=[],  # Extra safe domains on top of DEFAULT_SAFE_DOMAINS
         )
         self.config.register_member(caught=0)
-        self.session = aiohttp.ClientSession()
-        self.bot.loop.create_task(self.get_phishing_domains())
-        self.domains = []
+        # Detection counters are buffered and written to Config by flush_counters
+        self.counters = CounterBuffer(self.config)
+
+        # Per-source validators and domains, persisted so the cog is protected before the first fetch
+        self.blocklist_path = cog_data_path(self) / "blocklist"
+        self.sources: Dict[str, dict] = {
+            name: {"etag": None, "last_modified": None, "domains": []} for name in BLOCKLIST_SOURCES
+        }
+        self.refresh_stats = {
+            "bytes": 0,
+            "parse_seconds": 0.0,
+            "not_modified": 0,
+            "last_success": None,
+            "last_error": None,
+        }
+        # Swapped wholesale on every refresh; supports `host in self.domains` with subdomain matching
+        self.domains = DomainIndex()
+        self.load_blocklist_snapshot()
+        self.resolver = RedirectResolver(self._fetch_redirect_chain)
+        # Per-guild allowlists (defaults plus the guild's own entries), built on first use
+        self.allowlists: Dict[int, DomainIndex] = {}
+        # How each link was settled: tier 1 is local-only, tier 2 needed redirect resolution
+        self.screen_stats = {
+            "blocked_local": 0,
+            "allowed_local": 0,
+            "resolved": 0,
+        }
+        self.get_phishing_domains.start()
+        self.flush_counters.start()
+
+    @property
+    def http(self):
+        # Pooled session shared by the BeeHive cogs, looked up per use so load order doesn't matter
+        cog = self.bot.get_cog("BeeHiveHTTP")
+        if cog is None:
+            raise RuntimeError("The beehivehttp cog must be loaded to make web requests.")
+        return cog.provider
 
     def cog_unload(self):
-        self.bot.loop.create_task(self.session.close())
+        self.get_phishing_domains.cancel()
+        self.flush_counters.cancel()
+        self.bot.loop.create_task(self.counters.flush())
+
+    def load_blocklist_snapshot(self) -> None:
+        """
+        Load the last persisted blocklist from the cog data path.
+        Domains are stored one per line, which loads in a few milliseconds even for large lists.
+        """
+        try:
+            with open(self.blocklist_path / "state.json", encoding="utf-8") as fp:
+                state = json.load(fp)
+        except (OSError, ValueError):
+            return
+        for name, source in self.sources.items():
+            saved = state.get("sources", {}).get(name)
+            if not saved:
+                continue
+            try:
+                with open(self.blocklist_path / f"{name}.txt", encoding="utf-8") as fp:
+                    source["domains"] = fp.read().split()
+            except OSError:
+                continue
+            source["etag"] = saved.get("etag")
+            source["last_modified"] = saved.get("last_modified")
+        self.refresh_stats["last_success"] = state.get("last_success")
+        self.domains = DomainIndex(d for source in self.sources.values() for d in source["domains"])
+
+    def _write_blocklist_snapshot(self, changed: List[str]) -> None:
+        self.blocklist_path.mkdir(parents=True, exist_ok=True)
+        for name in changed:
+            path = self.blocklist_path / f"{name}.txt"
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as fp:
+                fp.write("\n".join(self.sources[name]["domains"]))
+            os.replace(tmp, path)
+        state = {
+            "last_success": self.refresh_stats["last_success"],
+            "sources": {
+                name: {"etag": source["etag"], "last_modified": source["last_modified"]}
+                for name, source in self.sources.items()
+            },
+        }
+        path = self.blocklist_path / "state.json"
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as fp:
+            json.dump(state, fp)
+        os.replace(tmp, path)
 
     async def red_delete_data_for_user(self, **kwargs):
         return
@@ -212,12 +313,13 @@ class LinkSafety(commands.Cog):
 
         [View command documentation](<https://sentri.beehive.systems/features/link-scanning#linksafety-stats>)
         """
-        caught = await self.config.guild(ctx.guild).caught()
-        notifications = await self.config.guild(ctx.guild).notifications()
-        deletions = await self.config.guild(ctx.guild).deletions()
-        kicks = await self.config.guild(ctx.guild).kicks()
-        bans = await self.config.guild(ctx.guild).bans()
-        timeouts = await self.config.guild(ctx.guild).timeouts()  # Added timeout statistic retrieval
+        totals = await self.counters.guild_totals(ctx.guild.id)
+        caught = totals["caught"]
+        notifications = totals["notifications"]
+        deletions = totals["deletions"]
+        kicks = totals["kicks"]
+        bans = totals["bans"]
+        timeouts = totals["timeouts"]
         last_updated = self.__last_updated__
         patch_notes = self.__quick_notes__
         total_domains = len(self.domains)
@@ -271,6 +373,41 @@ class LinkSafety(commands.Cog):
             value=f"There are **{total_domains:,}** domains on the [BeeHive](https://www.beehive.systems) blocklist",
             inline=False
         )
+        refresh = self.refresh_stats
+        last_success = f"<t:{refresh['last_success']}:R>" if refresh["last_success"] else "Never"
+        embed.add_field(
+            name="Blocklist refresh",
+            value=(
+                f"Last success: {last_success}\n"
+                f"Transferred: **{refresh['bytes'] / 1024:,.0f} KB** since load "
+                f"({refresh['not_modified']:,} unchanged checks)\n"
+                f"Last parse: **{refresh['parse_seconds'] * 1000:,.0f} ms**"
+            ),
+            inline=False
+        )
+        screen = self.screen_stats
+        screened = screen["blocked_local"] + screen["allowed_local"] + screen["resolved"]
+        local_share = (screened - screen["resolved"]) / screened * 100 if screened else 0
+        embed.add_field(
+            name="Link pre-screen",
+            value=(
+                f"**{screen['blocked_local']:,}** blocked and **{screen['allowed_local']:,}** allowed "
+                f"without a network request\n"
+                f"**{screen['resolved']:,}** sent to redirect resolution "
+                f"({local_share:.0f}% settled locally)"
+            ),
+            inline=False
+        )
+        resolver = self.resolver
+        embed.add_field(
+            name="Redirect cache",
+            value=(
+                f"**{len(resolver):,}** cached chains\n"
+                f"**{resolver.hits:,}** hits, **{resolver.misses:,}** lookups, "
+                f"**{resolver.coalesced:,}** shared in-flight"
+            ),
+            inline=False
+        )
         embed.add_field(name="About this cog", value="", inline=False)
         embed.add_field(
             name="Version",
@@ -300,68 +437,176 @@ class LinkSafety(commands.Cog):
         )
         await ctx.send(embed=embed)
 
+    @commands.admin_or_permissions()
+    @linksafety.group()
+    async def allowlist(self, ctx: Context):
+        """
+        Manage domains that are trusted without following redirects
+
+        Links to these domains (and their subdomains) are never resolved or actioned. Link shorteners can't be allowlisted.
+        """
+
+    @allowlist.command(name="add")
+    async def allowlist_add(self, ctx: Context, domain: str):
+        """
+        Trust a domain and its subdomains
+        """
+        domain = link_host(domain)
+        if not domain or "." not in domain:
+            await ctx.send("That doesn't look like a domain.")
+            return
+        if domain in URL_SHORTENERS:
+            await ctx.send("Link shorteners can't be allowlisted, their destinations are always checked.")
+            return
+        if domain in self.domains:
+            await ctx.send("That domain is on the blocklist and can't be allowlisted.")
+            return
+        async with self.config.guild(ctx.guild).allowlist() as allowlist:
+            if domain not in allowlist:
+                allowlist.append(domain)
+        self.allowlists.pop(ctx.guild.id, None)
+        await ctx.send(f"Links to **{domain}** will no longer be resolved.")
+
+    @allowlist.command(name="remove")
+    async def allowlist_remove(self, ctx: Context, domain: str):
+        """
+        Stop trusting a domain
+        """
+        domain = link_host(domain)
+        async with self.config.guild(ctx.guild).allowlist() as allowlist:
+            if domain not in allowlist:
+                await ctx.send("That domain isn't on this server's allowlist.")
+                return
+            allowlist.remove(domain)
+        self.allowlists.pop(ctx.guild.id, None)
+        await ctx.send(f"Removed **{domain}** from the allowlist.")
+
+    @allowlist.command(name="list")
+    async def allowlist_list(self, ctx: Context):
+        """
+        Show trusted domains
+        """
+        allowlist = await self.config.guild(ctx.guild).allowlist()
+        embed = discord.Embed(title="Trusted domains", colour=0xfffffe)
+        embed.add_field(
+            name="This server",
+            value="\n".join(allowlist)[:1024] if allowlist else "None",
+            inline=False
+        )
+        embed.add_field(name="Built in", value=", ".join(DEFAULT_SAFE_DOMAINS), inline=False)
+        await ctx.send(embed=embed)
+
     @tasks.loop(minutes=2)
     async def get_phishing_domains(self) -> None:
-        domains = []
-
         headers = {
             "X-Identity": f"BeeHive AntiPhishing v{self.__version__} (https://www.beehive.systems/)",
             "User-Agent": f"BeeHive AntiPhishing v{self.__version__} (https://www.beehive.systems/)"
         }
 
-        async with self.session.get(
-            "https://phish.sinking.yachts/v2/all", headers=headers
-        ) as request:
-            if request.status == 200:
-                try:
-                    data = await request.json()
-                    domains.extend(data)
-                except Exception as e:
-                    print(f"Error parsing JSON from Sinking Yachts: {e}")
-            else:
-                print(f"Failed to fetch Sinking Yachts blacklist, status code: {request.status}")
-
-        async with self.session.get(
-            "https://www.beehive.systems/hubfs/blocklist/blocklist.json", headers=headers
-        ) as request:
-            if request.status == 200:
-                try:
-                    data = await request.json()
-                    if isinstance(data, list):
-                        domains.extend(data)
-                    else:
-                        print("Unexpected data format received from blocklist.")
-                except Exception as e:
-                    print(f"Error parsing JSON from blocklist: {e}")
-            else:
-                print(f"Failed to fetch blocklist, status code: {request.status}")
-        self.domains = list(set(domains))
-
-    async def follow_redirects(self, url: str) -> List[str]:
+        changed = []
+        succeeded = False
+        parse_seconds = 0.0
+        for name, url in BLOCKLIST_SOURCES.items():
+            try:
+                result = await self._fetch_blocklist(name, url, headers)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                self.refresh_stats["last_error"] = f"{name}: {e}"
+                print(f"Error refreshing {name} blocklist: {e}")
+                continue
+            if result is None:
+                continue
+            succeeded = True
+            if result is not False:
+                changed.append(name)
+                parse_seconds += result
+
+        if succeeded:
+            self.refresh_stats["last_success"] = int(time.time())
+        if changed:
+            self.refresh_stats["parse_seconds"] = parse_seconds
+            self.domains = DomainIndex(d for source in self.sources.values() for d in source["domains"])
+            try:
+                await asyncio.to_thread(self._write_blocklist_snapshot, changed)
+            except OSError as e:
+                print(f"Error saving blocklist snapshot: {e}")
+
+    @get_phishing_domains.before_loop
+    async def before_get_phishing_domains(self) -> None:
+        await self.bot.wait_until_red_ready()
+
+    @tasks.loop(seconds=30)
+    async def flush_counters(self) -> None:
+        # Shielded so cancelling the loop at unload can't drop a batch mid-write
+        await asyncio.shield(self.counters.flush())
+
+    async def _fetch_blocklist(self, name: str, url: str, headers: dict):
         """
-        Follow redirects and return the final URL and any intermediate URLs.
+        Conditionally fetch one blocklist source and stream-parse it.
+        Returns the parse time in seconds if the source changed, False if it was
+        not modified, or None if the request failed.
+        """
+        source = self.sources[name]
+        request_headers = dict(headers)
+        if source["etag"]:
+            request_headers["If-None-Match"] = source["etag"]
+        if source["last_modified"]:
+            request_headers["If-Modified-Since"] = source["last_modified"]
+
+        async with self.http.get(url, headers=request_headers) as response:
+            if response.status == 304:
+                self.refresh_stats["not_modified"] += 1
+                return False
+            if response.status != 200:
+                print(f"Failed to fetch {name} blocklist, status code: {response.status}")
+                return None
+
+            parser = JSONArrayStream()
+            parse_seconds = 0.0
+            transferred = 0
+            async for chunk in response.content.iter_chunked(65536):
+                transferred += len(chunk)
+                started = time.perf_counter()
+                parser.feed(chunk)
+                parse_seconds += time.perf_counter() - started
+            started = time.perf_counter()
+            domains = [d for d in parser.close() if isinstance(d, str)]
+            parse_seconds += time.perf_counter() - started
+
+        self.refresh_stats["bytes"] += transferred
+        source["domains"] = domains
+        source["etag"] = response.headers.get("ETag")
+        source["last_modified"] = response.headers.get("Last-Modified")
+        return parse_seconds
+
+    async def _fetch_redirect_chain(self, url: str) -> List[str]:
+        """
+        Issue the HEAD request behind follow_redirects. Errors propagate so the resolver can negative-cache them.
         """
         urls = []
         headers = {
             "User-Agent": "BeeHive Security Intelligence (https://www.beehive.systems)"
         }
-        try:
-            async with self.session.head(url, allow_redirects=True, headers=headers) as response:
-                urls.append(str(response.url))
-                for history in response.history:
-                    urls.append(str(history.url))
-        except Exception as e:
-            print(f"Error following redirects: {e}")
+        async with self.http.session.head(
+            url, allow_redirects=True, headers=headers, timeout=REDIRECT_TIMEOUT
+        ) as response:
+            urls.append(str(response.url))
+            for history in response.history:
+                urls.append(str(history.url))
         return urls
 
+    async def follow_redirects(self, url: str) -> List[str]:
+        """
+        Follow redirects and return the final URL and any intermediate URLs.
+        Results are cached and identical in-flight lookups are shared.
+        """
+        return await self.resolver.resolve(url)
+
     async def handle_phishing(self, message: discord.Message, domain: str, redirect_chain: List[str]) -> None:
         domain = domain[:250]
         action = await self.config.guild(message.guild).action()
         if action != "ignore":
-            count = await self.config.guild(message.guild).caught()
-            await self.config.guild(message.guild).caught.set(count + 1)
-        member_count = await self.config.member(message.author).caught()
-        await self.config.member(message.author).caught.set(member_count + 1)
+            self.counters.add_guild(message.guild.id, "caught")
+        self.counters.add_member(message.guild.id, message.author.id, "caught")
 
         # Send URL to vendor server if set
         vendor_server_id = await self.config.guild(message.guild).vendor_server_id()
@@ -437,15 +682,13 @@ class LinkSafety(commands.Cog):
                     else:
                         await message.reply(embed=embed)
 
-                notifications = await self.config.guild(message.guild).notifications()
-                await self.config.guild(message.guild).notifications.set(notifications + 1)
+                self.counters.add_guild(message.guild.id, "notifications")
         elif action == "delete":
             if message.channel.permissions_for(message.guild.me).manage_messages:
                 with contextlib.suppress(discord.NotFound):
                     await message.delete()
 
-                deletions = await self.config.guild(message.guild).deletions()
-                await self.config.guild(message.guild).deletions.set(deletions + 1)
+                self.counters.add_guild(message.guild.id, "deletions")
         elif action == "kick":
             if (
                 message.channel.permissions_for(message.guild.me).kick_members
@@ -461,8 +704,7 @@ class LinkSafety(commands.Cog):
 
                     await message.author.kick()
 
-                kicks = await self.config.guild(message.guild).kicks()
-                await self.config.guild(message.guild).kicks.set(kicks + 1)
+                self.counters.add_guild(message.guild.id, "kicks")
         elif action == "ban":
             if (
                 message.channel.permissions_for(message.guild.me).ban_members
@@ -478,8 +720,7 @@ class LinkSafety(commands.Cog):
 
                     await message.author.ban()
 
-                bans = await self.config.guild(message.guild).bans()
-                await self.config.guild(message.guild).bans.set(bans + 1)
+                self.counters.add_guild(message.guild.id, "bans")
         elif action == "timeout":
             if message.channel.permissions_for(message.guild.me).moderate_members:
                 with contextlib.suppress(discord.NotFound):
@@ -497,8 +738,7 @@ class LinkSafety(commands.Cog):
                     timeout_duration = datetime.timedelta(minutes=minutes)
                     await message.author.timeout_for(timeout_duration, reason="Shared a known dangerous link")
 
-                timeouts = await self.config.guild(message.guild).timeouts()  # Retrieve current timeout count
-                await self.config.guild(message.guild).timeouts.set(timeouts + 1)  # Increment timeout count
+                self.counters.add_guild(message.guild.id, "timeouts")
 
     @commands.Cog.listener()
     async def on_message_edit(self, before: discord.Message, after: discord.Message):
@@ -518,14 +758,7 @@ class LinkSafety(commands.Cog):
         if not links:
             return
 
-        # Only handle the first malicious link per message to avoid double alerts
-        for url in links:
-            domains_to_check = await self.follow_redirects(url)
-            for domain_url in domains_to_check:
-                domain = urlparse(domain_url).netloc
-                if domain in self.domains:
-                    await self.handle_phishing(after, domain, domains_to_check)
-                    return
+        await self.check_links(after, links)
 
     @commands.Cog.listener()
     async def on_message_without_command(self, message: discord.Message):
@@ -546,9 +779,43 @@ class LinkSafety(commands.Cog):
         if not links:
             return
 
-        # Only handle the first malicious link per message to avoid double alerts
+        await self.check_links(message, links)
+
+    async def get_allowlist(self, guild: discord.Guild) -> DomainIndex:
+        allowlist = self.allowlists.get(guild.id)
+        if allowlist is None:
+            extra = await self.config.guild(guild).allowlist()
+            allowlist = self.allowlists[guild.id] = DomainIndex((*DEFAULT_SAFE_DOMAINS, *extra))
+        return allowlist
+
+    async def check_links(self, message: discord.Message, links: List[str]) -> None:
+        """
+        Check the links in a message in two tiers and act on the first malicious one.
+
+        Tier 1 looks the literal hosts up in the blocklist and allowlist without any I/O.
+        Only links it can't settle (unknown hosts, shorteners and known redirect paths)
+        go to tier 2, which resolves their redirect chains concurrently.
+        """
+        allowlist = await self.get_allowlist(message.guild)
+        unresolved = []
         for url in links:
-            domains_to_check = await self.follow_redirects(url)
+            host = link_host(url)
+            if host in self.domains:
+                self.screen_stats["blocked_local"] += 1
+                await self.handle_phishing(message, host, [url])
+                return  # Stop after first malicious link to avoid double notification
+            if host in allowlist and host not in URL_SHORTENERS and not is_redirector(url):
+                self.screen_stats["allowed_local"] += 1
+                continue
+            unresolved.append(url)
+        if not unresolved:
+            return
+
+        self.screen_stats["resolved"] += len(unresolved)
+        chains = await self.resolver.resolve_many(unresolved, timeout=REDIRECT_DEADLINE)
+        # Only handle the first malicious link per message to avoid double alerts
+        for url in unresolved:
+            domains_to_check = chains.get(url, [])
             for domain_url in domains_to_check:
                 domain = urlparse(domain_url).netloc
                 if domain in self.domains:
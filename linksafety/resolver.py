@@ -0,0 +1,117 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+
+class RedirectResolver:
+    """
+    Caching, coalescing front end for redirect-chain lookups.
+
+    - Chains are cached per URL for ``ttl`` seconds. Failed lookups are cached as an
+      empty chain for the shorter ``negative_ttl``, so a dead link isn't retried on
+      every post.
+    - Concurrent requests for the same URL share one in-flight lookup.
+    - Lookups are capped at ``per_host`` concurrent requests per host and ``total``
+      overall, so a burst of links can't flood one site or the bot's connection pool.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Awaitable[List[str]]],
+        ttl: float = 3600,
+        negative_ttl: float = 300,
+        max_entries: int = 10000,
+        per_host: int = 4,
+        total: int = 32,
+    ):
+        self._fetch = fetch
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.per_host = per_host
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._total = asyncio.Semaphore(total)
+        self._hosts: Dict[str, list] = {}  # host -> [semaphore, active lookups]
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def get_cached(self, url: str) -> Optional[List[str]]:
+        """Return the cached chain for ``url`` if it hasn't expired, else None."""
+        entry = self._cache.get(url)
+        if entry is None:
+            return None
+        expires, chain = entry
+        if expires < time.monotonic():
+            del self._cache[url]
+            return None
+        self._cache.move_to_end(url)
+        return chain
+
+    def _store(self, url: str, chain: List[str], ttl: float):
+        self._cache[url] = (time.monotonic() + ttl, chain)
+        self._cache.move_to_end(url)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    async def resolve(self, url: str) -> List[str]:
+        """Return the redirect chain for ``url`` (final URL first), or [] if it couldn't be resolved."""
+        chain = self.get_cached(url)
+        if chain is not None:
+            self.hits += 1
+            return chain
+        task = self._inflight.get(url)
+        if task is None:
+            self.misses += 1
+            task = asyncio.create_task(self._lookup(url))
+            self._inflight[url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(url, None))
+        else:
+            self.coalesced += 1
+        # Shield so one caller hitting its deadline doesn't cancel the lookup for everyone else
+        return await asyncio.shield(task)
+
+    async def resolve_many(self, urls: Iterable[str], timeout: float) -> Dict[str, List[str]]:
+        """
+        Resolve several URLs concurrently under one overall deadline.
+        URLs still unresolved at the deadline map to [] (their lookups keep running and fill the cache).
+        """
+        urls = list(dict.fromkeys(urls))
+        tasks = {url: asyncio.ensure_future(self.resolve(url)) for url in urls}
+        if tasks:
+            await asyncio.wait(tasks.values(), timeout=timeout)
+        results = {}
+        for url, task in tasks.items():
+            if task.done() and not task.cancelled() and task.exception() is None:
+                results[url] = task.result()
+            else:
+                task.cancel()
+                results[url] = []
+        return results
+
+    async def _lookup(self, url: str) -> List[str]:
+        host = (urlparse(url).hostname or "").lower()
+        limit = self._hosts.get(host)
+        if limit is None:
+            limit = self._hosts[host] = [asyncio.Semaphore(self.per_host), 0]
+        limit[1] += 1
+        try:
+            async with self._total, limit[0]:
+                chain = await self._fetch(url)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._store(url, [], self.negative_ttl)
+            return []
+        finally:
+            limit[1] -= 1
+            if not limit[1]:
+                self._hosts.pop(host, None)
+        self._store(url, chain, self.ttl if chain else self.negative_ttl)
+        return chain
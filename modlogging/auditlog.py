@@ -0,0 +1,222 @@
+import asyncio
+import datetime
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+import discord # type: ignore
+from red_commons.logging import getLogger # type: ignore
+
+logger = getLogger("red.beehive-cogs.Logging")
+
+TargetID = Union[int, str, None]
+
+# Discord folds repeats of these by the same user into the existing entry and bumps its
+# count, so no new entry is created and created_at stays at the first occurrence
+MERGED_ACTIONS = frozenset(
+    {
+        discord.AuditLogAction.message_delete,
+        discord.AuditLogAction.member_move,
+        discord.AuditLogAction.member_disconnect,
+    }
+)
+
+
+class _Waiter:
+    __slots__ = ("target_id", "extra", "future")
+
+    def __init__(self, target_id: TargetID, extra: Optional[str], future: asyncio.Future):
+        self.target_id = target_id
+        self.extra = extra
+        self.future = future
+
+
+def entry_matches(
+    entry: discord.AuditLogEntry,
+    action: discord.AuditLogAction,
+    target_id: TargetID,
+    extra: Optional[str] = None,
+) -> bool:
+    """
+    Whether an audit log entry describes ``action`` on ``target_id``.
+    A ``target_id`` of None matches any entry for the action.
+    """
+    if entry.action != action:
+        return False
+    if extra is not None and getattr(entry.after, extra, None) is None:
+        return False
+    if target_id is None:
+        return True
+    return target_id == getattr(entry.target, "id", None) or target_id == getattr(
+        entry.target, "code", None
+    )
+
+
+class AuditLogCorrelator:
+    """
+    Matches events to the audit log entries that explain them.
+
+    ``on_audit_log_entry_create`` feeds every entry to :meth:`feed`. Handlers call
+    :meth:`wait_for`, which returns a matching entry from the last few seconds
+    straight away, otherwise waits for one to arrive for at most ``timeout``
+    seconds. Only then does it fall back to the API, and concurrent fallbacks for
+    the same guild and action share one ``guild.audit_logs`` request, so a mass
+    ban or kick wave costs one fetch rather than one per member.
+
+    Entries older than ``max_age`` seconds are ignored, except for actions Discord
+    merges (see ``MERGED_ACTIONS``), which get ``merged_max_age`` instead.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 5.0,
+        max_age: float = 10.0,
+        merged_max_age: float = 3600.0,
+        history: int = 50,
+        fetch_limit: int = 25,
+    ):
+        self.timeout = timeout
+        self.max_age = datetime.timedelta(seconds=max_age)
+        self.merged_max_age = datetime.timedelta(seconds=merged_max_age)
+        self.history = history
+        self.fetch_limit = fetch_limit
+        self._recent: Dict[int, Deque[discord.AuditLogEntry]] = {}
+        self._waiters: Dict[Tuple[int, discord.AuditLogAction], List[_Waiter]] = {}
+        self._fetches: Dict[Tuple[int, discord.AuditLogAction], asyncio.Task] = {}
+        self.resolved_live = 0
+        self.resolved_fetch = 0
+        self.fetches = 0
+        self.missed = 0
+
+    def feed(self, entry: discord.AuditLogEntry) -> None:
+        """Record a new entry and wake any handler waiting for it."""
+        guild_id = entry.guild.id
+        recent = self._recent.get(guild_id)
+        if recent is None:
+            recent = self._recent[guild_id] = deque(maxlen=self.history)
+        recent.append(entry)
+        waiters = self._waiters.get((guild_id, entry.action))
+        if not waiters:
+            return
+        for waiter in list(waiters):
+            if not waiter.future.done() and entry_matches(
+                entry, entry.action, waiter.target_id, waiter.extra
+            ):
+                waiter.future.set_result(entry)
+
+    def _find_recent(
+        self,
+        guild_id: int,
+        action: discord.AuditLogAction,
+        target_id: TargetID,
+        extra: Optional[str],
+        cutoff: datetime.datetime,
+    ) -> Optional[discord.AuditLogEntry]:
+        for entry in reversed(self._recent.get(guild_id, ())):
+            # Every action shares this deque and merged entries keep an old
+            # created_at, so only the searched action's own entries end the scan
+            if entry.action != action:
+                continue
+            if entry.created_at < cutoff:
+                break
+            if entry_matches(entry, action, target_id, extra):
+                return entry
+        return None
+
+    async def wait_for(
+        self,
+        guild: discord.Guild,
+        action: discord.AuditLogAction,
+        target_id: TargetID,
+        *,
+        extra: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[discord.AuditLogEntry]:
+        # Older entries belong to some earlier change of the same target. A merged
+        # entry keeps the time of the first action, so later repeats need a longer window
+        max_age = self.merged_max_age if action in MERGED_ACTIONS else self.max_age
+        cutoff = discord.utils.utcnow() - max_age
+        entry = self._find_recent(guild.id, action, target_id, extra, cutoff)
+        if entry is not None:
+            self.resolved_live += 1
+            return entry
+
+        key = (guild.id, action)
+        waiter = _Waiter(target_id, extra, asyncio.get_running_loop().create_future())
+        self._waiters.setdefault(key, []).append(waiter)
+        try:
+            entry = await asyncio.wait_for(waiter.future, self.timeout if timeout is None else timeout)
+            self.resolved_live += 1
+            return entry
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            waiters = self._waiters.get(key)
+            if waiters is not None:
+                waiters.remove(waiter)
+                if not waiters:
+                    del self._waiters[key]
+
+        try:
+            entries = await asyncio.shield(self._fetch(guild, action))
+        except (discord.Forbidden, discord.HTTPException):
+            entries = []
+        for entry in entries:
+            if entry.created_at >= cutoff and entry_matches(entry, action, target_id, extra):
+                self.resolved_fetch += 1
+                return entry
+        self.missed += 1
+        return None
+
+    async def wait_for_first(
+        self,
+        guild: discord.Guild,
+        actions: Iterable[discord.AuditLogAction],
+        target_id: TargetID,
+        *,
+        timeout: Optional[float] = None,
+    ) -> Optional[discord.AuditLogEntry]:
+        """
+        :meth:`wait_for` across several actions at once, returning whichever
+        matching entry turns up first.
+        """
+        tasks = [
+            asyncio.ensure_future(self.wait_for(guild, action, target_id, timeout=timeout))
+            for action in actions
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                entry = await next_done
+                if entry is not None:
+                    return entry
+        finally:
+            for task in tasks:
+                task.cancel()
+        return None
+
+    def _fetch(self, guild: discord.Guild, action: discord.AuditLogAction) -> asyncio.Task:
+        key = (guild.id, action)
+        task = self._fetches.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_entries(guild, action))
+            self._fetches[key] = task
+            task.add_done_callback(lambda _: self._fetches.pop(key, None))
+        return task
+
+    async def _fetch_entries(
+        self, guild: discord.Guild, action: discord.AuditLogAction
+    ) -> List[discord.AuditLogEntry]:
+        self.fetches += 1
+        entries = [entry async for entry in guild.audit_logs(limit=self.fetch_limit, action=action)]
+        logger.debug("Fetched %s %s audit log entries for %s", len(entries), action, guild.id)
+        return entries
+
+    def clear(self) -> None:
+        for task in self._fetches.values():
+            task.cancel()
+        for waiters in self._waiters.values():
+            for waiter in waiters:
+                if not waiter.future.done():
+                    waiter.future.cancel()
+        self._recent.clear()
+        self._waiters.clear()
+        self._fetches.clear()
@@ -0,0 +1,168 @@
+"""
+Config write volume during a simulated join wave.
+
+Replays a wave of member joins through :class:`InviteTracker` against a Config
+stand-in that counts writes and serialised bytes, once with ``SettingsWriter``
+and once with the old whole-blob ``save``, so the two can be compared on the
+same tracker. Runs in scaled time, so a one minute wave takes about a second.
+
+Usage::
+
+    python -m modlogging.benchmarks.join_wave [--members 500] [--invites 300] [--seconds 60]
+"""
+
+import argparse
+import asyncio
+import copy
+import datetime
+import json
+import random
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+from ..invites import InviteTracker, invite_record
+from ..persistence import SettingsWriter
+from ..settings import inv_settings
+
+# One simulated second takes this long in real time
+SCALE = 0.02
+
+
+class WriteStats:
+    def __init__(self):
+        self.writes = 0
+        self.bytes = 0
+
+    def record(self, value: Any):
+        self.writes += 1
+        self.bytes += len(json.dumps(value))
+
+
+class _AllContext:
+    def __init__(self, group: "CountingGroup"):
+        self._group = group
+
+    async def __aenter__(self) -> dict:
+        self._data = copy.deepcopy(self._group.data)
+        return self._data
+
+    async def __aexit__(self, *exc):
+        self._group.data = self._data
+        self._group.stats.record(self._data)
+
+
+class CountingGroup:
+    """The parts of a Config guild group that ``save`` uses, counting every write."""
+
+    def __init__(self, data: dict, stats: WriteStats):
+        self.data = data
+        self.stats = stats
+
+    def all(self) -> _AllContext:
+        return _AllContext(self)
+
+    async def set_raw(self, *path, value):
+        node = self.data
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = copy.deepcopy(value)
+        self.stats.record(value)
+
+    async def clear_raw(self, *path):
+        node = self.data
+        for key in path[:-1]:
+            node = node[key]
+        node.pop(path[-1], None)
+        self.stats.record(None)
+
+
+class CountingConfig:
+    def __init__(self, data: dict):
+        self.stats = WriteStats()
+        self.group = CountingGroup(data, self.stats)
+
+    def guild(self, guild) -> CountingGroup:
+        return self.group
+
+
+class FakeInvite:
+    def __init__(self, code: str, uses: int):
+        self.code = code
+        self.uses = uses
+        self.max_uses = 0
+        self.max_age = 0
+        self.temporary = False
+        self.inviter = SimpleNamespace(id=1, mention="<@1>")
+        self.channel = SimpleNamespace(id=1)
+        self.created_at = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class FakeGuild:
+    id = 1
+    me = SimpleNamespace(guild_permissions=SimpleNamespace(manage_guild=True))
+
+    def __init__(self, invites: List[FakeInvite]):
+        self._invites = invites
+        self.fetches = 0
+
+    async def invites(self) -> List[FakeInvite]:
+        self.fetches += 1
+        await asyncio.sleep(0.2 * SCALE)
+        return [copy.copy(invite) for invite in self._invites]
+
+
+async def run(members: int, invites: int, seconds: float, use_writer: bool, save_delay: float, seed: int = 1) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    guild = FakeGuild([FakeInvite(f"code{i:04}", rng.randint(0, 50)) for i in range(invites)])
+    settings = {guild.id: copy.deepcopy(inv_settings)}
+    settings[guild.id]["invite_links"] = {invite.code: invite_record(invite) for invite in guild._invites}
+    config = CountingConfig(copy.deepcopy(settings[guild.id]))
+
+    if use_writer:
+        writer = SettingsWriter(config)
+        writer.loaded(guild.id, settings[guild.id])
+
+        async def save(g):
+            await writer.save(g, settings[g.id])
+
+    else:
+
+        async def save(g):
+            # ModLogging.save before SettingsWriter
+            async with config.guild(g).all() as all_settings:
+                for key, value in settings[g.id].items():
+                    all_settings[key] = value
+
+    tracker = InviteTracker(settings, save, window=2 * SCALE, save_delay=save_delay * SCALE)
+    joins = []
+    popular = guild._invites[:5]
+    for _ in range(members):
+        rng.choice(popular).uses += 1
+        joins.append(asyncio.ensure_future(tracker.resolve(guild)))
+        await asyncio.sleep(rng.expovariate(members / seconds) * SCALE)
+    await asyncio.gather(*joins)
+    await tracker.close()
+    assert config.group.data["invite_links"] == settings[guild.id]["invite_links"]
+    return {"fetches": guild.fetches, "writes": config.stats.writes, "bytes": config.stats.bytes}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure Config writes during a simulated join wave.")
+    parser.add_argument("--members", type=int, default=500)
+    parser.add_argument("--invites", type=int, default=300)
+    parser.add_argument("--seconds", type=float, default=60)
+    args = parser.parse_args(argv)
+
+    print(f"{args.members} joins over {args.seconds:g}s, {args.invites} invites, 5 of them in use")
+    print(f"{'save debounce':<15}{'SettingsWriter':<16}{'fetches':>8}{'writes':>8}{'KiB written':>13}")
+    for save_delay in (0, 30):
+        for use_writer in (False, True):
+            result = asyncio.run(run(args.members, args.invites, args.seconds, use_writer, save_delay))
+            print(
+                f"{f'{save_delay}s':<15}{'on' if use_writer else 'off':<16}"
+                f"{result['fetches']:>8}{result['writes']:>8}{result['bytes'] / 1024:>13,.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,9 @@
 import asyncio
 import datetime
-from collections import deque
 from enum import Enum
-from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple, Union, cast
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union, cast
 
 import discord # type: ignore
-from discord.ext import tasks # type: ignore
 from discord.ext.commands.converter import Converter # type: ignore
 from discord.ext.commands.errors import BadArgument # type: ignore
 from red_commons.logging import getLogger # type: ignore
@@ -20,6 +18,10 @@ from redbot.core.utils.chat_formatting import ( # type: ignore
     pagify,
 )
 
+from .auditlog import AuditLogCorrelator
+from .invites import InviteTracker
+from .logbuffer import BufferedChannel, LogOutput
+
 _ = i18n.Translator("Logging", __file__)
 logger = getLogger("red.beehive-cogs.Logging")
 
@@ -111,6 +113,31 @@ class EventChooser(Converter):
         return result
 
 
+DEFAULT_EVENT_COLOURS = {
+    "message_edit": discord.Colour.orange(),
+    "message_delete": discord.Colour(0xFF4545),
+    "user_change": discord.Colour.greyple(),
+    "role_change": discord.Colour.blue(),
+    "role_create": discord.Colour.blue(),
+    "role_delete": discord.Colour.dark_blue(),
+    "voice_change": discord.Colour.magenta(),
+    "user_join": discord.Colour.green(),
+    "user_left": discord.Colour.dark_green(),
+    "channel_change": discord.Colour.teal(),
+    "channel_create": discord.Colour.teal(),
+    "channel_delete": discord.Colour(0xFF4545),
+    "guild_change": discord.Colour.blurple(),
+    "emoji_change": discord.Colour.gold(),
+    "stickers_change": discord.Colour.gold(),
+    "commands_used": discord.Colour(0xFFFFFE),
+    "invite_created": discord.Colour.blurple(),
+    "invite_deleted": discord.Colour(0xFF4545),
+    "thread_change": discord.Colour.teal(),
+    "thread_create": discord.Colour.teal(),
+    "thread_delete": discord.Colour(0xFF4545),
+}
+
+
 class EventMixin:
     """
     Handles all the on_event data
@@ -121,42 +148,19 @@ class EventMixin:
     settings: Dict[int, Any]
     _ban_cache: Dict[int, List[int]]
     allowed_mentions: discord.AllowedMentions
-    audit_log: Dict[int, Deque[discord.AuditLogEntry]]
+    audit_log: AuditLogCorrelator
+    log_output: LogOutput
+    invite_tracker: InviteTracker
 
     async def get_event_colour(
         self, guild: discord.Guild, event_type: str, changed_object: Optional[discord.Role] = None
     ) -> discord.Colour:
-        if guild.text_channels:
-            cmd_colour = await self.bot.get_embed_colour(guild.text_channels[0])
-        else:
-            cmd_colour = discord.Colour.red()
-        defaults = {
-            "message_edit": discord.Colour.orange(),
-            "message_delete": 0xff4545,
-            "user_change": discord.Colour.greyple(),
-            "role_change": changed_object.colour if changed_object else discord.Colour.blue(),
-            "role_create": discord.Colour.blue(),
-            "role_delete": discord.Colour.dark_blue(),
-            "voice_change": discord.Colour.magenta(),
-            "user_join": discord.Colour.green(),
-            "user_left": discord.Colour.dark_green(),
-            "channel_change": discord.Colour.teal(),
-            "channel_create": discord.Colour.teal(),
-            "channel_delete": 0xff4545,
-            "guild_change": discord.Colour.blurple(),
-            "emoji_change": discord.Colour.gold(),
-            "stickers_change": discord.Colour.gold(),
-            "commands_used": 0xfffffe,
-            "invite_created": discord.Colour.blurple(),
-            "invite_deleted": 0xff4545,
-            "thread_change": discord.Colour.teal(),
-            "thread_create": discord.Colour.teal(),
-            "thread_delete": 0xff4545,
-        }
-        colour = defaults[event_type]
-        if self.settings[guild.id][event_type]["colour"] is not None:
-            colour = discord.Colour(self.settings[guild.id][event_type]["colour"])
-        return colour
+        setting = self.settings[guild.id][event_type]["colour"]
+        if setting is not None:
+            return discord.Colour(setting)
+        if event_type == "role_change" and changed_object:
+            return changed_object.colour
+        return DEFAULT_EVENT_COLOURS[event_type]
 
     async def is_ignored_channel(
         self, guild: discord.Guild, channel: Union[discord.abc.GuildChannel, discord.Thread, int]
@@ -180,7 +184,7 @@ class EventMixin:
             return True
         return False
 
-    async def modlog_channel(self, guild: discord.Guild, event: str) -> discord.TextChannel:
+    async def modlog_channel(self, guild: discord.Guild, event: str) -> BufferedChannel:
         channel = None
         settings = self.settings[guild.id].get(event)
         if "channel" in settings and settings["channel"]:
@@ -192,7 +196,8 @@ class EventMixin:
                 raise RuntimeError("No Modlog set")
         if not channel.permissions_for(guild.me).send_messages:
             raise RuntimeError("No permission to send messages in channel")
-        return channel
+        # Sends are queued and batched per destination so bursts don't hit rate limits
+        return self.log_output.wrap(channel)
 
     @commands.Cog.listener()
     async def on_command(self, ctx: commands.Context) -> None:
@@ -583,55 +588,27 @@ class EventMixin:
                 except Exception:
                     pass
 
-    @tasks.loop(seconds=300)
-    async def invite_links_loop(self) -> None:
-        """Check every 5 minutes for updates to the invite links"""
-        for guild_id in self.settings.keys():
+    async def sync_invite_links(self) -> None:
+        """Load the current invites once on startup, after that they're tracked by events"""
+        await self.bot.wait_until_red_ready()
+        for guild_id in list(self.settings.keys()):
             guild = self.bot.get_guild(guild_id)
             if guild is None:
                 continue
             if self.settings[guild_id]["user_join"]["enabled"]:
-                await self.save_invite_links(guild)
-
-    @invite_links_loop.before_loop
-    async def before_invite_loop(self):
-        await self.bot.wait_until_red_ready()
-
-    async def save_invite_links(self, guild: discord.Guild) -> bool:
-        invites = {}
-        if not guild.me.guild_permissions.manage_guild:
-            return False
-        try:
-            for invite in await guild.invites():
-                created_at = getattr(
-                    invite, "created_at", datetime.datetime.now(datetime.timezone.utc)
-                )
-                channel = getattr(invite, "channel", discord.Object(id=0))
-                inviter = getattr(invite, "inviter", discord.Object(id=0))
-                invites[invite.code] = {
-                    "uses": getattr(invite, "uses", 0),
-                    "max_age": getattr(invite, "max_age", None),
-                    "created_at": created_at.timestamp(),
-                    "max_uses": getattr(invite, "max_uses", None),
-                    "temporary": getattr(invite, "temporary", False),
-                    "inviter": getattr(inviter, "id", "Unknown"),
-                    "channel": getattr(channel, "id", "Unknown"),
-                }
-        except discord.HTTPException:
-            logger.error("Error saving invites for guild %s. Discord Server Error.", guild.id)
-            return False
-        except Exception:
-            logger.exception("Error saving invites for guild %s.", guild.id)
-            return False
+                await self.invite_tracker.refresh(guild)
 
-        self.settings[guild.id]["invite_links"] = invites
-        await self.save(guild)
-        return True
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild) -> None:
+        # Rejoining a guild that was set up before, its stored invites are stale
+        if guild.id not in self.settings:
+            return
+        if self.settings[guild.id]["user_join"]["enabled"]:
+            await self.invite_tracker.refresh(guild)
 
     async def get_invite_link(self, member: discord.Member) -> str:
         guild = member.guild
         manage_guild = guild.me.guild_permissions.manage_guild
-        invites = self.settings[guild.id]["invite_links"]
         possible_link = ""
         check_logs = manage_guild and guild.me.guild_permissions.view_audit_log
         if member.bot:
@@ -647,50 +624,24 @@ class EventMixin:
             except (discord.errors.NotFound, discord.errors.HTTPException):
                 pass
 
-        if invites and manage_guild:
-            guild_invites = await guild.invites()
-            for invite in guild_invites:
-                if invite.code in invites:
-                    uses = invites[invite.code]["uses"]
-                    # we can't get accurate information if the uses is None
-                    if invite.uses is None or uses is None:
-                        continue
-                    if invite.uses > uses:
-                        possible_link = _(
-                            "https://discord.gg/{code}\nInvited by: {inviter}"
-                        ).format(
-                            code=invite.code,
-                            inviter=str(
-                                getattr(invite.inviter, "mention", _("Web integration"))
-                            ),
-                        )
-
-            if not possible_link:
-                for code, data in invites.items():
+        if manage_guild:
+            links = []
+            for use in await self.invite_tracker.resolve(guild):
+                inviter = use.inviter
+                if isinstance(inviter, int):
                     try:
-                        invite = await self.bot.fetch_invite(code)
-                    except Exception:
-                        logger.error("Error getting invite {code}".format(code=code))
-                        invite = None
-                        pass
-                    if invite is None:
-                        if (data["max_uses"] - data["uses"]) == 1:
-                            # The invite link was on its last uses and subsequently
-                            # deleted so we're fairly sure this was the one used
-                            try:
-                                inviter = guild.get_member(data["inviter"])
-                                if inviter is None:
-                                    inviter = await self.bot.fetch_user(data["inviter"])
-                                if inviter is not None:
-                                    inviter = inviter.mention
-                            except (discord.errors.NotFound, discord.errors.Forbidden):
-                                inviter = _("Unknown or deleted user ({inviter})").format(
-                                    inviter=data["inviter"]
-                                )
-                            possible_link = _(
-                                "https://discord.gg/{code}\nInvited by: {inviter}"
-                            ).format(code=code, inviter=str(inviter))
-            await self.save_invite_links(guild)  # Save all the invites again since they've changed
+                        inviter = guild.get_member(inviter) or await self.bot.fetch_user(inviter)
+                    except (discord.errors.NotFound, discord.errors.Forbidden):
+                        inviter = _("Unknown or deleted user ({inviter})").format(inviter=use.inviter)
+                links.append(
+                    _("https://discord.gg/{code}\nInvited by: {inviter}").format(
+                        code=use.code,
+                        inviter=str(getattr(inviter, "mention", inviter or _("Web integration"))),
+                    )
+                )
+            if links:
+                # Several invites can be used in one burst of joins, list them all
+                possible_link = "\n".join(links)
         if check_logs and not possible_link:
             action = discord.AuditLogAction.invite_create
             entry = await self.get_audit_log_entry(guild, None, action)
@@ -771,10 +722,6 @@ class EventMixin:
     @commands.Cog.listener()
     async def on_member_remove(self, member: discord.Member):
         guild = member.guild
-        await asyncio.sleep(5)
-        if guild.id in self._ban_cache and member.id in self._ban_cache[guild.id]:
-            # was a ban so we can leave early
-            return
         if guild.id not in self.settings:
             return
         if not self.settings[guild.id]["user_left"]["enabled"]:
@@ -791,10 +738,24 @@ class EventMixin:
             channel.permissions_for(guild.me).embed_links
             and self.settings[guild.id]["user_left"]["embed"]
         )
+        time = datetime.datetime.now(datetime.timezone.utc)
+        if guild.me.guild_permissions.view_audit_log:
+            # Returns as soon as a ban or kick entry for the member arrives,
+            # only a plain leave waits out the correlator's timeout
+            entry = await self.audit_log.wait_for_first(
+                guild, (discord.AuditLogAction.ban, discord.AuditLogAction.kick), member.id
+            )
+        else:
+            # Without the audit log only on_member_ban can tell a ban apart
+            entry = None
+            await asyncio.sleep(5)
+        if entry is not None and entry.action is discord.AuditLogAction.ban:
+            return
+        if guild.id in self._ban_cache and member.id in self._ban_cache[guild.id]:
+            # was a ban so we can leave early
+            return
         await i18n.set_contextual_locales_from_guild(self.bot, guild)
         # set guild level i18n
-        time = datetime.datetime.now(datetime.timezone.utc)
-        entry = await self.get_audit_log_entry(guild, member, discord.AuditLogAction.kick)
         joined = member.joined_at
         member_time = None
         if joined is not None:
@@ -1048,9 +1009,7 @@ class EventMixin:
 
     @commands.Cog.listener()
     async def on_audit_log_entry_create(self, entry: discord.AuditLogEntry):
-        if entry.guild.id not in self.audit_log:
-            self.audit_log[entry.guild.id] = deque(maxlen=10)
-        self.audit_log[entry.guild.id].append(entry)
+        self.audit_log.feed(entry)
 
     async def get_audit_log_entry(
         self,
@@ -1068,7 +1027,6 @@ class EventMixin:
         *,
         extra: Optional[str] = None,
     ) -> Optional[discord.AuditLogEntry]:
-        entry = None
         if isinstance(target, int) or target is None:
             target_id = target
         elif isinstance(target, discord.Invite):
@@ -1076,36 +1034,11 @@ class EventMixin:
         else:
             target_id = target.id
 
-        if guild.me.guild_permissions.view_audit_log:
-            await asyncio.sleep(5)
-            # wait 5 seconds incase the audit log entry is slow and we prioritize the cache
-            if guild.id in self.audit_log:
-                for log in self.audit_log[guild.id]:
-                    if log.action != action:
-                        continue
-                    if extra is not None:
-                        if getattr(log.after, extra, None) is None:
-                            continue
-                    if target_id == getattr(log.target, "id", None):
-                        logger.trace("Found entry through cache")
-                        entry = log
-                    if target_id == getattr(log.target, "code", None):
-                        logger.trace("Found invite code entry through cache")
-                        entry = log
-
-            if entry is None:
-                async for log in guild.audit_logs(limit=5, action=action):
-                    if extra is not None:
-                        if getattr(log.after, extra, None) is None:
-                            continue
-                    if target_id == getattr(log.target, "id", None):
-                        logger.trace("Found perp through fetch")
-                        entry = log
-                        break
-                    if target_id == getattr(log.target, "code", None):
-                        logger.trace("Found invite code entry through fetch")
-                        entry = log
-        return entry
+        if not guild.me.guild_permissions.view_audit_log:
+            return None
+        # Resolves as soon as the matching entry arrives over the gateway,
+        # falling back to one shared API fetch per guild and action
+        return await self.audit_log.wait_for(guild, action, target_id, extra=extra)
 
     @commands.Cog.listener()
     async def on_guild_channel_update(
@@ -2170,26 +2103,11 @@ class EventMixin:
             return
         if guild.id not in self.settings:
             return
+        self.invite_tracker.created(guild, invite)
         if await self.bot.cog_disabled_in_guild(self, guild):
             return
         if guild.me.is_timed_out():
             return
-        if invite.code not in self.settings[guild.id]["invite_links"]:
-            created_at = getattr(
-                invite, "created_at", datetime.datetime.now(datetime.timezone.utc)
-            )
-            inviter = getattr(invite, "inviter", discord.Object(id=0))
-            channel = getattr(invite, "channel", discord.Object(id=0))
-            self.settings[guild.id]["invite_links"][invite.code] = {
-                "uses": getattr(invite, "uses", 0),
-                "max_age": getattr(invite, "max_age", None),
-                "created_at": created_at.timestamp(),
-                "max_uses": getattr(invite, "max_uses", None),
-                "temporary": getattr(invite, "temporary", False),
-                "inviter": getattr(inviter, "id", "Unknown"),
-                "channel": channel.id,
-            }
-            await self.save(guild)
         if not self.settings[guild.id]["invite_created"]["enabled"]:
             return
         try:
@@ -2271,6 +2189,7 @@ class EventMixin:
             return
         if guild.id not in self.settings:
             return
+        self.invite_tracker.deleted(guild, invite)
         if await self.bot.cog_disabled_in_guild(self, guild):
             return
         if guild.me.is_timed_out():
@@ -0,0 +1,229 @@
+import asyncio
+import datetime
+import time
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import discord # type: ignore
+from red_commons.logging import getLogger # type: ignore
+
+logger = getLogger("red.beehive-cogs.Logging")
+
+
+def invite_record(invite: discord.Invite) -> Dict[str, Any]:
+    """The dict stored in the ``invite_links`` setting for an invite."""
+    created_at = getattr(invite, "created_at", None) or datetime.datetime.now(datetime.timezone.utc)
+    channel = getattr(invite, "channel", None) or discord.Object(id=0)
+    inviter = getattr(invite, "inviter", None) or discord.Object(id=0)
+    return {
+        "uses": getattr(invite, "uses", 0),
+        "max_age": getattr(invite, "max_age", None),
+        "created_at": created_at.timestamp(),
+        "max_uses": getattr(invite, "max_uses", None),
+        "temporary": getattr(invite, "temporary", False),
+        "inviter": getattr(inviter, "id", "Unknown"),
+        "channel": getattr(channel, "id", "Unknown"),
+    }
+
+
+class InviteUse(NamedTuple):
+    code: str
+    inviter: Union[discord.abc.User, int, str, None]
+    uses: int
+
+
+class _Burst:
+    __slots__ = ("future", "joins")
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.joins = 0
+
+
+class InviteTracker:
+    """
+    Keeps the ``invite_links`` setting of each guild current and works out which
+    invite new members used.
+
+    The model is updated from ``on_invite_create`` and ``on_invite_delete``, so it
+    never needs polling. Joins are grouped into bursts: the first join in a guild
+    waits ``window`` seconds, then a single ``guild.invites()`` call is diffed
+    against the model and the result is shared by everyone who joined meanwhile.
+    Invites that were deleted on their last use count too, since Discord deletes
+    them before the diff can see the new use count. Config writes are debounced
+    by ``save_delay`` seconds.
+    """
+
+    def __init__(
+        self,
+        settings: Dict[int, Dict[str, Any]],
+        save: Callable[[discord.Guild], Awaitable[None]],
+        window: float = 2.0,
+        save_delay: float = 30.0,
+        deleted_ttl: float = 60.0,
+    ):
+        self.settings = settings
+        self._save = save
+        self.window = window
+        self.save_delay = save_delay
+        self.deleted_ttl = deleted_ttl
+        self._bursts: Dict[int, _Burst] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._deleted: Dict[int, Dict[str, Tuple[Dict[str, Any], float]]] = {}
+        self._saves: Dict[int, Tuple[discord.Guild, asyncio.Task]] = {}
+        self._tasks: set = set()
+        self.fetches = 0
+        self.joins = 0
+
+    def _links(self, guild: discord.Guild) -> Dict[str, Dict[str, Any]]:
+        return self.settings[guild.id].setdefault("invite_links", {})
+
+    def _lock(self, guild_id: int) -> asyncio.Lock:
+        lock = self._locks.get(guild_id)
+        if lock is None:
+            lock = self._locks[guild_id] = asyncio.Lock()
+        return lock
+
+    def created(self, guild: discord.Guild, invite: discord.Invite) -> None:
+        links = self._links(guild)
+        if invite.code not in links:
+            links[invite.code] = invite_record(invite)
+            self.schedule_save(guild)
+
+    def deleted(self, guild: discord.Guild, invite: discord.Invite) -> None:
+        data = self._links(guild).pop(invite.code, None)
+        if data is None:
+            return
+        # Kept for a while, this may have been an invite deleted on its last use
+        now = time.monotonic()
+        recent = self._deleted.setdefault(guild.id, {})
+        for code, (_data, deleted_at) in list(recent.items()):
+            if now - deleted_at > self.deleted_ttl:
+                del recent[code]
+        recent[invite.code] = (data, now)
+        self.schedule_save(guild)
+
+    async def refresh(self, guild: discord.Guild) -> bool:
+        """Replace the guild's model with the current invite list."""
+        if not guild.me.guild_permissions.manage_guild:
+            return False
+        async with self._lock(guild.id):
+            invites = await self._fetch(guild)
+            if invites is None:
+                return False
+            self.settings[guild.id]["invite_links"] = {
+                invite.code: invite_record(invite) for invite in invites
+            }
+            self._deleted.pop(guild.id, None)
+        self.schedule_save(guild)
+        return True
+
+    async def resolve(self, guild: discord.Guild) -> List[InviteUse]:
+        """
+        Invites whose use count went up since the last diff, for a member who just
+        joined. Members joining in the same burst share the result.
+        """
+        if not guild.me.guild_permissions.manage_guild:
+            return []
+        self.joins += 1
+        burst = self._bursts.get(guild.id)
+        if burst is None:
+            burst = self._bursts[guild.id] = _Burst(asyncio.get_running_loop().create_future())
+            self._spawn(self._run_burst(guild, burst))
+        burst.joins += 1
+        return await asyncio.shield(burst.future)
+
+    async def _run_burst(self, guild: discord.Guild, burst: _Burst) -> None:
+        try:
+            await asyncio.sleep(self.window)
+            async with self._lock(guild.id):
+                # Joins from here on need a fresh diff
+                if self._bursts.get(guild.id) is burst:
+                    del self._bursts[guild.id]
+                used = await self._diff(guild)
+        except Exception:
+            logger.exception("Error resolving invites for guild %s.", guild.id)
+            used = []
+        finally:
+            if self._bursts.get(guild.id) is burst:
+                del self._bursts[guild.id]
+        if not burst.future.done():
+            burst.future.set_result(used)
+        logger.debug("Resolved %s joins in %s with one invite fetch", burst.joins, guild.id)
+
+    async def _diff(self, guild: discord.Guild) -> List[InviteUse]:
+        invites = await self._fetch(guild)
+        if invites is None:
+            return []
+        links = self._links(guild)
+        used = []
+        current = {}
+        for invite in invites:
+            current[invite.code] = invite_record(invite)
+            data = links.get(invite.code)
+            # we can't get accurate information if the uses is None
+            if data is None or invite.uses is None or data.get("uses") is None:
+                continue
+            if invite.uses > data["uses"]:
+                used.append(InviteUse(invite.code, invite.inviter, invite.uses - data["uses"]))
+
+        gone = {code: data for code, data in links.items() if code not in current}
+        for code, (data, _deleted_at) in self._deleted.pop(guild.id, {}).items():
+            gone.setdefault(code, data)
+        for code, data in gone.items():
+            max_uses = data.get("max_uses")
+            uses = data.get("uses")
+            if max_uses and uses is not None and max_uses - uses == 1:
+                # The invite link was on its last uses and subsequently
+                # deleted so we're fairly sure this was the one used
+                used.append(InviteUse(code, data.get("inviter"), 1))
+
+        if current != links:
+            self.settings[guild.id]["invite_links"] = current
+            self.schedule_save(guild)
+        return used
+
+    async def _fetch(self, guild: discord.Guild) -> Optional[List[discord.Invite]]:
+        self.fetches += 1
+        try:
+            return await guild.invites()
+        except discord.HTTPException:
+            logger.error("Error fetching invites for guild %s. Discord Server Error.", guild.id)
+        except Exception:
+            logger.exception("Error fetching invites for guild %s.", guild.id)
+        return None
+
+    def schedule_save(self, guild: discord.Guild) -> None:
+        """Write the guild's settings to Config once things have been quiet for ``save_delay``."""
+        if guild.id in self._saves:
+            return
+        self._saves[guild.id] = (guild, self._spawn(self._save_later(guild)))
+
+    async def _save_later(self, guild: discord.Guild) -> None:
+        await asyncio.sleep(self.save_delay)
+        self._saves.pop(guild.id, None)
+        try:
+            await self._save(guild)
+        except Exception:
+            logger.exception("Error saving invites for guild %s.", guild.id)
+
+    def _spawn(self, coro: Awaitable[None]) -> asyncio.Task:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def close(self) -> None:
+        """Cancel pending work and write any unsaved changes straight away."""
+        pending = list(self._saves.values())
+        self._saves.clear()
+        for task in list(self._tasks):
+            task.cancel()
+        for burst in self._bursts.values():
+            if not burst.future.done():
+                burst.future.set_result([])
+        self._bursts.clear()
+        for guild, _task in pending:
+            try:
+                await self._save(guild)
+            except Exception:
+                logger.exception("Error saving invites for guild %s.", guild.id)
@@ -0,0 +1,248 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+import discord # type: ignore
+from red_commons.logging import getLogger # type: ignore
+
+logger = getLogger("red.beehive-cogs.Logging")
+
+MAX_EMBEDS = 10
+MAX_EMBED_CHARS = 6000
+MAX_CONTENT = 2000
+
+
+class _Pending:
+    __slots__ = ("content", "embed", "allowed_mentions", "kwargs", "queued_at")
+
+    def __init__(
+        self,
+        content: Optional[str],
+        embed: Optional[discord.Embed],
+        allowed_mentions: Optional[discord.AllowedMentions],
+        kwargs: Dict[str, Any],
+    ):
+        self.content = content
+        self.embed = embed
+        self.allowed_mentions = allowed_mentions
+        self.kwargs = kwargs
+        self.queued_at = time.monotonic()
+
+    @property
+    def is_embed(self) -> bool:
+        return self.embed is not None and self.content is None and not self.kwargs
+
+    @property
+    def is_text(self) -> bool:
+        return self.embed is None and self.content is not None and not self.kwargs
+
+
+class ChannelBuffer:
+    """
+    Ordered output queue for one log channel.
+
+    Consecutive embeds are packed up to 10 per message and consecutive plain text
+    lines are joined up to the 2000 character limit. A batch is sent as soon as it
+    is full, or once its oldest item has waited ``delay`` seconds. Messages are sent
+    one at a time, so they arrive in the order the events were logged.
+    """
+
+    def __init__(self, channel: discord.abc.Messageable, delay: float):
+        self.channel = channel
+        self.delay = delay
+        self.items: Deque[_Pending] = deque()
+        self.sent_messages = 0
+        self.sent_items = 0
+        self.failed = 0
+        self.last_lag = 0.0
+        self._full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    @property
+    def depth(self) -> int:
+        return len(self.items)
+
+    @property
+    def lag(self) -> float:
+        """How long the oldest pending item has been waiting, in seconds."""
+        if not self.items:
+            return 0.0
+        return time.monotonic() - self.items[0].queued_at
+
+    def put(self, item: _Pending) -> None:
+        self.items.append(item)
+        if self._batch_ready():
+            self._full.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def _batch_ready(self) -> bool:
+        """Whether the batch at the head of the queue can't grow any further."""
+        if self._closing or not self.items:
+            return bool(self.items)
+        first = self.items[0]
+        if not first.is_embed and not first.is_text:
+            return True
+        count = 0
+        chars = 0
+        for item in self.items:
+            if item.is_embed != first.is_embed or item.is_text != first.is_text:
+                # Anything of another kind ends the batch
+                return True
+            count += 1
+            if item.is_embed:
+                chars += len(item.embed)
+                if count >= MAX_EMBEDS or chars >= MAX_EMBED_CHARS:
+                    return True
+            else:
+                chars += len(item.content) + 1
+                if chars >= MAX_CONTENT:
+                    return True
+        return False
+
+    async def _run(self) -> None:
+        while self.items:
+            remaining = self.delay - self.lag
+            if remaining > 0 and not self._batch_ready():
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+            self._full.clear()
+            batch = self._take_batch()
+            await self._send(batch)
+            self.last_lag = time.monotonic() - batch[0].queued_at
+
+    def _take_batch(self) -> List[_Pending]:
+        first = self.items.popleft()
+        batch = [first]
+        if first.is_embed:
+            chars = len(first.embed)
+            while self.items and len(batch) < MAX_EMBEDS:
+                item = self.items[0]
+                if not item.is_embed or item.allowed_mentions is not first.allowed_mentions:
+                    break
+                if chars + len(item.embed) > MAX_EMBED_CHARS:
+                    break
+                chars += len(item.embed)
+                batch.append(self.items.popleft())
+        elif first.is_text:
+            chars = len(first.content)
+            while self.items:
+                item = self.items[0]
+                if not item.is_text or item.allowed_mentions is not first.allowed_mentions:
+                    break
+                if chars + len(item.content) + 1 > MAX_CONTENT:
+                    break
+                chars += len(item.content) + 1
+                batch.append(self.items.popleft())
+        return batch
+
+    async def _send(self, batch: List[_Pending]) -> None:
+        first = batch[0]
+        try:
+            if len(batch) == 1:
+                await self._send_one(first)
+            elif first.is_embed:
+                await self.channel.send(
+                    embeds=[item.embed for item in batch], allowed_mentions=first.allowed_mentions
+                )
+            else:
+                await self.channel.send(
+                    "\n".join(item.content for item in batch), allowed_mentions=first.allowed_mentions
+                )
+        except (discord.Forbidden, discord.NotFound):
+            self.failed += len(batch)
+            logger.warning("Dropped %s log messages for channel %s", len(batch), self.channel.id)
+            return
+        except discord.HTTPException:
+            if len(batch) == 1:
+                self.failed += 1
+                logger.exception("Failed to send log message to channel %s", self.channel.id)
+                return
+            # One bad embed shouldn't lose the rest of the batch
+            for item in batch:
+                try:
+                    await self._send_one(item)
+                except discord.HTTPException:
+                    self.failed += 1
+                    logger.exception("Failed to send log message to channel %s", self.channel.id)
+                else:
+                    self.sent_messages += 1
+                    self.sent_items += 1
+            return
+        self.sent_messages += 1
+        self.sent_items += len(batch)
+
+    async def _send_one(self, item: _Pending) -> None:
+        await self.channel.send(
+            item.content, embed=item.embed, allowed_mentions=item.allowed_mentions, **item.kwargs
+        )
+
+    async def close(self) -> None:
+        """Send everything still queued without waiting out the delay."""
+        self._closing = True
+        self._full.set()
+        if self._task is not None:
+            await self._task
+
+
+class BufferedChannel:
+    """
+    Stand-in for a log channel whose :meth:`send` queues the message on the
+    channel's :class:`ChannelBuffer` instead of sending it straight away.
+    Everything else is passed through to the real channel.
+    """
+
+    def __init__(self, channel: discord.TextChannel, buffer: ChannelBuffer):
+        self._channel = channel
+        self._buffer = buffer
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._channel, name)
+
+    async def send(
+        self,
+        content: Optional[str] = None,
+        *,
+        embed: Optional[discord.Embed] = None,
+        allowed_mentions: Optional[discord.AllowedMentions] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._buffer.put(_Pending(content, embed, allowed_mentions, kwargs))
+
+
+class LogOutput:
+    """Per-destination-channel output buffers for every log channel the cog writes to."""
+
+    def __init__(self, delay: float = 1.5):
+        self.delay = delay
+        self._buffers: Dict[int, ChannelBuffer] = {}
+
+    def wrap(self, channel: discord.TextChannel) -> BufferedChannel:
+        buffer = self._buffers.get(channel.id)
+        if buffer is None:
+            buffer = self._buffers[channel.id] = ChannelBuffer(channel, self.delay)
+        else:
+            # Keep the latest channel object in case the cached one went stale
+            buffer.channel = channel
+        return BufferedChannel(channel, buffer)
+
+    def guild_buffers(self, guild: discord.Guild) -> List[ChannelBuffer]:
+        return [buffer for buffer in self._buffers.values() if buffer.channel.guild.id == guild.id]
+
+    async def close(self, timeout: float = 10.0) -> None:
+        buffers = list(self._buffers.values())
+        self._buffers.clear()
+        if not buffers:
+            return
+        tasks = [asyncio.ensure_future(buffer.close()) for buffer in buffers]
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        for buffer in buffers:
+            if buffer._task is not None and not buffer._task.done():
+                buffer._task.cancel()
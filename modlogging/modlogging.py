@@ -1,5 +1,5 @@
-from collections import deque
-from typing import Deque, Dict, Union
+import asyncio
+from typing import Optional, Union
 
 import discord # type: ignore
 from red_commons.logging import getLogger # type: ignore
@@ -7,7 +7,11 @@ from redbot.core import Config, checks, commands, modlog # type: ignore
 from redbot.core.i18n import Translator, cog_i18n # type: ignore
 from redbot.core.utils.chat_formatting import humanize_list # type: ignore
 
+from .auditlog import AuditLogCorrelator
 from .eventmixin import CommandPrivs, EventChooser, EventMixin, MemberUpdateEnum
+from .invites import InviteTracker
+from .logbuffer import LogOutput
+from .persistence import SettingsWriter
 from .settings import inv_settings
 
 _ = Translator("ModLogging", __file__)
@@ -71,10 +75,13 @@ class ModLogging(EventMixin, commands.Cog):
         self.config.register_guild(**inv_settings)
         self.config.register_global(version="0.0.0")
         self.settings = {}
+        self.settings_writer = SettingsWriter(self.config)
         self._ban_cache = {}
-        self.invite_links_loop.start()
         self.allowed_mentions = discord.AllowedMentions(users=False, roles=False, everyone=False)
-        self.audit_log: Dict[int, Deque[discord.AuditLogEntry]] = {}
+        self.audit_log = AuditLogCorrelator()
+        self.log_output = LogOutput()
+        self.invite_tracker = InviteTracker(self.settings, self.save)
+        self._invite_sync: Optional[asyncio.Task] = None
 
     def format_help_for_context(self, ctx: commands.Context):
         """
@@ -84,7 +91,11 @@ class ModLogging(EventMixin, commands.Cog):
         return f"{pre_processed}\n\nVersion: {self.__version__}"
 
     async def cog_unload(self):
-        self.invite_links_loop.stop()
+        if self._invite_sync is not None:
+            self._invite_sync.cancel()
+        self.audit_log.clear()
+        await self.invite_tracker.close()
+        await self.log_output.close()
 
     async def red_delete_data_for_user(self, **kwargs):
         """
@@ -97,6 +108,8 @@ class ModLogging(EventMixin, commands.Cog):
             await self.migrate_2_8_5_settings()
         for guild_id in await self.config.all_guilds():
             self.settings[int(guild_id)] = await self.config.guild_from_id(guild_id).all()
+            self.settings_writer.loaded(int(guild_id), self.settings[int(guild_id)])
+        self._invite_sync = asyncio.create_task(self.sync_invite_links())
 
     async def migrate_2_8_5_settings(self):
         all_data = await self.config.all_guilds()
@@ -185,8 +198,22 @@ class ModLogging(EventMixin, commands.Cog):
             disabled = _("None  ")
         if ignored_channels:
             chans = ", ".join(c.mention for c in ignored_channels)
-            msg += _("Ignored Channels") + ": " + chans
-        await self.config.guild(ctx.guild).set(data)
+            msg += _("Ignored Channels") + ": " + chans + "\n"
+        buffers = self.log_output.guild_buffers(guild)
+        if buffers:
+            msg += "\n" + _("Log output queue") + ":\n"
+            for buffer in buffers:
+                if buffer.depth:
+                    status = _("{depth} pending, {lag:.1f}s behind").format(
+                        depth=buffer.depth, lag=buffer.lag
+                    )
+                else:
+                    status = _("idle, last delivered after {lag:.1f}s").format(lag=buffer.last_lag)
+                msg += f"{buffer.channel.mention}: {status}"
+                if buffer.failed:
+                    msg += _(" ({failed} failed)").format(failed=buffer.failed)
+                msg += "\n"
+        await self.save(ctx.guild)
         await ctx.maybe_send_embed(msg)
 
     @checks.admin_or_permissions(manage_channels=True)
@@ -201,9 +228,7 @@ class ModLogging(EventMixin, commands.Cog):
         pass
 
     async def save(self, guild: discord.Guild):
-        async with self.config.guild(guild).all() as all_settings:
-            for key, value in self.settings[guild.id].items():
-                all_settings[key] = value
+        await self.settings_writer.save(guild, self.settings[guild.id])
 
     @_logging.command(name="settings")
     async def _show_logging_settings(self, ctx: commands.Context):
@@ -317,6 +342,9 @@ class ModLogging(EventMixin, commands.Cog):
         for event in events:
             self.settings[ctx.guild.id][event]["enabled"] = true_or_false
         await self.save(ctx.guild)
+        if true_or_false and "user_join" in events:
+            # Invites aren't polled, so load them now or the first joins can't be attributed
+            await self.invite_tracker.refresh(ctx.guild)
         await ctx.send(
             _("{event} logs have been set to {true_or_false}").format(
                 event=humanize_list([e.replace("user_", "member_") for e in events]),
@@ -402,6 +430,8 @@ class ModLogging(EventMixin, commands.Cog):
             if "enabled" in self.settings[ctx.guild.id][setting]:
                 self.settings[ctx.guild.id][setting]["enabled"] = true_or_false
         await self.save(ctx.guild)
+        if true_or_false:
+            await self.invite_tracker.refresh(ctx.guild)
         await self.modlog_settings(ctx)
 
     @_logging.group(name="delete")
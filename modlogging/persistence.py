@@ -0,0 +1,71 @@
+import asyncio
+import copy
+from typing import Any, Dict
+
+import discord # type: ignore
+from redbot.core import Config # type: ignore
+
+# Rewrite a whole sub-dict instead of its keys one by one past this many changes
+MAX_RAW_WRITES = 10
+
+
+class SettingsWriter:
+    """
+    Persists the cog's in-memory guild settings to Config, writing only what changed.
+
+    A copy of what was last written is kept per guild. :meth:`save` compares the
+    live settings against it and writes just the top-level keys that differ; for
+    dict settings such as ``invite_links`` only the changed or removed entries are
+    written. Saves for one guild run one at a time, so a burst of saves collapses
+    into a single write of the combined changes and the rest find nothing to do.
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+        self._saved: Dict[int, Dict[str, Any]] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self.saves = 0
+        self.writes = 0
+
+    def loaded(self, guild_id: int, data: Dict[str, Any]) -> None:
+        """Record ``data`` as what Config currently holds for the guild."""
+        self._saved[guild_id] = copy.deepcopy(data)
+
+    async def save(self, guild: discord.Guild, data: Dict[str, Any]) -> int:
+        """Write the parts of ``data`` that changed since the last save. Returns the number of writes."""
+        lock = self._locks.get(guild.id)
+        if lock is None:
+            lock = self._locks[guild.id] = asyncio.Lock()
+        async with lock:
+            self.saves += 1
+            saved = self._saved.get(guild.id)
+            group = self.config.guild(guild)
+            if saved is None:
+                # Nothing to compare against yet
+                async with group.all() as all_settings:
+                    all_settings.update(data)
+                self.writes += 1
+                self.loaded(guild.id, data)
+                return 1
+            writes = 0
+            for key, value in list(data.items()):
+                old = saved.get(key)
+                if value == old:
+                    continue
+                if isinstance(value, dict) and isinstance(old, dict):
+                    changed = [sub for sub, sub_value in value.items() if old.get(sub) != sub_value]
+                    removed = [sub for sub in old if sub not in value]
+                    if len(changed) + len(removed) <= MAX_RAW_WRITES:
+                        for sub in changed:
+                            await group.set_raw(key, sub, value=value[sub])
+                            old[sub] = copy.deepcopy(value[sub])
+                        for sub in removed:
+                            await group.clear_raw(key, sub)
+                            del old[sub]
+                        writes += len(changed) + len(removed)
+                        continue
+                await group.set_raw(key, value=value)
+                saved[key] = copy.deepcopy(value)
+                writes += 1
+            self.writes += writes
+            return writes
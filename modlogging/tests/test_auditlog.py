@@ -0,0 +1,71 @@
+import asyncio
+import datetime
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("redbot")
+
+import discord  # noqa: E402
+
+from modlogging.auditlog import AuditLogCorrelator  # noqa: E402
+
+GUILD = SimpleNamespace(id=1)
+
+
+def _entry(action, target_id, minutes_ago=0.0):
+    created_at = discord.utils.utcnow() - datetime.timedelta(minutes=minutes_ago)
+    return SimpleNamespace(
+        guild=GUILD,
+        action=action,
+        target=SimpleNamespace(id=target_id),
+        after=SimpleNamespace(),
+        created_at=created_at,
+        user=None,
+    )
+
+
+def test_old_merged_entry_does_not_hide_newer_entries():
+    correlator = AuditLogCorrelator(timeout=0.01)
+    role_update = _entry(discord.AuditLogAction.role_update, 42)
+    correlator.feed(role_update)
+    # A repeat delete bumps an entry whose created_at is the first delete's
+    correlator.feed(_entry(discord.AuditLogAction.message_delete, 7, minutes_ago=30))
+
+    entry = asyncio.run(correlator.wait_for(GUILD, discord.AuditLogAction.role_update, 42))
+    assert entry is role_update
+    assert correlator.missed == 0
+    assert correlator.fetches == 0
+
+
+def test_stale_entry_of_searched_action_is_ignored():
+    correlator = AuditLogCorrelator(timeout=0.01)
+    correlator.feed(_entry(discord.AuditLogAction.kick, 42, minutes_ago=5))
+
+    async def run():
+        guild = SimpleNamespace(id=GUILD.id, audit_logs=_no_entries)
+        return await correlator.wait_for(guild, discord.AuditLogAction.kick, 42)
+
+    assert asyncio.run(run()) is None
+    assert correlator.missed == 1
+
+
+def test_wait_for_first_returns_the_entry_that_arrives():
+    correlator = AuditLogCorrelator(timeout=1.0)
+    kick = _entry(discord.AuditLogAction.kick, 42)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.01, correlator.feed, kick)
+        return await correlator.wait_for_first(
+            GUILD, (discord.AuditLogAction.ban, discord.AuditLogAction.kick), 42
+        )
+
+    assert asyncio.run(run()) is kick
+    assert correlator.fetches == 0
+    assert not correlator._waiters
+
+
+async def _no_entries(**kwargs):
+    return
+    yield
@@ -1,6 +1,5 @@
 from redbot.core import commands, Config  # type: ignore
 import discord
-import aiohttp
 import asyncio
 from collections import Counter
 from datetime import datetime, timedelta
@@ -29,12 +28,18 @@ class OpenBanList(commands.Cog):
         }
         self.config.register_guild(**default_guild)
         self.banlist_url = "https://openbanlist.cc/data/banlist.json"
-        self.session = aiohttp.ClientSession()
         self.bot.loop.create_task(self.update_banlist_periodically())
         self.timeout_task = self.bot.loop.create_task(self.timeout_enforcer())
 
+    @property
+    def http(self):
+        # Pooled session shared by the BeeHive cogs, looked up per use so load order doesn't matter
+        cog = self.bot.get_cog("BeeHiveHTTP")
+        if cog is None:
+            raise RuntimeError("The beehivehttp cog must be loaded to make web requests.")
+        return cog.provider
+
     def cog_unload(self):
-        self.bot.loop.create_task(self.session.close())
         if hasattr(self, "timeout_task"):
             self.timeout_task.cancel()
 
@@ -146,7 +151,7 @@ class OpenBanList(commands.Cog):
         else:
             user_id = user.id
 
-        async with self.session.get(self.banlist_url) as response:
+        async with self.http.get(self.banlist_url) as response:
             if response.status == 200:
                 banlist_data = await response.json()
                 # Find all bans for this user by reported_id
@@ -267,7 +272,7 @@ class OpenBanList(commands.Cog):
     @banlist.command()
     async def stats(self, ctx):
         """Show statistics about the banlist."""
-        async with self.session.get(self.banlist_url) as response:
+        async with self.http.get(self.banlist_url) as response:
             if response.status == 200:
                 banlist_data = await response.json()
                 total_banned = len(banlist_data)
@@ -326,7 +331,7 @@ class OpenBanList(commands.Cog):
 
         await ctx.send("🔍 Scanning server for users on the OpenBanlist...")
 
-        async with self.session.get(self.banlist_url) as response:
+        async with self.http.get(self.banlist_url) as response:
             if response.status != 200:
                 await ctx.send("Failed to fetch the banlist. Please try again later.")
                 return
@@ -478,12 +483,14 @@ class OpenBanList(commands.Cog):
         await ctx.send(embed=summary_embed)
 
     async def update_banlist_periodically(self):
+        # The shared HTTP session comes from another cog, wait until every cog has loaded
+        await self.bot.wait_until_red_ready()
         while True:
             await self.update_banlist()
             await asyncio.sleep(86400)  # 24 hours
 
     async def update_banlist(self):
-        async with self.session.get(self.banlist_url) as response:
+        async with self.http.get(self.banlist_url) as response:
             if response.status == 200:
                 banlist_data = await response.json()
                 for guild in self.bot.guilds:
@@ -534,7 +541,7 @@ class OpenBanList(commands.Cog):
                     log_channel_id = await self.config.guild(guild).log_channel()
                     log_channel = guild.get_channel(log_channel_id) if log_channel_id else None
 
-                    async with self.session.get(self.banlist_url) as response:
+                    async with self.http.get(self.banlist_url) as response:
                         if response.status != 200:
                             continue
                         banlist_data = await response.json()
@@ -572,7 +579,7 @@ class OpenBanList(commands.Cog):
         if not await self.config.guild(guild).enabled():
             return
 
-        async with self.session.get(self.banlist_url) as response:
+        async with self.http.get(self.banlist_url) as response:
             if response.status == 200:
                 banlist_data = await response.json()
                 log_channel_id = await self.config.guild(guild).log_channel()
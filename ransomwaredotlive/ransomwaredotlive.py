@@ -1,6 +1,5 @@
 import discord #type: ignore
 from redbot.core import commands #type: ignore
-import aiohttp #type: ignore
 import asyncio
 import datetime
 from discord.ext import tasks #type: ignore
@@ -18,6 +17,14 @@ class RansomwareDotLive(commands.Cog):
         self.last_checked_name = None
         self.check_recent_victims.start()
 
+    @property
+    def http(self):
+        # Pooled session shared by the BeeHive cogs, looked up per use so load order doesn't matter
+        cog = self.bot.get_cog("BeeHiveHTTP")
+        if cog is None:
+            raise RuntimeError("The beehivehttp cog must be loaded to make web requests.")
+        return cog.provider
+
     def cog_unload(self):
         self.check_recent_victims.cancel()
 
@@ -33,21 +40,20 @@ class RansomwareDotLive(commands.Cog):
         headers = {
             "User-Agent": "DiscordBot (BeeHive-Cogs, ransomwaredotlive)"
         }
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get("https://api.ransomware.live/recentvictims") as response:
-                if response.status != 200:
-                    return
-
-                data = await response.json()
-                today = datetime.datetime.now().date()
-                new_victims = [item for item in data if datetime.datetime.strptime(item['date'], '%Y-%m-%d').date() == today]
-
-                if new_victims:
-                    embed = discord.Embed(title="Today's ransomware rundown", color=0xfffffe)
-                    for victim in new_victims:
-                        embed.add_field(name=victim['name'], value=f"Date: {victim['date']}", inline=False)
-                    await self.send_alert(embed)
-                    self.last_checked_name = new_victims[0]['name']  # Update last_checked_name only if there are new victims
+        async with self.http.get("https://api.ransomware.live/recentvictims", headers=headers) as response:
+            if response.status != 200:
+                return
+
+            data = await response.json()
+            today = datetime.datetime.now().date()
+            new_victims = [item for item in data if datetime.datetime.strptime(item['date'], '%Y-%m-%d').date() == today]
+
+            if new_victims:
+                embed = discord.Embed(title="Today's ransomware rundown", color=0xfffffe)
+                for victim in new_victims:
+                    embed.add_field(name=victim['name'], value=f"Date: {victim['date']}", inline=False)
+                await self.send_alert(embed)
+                self.last_checked_name = new_victims[0]['name']  # Update last_checked_name only if there are new victims
 
     @commands.group()
     async def ransomware(self, ctx):
@@ -57,156 +63,154 @@ class RansomwareDotLive(commands.Cog):
     @ransomware.command()
     async def groups(self, ctx):
         """Get the list of ransomware groups"""
-        async with aiohttp.ClientSession() as session:
-            async with session.get("https://api.ransomware.live/groups") as response:
-                if response.status != 200:
-                    await ctx.send("Failed to fetch data from ransomware.live API.")
-                    return
-
-                data = await response.json()
-                pages = []
-                for group in data:
-                    embed = discord.Embed(title=group["name"], color=0xfffffe)
+        async with self.http.get("https://api.ransomware.live/groups") as response:
+            if response.status != 200:
+                await ctx.send("Failed to fetch data from ransomware.live API.")
+                return
+
+            data = await response.json()
+            pages = []
+            for group in data:
+                embed = discord.Embed(title=group["name"], color=0xfffffe)
                     
-                    if 'description' in group and group['description']:
-                        # Transform HTML to markdown in the description
-                        description = group['description'].replace('<br>', '\n').replace('<b>', '**').replace('</b>', '**').replace('<BR>', '\n')
-                        embed.description = description
+                if 'description' in group and group['description']:
+                    # Transform HTML to markdown in the description
+                    description = group['description'].replace('<br>', '\n').replace('<b>', '**').replace('</b>', '**').replace('<BR>', '\n')
+                    embed.description = description
                     
-                    if 'locations' in group:
-                        for location in group['locations']:
-                            status = "Available" if location['available'] else "Unavailable"
-                            embed.add_field(name=location['title'], value=f"URL: {location['slug']}\nStatus: {status}", inline=False)
+                if 'locations' in group:
+                    for location in group['locations']:
+                        status = "Available" if location['available'] else "Unavailable"
+                        embed.add_field(name=location['title'], value=f"URL: {location['slug']}\nStatus: {status}", inline=False)
                     
-                    if 'profile' in group and group['profile']:
-                        for profile_link in group['profile']:
-                            embed.add_field(name="Profile", value=profile_link, inline=False)
+                if 'profile' in group and group['profile']:
+                    for profile_link in group['profile']:
+                        embed.add_field(name="Profile", value=profile_link, inline=False)
                     
-                    pages.append(embed)
-
-                message = await ctx.send(embed=pages[0])
-
-                # Add navigation reactions if there are multiple pages
-                if len(pages) > 1:
-                    await message.add_reaction("⬅️")
-                    await message.add_reaction("➡️")
-                    await message.add_reaction("❌")  # Add close reaction
-
-                    def check(reaction, user):
-                        return user == ctx.author and str(reaction.emoji) in ["⬅️", "➡️", "❌"] and reaction.message.id == message.id
-
-                    current_page = 0
-                    while True:
-                        try:
-                            reaction, user = await self.bot.wait_for("reaction_add", timeout=60.0, check=check)
-                            if str(reaction.emoji) == "⬅️":
-                                current_page = (current_page - 1) % len(pages)
-                            elif str(reaction.emoji) == "➡️":
-                                current_page = (current_page + 1) % len(pages)
-                            elif str(reaction.emoji) == "❌":
-                                await message.delete()
-                                break
-
-                            await message.edit(embed=pages[current_page])
-                            await message.remove_reaction(reaction, user)
-                        except asyncio.TimeoutError:
+                pages.append(embed)
+
+            message = await ctx.send(embed=pages[0])
+
+            # Add navigation reactions if there are multiple pages
+            if len(pages) > 1:
+                await message.add_reaction("⬅️")
+                await message.add_reaction("➡️")
+                await message.add_reaction("❌")  # Add close reaction
+
+                def check(reaction, user):
+                    return user == ctx.author and str(reaction.emoji) in ["⬅️", "➡️", "❌"] and reaction.message.id == message.id
+
+                current_page = 0
+                while True:
+                    try:
+                        reaction, user = await self.bot.wait_for("reaction_add", timeout=60.0, check=check)
+                        if str(reaction.emoji) == "⬅️":
+                            current_page = (current_page - 1) % len(pages)
+                        elif str(reaction.emoji) == "➡️":
+                            current_page = (current_page + 1) % len(pages)
+                        elif str(reaction.emoji) == "❌":
+                            await message.delete()
                             break
 
-                    await message.clear_reactions()
+                        await message.edit(embed=pages[current_page])
+                        await message.remove_reaction(reaction, user)
+                    except asyncio.TimeoutError:
+                        break
+
+                await message.clear_reactions()
 
     @ransomware.command()
     async def recent(self, ctx):
         """Get the latest ransomware information"""
-        async with aiohttp.ClientSession() as session:
-            async with session.get("https://api.ransomware.live/recentvictims") as response:
-                if response.status != 200:
-                    await ctx.send("Failed to fetch data from ransomware.live API.")
-                    return
-
-                data = await response.json()
-                pages = []
-                for item in data:
-                    embed = discord.Embed(title=item["post_title"], color=0xfffffe)
-                    embed.description = item['description']
+        async with self.http.get("https://api.ransomware.live/recentvictims") as response:
+            if response.status != 200:
+                await ctx.send("Failed to fetch data from ransomware.live API.")
+                return
+
+            data = await response.json()
+            pages = []
+            for item in data:
+                embed = discord.Embed(title=item["post_title"], color=0xfffffe)
+                embed.description = item['description']
                     
-                    if 'activity' in item:
-                        embed.add_field(name="Industry of service", value=item['activity'], inline=True)
-                    if 'country' in item:
-                        embed.add_field(name="Country of business", value=item['country'], inline=True)
+                if 'activity' in item:
+                    embed.add_field(name="Industry of service", value=item['activity'], inline=True)
+                if 'country' in item:
+                    embed.add_field(name="Country of business", value=item['country'], inline=True)
                     
-                    # Convert datetime string to timestamp
-                    if 'published' in item:
-                        try:
-                            published_timestamp = int(datetime.datetime.strptime(item['published'], "%Y-%m-%d %H:%M:%S.%f").timestamp())
-                            embed.add_field(name="Published by hackers", value=f"**<t:{published_timestamp}:R>**", inline=True)
-                        except ValueError:
-                            pass
-                    if 'discovered' in item:
-                        try:
-                            discovered_timestamp = int(datetime.datetime.strptime(item['discovered'], "%Y-%m-%d %H:%M:%S.%f").timestamp())
-                            embed.add_field(name="Discovered by indexer", value=f"**<t:{discovered_timestamp}:R>**", inline=True)
-                        except ValueError:
-                            pass
-                    if 'group_name' in item:
-                        embed.add_field(name="Ransom group", value=f"`{item['group_name']}`", inline=True)
-                    if 'website' in item and item['website'].strip():
-                        embed.add_field(name="Website compromised", value=f"`{item['website']}`", inline=True)
-                    if 'screenshot' in item and item['screenshot'].strip():
-                        embed.set_image(url=item['screenshot'])
-                    if 'infostealer' in item:
-                        infostealer_info = item['infostealer']
-                        if 'employees' in infostealer_info and infostealer_info.get('employees', 0) != 0:
-                            embed.add_field(name="Employees with data stolen", value=infostealer_info.get('employees', 'N/A'), inline=True)
-                        if 'thirdparties' in infostealer_info and infostealer_info.get('thirdparties', 0) != 0:
-                            embed.add_field(name="Third parties with data stolen", value=infostealer_info.get('thirdparties', 'N/A'), inline=True)
-                        if 'users' in infostealer_info and infostealer_info.get('users', 0) != 0:
-                            embed.add_field(name="Users with data stolen", value=infostealer_info.get('users', 'N/A'), inline=True)
+                # Convert datetime string to timestamp
+                if 'published' in item:
+                    try:
+                        published_timestamp = int(datetime.datetime.strptime(item['published'], "%Y-%m-%d %H:%M:%S.%f").timestamp())
+                        embed.add_field(name="Published by hackers", value=f"**<t:{published_timestamp}:R>**", inline=True)
+                    except ValueError:
+                        pass
+                if 'discovered' in item:
+                    try:
+                        discovered_timestamp = int(datetime.datetime.strptime(item['discovered'], "%Y-%m-%d %H:%M:%S.%f").timestamp())
+                        embed.add_field(name="Discovered by indexer", value=f"**<t:{discovered_timestamp}:R>**", inline=True)
+                    except ValueError:
+                        pass
+                if 'group_name' in item:
+                    embed.add_field(name="Ransom group", value=f"`{item['group_name']}`", inline=True)
+                if 'website' in item and item['website'].strip():
+                    embed.add_field(name="Website compromised", value=f"`{item['website']}`", inline=True)
+                if 'screenshot' in item and item['screenshot'].strip():
+                    embed.set_image(url=item['screenshot'])
+                if 'infostealer' in item:
+                    infostealer_info = item['infostealer']
+                    if 'employees' in infostealer_info and infostealer_info.get('employees', 0) != 0:
+                        embed.add_field(name="Employees with data stolen", value=infostealer_info.get('employees', 'N/A'), inline=True)
+                    if 'thirdparties' in infostealer_info and infostealer_info.get('thirdparties', 0) != 0:
+                        embed.add_field(name="Third parties with data stolen", value=infostealer_info.get('thirdparties', 'N/A'), inline=True)
+                    if 'users' in infostealer_info and infostealer_info.get('users', 0) != 0:
+                        embed.add_field(name="Users with data stolen", value=infostealer_info.get('users', 'N/A'), inline=True)
                     
-                    pages.append(embed)
+                pages.append(embed)
 
-                message = await ctx.send(embed=pages[0])
+            message = await ctx.send(embed=pages[0])
 
-                # Add URL button if post_url is present
-                view = discord.ui.View()
-                if 'post_url' in data[0] and data[0]['post_url'].strip():
-                    button = discord.ui.Button(label="Read the leak post", url=data[0]['post_url'])
-                    view.add_item(button)
+            # Add URL button if post_url is present
+            view = discord.ui.View()
+            if 'post_url' in data[0] and data[0]['post_url'].strip():
+                button = discord.ui.Button(label="Read the leak post", url=data[0]['post_url'])
+                view.add_item(button)
 
-                # Add URL button to search the group name on Google if group_name is present
-                if 'group_name' in data[0] and data[0]['group_name'].strip():
-                    google_search_url = f"https://www.google.com/search?q={data[0]['group_name']}%20ransomware%20group"
-                    google_button = discord.ui.Button(label="Search on web", url=google_search_url)
-                    view.add_item(google_button)
+            # Add URL button to search the group name on Google if group_name is present
+            if 'group_name' in data[0] and data[0]['group_name'].strip():
+                google_search_url = f"https://www.google.com/search?q={data[0]['group_name']}%20ransomware%20group"
+                google_button = discord.ui.Button(label="Search on web", url=google_search_url)
+                view.add_item(google_button)
 
-                await message.edit(view=view)
+            await message.edit(view=view)
 
-                emojis = ['⬅️', '❌', '➡️']
-                for emoji in emojis:
-                    await message.add_reaction(emoji)
+            emojis = ['⬅️', '❌', '➡️']
+            for emoji in emojis:
+                await message.add_reaction(emoji)
 
-                def check(reaction, user):
-                    return user == ctx.author and str(reaction.emoji) in emojis and reaction.message.id == message.id
+            def check(reaction, user):
+                return user == ctx.author and str(reaction.emoji) in emojis and reaction.message.id == message.id
 
-                current_page = 0
-                while True:
-                    try:
-                        reaction, user = await self.bot.wait_for('reaction_add', timeout=60.0, check=check)
-
-                        if str(reaction.emoji) == '⬅️':
-                            current_page = (current_page - 1) % len(pages)
-                            await message.edit(embed=pages[current_page])
-                        elif str(reaction.emoji) == '➡️':
-                            current_page = (current_page + 1) % len(pages)
-                            await message.edit(embed=pages[current_page])
-                        elif str(reaction.emoji) == '❌':
-                            await message.delete()
-                            break
-
-                        await message.remove_reaction(reaction, user)
-                    except asyncio.TimeoutError:
-                        for emoji in emojis:
-                            await message.remove_reaction(emoji, self.bot.user)
+            current_page = 0
+            while True:
+                try:
+                    reaction, user = await self.bot.wait_for('reaction_add', timeout=60.0, check=check)
+
+                    if str(reaction.emoji) == '⬅️':
+                        current_page = (current_page - 1) % len(pages)
+                        await message.edit(embed=pages[current_page])
+                    elif str(reaction.emoji) == '➡️':
+                        current_page = (current_page + 1) % len(pages)
+                        await message.edit(embed=pages[current_page])
+                    elif str(reaction.emoji) == '❌':
+                        await message.delete()
                         break
+
+                    await message.remove_reaction(reaction, user)
+                except asyncio.TimeoutError:
+                    for emoji in emojis:
+                        await message.remove_reaction(emoji, self.bot.user)
+                    break
     
     @ransomware.command()
     async def about(self, ctx):
@@ -39,15 +39,17 @@ class Skysearch(commands.Cog):
         self.ukr_conflict_set = ukr_conflict_set
         self.agri_utility_set = agri_utility_set
         
-    async def cog_unload(self):
-        if hasattr(self, '_http_client'):
-            await self._http_client.close()
+    @property
+    def http(self):
+        # Pooled session shared by the BeeHive cogs, looked up per use so load order doesn't matter
+        cog = self.bot.get_cog("BeeHiveHTTP")
+        if cog is None:
+            raise RuntimeError("The beehivehttp cog must be loaded to make web requests.")
+        return cog.provider
 
     async def _make_request(self, url):
-        if not hasattr(self, '_http_client'):
-            self._http_client = aiohttp.ClientSession()
         try:
-            async with self._http_client.get(url) as response:
+            async with self.http.get(url) as response:
                 response.raise_for_status()
                 return await response.json()
         except aiohttp.ClientError as e:
@@ -252,10 +254,8 @@ class Skysearch(commands.Cog):
                 pass
 
     async def _get_photo_by_hex(self, hex_id):
-        if not hasattr(self, '_http_client'):
-            self._http_client = aiohttp.ClientSession()
         try:
-            async with self._http_client.get(f'https://api.planespotters.net/pub/photos/hex/{hex_id}') as response:
+            async with self.http.get(f'https://api.planespotters.net/pub/photos/hex/{hex_id}') as response:
                 if response.status == 200:
                     json_out = await response.json()
                     if 'photos' in json_out and json_out['photos']:
@@ -282,9 +282,7 @@ class Skysearch(commands.Cog):
         url = "https://api.airplanes.live/stats"
 
         try:
-            if not hasattr(self, '_http_client'):
-                self._http_client = aiohttp.ClientSession()
-            async with self._http_client.get(url) as response:
+            async with self.http.get(url) as response:
                 if response.status == 200:
                     data = await response.json()
                 else:
@@ -844,9 +842,8 @@ class Skysearch(commands.Cog):
         try:
             async with ctx.typing():
                 url1 = f"https://airport-data.com/api/ap_info.json?{code_type}={code}"
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url1) as response1:
-                        data1 = await response1.json()
+                async with self.http.get(url1) as response1:
+                    data1 = await response1.json()
                 
                 if 'error' in data1 or not data1 or 'name' not in data1:
                     embed = discord.Embed(title="Error", description="No airport found with the provided code.", color=0xff4545)
@@ -877,13 +874,12 @@ class Skysearch(commands.Cog):
                         "Content-Type": "application/json",
                         "Authorization": f"Bearer {openai_api_key}"
                     }
-                    async with aiohttp.ClientSession() as session:
-                        async with session.post("https://api.openai.com/v1/chat/completions", headers=headers, json=openai_payload) as openai_response:
-                            if openai_response.status == 200:
-                                openai_data = await openai_response.json()
-                                summary = openai_data.get('choices', [{}])[0].get('message', {}).get('content', '')
-                                embed.description = summary
-                                embed.set_footer(text="Summary generated using AI, check factual accuracy")
+                    async with self.http.post("https://api.openai.com/v1/chat/completions", headers=headers, json=openai_payload) as openai_response:
+                        if openai_response.status == 200:
+                            openai_data = await openai_response.json()
+                            summary = openai_data.get('choices', [{}])[0].get('message', {}).get('content', '')
+                            embed.description = summary
+                            embed.set_footer(text="Summary generated using AI, check factual accuracy")
 
                 googlemaps_tokens = await self.bot.get_shared_api_tokens("googlemaps")
                 google_street_view_api_key = googlemaps_tokens.get("api_key", "YOUR_API_KEY")
@@ -899,17 +895,16 @@ class Skysearch(commands.Cog):
                         "maptype": "hybrid",
                         "key": google_street_view_api_key
                     }
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(street_view_base_url, params=street_view_params) as street_view_response:
-                            if street_view_response.status == 200:
-                                # Save the raw binary that the API returns as an image to set in embed.set_image
-                                street_view_image_url = "attachment://street_view_image.png"
-                                embed.set_image(url=street_view_image_url)
-                                street_view_image_stream = io.BytesIO(await street_view_response.read())
-                                file = discord.File(fp=street_view_image_stream, filename="street_view_image.png")
-                            else:
-                                # Handle the error accordingly, e.g., log it or send a message to the user
-                                pass
+                    async with self.http.get(street_view_base_url, params=street_view_params) as street_view_response:
+                        if street_view_response.status == 200:
+                            # Save the raw binary that the API returns as an image to set in embed.set_image
+                            street_view_image_url = "attachment://street_view_image.png"
+                            embed.set_image(url=street_view_image_url)
+                            street_view_image_stream = io.BytesIO(await street_view_response.read())
+                            file = discord.File(fp=street_view_image_stream, filename="street_view_image.png")
+                        else:
+                            # Handle the error accordingly, e.g., log it or send a message to the user
+                            pass
 
                 view = discord.ui.View(timeout=180)  # Initialize view outside of the else block
                 if 'icao' in data1:
@@ -959,22 +954,20 @@ class Skysearch(commands.Cog):
         try:
             if code_type == 'iata':
                 url1 = f"https://airport-data.com/api/ap_info.json?iata={code}"
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url1) as response1:
-                        data1 = await response1.json()
-                        if 'icao' in data1:
-                            code = data1['icao']
-                        else:
-                            embed = discord.Embed(title="Error", description="No ICAO code found for the provided IATA code.", color=0xff4545)
-                            await ctx.send(embed=embed)
-                            return
+                async with self.http.get(url1) as response1:
+                    data1 = await response1.json()
+                    if 'icao' in data1:
+                        code = data1['icao']
+                    else:
+                        embed = discord.Embed(title="Error", description="No ICAO code found for the provided IATA code.", color=0xff4545)
+                        await ctx.send(embed=embed)
+                        return
 
             api_token = await self.bot.get_shared_api_tokens("airportdbio")
             if api_token and 'api_token' in api_token:
                 url2 = f"https://airportdb.io/api/v1/airport/{code}?apiToken={api_token['api_token']}"
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url2) as response2:
-                        data2 = await response2.json()
+                async with self.http.get(url2) as response2:
+                    data2 = await response2.json()
 
                 if 'error' in data2:
                     error_message = data2['error']
@@ -1081,22 +1074,20 @@ class Skysearch(commands.Cog):
         try:
             if code_type == 'iata':
                 url1 = f"https://airport-data.com/api/ap_info.json?iata={code}"
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url1) as response1:
-                        data1 = await response1.json()
-                        if 'icao' in data1:
-                            code = data1['icao']
-                        else:
-                            embed = discord.Embed(title="Error", description="No ICAO code found for the provided IATA code.", color=0xff4545)
-                            await ctx.send(embed=embed)
-                            return
+                async with self.http.get(url1) as response1:
+                    data1 = await response1.json()
+                    if 'icao' in data1:
+                        code = data1['icao']
+                    else:
+                        embed = discord.Embed(title="Error", description="No ICAO code found for the provided IATA code.", color=0xff4545)
+                        await ctx.send(embed=embed)
+                        return
 
             api_token = await self.bot.get_shared_api_tokens("airportdbio")
             if api_token and 'api_token' in api_token:
                 url = f"https://airportdb.io/api/v1/airport/{code}?apiToken={api_token['api_token']}"
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url) as response:
-                        data = await response.json()
+                async with self.http.get(url) as response:
+                    data = await response.json()
 
                 if 'error' in data:
                     error_message = data['error']
@@ -1165,30 +1156,29 @@ class Skysearch(commands.Cog):
             return
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"https://airport-data.com/api/ap_info.json?{code_type}={code}") as response1:
-                    data1 = await response1.json()
-                    latitude, longitude = data1.get('latitude'), data1.get('longitude')
-                    if not latitude or not longitude:
-                        await ctx.send(embed=discord.Embed(title="Error", description="Could not fetch latitude and longitude for the provided code.", color=0xff4545))
-                        return
-                    if data1.get('country_code') != 'US':
-                        await ctx.send(embed=discord.Embed(title="Error", description="Weather forecasts are currently only available for airports in the United States.", color=0xff4545))
-                        return
+            async with self.http.get(f"https://airport-data.com/api/ap_info.json?{code_type}={code}") as response1:
+                data1 = await response1.json()
+                latitude, longitude = data1.get('latitude'), data1.get('longitude')
+                if not latitude or not longitude:
+                    await ctx.send(embed=discord.Embed(title="Error", description="Could not fetch latitude and longitude for the provided code.", color=0xff4545))
+                    return
+                if data1.get('country_code') != 'US':
+                    await ctx.send(embed=discord.Embed(title="Error", description="Weather forecasts are currently only available for airports in the United States.", color=0xff4545))
+                    return
 
-                async with session.get(f"https://api.weather.gov/points/{latitude},{longitude}") as response2:
-                    data2 = await response2.json()
-                    forecast_url = data2.get('properties', {}).get('forecast')
-                    if not forecast_url:
-                        await ctx.send(embed=discord.Embed(title="Error", description="Could not fetch forecast URL.", color=0xff4545))
-                        return
+            async with self.http.get(f"https://api.weather.gov/points/{latitude},{longitude}") as response2:
+                data2 = await response2.json()
+                forecast_url = data2.get('properties', {}).get('forecast')
+                if not forecast_url:
+                    await ctx.send(embed=discord.Embed(title="Error", description="Could not fetch forecast URL.", color=0xff4545))
+                    return
 
-                async with session.get(forecast_url) as response3:
-                    data3 = await response3.json()
-                    periods = data3.get('properties', {}).get('periods')
-                    if not periods:
-                        await ctx.send(embed=discord.Embed(title="Error", description="Could not fetch forecast details.", color=0xff4545))
-                        return
+            async with self.http.get(forecast_url) as response3:
+                data3 = await response3.json()
+                periods = data3.get('properties', {}).get('periods')
+                if not periods:
+                    await ctx.send(embed=discord.Embed(title="Error", description="Could not fetch forecast details.", color=0xff4545))
+                    return
 
             combined_pages = []
             
@@ -17,6 +17,14 @@ class ChatSummary(commands.Cog):
         default_user = {"customer_id": None, "is_afk": False, "afk_since": None, "preferred_model": "gpt-4o"}
         self.config.register_user(**default_user)
 
+    @property
+    def http(self):
+        # Pooled session shared by the BeeHive cogs, looked up per use so load order doesn't matter
+        cog = self.bot.get_cog("BeeHiveHTTP")
+        if cog is None:
+            raise RuntimeError("The beehivehttp cog must be loaded to make web requests.")
+        return cog.provider
+
     async def _track_stripe_event(self, ctx, customer_id, model_name, event_type, tokens):
         stripe_tokens = await self.bot.get_shared_api_tokens("stripe")
         stripe_key = stripe_tokens.get("api_key") if stripe_tokens else None
@@ -33,16 +41,15 @@ class ChatSummary(commands.Cog):
                 "payload[stripe_customer_id]": customer_id,
                 "payload[tokens]": tokens
             }
-            async with aiohttp.ClientSession() as session:
-                try:
-                    async with session.post(stripe_url, headers=stripe_headers, data=stripe_payload) as stripe_response:
-                        if stripe_response.status == 400:
-                            error_message = await stripe_response.text()
-                            raise Exception(f"Failed to track event with Stripe. Status code: 400, Error: {error_message}")
-                        elif stripe_response.status != 200:
-                            await ctx.send(f"Failed to track event with Stripe. Status code: {stripe_response.status}", delete_after=10)
-                except aiohttp.ClientError as e:
-                    await ctx.send(f"Failed to connect to Stripe API: {str(e)}", delete_after=10)
+            try:
+                async with self.http.post(stripe_url, headers=stripe_headers, data=stripe_payload) as stripe_response:
+                    if stripe_response.status == 400:
+                        error_message = await stripe_response.text()
+                        raise Exception(f"Failed to track event with Stripe. Status code: 400, Error: {error_message}")
+                    elif stripe_response.status != 200:
+                        await ctx.send(f"Failed to track event with Stripe. Status code: {stripe_response.status}", delete_after=10)
+            except aiohttp.ClientError as e:
+                await ctx.send(f"Failed to connect to Stripe API: {str(e)}", delete_after=10)
 
                         
     @commands.group(name="summarizer")
@@ -217,102 +224,101 @@ class ChatSummary(commands.Cog):
 
                                         async with self.ctx.typing():
                                             start_time_first_call = time.time()  # Start timing the first call
-                                            async with aiohttp.ClientSession() as session:
-                                                async with session.post("https://api.openai.com/v1/responses", headers=headers, json=payload) as response:
-                                                    if response.status == 200:
-                                                        data = await response.json()
-
-                                                        # Extract the message content
-                                                        message = next((item for item in data["output"] if item["type"] == "message"), None)
-                                                        if message:
-                                                            content = message["content"][0]
-                                                            output_text = content["text"]
-
-                                                            # Tokenize input and output using tiktoken's encoding for the first call
-                                                            encoding = tiktoken.get_encoding("o200k_base")
-                                                            input_tokens_first_call = len(encoding.encode(input_text))
-                                                            output_tokens_first_call = len(encoding.encode(output_text))
+                                            async with self.parent_cog.http.post("https://api.openai.com/v1/responses", headers=headers, json=payload) as response:
+                                                if response.status == 200:
+                                                    data = await response.json()
+
+                                                    # Extract the message content
+                                                    message = next((item for item in data["output"] if item["type"] == "message"), None)
+                                                    if message:
+                                                        content = message["content"][0]
+                                                        output_text = content["text"]
+
+                                                        # Tokenize input and output using tiktoken's encoding for the first call
+                                                        encoding = tiktoken.get_encoding("o200k_base")
+                                                        input_tokens_first_call = len(encoding.encode(input_text))
+                                                        output_tokens_first_call = len(encoding.encode(output_text))
                                                             
-                                                            # Track stripe event for the first call
-                                                            await self.parent_cog._track_stripe_event(self.ctx, self.customer_id, f"gpt-4o-search-preview", "input", input_tokens_first_call)
-                                                            await self.parent_cog._track_stripe_event(self.ctx, self.customer_id, f"gpt-4o-search-preview", "output", output_tokens_first_call)
-
-                                                            # Measure time taken for the first call
-                                                            time_taken_first_call = time.time() - start_time_first_call
-
-                                                            # Send the output text to the user's preferred model for summarization
-                                                            summarize_payload = {
-                                                                "model": self.preferred_model,
-                                                                "messages": [
-                                                                    {
-                                                                        "role": "system",
-                                                                        "content": "You are a news summarizer. Summarize the following news stories without including any URLs. Add context where possible. Use the format '### Title\n\n> Summary text here'"
-                                                                    },
-                                                                    {
-                                                                        "role": "user",
-                                                                        "content": output_text
-                                                                    }
-                                                                ]
-                                                            }
-
-                                                            start_time_second_call = time.time()  # Start timing the second call
-                                                            async with session.post("https://api.openai.com/v1/chat/completions", headers=headers, json=summarize_payload) as summarize_response:
-                                                                if summarize_response.status == 200:
-                                                                    summarize_data = await summarize_response.json()
-                                                                    summary = summarize_data.get('choices', [{}])[0].get('message', {}).get('content', '').strip()
-
-                                                                    # Tokenize input and output using tiktoken's encoding for the second call
-                                                                    input_tokens_second_call = len(encoding.encode(output_text))
-                                                                    output_tokens_second_call = len(encoding.encode(summary))
+                                                        # Track stripe event for the first call
+                                                        await self.parent_cog._track_stripe_event(self.ctx, self.customer_id, f"gpt-4o-search-preview", "input", input_tokens_first_call)
+                                                        await self.parent_cog._track_stripe_event(self.ctx, self.customer_id, f"gpt-4o-search-preview", "output", output_tokens_first_call)
+
+                                                        # Measure time taken for the first call
+                                                        time_taken_first_call = time.time() - start_time_first_call
+
+                                                        # Send the output text to the user's preferred model for summarization
+                                                        summarize_payload = {
+                                                            "model": self.preferred_model,
+                                                            "messages": [
+                                                                {
+                                                                    "role": "system",
+                                                                    "content": "You are a news summarizer. Summarize the following news stories without including any URLs. Add context where possible. Use the format '### Title\n\n> Summary text here'"
+                                                                },
+                                                                {
+                                                                    "role": "user",
+                                                                    "content": output_text
+                                                                }
+                                                            ]
+                                                        }
+
+                                                        start_time_second_call = time.time()  # Start timing the second call
+                                                        async with self.parent_cog.http.post("https://api.openai.com/v1/chat/completions", headers=headers, json=summarize_payload) as summarize_response:
+                                                            if summarize_response.status == 200:
+                                                                summarize_data = await summarize_response.json()
+                                                                summary = summarize_data.get('choices', [{}])[0].get('message', {}).get('content', '').strip()
+
+                                                                # Tokenize input and output using tiktoken's encoding for the second call
+                                                                input_tokens_second_call = len(encoding.encode(output_text))
+                                                                output_tokens_second_call = len(encoding.encode(summary))
                                                                     
-                                                                    # Track stripe event for the second call
-                                                                    await self.parent_cog._track_stripe_event(self.ctx, self.customer_id, self.preferred_model, "input", input_tokens_second_call)
-                                                                    await self.parent_cog._track_stripe_event(self.ctx, self.customer_id, self.preferred_model, "output", output_tokens_second_call)
-
-                                                                    # Measure time taken for the second call
-                                                                    time_taken_second_call = time.time() - start_time_second_call
-
-                                                                    # Corrected the payload format and removed incorrect string interpolation
-                                                                    stripe_payload = {
-                                                                        "event_name": f"gpt-4o-search-preview_{selected_context_size}",
-                                                                        "timestamp": int(datetime.now().timestamp()),
-                                                                        "payload[stripe_customer_id]": self.customer_id,
-                                                                        "payload[uses]": 1
-                                                                    }
-                                                                    stripe_tokens = await self.parent_cog.bot.get_shared_api_tokens("stripe")
-                                                                    stripe_api_key = stripe_tokens.get("api_key") if stripe_tokens else None
-                                                                    stripe_headers = {
-                                                                        "Authorization": f"Bearer {stripe_api_key}",
-                                                                        "Content-Type": "application/x-www-form-urlencoded"
-                                                                    }
-                                                                    async with session.post("https://api.stripe.com/v1/billing/meter_events", 
-                                                                                            headers=stripe_headers, 
-                                                                                            data=stripe_payload) as stripe_response:
-                                                                        if stripe_response.status != 200:
-                                                                            stripe_error_message = await stripe_response.text()
-                                                                            await interaction.message.edit(content=f"Failed to log Stripe event. Status code: {stripe_response.status}, Error: {stripe_error_message}", embed=None, view=None)
-
-                                                                    # Create and send embed
-                                                                    embed = discord.Embed(
-                                                                        title=f"Here's your {self.selected_category.lower()} news summary, curated by AI",
-                                                                        description=summary,
-                                                                        color=0xfffffe
-                                                                    )
-                                                                    embed.set_footer(text=f"{time_taken_first_call:.2f}s to search, {time_taken_second_call:.2f}s to summarize. AI can make mistakes, check for errors")
+                                                                # Track stripe event for the second call
+                                                                await self.parent_cog._track_stripe_event(self.ctx, self.customer_id, self.preferred_model, "input", input_tokens_second_call)
+                                                                await self.parent_cog._track_stripe_event(self.ctx, self.customer_id, self.preferred_model, "output", output_tokens_second_call)
+
+                                                                # Measure time taken for the second call
+                                                                time_taken_second_call = time.time() - start_time_second_call
+
+                                                                # Corrected the payload format and removed incorrect string interpolation
+                                                                stripe_payload = {
+                                                                    "event_name": f"gpt-4o-search-preview_{selected_context_size}",
+                                                                    "timestamp": int(datetime.now().timestamp()),
+                                                                    "payload[stripe_customer_id]": self.customer_id,
+                                                                    "payload[uses]": 1
+                                                                }
+                                                                stripe_tokens = await self.parent_cog.bot.get_shared_api_tokens("stripe")
+                                                                stripe_api_key = stripe_tokens.get("api_key") if stripe_tokens else None
+                                                                stripe_headers = {
+                                                                    "Authorization": f"Bearer {stripe_api_key}",
+                                                                    "Content-Type": "application/x-www-form-urlencoded"
+                                                                }
+                                                                async with self.parent_cog.http.post("https://api.stripe.com/v1/billing/meter_events", 
+                                                                                        headers=stripe_headers, 
+                                                                                        data=stripe_payload) as stripe_response:
+                                                                    if stripe_response.status != 200:
+                                                                        stripe_error_message = await stripe_response.text()
+                                                                        await interaction.message.edit(content=f"Failed to log Stripe event. Status code: {stripe_response.status}, Error: {stripe_error_message}", embed=None, view=None)
+
+                                                                # Create and send embed
+                                                                embed = discord.Embed(
+                                                                    title=f"Here's your {self.selected_category.lower()} news summary, curated by AI",
+                                                                    description=summary,
+                                                                    color=0xfffffe
+                                                                )
+                                                                embed.set_footer(text=f"{time_taken_first_call:.2f}s to search, {time_taken_second_call:.2f}s to summarize. AI can make mistakes, check for errors")
                                                                     
-                                                                    # If document generation is requested, create a file
-                                                                    if self.generate_document:
-                                                                        document_content = f"News Summary for {self.selected_category}\n\n{summary}"
-                                                                        document_file = discord.File(io.BytesIO(document_content.encode()), filename="news_summary.txt")
-                                                                        await interaction.message.edit(embed=embed, attachments=[document_file], view=None)
-                                                                    else:
-                                                                        await interaction.message.edit(embed=embed, view=None)
+                                                                # If document generation is requested, create a file
+                                                                if self.generate_document:
+                                                                    document_content = f"News Summary for {self.selected_category}\n\n{summary}"
+                                                                    document_file = discord.File(io.BytesIO(document_content.encode()), filename="news_summary.txt")
+                                                                    await interaction.message.edit(embed=embed, attachments=[document_file], view=None)
                                                                 else:
-                                                                    error_message = await summarize_response.text()
-                                                                    await interaction.message.edit(content=f"Failed to summarize news stories. Status code: {summarize_response.status}, Error: {error_message}", embed=None, view=None)
-                                                    else:
-                                                        error_message = await response.text()
-                                                        await interaction.message.edit(content=f"Failed to fetch news stories. Status code: {response.status}, Error: {error_message}", embed=None, view=None)
+                                                                    await interaction.message.edit(embed=embed, view=None)
+                                                            else:
+                                                                error_message = await summarize_response.text()
+                                                                await interaction.message.edit(content=f"Failed to summarize news stories. Status code: {summarize_response.status}, Error: {error_message}", embed=None, view=None)
+                                                else:
+                                                    error_message = await response.text()
+                                                    await interaction.message.edit(content=f"Failed to fetch news stories. Status code: {response.status}, Error: {error_message}", embed=None, view=None)
 
                                     @discord.ui.button(label="Cancel", style=discord.ButtonStyle.red)
                                     async def cancel(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -514,41 +520,40 @@ class ChatSummary(commands.Cog):
                 encoding = tiktoken.encoding_for_model(model)
                 input_tokens = len(encoding.encode(actions_content))
 
-                async with aiohttp.ClientSession() as session:
-                    headers = {
-                        "Authorization": f"Bearer {openai_key}",
-                        "Content-Type": "application/json"
-                    }
-                    payload = {
-                        "model": model,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are a moderation summary generator. Use bulletpoints. Don't use titles. Only connect events if they happen within an ongoing time span of each other."
-                            },
-                            {
-                                "role": "user",
-                                "content": f"Summarize the following moderation history: {actions_content}"
-                            }
-                        ]
-                    }
-                    async with session.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            summary = data.get('choices', [{}])[0].get('message', {}).get('content', '').strip()
-                            output_tokens = len(encoding.encode(summary))
-                            embed = discord.Embed(
-                                title="AI moderation summary",
-                                description=summary,
-                                color=0xfffffe
-                            )
-                            await ctx.send(embed=embed)
-                            # Track stripe event if customer_id is present
-                            if customer_id:
-                                await self._track_stripe_event(ctx, customer_id, model, "input", input_tokens)
-                                await self._track_stripe_event(ctx, customer_id, model, "output", output_tokens)
-                        else:
-                            await ctx.send(f"Failed to summarize moderation actions. Status code: {response.status}", delete_after=10)
+                headers = {
+                    "Authorization": f"Bearer {openai_key}",
+                    "Content-Type": "application/json"
+                }
+                payload = {
+                    "model": model,
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": "You are a moderation summary generator. Use bulletpoints. Don't use titles. Only connect events if they happen within an ongoing time span of each other."
+                        },
+                        {
+                            "role": "user",
+                            "content": f"Summarize the following moderation history: {actions_content}"
+                        }
+                    ]
+                }
+                async with self.http.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload) as response:
+                    if response.status == 200:
+                        data = await response.json()
+                        summary = data.get('choices', [{}])[0].get('message', {}).get('content', '').strip()
+                        output_tokens = len(encoding.encode(summary))
+                        embed = discord.Embed(
+                            title="AI moderation summary",
+                            description=summary,
+                            color=0xfffffe
+                        )
+                        await ctx.send(embed=embed)
+                        # Track stripe event if customer_id is present
+                        if customer_id:
+                            await self._track_stripe_event(ctx, customer_id, model, "input", input_tokens)
+                            await self._track_stripe_event(ctx, customer_id, model, "output", output_tokens)
+                    else:
+                        await ctx.send(f"Failed to summarize moderation actions. Status code: {response.status}", delete_after=10)
 
         except Exception as e:
             await ctx.send(f"An error occurred: {str(e)}", delete_after=10)
@@ -600,42 +605,41 @@ class ChatSummary(commands.Cog):
             encoding = tiktoken.encoding_for_model(model)
             input_tokens = len(encoding.encode(server_content))
 
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    "Authorization": f"Bearer {openai_key}",
-                    "Content-Type": "application/json"
-                }
-                payload = {
-                    "model": model,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are a Discord server information summary generator. Reply in a single conversational paragraph with basic language. Use Discord native timestamps when referring to times which are formatted as <t:UNIXTIME:d>."
-                        },
-                        {
-                            "role": "user",
-                            "content": f"Summarize the following server information: {server_content}"
-                        }
-                    ],
-                    "temperature": 1.0
-                }
-                async with session.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        summary = data.get('choices', [{}])[0].get('message', {}).get('content', '').strip()
-                        output_tokens = len(encoding.encode(summary))
-                        embed = discord.Embed(
-                            title="AI summary of this server",
-                            description=summary,
-                            color=0xfffffe
-                        )
-                        await ctx.send(embed=embed)
-                        # Track stripe event if customer_id is present
-                        if customer_id:
-                            await self._track_stripe_event(ctx, customer_id, model, "input", input_tokens)
-                            await self._track_stripe_event(ctx, customer_id, model, "output", output_tokens)
-                    else:
-                        await ctx.send(f"Failed to summarize server information. Status code: {response.status}", delete_after=10)
+            headers = {
+                "Authorization": f"Bearer {openai_key}",
+                "Content-Type": "application/json"
+            }
+            payload = {
+                "model": model,
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": "You are a Discord server information summary generator. Reply in a single conversational paragraph with basic language. Use Discord native timestamps when referring to times which are formatted as <t:UNIXTIME:d>."
+                    },
+                    {
+                        "role": "user",
+                        "content": f"Summarize the following server information: {server_content}"
+                    }
+                ],
+                "temperature": 1.0
+            }
+            async with self.http.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    summary = data.get('choices', [{}])[0].get('message', {}).get('content', '').strip()
+                    output_tokens = len(encoding.encode(summary))
+                    embed = discord.Embed(
+                        title="AI summary of this server",
+                        description=summary,
+                        color=0xfffffe
+                    )
+                    await ctx.send(embed=embed)
+                    # Track stripe event if customer_id is present
+                    if customer_id:
+                        await self._track_stripe_event(ctx, customer_id, model, "input", input_tokens)
+                        await self._track_stripe_event(ctx, customer_id, model, "output", output_tokens)
+                else:
+                    await ctx.send(f"Failed to summarize server information. Status code: {response.status}", delete_after=10)
 
         except Exception as e:
             await ctx.send(f"An error occurred: {str(e)}", delete_after=10)
@@ -735,18 +739,17 @@ class ChatSummary(commands.Cog):
                 "messages": messages,
                 "temperature": 1.0
             }
-            async with aiohttp.ClientSession() as session:
-                try:
-                    async with session.post(openai_url, headers=headers, json=openai_payload) as openai_response:
-                        if openai_response.status == 200:
-                            openai_data = await openai_response.json()
-                            summary = openai_data.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
-                            output_tokens = len(encoding.encode(summary))
-                            return summary, input_tokens, output_tokens
-                        else:
-                            return f"Failed to generate summary from OpenAI. Status code: {openai_response.status}", 0, 0
-                except aiohttp.ClientError as e:
-                    return f"Failed to connect to OpenAI API: {str(e)}", 0, 0
+            try:
+                async with self.http.post(openai_url, headers=headers, json=openai_payload) as openai_response:
+                    if openai_response.status == 200:
+                        openai_data = await openai_response.json()
+                        summary = openai_data.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
+                        output_tokens = len(encoding.encode(summary))
+                        return summary, input_tokens, output_tokens
+                    else:
+                        return f"Failed to generate summary from OpenAI. Status code: {openai_response.status}", 0, 0
+            except aiohttp.ClientError as e:
+                return f"Failed to connect to OpenAI API: {str(e)}", 0, 0
         else:
             return "OpenAI API key not configured.", 0, 0
 
@@ -825,27 +828,26 @@ class ChatSummary(commands.Cog):
                         await interaction.response.send_message("You're not the customer, nor are you allowed to access their billing portal. Please see https://en.wikipedia.org/wiki/Computer_Fraud_and_Abuse_Act to know why you're not allowed to do this.", ephemeral=True)
                         return
 
-                    async with aiohttp.ClientSession() as session:
-                        try:
-                            stripe_url = "https://api.stripe.com/v1/billing_portal/sessions"
-                            stripe_headers = {
-                                "Authorization": f"Bearer {stripe_key}",
-                                "Content-Type": "application/x-www-form-urlencoded"
-                            }
-                            stripe_payload = {
-                                "customer": customer_id,
-                                "return_url": ctx.channel.jump_url
-                            }
-                            async with session.post(stripe_url, headers=stripe_headers, data=stripe_payload) as stripe_response:
-                                if stripe_response.status == 200:
-                                    response_data = await stripe_response.json()
-                                    login_url = response_data.get("url")
-                                    if login_url:
-                                        await interaction.response.send_message(f"[Click here to manage your billing](<{login_url}>)\n\n# :octagonal_sign: This link will automatically sign you in - **don't share it with others no matter what**.", ephemeral=True)
-                                else:
-                                    await interaction.response.send_message(f"Failed to generate billing portal link. Status code: {stripe_response.status}", ephemeral=True)
-                        except aiohttp.ClientError as e:
-                            await interaction.response.send_message(f"Failed to connect to Stripe API: {str(e)}", ephemeral=True)
+                    try:
+                        stripe_url = "https://api.stripe.com/v1/billing_portal/sessions"
+                        stripe_headers = {
+                            "Authorization": f"Bearer {stripe_key}",
+                            "Content-Type": "application/x-www-form-urlencoded"
+                        }
+                        stripe_payload = {
+                            "customer": customer_id,
+                            "return_url": ctx.channel.jump_url
+                        }
+                        async with self.http.post(stripe_url, headers=stripe_headers, data=stripe_payload) as stripe_response:
+                            if stripe_response.status == 200:
+                                response_data = await stripe_response.json()
+                                login_url = response_data.get("url")
+                                if login_url:
+                                    await interaction.response.send_message(f"[Click here to manage your billing](<{login_url}>)\n\n# :octagonal_sign: This link will automatically sign you in - **don't share it with others no matter what**.", ephemeral=True)
+                            else:
+                                await interaction.response.send_message(f"Failed to generate billing portal link. Status code: {stripe_response.status}", ephemeral=True)
+                    except aiohttp.ClientError as e:
+                        await interaction.response.send_message(f"Failed to connect to Stripe API: {str(e)}", ephemeral=True)
 
                 view = discord.ui.View(timeout=30)
                 button = discord.ui.Button(label="🔒 Quick login", style=discord.ButtonStyle.gray)
@@ -18,6 +18,14 @@ class TwilioLookup(commands.Cog):
             # Add more error codes and their descriptions as needed
         }
 
+    @property
+    def http(self):
+        # Pooled session shared by the BeeHive cogs, looked up per use so load order doesn't matter
+        cog = self.bot.get_cog("BeeHiveHTTP")
+        if cog is None:
+            raise RuntimeError("The beehivehttp cog must be loaded to make web requests.")
+        return cog.provider
+
     async def _track_stripe_event(self, ctx, customer_id):
         stripe_tokens = await self.bot.get_shared_api_tokens("stripe")
         stripe_key = stripe_tokens.get("api_key") if stripe_tokens else None
@@ -33,14 +41,13 @@ class TwilioLookup(commands.Cog):
                 "timestamp": int(datetime.now().timestamp()),
                 "payload[stripe_customer_id]": customer_id
             }
-            async with aiohttp.ClientSession() as session:
-                try:
-                    async with session.post(stripe_url, headers=stripe_headers, data=stripe_payload) as stripe_response:
-                        if stripe_response.status != 200:
-                            error_message = await stripe_response.text()
-                            await ctx.send(f"Failed to track event with Stripe. Status code: {stripe_response.status}, Error: {error_message}", delete_after=10)
-                except aiohttp.ClientError as e:
-                    await ctx.send(f"Failed to connect to Stripe API: {str(e)}", delete_after=10)
+            try:
+                async with self.http.post(stripe_url, headers=stripe_headers, data=stripe_payload) as stripe_response:
+                    if stripe_response.status != 200:
+                        error_message = await stripe_response.text()
+                        await ctx.send(f"Failed to track event with Stripe. Status code: {stripe_response.status}, Error: {error_message}", delete_after=10)
+            except aiohttp.ClientError as e:
+                await ctx.send(f"Failed to connect to Stripe API: {str(e)}", delete_after=10)
 
     @commands.command(name="lookup")
     async def lookup_phone_number(self, ctx: commands.Context, phone_number: str):
@@ -74,73 +81,72 @@ class TwilioLookup(commands.Cog):
 
         try:
             async with ctx.typing():
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(twilio_url, auth=auth) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            carrier_info = data.get("carrier") or {}
-                            caller_name_info = data.get("caller_name") or {}
-                            sms_pumping_risk_info = data.get("sms_pumping_risk") or {}
-                            formatted_number = data.get("national_format", phone_number)
-
-                            embed = discord.Embed(title="Phone number lookup", color=0xfffffe)
-                            embed.add_field(name="Phone number", value=formatted_number, inline=False)
-
-                            # Safely handle None values for caller_name and caller_type
-                            if isinstance(caller_name_info, dict) and "caller_name" in caller_name_info:
-                                caller_name_val = caller_name_info["caller_name"]
-                                if caller_name_val is not None:
-                                    embed.add_field(name="Caller name", value=str(caller_name_val).title(), inline=True)
-                            if isinstance(caller_name_info, dict) and "caller_type" in caller_name_info:
-                                caller_type_val = caller_name_info["caller_type"]
-                                if caller_type_val is not None:
-                                    embed.add_field(name="Caller type", value=str(caller_type_val).title(), inline=True)
-
-                            if isinstance(carrier_info, dict) and "name" in carrier_info:
-                                embed.add_field(name="Carrier name", value=carrier_info["name"], inline=True)
-                            if isinstance(carrier_info, dict) and "type" in carrier_info:
-                                carrier_type = carrier_info.get("type")
-                                if carrier_type is not None:
-                                    embed.add_field(name="Carrier type", value=str(carrier_type).upper(), inline=True)
-                            if isinstance(carrier_info, dict) and "mobile_country_code" in carrier_info:
-                                embed.add_field(name="Mobile country code", value=carrier_info["mobile_country_code"], inline=True)
-                            if isinstance(carrier_info, dict) and "mobile_network_code" in carrier_info:
-                                embed.add_field(name="Mobile network code", value=carrier_info["mobile_network_code"], inline=True)
-                            if isinstance(carrier_info, dict) and "error_code" in carrier_info:
-                                error_code = carrier_info["error_code"]
-                                error_description = self.twilio_error_codes.get(error_code, "")
-                                embed.add_field(name="Carrier error code", value=f"`{error_code}` - {error_description}", inline=True)
-
-                            if isinstance(caller_name_info, dict) and "error_code" in caller_name_info:
-                                error_code = caller_name_info["error_code"]
-                                error_description = self.twilio_error_codes.get(error_code, "")
-                                embed.add_field(name="Caller error code", value=f"`{error_code}` - {error_description}", inline=True)
-
-                            # Add SMS Pumping Risk Information
-                            if isinstance(sms_pumping_risk_info, dict) and "carrier_risk_category" in sms_pumping_risk_info:
-                                carrier_risk_category_val = sms_pumping_risk_info["carrier_risk_category"]
-                                if carrier_risk_category_val is not None:
-                                    embed.add_field(name="SMS Pumping risk category", value=str(carrier_risk_category_val).title(), inline=True)
-                            if isinstance(sms_pumping_risk_info, dict) and "sms_pumping_risk_score" in sms_pumping_risk_info:
-                                embed.add_field(name="SMS Pumping risk score", value=sms_pumping_risk_info["sms_pumping_risk_score"], inline=True)
-                            if isinstance(sms_pumping_risk_info, dict) and "number_blocked" in sms_pumping_risk_info:
-                                embed.add_field(name="Number blocked", value=sms_pumping_risk_info["number_blocked"], inline=True)
-                            if isinstance(sms_pumping_risk_info, dict) and "number_blocked_date" in sms_pumping_risk_info:
-                                embed.add_field(name="Number blocked date", value=sms_pumping_risk_info["number_blocked_date"], inline=True)
-                            if isinstance(sms_pumping_risk_info, dict) and "number_blocked_last_3_months" in sms_pumping_risk_info:
-                                embed.add_field(name="Number blocked last 3mo", value=sms_pumping_risk_info["number_blocked_last_3_months"], inline=True)
-                            if isinstance(sms_pumping_risk_info, dict) and "error_code" in sms_pumping_risk_info:
-                                error_code = sms_pumping_risk_info["error_code"]
-                                error_description = self.twilio_error_codes.get(error_code, "")
-                                embed.add_field(name="SMS Pumping risk error code", value=f"`{error_code}` - {error_description}", inline=True)
-
-                            await ctx.send(embed=embed)
-
-                            # Track the event with Stripe
-                            await self._track_stripe_event(ctx, customer_id)
-                        else:
-                            error_description = self.twilio_error_codes.get(response.status, "Unknown error")
-                            await ctx.send(f"Failed to lookup phone number. Status code: {response.status} - {error_description}", delete_after=10)
+                async with self.http.get(twilio_url, auth=auth) as response:
+                    if response.status == 200:
+                        data = await response.json()
+                        carrier_info = data.get("carrier") or {}
+                        caller_name_info = data.get("caller_name") or {}
+                        sms_pumping_risk_info = data.get("sms_pumping_risk") or {}
+                        formatted_number = data.get("national_format", phone_number)
+
+                        embed = discord.Embed(title="Phone number lookup", color=0xfffffe)
+                        embed.add_field(name="Phone number", value=formatted_number, inline=False)
+
+                        # Safely handle None values for caller_name and caller_type
+                        if isinstance(caller_name_info, dict) and "caller_name" in caller_name_info:
+                            caller_name_val = caller_name_info["caller_name"]
+                            if caller_name_val is not None:
+                                embed.add_field(name="Caller name", value=str(caller_name_val).title(), inline=True)
+                        if isinstance(caller_name_info, dict) and "caller_type" in caller_name_info:
+                            caller_type_val = caller_name_info["caller_type"]
+                            if caller_type_val is not None:
+                                embed.add_field(name="Caller type", value=str(caller_type_val).title(), inline=True)
+
+                        if isinstance(carrier_info, dict) and "name" in carrier_info:
+                            embed.add_field(name="Carrier name", value=carrier_info["name"], inline=True)
+                        if isinstance(carrier_info, dict) and "type" in carrier_info:
+                            carrier_type = carrier_info.get("type")
+                            if carrier_type is not None:
+                                embed.add_field(name="Carrier type", value=str(carrier_type).upper(), inline=True)
+                        if isinstance(carrier_info, dict) and "mobile_country_code" in carrier_info:
+                            embed.add_field(name="Mobile country code", value=carrier_info["mobile_country_code"], inline=True)
+                        if isinstance(carrier_info, dict) and "mobile_network_code" in carrier_info:
+                            embed.add_field(name="Mobile network code", value=carrier_info["mobile_network_code"], inline=True)
+                        if isinstance(carrier_info, dict) and "error_code" in carrier_info:
+                            error_code = carrier_info["error_code"]
+                            error_description = self.twilio_error_codes.get(error_code, "")
+                            embed.add_field(name="Carrier error code", value=f"`{error_code}` - {error_description}", inline=True)
+
+                        if isinstance(caller_name_info, dict) and "error_code" in caller_name_info:
+                            error_code = caller_name_info["error_code"]
+                            error_description = self.twilio_error_codes.get(error_code, "")
+                            embed.add_field(name="Caller error code", value=f"`{error_code}` - {error_description}", inline=True)
+
+                        # Add SMS Pumping Risk Information
+                        if isinstance(sms_pumping_risk_info, dict) and "carrier_risk_category" in sms_pumping_risk_info:
+                            carrier_risk_category_val = sms_pumping_risk_info["carrier_risk_category"]
+                            if carrier_risk_category_val is not None:
+                                embed.add_field(name="SMS Pumping risk category", value=str(carrier_risk_category_val).title(), inline=True)
+                        if isinstance(sms_pumping_risk_info, dict) and "sms_pumping_risk_score" in sms_pumping_risk_info:
+                            embed.add_field(name="SMS Pumping risk score", value=sms_pumping_risk_info["sms_pumping_risk_score"], inline=True)
+                        if isinstance(sms_pumping_risk_info, dict) and "number_blocked" in sms_pumping_risk_info:
+                            embed.add_field(name="Number blocked", value=sms_pumping_risk_info["number_blocked"], inline=True)
+                        if isinstance(sms_pumping_risk_info, dict) and "number_blocked_date" in sms_pumping_risk_info:
+                            embed.add_field(name="Number blocked date", value=sms_pumping_risk_info["number_blocked_date"], inline=True)
+                        if isinstance(sms_pumping_risk_info, dict) and "number_blocked_last_3_months" in sms_pumping_risk_info:
+                            embed.add_field(name="Number blocked last 3mo", value=sms_pumping_risk_info["number_blocked_last_3_months"], inline=True)
+                        if isinstance(sms_pumping_risk_info, dict) and "error_code" in sms_pumping_risk_info:
+                            error_code = sms_pumping_risk_info["error_code"]
+                            error_description = self.twilio_error_codes.get(error_code, "")
+                            embed.add_field(name="SMS Pumping risk error code", value=f"`{error_code}` - {error_description}", inline=True)
+
+                        await ctx.send(embed=embed)
+
+                        # Track the event with Stripe
+                        await self._track_stripe_event(ctx, customer_id)
+                    else:
+                        error_description = self.twilio_error_codes.get(response.status, "Unknown error")
+                        await ctx.send(f"Failed to lookup phone number. Status code: {response.status} - {error_description}", delete_after=10)
         except aiohttp.ClientError as e:
             await ctx.send(f"Failed to connect to Twilio API: {str(e)}", delete_after=10)
 
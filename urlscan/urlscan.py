@@ -22,6 +22,14 @@ class URLScan(commands.Cog):
         }
         self.config.register_guild(**default_guild)
 
+    @property
+    def http(self):
+        # Pooled session shared by the BeeHive cogs, looked up per use so load order doesn't matter
+        cog = self.bot.get_cog("BeeHiveHTTP")
+        if cog is None:
+            raise RuntimeError("The beehivehttp cog must be loaded to make web requests.")
+        return cog.provider
+
     @commands.group(name='urlscan', help="Scan URL's for dangerous content", invoke_without_command=True)
     async def urlscan(self, ctx):
         """Base command for URLScan. Use subcommands for specific actions."""
@@ -111,53 +119,52 @@ class URLScan(commands.Cog):
             "API-Key": api_key
         }
 
-        async with aiohttp.ClientSession() as session:
-            for url in urls_to_scan:
-                data = {"url": url, "visibility": "public"}
-                try:
-                    async with ctx.typing():
-                        async with session.post('https://urlscan.io/api/v1/scan/', headers=headers, json=data, timeout=10) as r:
-                            res = await r.json()
-                            if 'result' not in res:
-                                await ctx.send(f"{res.get('message', 'Unknown error')}")
-                                continue
+        for url in urls_to_scan:
+            data = {"url": url, "visibility": "public"}
+            try:
+                async with ctx.typing():
+                    async with self.http.post('https://urlscan.io/api/v1/scan/', headers=headers, json=data, timeout=10) as r:
+                        res = await r.json()
+                        if 'result' not in res:
+                            await ctx.send(f"{res.get('message', 'Unknown error')}")
+                            continue
 
-                            report_url = res['result']
-                            report_api = res['api']
-                            await asyncio.sleep(30)
-                            async with session.get(report_api, timeout=10) as r2:
-                                res2 = await r2.json()
-                                view = discord.ui.View()
+                        report_url = res['result']
+                        report_api = res['api']
+                        await asyncio.sleep(30)
+                        async with self.http.get(report_api, timeout=10) as r2:
+                            res2 = await r2.json()
+                            view = discord.ui.View()
 
-                                embed = discord.Embed()
-                                if 'verdicts' in res2 and 'overall' in res2['verdicts'] and 'score' in res2['verdicts']['overall']:
-                                    threat_level = res2['verdicts']['overall']['score']
-                                    if threat_level != 0:
-                                        embed.title = "URLscan.io is suspicious"
-                                        embed.description = f"URLScan says {url} is suspicious!\n\nFor your own safety, please don't click it."
-                                        embed.color = 0xe25946
-                                        view.add_item(discord.ui.Button(label="View results", url=report_url, style=discord.ButtonStyle.link))
-                                    else:
-                                        embed.title = "URLscan.io detected no threats"
-                                        embed.color = 0x18bb9c
-                                        embed.description = f"URLScan did not detect any threats associated with {url}"
-                                        view.add_item(discord.ui.Button(label="View results", url=report_url, style=discord.ButtonStyle.link))
-                                elif 'message' in res2 and res2['message'] == "Scan prevented":
-                                    embed.title = "Domain is known safe"
-                                    embed.description = f"The domain for {url} is whitelisted and safe from scanning."
-                                    embed.color = 0x2d3e50
+                            embed = discord.Embed()
+                            if 'verdicts' in res2 and 'overall' in res2['verdicts'] and 'score' in res2['verdicts']['overall']:
+                                threat_level = res2['verdicts']['overall']['score']
+                                if threat_level != 0:
+                                    embed.title = "URLscan.io is suspicious"
+                                    embed.description = f"URLScan says {url} is suspicious!\n\nFor your own safety, please don't click it."
+                                    embed.color = 0xe25946
                                     view.add_item(discord.ui.Button(label="View results", url=report_url, style=discord.ButtonStyle.link))
                                 else:
-                                    embed.title = "Error occurred during URLScan"
-                                    embed.description = f"Unable to determine the threat level for {url}."
-                                    embed.color = 0xff4545
+                                    embed.title = "URLscan.io detected no threats"
+                                    embed.color = 0x18bb9c
+                                    embed.description = f"URLScan did not detect any threats associated with {url}"
+                                    view.add_item(discord.ui.Button(label="View results", url=report_url, style=discord.ButtonStyle.link))
+                            elif 'message' in res2 and res2['message'] == "Scan prevented":
+                                embed.title = "Domain is known safe"
+                                embed.description = f"The domain for {url} is whitelisted and safe from scanning."
+                                embed.color = 0x2d3e50
+                                view.add_item(discord.ui.Button(label="View results", url=report_url, style=discord.ButtonStyle.link))
+                            else:
+                                embed.title = "Error occurred during URLScan"
+                                embed.description = f"Unable to determine the threat level for {url}."
+                                embed.color = 0xff4545
 
-                                if 'verdicts' in res2 or ('message' in res2 and res2['message'] == "Scan prevented"):
-                                    await ctx.send(embed=embed, view=view)
-                                else:
-                                    await ctx.send(embed=embed)
-                except (json.JSONDecodeError, aiohttp.ClientError, asyncio.TimeoutError) as e:
-                    await ctx.send(f"Error: {str(e)} for {url}.")
+                            if 'verdicts' in res2 or ('message' in res2 and res2['message'] == "Scan prevented"):
+                                await ctx.send(embed=embed, view=view)
+                            else:
+                                await ctx.send(embed=embed)
+            except (json.JSONDecodeError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                await ctx.send(f"Error: {str(e)} for {url}.")
 
     @commands.Cog.listener()
     async def on_message(self, message):
@@ -199,109 +206,108 @@ class URLScan(commands.Cog):
                 "Content-Type": "application/json",
                 "API-Key": api_key
             }
-            async with aiohttp.ClientSession() as session:
-                data = {"url": url, "visibility": "public"}
-                async with session.post('https://urlscan.io/api/v1/scan/', headers=headers, json=data, timeout=10) as r:
-                    res = await r.json()
-                    if 'result' not in res:
-                        continue
-
-                    report_api = res['api']
-                    await asyncio.sleep(60)
-                    async with session.get(report_api, timeout=10) as r2:
-                        res2 = await r2.json()
-                        if 'verdicts' in res2 and 'overall' in res2['verdicts'] and 'score' in res2['verdicts']['overall']:
-                            threat_level = res2['verdicts']['overall']['score']
-                            if threat_level != 0:
-                                try:
-                                    # Always try to delete the message first
-                                    await message.delete()
-                                except discord.NotFound:
-                                    pass
-                                except discord.Forbidden:
-                                    embed = discord.Embed(
-                                        title="URLScan detected a threat",
-                                        description=f"Detected a suspicious URL posted by {message.author.mention}, but I don't have permission to delete it.",
-                                        color=0xe25946
-                                    )
-                                    await message.channel.send(embed=embed)
-                                    if log_channel:
-                                        await log_channel.send(embed=embed)
-                                    break
-
-                                # Now apply the configured punishment
-                                punishment_applied = False
-                                reason = "URLScan: Suspicious link detected"
-                                if punishment == "timeout":
-                                    # Discord timeouts require discord.py 2.0+ and permissions
-                                    try:
-                                        if hasattr(message.author, "timed_out_until"):
-                                            # Already timed out? (discord.py 2.0+)
-                                            await message.author.edit(timeout=discord.utils.utcnow() + discord.timedelta(seconds=punishment_duration), reason=reason)
-                                            punishment_applied = True
-                                        else:
-                                            # Try anyway (for compatibility)
-                                            await message.author.timeout(duration=punishment_duration, reason=reason)
-                                            punishment_applied = True
-                                    except Exception:
-                                        pass
-                                elif punishment == "kick":
-                                    try:
-                                        await message.author.kick(reason=reason)
-                                        punishment_applied = True
-                                    except Exception:
-                                        pass
-                                elif punishment == "ban":
-                                    try:
-                                        await message.author.ban(reason=reason, delete_message_days=0)
-                                        punishment_applied = True
-                                    except Exception:
-                                        pass
-                                # If punishment is delete or fallback, just deletion is enough
+            data = {"url": url, "visibility": "public"}
+            async with self.http.post('https://urlscan.io/api/v1/scan/', headers=headers, json=data, timeout=10) as r:
+                res = await r.json()
+                if 'result' not in res:
+                    continue
 
+                report_api = res['api']
+                await asyncio.sleep(60)
+                async with self.http.get(report_api, timeout=10) as r2:
+                    res2 = await r2.json()
+                    if 'verdicts' in res2 and 'overall' in res2['verdicts'] and 'score' in res2['verdicts']['overall']:
+                        threat_level = res2['verdicts']['overall']['score']
+                        if threat_level != 0:
+                            try:
+                                # Always try to delete the message first
+                                await message.delete()
+                            except discord.NotFound:
+                                pass
+                            except discord.Forbidden:
                                 embed = discord.Embed(
                                     title="URLScan detected a threat",
-                                    description=f"Deleted a suspicious URL posted by {message.author.mention}."
-                                                + (f"\n\nPunishment applied: **{punishment}**"
-                                                   + (f" ({punishment_duration}s)" if punishment == "timeout" else "")
-                                                   if punishment != "delete" else ""),
+                                    description=f"Detected a suspicious URL posted by {message.author.mention}, but I don't have permission to delete it.",
                                     color=0xe25946
                                 )
                                 await message.channel.send(embed=embed)
-                                # Send alert to log channel if set and different from the message channel
-                                if log_channel and log_channel.id != message.channel.id:
-                                    try:
-                                        log_embed = discord.Embed(
-                                            title="URLScan detected a threat",
-                                            description=f"A message containing a suspicious URL was detected and deleted in {message.channel.mention}.",
-                                            color=0xe25946
-                                        )
-                                        log_embed.add_field(
-                                            name="User",
-                                            value=f"{message.author.mention} (`{message.author.id}`)",
-                                            inline=False
-                                        )
-                                        log_embed.add_field(
-                                            name="URL",
-                                            value=url,
-                                            inline=False
-                                        )
-                                        log_embed.add_field(
-                                            name="Content",
-                                            value=message.content[:1024],
-                                            inline=False
-                                        )
-                                        log_embed.add_field(
-                                            name="Punishment",
-                                            value=f"{punishment}" + (f" ({punishment_duration}s)" if punishment == "timeout" else ""),
-                                            inline=False
-                                        )
-                                        log_embed.set_footer(text=f"User ID: {message.author.id}")
-                                        await log_channel.send(embed=log_embed)
-                                    except Exception:
-                                        pass
-                                elif log_channel:
-                                    # If log channel is same as message channel, just send the embed
+                                if log_channel:
                                     await log_channel.send(embed=embed)
                                 break
+
+                            # Now apply the configured punishment
+                            punishment_applied = False
+                            reason = "URLScan: Suspicious link detected"
+                            if punishment == "timeout":
+                                # Discord timeouts require discord.py 2.0+ and permissions
+                                try:
+                                    if hasattr(message.author, "timed_out_until"):
+                                        # Already timed out? (discord.py 2.0+)
+                                        await message.author.edit(timeout=discord.utils.utcnow() + discord.timedelta(seconds=punishment_duration), reason=reason)
+                                        punishment_applied = True
+                                    else:
+                                        # Try anyway (for compatibility)
+                                        await message.author.timeout(duration=punishment_duration, reason=reason)
+                                        punishment_applied = True
+                                except Exception:
+                                    pass
+                            elif punishment == "kick":
+                                try:
+                                    await message.author.kick(reason=reason)
+                                    punishment_applied = True
+                                except Exception:
+                                    pass
+                            elif punishment == "ban":
+                                try:
+                                    await message.author.ban(reason=reason, delete_message_days=0)
+                                    punishment_applied = True
+                                except Exception:
+                                    pass
+                            # If punishment is delete or fallback, just deletion is enough
+
+                            embed = discord.Embed(
+                                title="URLScan detected a threat",
+                                description=f"Deleted a suspicious URL posted by {message.author.mention}."
+                                            + (f"\n\nPunishment applied: **{punishment}**"
+                                               + (f" ({punishment_duration}s)" if punishment == "timeout" else "")
+                                               if punishment != "delete" else ""),
+                                color=0xe25946
+                            )
+                            await message.channel.send(embed=embed)
+                            # Send alert to log channel if set and different from the message channel
+                            if log_channel and log_channel.id != message.channel.id:
+                                try:
+                                    log_embed = discord.Embed(
+                                        title="URLScan detected a threat",
+                                        description=f"A message containing a suspicious URL was detected and deleted in {message.channel.mention}.",
+                                        color=0xe25946
+                                    )
+                                    log_embed.add_field(
+                                        name="User",
+                                        value=f"{message.author.mention} (`{message.author.id}`)",
+                                        inline=False
+                                    )
+                                    log_embed.add_field(
+                                        name="URL",
+                                        value=url,
+                                        inline=False
+                                    )
+                                    log_embed.add_field(
+                                        name="Content",
+                                        value=message.content[:1024],
+                                        inline=False
+                                    )
+                                    log_embed.add_field(
+                                        name="Punishment",
+                                        value=f"{punishment}" + (f" ({punishment_duration}s)" if punishment == "timeout" else ""),
+                                        inline=False
+                                    )
+                                    log_embed.set_footer(text=f"User ID: {message.author.id}")
+                                    await log_channel.send(embed=log_embed)
+                                except Exception:
+                                    pass
+                            elif log_channel:
+                                # If log channel is same as message channel, just send the embed
+                                await log_channel.send(embed=embed)
+                            break
             
@@ -31,6 +31,14 @@ class VirusTotal(commands.Cog):
         )
         self.submission_history = {}
 
+    @property
+    def http(self):
+        # Pooled session shared by the BeeHive cogs, looked up per use so load order doesn't matter
+        cog = self.bot.get_cog("BeeHiveHTTP")
+        if cog is None:
+            raise RuntimeError("The beehivehttp cog must be loaded to make web requests.")
+        return cog.provider
+
     async def initialize(self):
         for guild in self.bot.guilds:
             guild_data = await self.config.guild(guild).all()
@@ -198,146 +206,145 @@ class VirusTotal(commands.Cog):
         malware_action_threshold = await self.config.guild(guild).malware_action_threshold()
         malware_action_timeout = await self.config.guild(guild).malware_action_timeout()
 
-        async with aiohttp.ClientSession() as session:
-            for attachment in attachments:
-                # Only scan files with extensions that could reasonably contain malware
-                if not (attachment.filename and any(attachment.filename.lower().endswith(ext) for ext in self.MALWARE_FILE_EXTENSIONS)):
-                    continue
-
-                if attachment.size > 30 * 1024 * 1024:  # 30 MB limit
-                    continue  # Skip files that are too large
-
-                async with session.get(attachment.url) as response:
-                    if response.status != 200:
-                        continue  # Skip files that can't be downloaded
-
-                    file_content = await response.read()
-                    file_name = attachment.filename
-
-                    async with session.post(
-                        "https://www.virustotal.com/api/v3/files",
-                        headers={"x-apikey": vt_key["api_key"]},
-                        data={"file": file_content},
-                    ) as vt_response:
-                        if vt_response.status != 200:
-                            continue  # Skip files that can't be uploaded
-
-                        data = await vt_response.json()
-                        analysis_id = data.get("data", {}).get("id")
-                        if not analysis_id:
-                            continue  # Skip files without a valid analysis ID
-
-                        # Check the analysis results
-                        while True:
-                            await asyncio.sleep(15)  # Wait for the analysis to complete
-                            async with session.get(
-                                f"https://www.virustotal.com/api/v3/analyses/{analysis_id}",
-                                headers={"x-apikey": vt_key["api_key"]},
-                            ) as result_response:
-                                if result_response.status != 200:
-                                    continue  # Skip files that can't be checked
-
-                                result_data = await result_response.json()
-                                status = result_data.get("data", {}).get("attributes", {}).get("status")
-                                if status == "completed":
-                                    stats = result_data.get("data", {}).get("attributes", {}).get("stats", {})
-                                    malicious = stats.get("malicious", 0)
-                                    suspicious = stats.get("suspicious", 0)
-                                    undetected = stats.get("undetected", 0)
-                                    harmless = stats.get("harmless", 0)
-                                    failure = stats.get("failure", 0)
-                                    unsupported = stats.get("type-unsupported", 0)
-                                    total = malicious + suspicious + undetected + harmless + failure + unsupported
-                                    percent = round((malicious / total) * 100, 2) if total > 0 else 0
-
-                                    # Try to get hashes for logging
-                                    meta = result_data.get("meta", {}).get("file_info", {})
-                                    sha256 = meta.get("sha256", "Unknown")
-                                    sha1 = meta.get("sha1", "Unknown")
-                                    md5 = meta.get("md5", "Unknown")
-
-                                    # Compose embed for log
-                                    embed = discord.Embed(
-                                        title="VirusTotal Auto Scan Result",
-                                        description=f"File: `{file_name}`",
-                                        color=discord.Colour(0xff4545) if malicious > 0 else (discord.Colour(0xff9144) if suspicious > 0 else discord.Colour(0x2BBD8E))
-                                    )
-                                    embed.add_field(name="Malicious", value=str(malicious), inline=True)
-                                    embed.add_field(name="Suspicious", value=str(suspicious), inline=True)
-                                    embed.add_field(name="Harmless", value=str(harmless), inline=True)
-                                    embed.add_field(name="Undetected", value=str(undetected), inline=True)
-                                    embed.add_field(name="Failure", value=str(failure), inline=True)
-                                    embed.add_field(name="Unsupported", value=str(unsupported), inline=True)
-                                    embed.add_field(name="Detection %", value=f"{percent}%", inline=True)
-                                    embed.add_field(name="SHA256", value=sha256, inline=False)
-                                    embed.add_field(name="SHA1", value=sha1, inline=False)
-                                    embed.add_field(name="MD5", value=md5, inline=False)
-                                    embed.add_field(name="VirusTotal Link", value=f"[View results](https://www.virustotal.com/gui/file/{sha256})", inline=False)
+        for attachment in attachments:
+            # Only scan files with extensions that could reasonably contain malware
+            if not (attachment.filename and any(attachment.filename.lower().endswith(ext) for ext in self.MALWARE_FILE_EXTENSIONS)):
+                continue
+
+            if attachment.size > 30 * 1024 * 1024:  # 30 MB limit
+                continue  # Skip files that are too large
+
+            async with self.http.get(attachment.url) as response:
+                if response.status != 200:
+                    continue  # Skip files that can't be downloaded
+
+                file_content = await response.read()
+                file_name = attachment.filename
+
+                async with self.http.post(
+                    "https://www.virustotal.com/api/v3/files",
+                    headers={"x-apikey": vt_key["api_key"]},
+                    data={"file": file_content},
+                ) as vt_response:
+                    if vt_response.status != 200:
+                        continue  # Skip files that can't be uploaded
+
+                    data = await vt_response.json()
+                    analysis_id = data.get("data", {}).get("id")
+                    if not analysis_id:
+                        continue  # Skip files without a valid analysis ID
+
+                    # Check the analysis results
+                    while True:
+                        await asyncio.sleep(15)  # Wait for the analysis to complete
+                        async with self.http.get(
+                            f"https://www.virustotal.com/api/v3/analyses/{analysis_id}",
+                            headers={"x-apikey": vt_key["api_key"]},
+                        ) as result_response:
+                            if result_response.status != 200:
+                                continue  # Skip files that can't be checked
+
+                            result_data = await result_response.json()
+                            status = result_data.get("data", {}).get("attributes", {}).get("status")
+                            if status == "completed":
+                                stats = result_data.get("data", {}).get("attributes", {}).get("stats", {})
+                                malicious = stats.get("malicious", 0)
+                                suspicious = stats.get("suspicious", 0)
+                                undetected = stats.get("undetected", 0)
+                                harmless = stats.get("harmless", 0)
+                                failure = stats.get("failure", 0)
+                                unsupported = stats.get("type-unsupported", 0)
+                                total = malicious + suspicious + undetected + harmless + failure + unsupported
+                                percent = round((malicious / total) * 100, 2) if total > 0 else 0
+
+                                # Try to get hashes for logging
+                                meta = result_data.get("meta", {}).get("file_info", {})
+                                sha256 = meta.get("sha256", "Unknown")
+                                sha1 = meta.get("sha1", "Unknown")
+                                md5 = meta.get("md5", "Unknown")
+
+                                # Compose embed for log
+                                embed = discord.Embed(
+                                    title="VirusTotal Auto Scan Result",
+                                    description=f"File: `{file_name}`",
+                                    color=discord.Colour(0xff4545) if malicious > 0 else (discord.Colour(0xff9144) if suspicious > 0 else discord.Colour(0x2BBD8E))
+                                )
+                                embed.add_field(name="Malicious", value=str(malicious), inline=True)
+                                embed.add_field(name="Suspicious", value=str(suspicious), inline=True)
+                                embed.add_field(name="Harmless", value=str(harmless), inline=True)
+                                embed.add_field(name="Undetected", value=str(undetected), inline=True)
+                                embed.add_field(name="Failure", value=str(failure), inline=True)
+                                embed.add_field(name="Unsupported", value=str(unsupported), inline=True)
+                                embed.add_field(name="Detection %", value=f"{percent}%", inline=True)
+                                embed.add_field(name="SHA256", value=sha256, inline=False)
+                                embed.add_field(name="SHA1", value=sha1, inline=False)
+                                embed.add_field(name="MD5", value=md5, inline=False)
+                                embed.add_field(name="VirusTotal Link", value=f"[View results](https://www.virustotal.com/gui/file/{sha256})", inline=False)
+                                if message:
+                                    embed.add_field(name="Submitted By", value=message.author.mention, inline=True)
+                                    embed.add_field(name="Channel", value=message.channel.mention, inline=True)
+                                    embed.timestamp = message.created_at
+
+                                # --- Malware action logic ---
+                                action_taken = False
+                                if malicious >= malware_action_threshold and malware_action != "none" and message:
+                                    member = message.author
+                                    reason = f"VirusTotal: Sent file flagged as malware by {malicious} vendors."
+                                    try:
+                                        if malware_action == "kick":
+                                            await member.kick(reason=reason)
+                                            await ctx.send(f":warning: {member.mention} was **kicked** for sending a file flagged as malware by {malicious} vendors.")
+                                            action_taken = True
+                                        elif malware_action == "ban":
+                                            await member.ban(reason=reason, delete_message_days=0)
+                                            await ctx.send(f":warning: {member.mention} was **banned** for sending a file flagged as malware by {malicious} vendors.")
+                                            action_taken = True
+                                        elif malware_action == "timeout":
+                                            # Discord timeouts require discord.py 2.0+ and permissions
+                                            if hasattr(member, "timed_out_until"):
+                                                from datetime import timedelta, datetime, timezone
+                                                until = datetime.now(timezone.utc) + timedelta(seconds=malware_action_timeout)
+                                                await member.edit(timeout=until, reason=reason)
+                                                await ctx.send(f"{member.mention} was **timed out** for {malware_action_timeout} seconds for sending a file flagged as malware by {malicious} vendors.")
+                                                action_taken = True
+                                            else:
+                                                await ctx.send(":warning: Timeout action is not supported on this version of discord.py.")
+                                    except discord.Forbidden:
+                                        await ctx.send(f":warning: I do not have permission to {malware_action} {member.mention}.")
+                                    except Exception as e:
+                                        await ctx.send(f":warning: Failed to {malware_action} {member.mention}: {e}")
+
+                                if malicious > 0 or suspicious > 0:
+                                    # Attempt to delete the file message if possible
                                     if message:
-                                        embed.add_field(name="Submitted By", value=message.author.mention, inline=True)
-                                        embed.add_field(name="Channel", value=message.channel.mention, inline=True)
-                                        embed.timestamp = message.created_at
-
-                                    # --- Malware action logic ---
-                                    action_taken = False
-                                    if malicious >= malware_action_threshold and malware_action != "none" and message:
-                                        member = message.author
-                                        reason = f"VirusTotal: Sent file flagged as malware by {malicious} vendors."
                                         try:
-                                            if malware_action == "kick":
-                                                await member.kick(reason=reason)
-                                                await ctx.send(f":warning: {member.mention} was **kicked** for sending a file flagged as malware by {malicious} vendors.")
-                                                action_taken = True
-                                            elif malware_action == "ban":
-                                                await member.ban(reason=reason, delete_message_days=0)
-                                                await ctx.send(f":warning: {member.mention} was **banned** for sending a file flagged as malware by {malicious} vendors.")
-                                                action_taken = True
-                                            elif malware_action == "timeout":
-                                                # Discord timeouts require discord.py 2.0+ and permissions
-                                                if hasattr(member, "timed_out_until"):
-                                                    from datetime import timedelta, datetime, timezone
-                                                    until = datetime.now(timezone.utc) + timedelta(seconds=malware_action_timeout)
-                                                    await member.edit(timeout=until, reason=reason)
-                                                    await ctx.send(f"{member.mention} was **timed out** for {malware_action_timeout} seconds for sending a file flagged as malware by {malicious} vendors.")
-                                                    action_taken = True
-                                                else:
-                                                    await ctx.send(":warning: Timeout action is not supported on this version of discord.py.")
-                                        except discord.Forbidden:
-                                            await ctx.send(f":warning: I do not have permission to {malware_action} {member.mention}.")
-                                        except Exception as e:
-                                            await ctx.send(f":warning: Failed to {malware_action} {member.mention}: {e}")
-
-                                    if malicious > 0 or suspicious > 0:
-                                        # Attempt to delete the file message if possible
-                                        if message:
-                                            try:
-                                                await message.delete()
-                                            except Exception:
-                                                pass
-                                        # Send alert as an embed
-                                        alert_embed = discord.Embed(
-                                            title="Malware detected in file",
-                                            description=f"Malware or suspicious behavor was detected in file `{file_name}`",
-                                            color=0xfffffe
-                                        )
-                                        embed.set_footer(text="Powered by VirusTotal | virustotal.com")
-                                        await ctx.send(embed=alert_embed)
-                                        # Log to log channel if set
-                                        if log_channel:
-                                            try:
-                                                await log_channel.send(embed=embed)
-                                            except Exception:
-                                                pass
-                                    else:
-                                        # Log all scans to log channel if set
-                                        if log_channel:
-                                            try:
-                                                await log_channel.send(embed=embed)
-                                            except Exception:
-                                                pass
-                                    break
+                                            await message.delete()
+                                        except Exception:
+                                            pass
+                                    # Send alert as an embed
+                                    alert_embed = discord.Embed(
+                                        title="Malware detected in file",
+                                        description=f"Malware or suspicious behavor was detected in file `{file_name}`",
+                                        color=0xfffffe
+                                    )
+                                    embed.set_footer(text="Powered by VirusTotal | virustotal.com")
+                                    await ctx.send(embed=alert_embed)
+                                    # Log to log channel if set
+                                    if log_channel:
+                                        try:
+                                            await log_channel.send(embed=embed)
+                                        except Exception:
+                                            pass
                                 else:
-                                    await asyncio.sleep(15)  # Wait a bit before checking again
+                                    # Log all scans to log channel if set
+                                    if log_channel:
+                                        try:
+                                            await log_channel.send(embed=embed)
+                                        except Exception:
+                                            pass
+                                break
+                            else:
+                                await asyncio.sleep(15)  # Wait a bit before checking again
 
     @virustotal.group(name="scan", invoke_without_command=True)
     async def scan(self, ctx):
@@ -353,13 +360,13 @@ class VirusTotal(commands.Cog):
                 await self.send_error(ctx, "No VirusTotal API Key set", "Your Red instance doesn't have an API key set for VirusTotal.\n\nUntil you add an API key using `[p]set api`, the VirusTotal API will refuse your requests and this cog won't work.")
                 return
 
-            async with aiohttp.ClientSession() as session:
-                try:
-                    await self.submit_url_for_analysis(ctx, session, vt_key, file_url)
-                except (aiohttp.ClientResponseError, ValueError) as e:
-                    await self.send_error(ctx, "Failed to submit URL", str(e))
-                except asyncio.TimeoutError:
-                    await self.send_error(ctx, "Request timed out", "The bot was unable to complete the request due to a timeout.")
+            session = self.http.session
+            try:
+                await self.submit_url_for_analysis(ctx, session, vt_key, file_url)
+            except (aiohttp.ClientResponseError, ValueError) as e:
+                await self.send_error(ctx, "Failed to submit URL", str(e))
+            except asyncio.TimeoutError:
+                await self.send_error(ctx, "Request timed out", "The bot was unable to complete the request due to a timeout.")
 
     @scan.command(name="file")
     async def scan_file(self, ctx):
@@ -370,21 +377,21 @@ class VirusTotal(commands.Cog):
                 await self.send_error(ctx, "No VirusTotal API Key set", "Your Red instance doesn't have an API key set for VirusTotal.\n\nUntil you add an API key using `[p]set api`, the VirusTotal API will refuse your requests and this cog won't work.")
                 return
 
-            async with aiohttp.ClientSession() as session:
-                try:
-                    attachments = ctx.message.attachments
-                    if ctx.message.reference and not attachments:
-                        ref_message = await ctx.channel.fetch_message(ctx.message.reference.message_id)
-                        attachments = ref_message.attachments
-
-                    if attachments:
-                        await self.submit_attachment_for_analysis(ctx, session, vt_key, attachments[0])
-                    else:
-                        await self.send_error(ctx, "No file provided", "The bot was unable to find content to submit for analysis!\nPlease provide one of the following when using this command:\n- Drag-and-drop a file less than 30mb in size\n- Reply to a message containing a file")
-                except (aiohttp.ClientResponseError, ValueError) as e:
-                    await self.send_error(ctx, "Failed to submit file", str(e))
-                except asyncio.TimeoutError:
-                    await self.send_error(ctx, "Request timed out", "The bot was unable to complete the request due to a timeout.")
+            session = self.http.session
+            try:
+                attachments = ctx.message.attachments
+                if ctx.message.reference and not attachments:
+                    ref_message = await ctx.channel.fetch_message(ctx.message.reference.message_id)
+                    attachments = ref_message.attachments
+
+                if attachments:
+                    await self.submit_attachment_for_analysis(ctx, session, vt_key, attachments[0])
+                else:
+                    await self.send_error(ctx, "No file provided", "The bot was unable to find content to submit for analysis!\nPlease provide one of the following when using this command:\n- Drag-and-drop a file less than 30mb in size\n- Reply to a message containing a file")
+            except (aiohttp.ClientResponseError, ValueError) as e:
+                await self.send_error(ctx, "Failed to submit file", str(e))
+            except asyncio.TimeoutError:
+                await self.send_error(ctx, "Request timed out", "The bot was unable to complete the request due to a timeout.")
 
     async def submit_url_for_analysis(self, ctx, session, vt_key, file_url):
         async with session.post("https://www.virustotal.com/api/v3/urls", headers={"x-apikey": vt_key["api_key"]}, data={"url": file_url}) as response:
@@ -442,45 +449,44 @@ class VirusTotal(commands.Cog):
         vt_key = await self.bot.get_shared_api_tokens("virustotal")
         headers = {"x-apikey": vt_key["api_key"]}
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(f'https://www.virustotal.com/api/v3/analyses/{analysis_id}', headers=headers) as response:
-                    if response.status != 200:
-                        raise aiohttp.ClientResponseError(response.request_info, response.history, status=response.status, message=f"HTTP error {response.status}", headers=response.headers)
-                    data = await response.json()
-                    attributes = data.get("data", {}).get("attributes", {})
-                    while attributes.get("status") != "completed":
-                        await asyncio.sleep(3)
-                        async with session.get(f'https://www.virustotal.com/api/v3/analyses/{analysis_id}', headers=headers) as response:
-                            if response.status != 200:
-                                raise aiohttp.ClientResponseError(response.request_info, response.history, status=response.status, message=f"HTTP error {response.status}", headers=response.headers)
-                            data = await response.json()
-                            attributes = data.get("data", {}).get("attributes", {})
+        try:
+            async with self.http.get(f'https://www.virustotal.com/api/v3/analyses/{analysis_id}', headers=headers) as response:
+                if response.status != 200:
+                    raise aiohttp.ClientResponseError(response.request_info, response.history, status=response.status, message=f"HTTP error {response.status}", headers=response.headers)
+                data = await response.json()
+                attributes = data.get("data", {}).get("attributes", {})
+                while attributes.get("status") != "completed":
+                    await asyncio.sleep(3)
+                    async with self.http.get(f'https://www.virustotal.com/api/v3/analyses/{analysis_id}', headers=headers) as response:
+                        if response.status != 200:
+                            raise aiohttp.ClientResponseError(response.request_info, response.history, status=response.status, message=f"HTTP error {response.status}", headers=response.headers)
+                        data = await response.json()
+                        attributes = data.get("data", {}).get("attributes", {})
                     
-                    stats = attributes.get("stats", {})
-                    malicious_count = stats.get("malicious", 0)
-                    suspicious_count = stats.get("suspicious", 0)
-                    undetected_count = stats.get("undetected", 0)
-                    harmless_count = stats.get("harmless", 0)
-                    failure_count = stats.get("failure", 0)
-                    unsupported_count = stats.get("type-unsupported", 0)
-                    meta = data.get("meta", {}).get("file_info", {})
-                    sha256 = meta.get("sha256")
-                    sha1 = meta.get("sha1")
-                    md5 = meta.get("md5")
-
-                    total_count = malicious_count + suspicious_count + undetected_count + harmless_count + failure_count + unsupported_count
-                    safe_count = harmless_count + undetected_count
-                    percent = round((malicious_count / total_count) * 100, 2) if total_count > 0 else 0
-                    if sha256 and sha1 and md5:
-                        await self.send_analysis_results(ctx, presid, sha256, sha1, file_name, malicious_count, total_count, percent, safe_count)
-                        self.log_submission(ctx.author.id, f"`{file_name}` - **{malicious_count}/{total_count}** - [View results](https://www.virustotal.com/gui/file/{sha256})")
-                    else:
-                        raise ValueError("Required hash values not found in the analysis response.")
-            except (aiohttp.ClientResponseError, ValueError) as e:
-                await self.send_error(ctx, "Analysis failed", str(e))
-            except asyncio.TimeoutError:
-                await self.send_error(ctx, "Request timed out", "The bot was unable to complete the request due to a timeout.")
+                stats = attributes.get("stats", {})
+                malicious_count = stats.get("malicious", 0)
+                suspicious_count = stats.get("suspicious", 0)
+                undetected_count = stats.get("undetected", 0)
+                harmless_count = stats.get("harmless", 0)
+                failure_count = stats.get("failure", 0)
+                unsupported_count = stats.get("type-unsupported", 0)
+                meta = data.get("meta", {}).get("file_info", {})
+                sha256 = meta.get("sha256")
+                sha1 = meta.get("sha1")
+                md5 = meta.get("md5")
+
+                total_count = malicious_count + suspicious_count + undetected_count + harmless_count + failure_count + unsupported_count
+                safe_count = harmless_count + undetected_count
+                percent = round((malicious_count / total_count) * 100, 2) if total_count > 0 else 0
+                if sha256 and sha1 and md5:
+                    await self.send_analysis_results(ctx, presid, sha256, sha1, file_name, malicious_count, total_count, percent, safe_count)
+                    self.log_submission(ctx.author.id, f"`{file_name}` - **{malicious_count}/{total_count}** - [View results](https://www.virustotal.com/gui/file/{sha256})")
+                else:
+                    raise ValueError("Required hash values not found in the analysis response.")
+        except (aiohttp.ClientResponseError, ValueError) as e:
+            await self.send_error(ctx, "Analysis failed", str(e))
+        except asyncio.TimeoutError:
+            await self.send_error(ctx, "Request timed out", "The bot was unable to complete the request due to a timeout.")
 
     async def send_analysis_results(self, ctx, presid, sha256, sha1, file_name, malicious_count, total_count, percent, safe_count):
         content = f"||<@{presid}>||"
@@ -1,5 +1,4 @@
 import discord #type: ignore
-import aiohttp #type: ignore
 import asyncio
 import csv
 from datetime import datetime
@@ -11,7 +10,6 @@ class Weather(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
-        self.session = aiohttp.ClientSession()
         self.config = Config.get_conf(self, identifier=1234567890)
         default_user = {
             "zip_code": None,
@@ -53,14 +51,19 @@ class Weather(commands.Cog):
                 if i != 0
             }
         
+    @property
+    def http(self):
+        # Pooled session shared by the BeeHive cogs, looked up per use so load order doesn't matter
+        cog = self.bot.get_cog("BeeHiveHTTP")
+        if cog is None:
+            raise RuntimeError("The beehivehttp cog must be loaded to make web requests.")
+        return cog.provider
+
     def cog_load(self):
         self.bot.loop.create_task(self.start_severe_alerts_task())
         self.bot.loop.create_task(self.start_freeze_alerts_task())
         self.bot.loop.create_task(self.start_heat_alerts_task())
 
-    def cog_unload(self):
-        self.bot.loop.create_task(self.session.close())
-
     def fahrenheit_to_celsius(self, f):
         result = round((f - 32) * 5.0 / 9.0, 1)
         return f"{result:.1f}"
@@ -91,7 +94,7 @@ class Weather(commands.Cog):
             latitude, longitude = self.zip_codes[zip_code]
             alerts_url = f"https://api.weather.gov/alerts/active?point={latitude.strip()},{longitude.strip()}"
 
-            async with self.session.get(alerts_url) as response:
+            async with self.http.get(alerts_url) as response:
                 if response.status != 200:
                     continue
 
@@ -154,7 +157,7 @@ class Weather(commands.Cog):
         points_url = f"https://api.weather.gov/points/{latitude.strip()},{longitude.strip()}"
         
         # Fetch weather data using the latitude and longitude
-        async with self.session.get(points_url) as response:
+        async with self.http.get(points_url) as response:
             if response.status != 200:
                 await ctx.send(f"Failed to fetch the weather data. Status Code: {response.status}")
                 return
@@ -165,7 +168,7 @@ class Weather(commands.Cog):
                 await ctx.send(f"Failed to retrieve forecast URL.")
                 return
             
-            async with self.session.get(forecast_url) as forecast_response:
+            async with self.http.get(forecast_url) as forecast_response:
                 if forecast_response.status != 200:
                     await ctx.send(f"Failed to fetch the forecast data.")
                     return
@@ -341,7 +344,7 @@ class Weather(commands.Cog):
             queryString = "&".join(f"{key}={value}" for key, value in params.items())
             weather_url = f"{url}?{queryString}"
             
-            async with self.session.get(weather_url) as response:
+            async with self.http.get(weather_url) as response:
                 if response.status != 200:
                     await ctx.send(f"Failed to fetch the weather data. URL: {weather_url}, Status Code: {response.status}")
                     return
@@ -455,7 +458,7 @@ class Weather(commands.Cog):
                 # Fetch severe and extreme weather alerts
                 alerts_url = f"https://api.weather.gov/alerts/active?point={latitude.strip()},{longitude.strip()}"
                 active_alerts_list = []
-                async with self.session.get(alerts_url) as alerts_response:
+                async with self.http.get(alerts_url) as alerts_response:
                     try:
                         alerts_response.raise_for_status()
                         alerts_data = await alerts_response.json()
@@ -561,7 +564,7 @@ class Weather(commands.Cog):
                         "max_tokens": 500,
                         "temperature": 1.0
                     }
-                    async with self.session.post(openai_url, headers=headers, json=openai_payload) as openai_response:
+                    async with self.http.post(openai_url, headers=headers, json=openai_payload) as openai_response:
                         if openai_response.status == 200:
                             openai_data = await openai_response.json()
                             ai_summary = openai_data.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
@@ -629,7 +632,7 @@ class Weather(commands.Cog):
     async def glossary(self, ctx, *, search_term: str = None):
         """Show a glossary, or specify a word to search"""
         headers = {"Accept": "application/ld+json"}
-        async with self.session.get("https://api.weather.gov/glossary", headers=headers) as response:
+        async with self.http.get("https://api.weather.gov/glossary", headers=headers) as response:
             if response.status != 200:
                 await ctx.send("Failed to fetch the glossary. Please try again later.")
                 return
@@ -727,12 +730,11 @@ class Weather(commands.Cog):
     async def alerts(self, ctx):
         """Shows a statistical summary of active weather alerts"""
         url = "https://api.weather.gov/alerts/active/count"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    await ctx.send("Failed to fetch active alerts.")
-                    return
-                data = await response.json()
+        async with self.http.get(url) as response:
+            if response.status != 200:
+                await ctx.send("Failed to fetch active alerts.")
+                return
+            data = await response.json()
                     
         pages = []
 
@@ -760,30 +762,29 @@ class Weather(commands.Cog):
 
         # Page 3: alert types
         alerts_url = "https://api.weather.gov/alerts/active"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(alerts_url) as alerts_response:
-                if alerts_response.status != 200:
-                    await ctx.send("Failed to fetch active alerts by type.")
-                    return
-                alerts_data = await alerts_response.json()
-                if "features" in alerts_data:
-                    alert_types = {}
-                    for alert in alerts_data["features"]:
-                        alert_type = alert["properties"].get("event", "Unknown")
-                        if alert_type == "Test Message":
-                            continue  # Skip "Test Message" events
-                        if alert_type in alert_types:
-                            alert_types[alert_type] += 1
-                        else:
-                            alert_types[alert_type] = 1
-
-                    alert_type_items = list(alert_types.items())
-                    for i in range(0, len(alert_type_items), 25):
-                        embed = discord.Embed(title="Active weather alerts by type", color=0xfffffe)
-                        for alert_type, count in alert_type_items[i:i+25]:
-                            alert_word = "alert" if count == 1 else "alerts"
-                            embed.add_field(name=alert_type, value=f"**{count}** {alert_word}", inline=True)
-                        pages.append(embed)
+        async with self.http.get(alerts_url) as alerts_response:
+            if alerts_response.status != 200:
+                await ctx.send("Failed to fetch active alerts by type.")
+                return
+            alerts_data = await alerts_response.json()
+            if "features" in alerts_data:
+                alert_types = {}
+                for alert in alerts_data["features"]:
+                    alert_type = alert["properties"].get("event", "Unknown")
+                    if alert_type == "Test Message":
+                        continue  # Skip "Test Message" events
+                    if alert_type in alert_types:
+                        alert_types[alert_type] += 1
+                    else:
+                        alert_types[alert_type] = 1
+
+                alert_type_items = list(alert_types.items())
+                for i in range(0, len(alert_type_items), 25):
+                    embed = discord.Embed(title="Active weather alerts by type", color=0xfffffe)
+                    for alert_type, count in alert_type_items[i:i+25]:
+                        alert_word = "alert" if count == 1 else "alerts"
+                        embed.add_field(name=alert_type, value=f"**{count}** {alert_word}", inline=True)
+                    pages.append(embed)
 
         # Page 4 and beyond: areas
         state_full_names = {
@@ -855,75 +856,74 @@ class Weather(commands.Cog):
         url = "https://api.weather.gov/stations"
         headers = {"accept": "application/geo+json"}
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status != 200:
-                    await ctx.send("Failed to fetch stations data.")
-                    return
-                data = await response.json()
+        async with self.http.get(url, headers=headers) as response:
+            if response.status != 200:
+                await ctx.send("Failed to fetch stations data.")
+                return
+            data = await response.json()
                 
-                stations = data.get("features", [])
-                if not stations:
-                    await ctx.send("No stations data found.")
-                    return
+            stations = data.get("features", [])
+            if not stations:
+                await ctx.send("No stations data found.")
+                return
                 
-                pages = []
-                for i in range(0, len(stations), 15):
-                    embed = discord.Embed(
-                        title="Weather observation stations", 
-                        description=f"There are {len(stations)} stations in the coverage area", 
-                        color=0xfffffe
+            pages = []
+            for i in range(0, len(stations), 15):
+                embed = discord.Embed(
+                    title="Weather observation stations", 
+                    description=f"There are {len(stations)} stations in the coverage area", 
+                    color=0xfffffe
+                )
+                for station in stations[i:i+15]:
+                    station_name = station["properties"].get("name", "Unknown")
+                    station_id = station["properties"].get("stationIdentifier", "Unknown")
+                    coordinates = station["geometry"]["coordinates"] if "geometry" in station else ["Unknown", "Unknown"]
+                    if coordinates != ["Unknown", "Unknown"]:
+                        coordinates = [round(coordinates[0], 2), round(coordinates[1], 2)]
+                    elevation = station["properties"].get("elevation", {}).get("value", "Unknown")
+                    if elevation != "Unknown":
+                        elevation = int(elevation)
+                    time_zone = station["properties"].get("timeZone", "Unknown").replace("_", " ")
+                    embed.add_field(
+                        name=station_name, 
+                        value=f"`{station_id}`\n`{coordinates[1]}, {coordinates[0]}`\n`{elevation} meters high`\n`{time_zone}`", 
+                        inline=True
                     )
-                    for station in stations[i:i+15]:
-                        station_name = station["properties"].get("name", "Unknown")
-                        station_id = station["properties"].get("stationIdentifier", "Unknown")
-                        coordinates = station["geometry"]["coordinates"] if "geometry" in station else ["Unknown", "Unknown"]
-                        if coordinates != ["Unknown", "Unknown"]:
-                            coordinates = [round(coordinates[0], 2), round(coordinates[1], 2)]
-                        elevation = station["properties"].get("elevation", {}).get("value", "Unknown")
-                        if elevation != "Unknown":
-                            elevation = int(elevation)
-                        time_zone = station["properties"].get("timeZone", "Unknown").replace("_", " ")
-                        embed.add_field(
-                            name=station_name, 
-                            value=f"`{station_id}`\n`{coordinates[1]}, {coordinates[0]}`\n`{elevation} meters high`\n`{time_zone}`", 
-                            inline=True
-                        )
-                    pages.append(embed)
+                pages.append(embed)
                 
-                if not pages:
-                    await ctx.send("No valid stations data found.")
-                    return
+            if not pages:
+                await ctx.send("No valid stations data found.")
+                return
                 
-                message = await ctx.send(embed=pages[0])
-                await message.add_reaction("⬅️")
-                await message.add_reaction("❌")
-                await message.add_reaction("➡️")
+            message = await ctx.send(embed=pages[0])
+            await message.add_reaction("⬅️")
+            await message.add_reaction("❌")
+            await message.add_reaction("➡️")
 
-                def check(reaction, user):
-                    return user == ctx.author and str(reaction.emoji) in ["⬅️", "➡️", "❌"]
+            def check(reaction, user):
+                return user == ctx.author and str(reaction.emoji) in ["⬅️", "➡️", "❌"]
 
-                i = 0
-                reaction = None
-                while True:
-                    try:
-                        reaction, user = await self.bot.wait_for("reaction_add", timeout=30.0, check=check)
-                        await message.remove_reaction(reaction, user)
-                    except asyncio.TimeoutError:
-                        await message.clear_reactions()
-                        break
+            i = 0
+            reaction = None
+            while True:
+                try:
+                    reaction, user = await self.bot.wait_for("reaction_add", timeout=30.0, check=check)
+                    await message.remove_reaction(reaction, user)
+                except asyncio.TimeoutError:
+                    await message.clear_reactions()
+                    break
 
-                    if str(reaction) == "⬅️":
-                        if i > 0:
-                            i -= 1
-                            await message.edit(embed=pages[i])
-                    elif str(reaction) == "➡️":
-                        if i < len(pages) - 1:
-                            i += 1
-                            await message.edit(embed=pages[i])
-                    elif str(reaction) == "❌":
-                        await message.delete()
-                        break
+                if str(reaction) == "⬅️":
+                    if i > 0:
+                        i -= 1
+                        await message.edit(embed=pages[i])
+                elif str(reaction) == "➡️":
+                    if i < len(pages) - 1:
+                        i += 1
+                        await message.edit(embed=pages[i])
+                elif str(reaction) == "❌":
+                    await message.delete()
+                    break
     
     @commands.guild_only()
     @weather.command()
@@ -932,12 +932,11 @@ class Weather(commands.Cog):
         url = "https://api.weather.gov/radar/stations"
         headers = {"accept": "application/geo+json"}
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status != 200:
-                    await ctx.send("Failed to fetch radar stations data.")
-                    return
-                data = await response.json()
+        async with self.http.get(url, headers=headers) as response:
+            if response.status != 200:
+                await ctx.send("Failed to fetch radar stations data.")
+                return
+            data = await response.json()
         
         stations = data.get("features", [])
         if not stations:
@@ -1164,7 +1163,7 @@ class Weather(commands.Cog):
             latitude, longitude = self.zip_codes[zip_code]
             alerts_url = f"https://api.weather.gov/alerts/active?point={latitude.strip()},{longitude.strip()}"
 
-            async with self.session.get(alerts_url) as response:
+            async with self.http.get(alerts_url) as response:
                 if response.status != 200:
                     continue
 
@@ -1204,6 +1203,7 @@ class Weather(commands.Cog):
                             await self.config.total_alerts_sent.set(total_alerts_sent + len(new_alerts))
 
     async def start_severe_alerts_task(self):
+        await self.bot.wait_until_red_ready()
         while True:
             await self.check_weather_alerts()
             await asyncio.sleep(900)
@@ -1232,7 +1232,7 @@ class Weather(commands.Cog):
             latitude, longitude = self.zip_codes[zip_code]
             forecast_url = f"https://api.weather.gov/points/{latitude.strip()},{longitude.strip()}/forecast"
 
-            async with self.session.get(forecast_url) as response:
+            async with self.http.get(forecast_url) as response:
                 if response.status != 200:
                     continue
 
@@ -1258,6 +1258,7 @@ class Weather(commands.Cog):
                             await self.config.total_freeze_alerts_sent.set(total_freeze_alerts_sent + 1)
 
     async def start_freeze_alerts_task(self):
+        await self.bot.wait_until_red_ready()
         while True:
             await self.check_freeze_alerts()
             await asyncio.sleep(604800)  # 7 days in seconds
@@ -1286,7 +1287,7 @@ class Weather(commands.Cog):
             latitude, longitude = self.zip_codes[zip_code]
             forecast_url = f"https://api.weather.gov/points/{latitude.strip()},{longitude.strip()}/forecast"
 
-            async with self.session.get(forecast_url) as response:
+            async with self.http.get(forecast_url) as response:
                 if response.status != 200:
                     continue
 
@@ -1312,6 +1313,7 @@ class Weather(commands.Cog):
                             await self.config.total_heat_alerts_sent.set(total_heat_alerts_sent + 1)
 
     async def start_heat_alerts_task(self):
+        await self.bot.wait_until_red_ready()
         while True:
             await self.check_heat_alerts()
             await asyncio.sleep(604800)  # 7 days in seconds